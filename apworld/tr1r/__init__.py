@@ -2,26 +2,41 @@
 Archipelago World definition for Tomb Raider 1 Remastered.
 """
 
-from typing import Any, Dict, List, Set
+import logging
+from itertools import cycle, islice
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
 
-from BaseClasses import ItemClassification, MultiWorld, Tutorial
+from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, Tutorial
 from worlds.AutoWorld import WebWorld, World
 
-from .items import (
-    AMMO,
-    EVENTS,
-    KEY_ITEMS,
-    MEDIPACKS,
-    TRAPS,
-    TR1RItemData,
-    WEAPONS,
-    get_all_items,
-)
-from .locations import LEVELS, SECRETS_PER_LEVEL, location_id_to_name, location_table
+from .game_data import get_levels, get_secrets_per_level, load_region_table
+from .items import TRAPS, TR1RItemData, get_all_items, get_items_by_category
+from .level_order import Order, shuffle_level_order, vanilla_level_order
+from .locations import get_location_table, get_locations_by_category
+from .manifest import Placement, encode_manifest
 from .options import TR1ROptions
+from .profiling import (
+    ENABLED as PROFILING,
+    PROFILE_DIR,
+    instrument_rule,
+    reset as reset_profile,
+    timed_stage,
+    write_reports,
+)
+from .progress import (
+    LEVELS_COMPLETED,
+    SECRETS_UNLOCKED,
+    ProgressTables,
+    on_collect,
+    on_remove,
+    progress_tables,
+    secrets_needed_for_all,
+)
 from .regions import create_regions
 from .rules import set_rules
 
+logger = logging.getLogger(__name__)
+
 
 class TR1RWeb(WebWorld):
     theme = "dirt"
@@ -52,37 +67,74 @@ class TR1RWorld(World):
     options_dataclass = TR1ROptions
     options: TR1ROptions
 
+    # Frozen item table, shared by every instance of this world
+    item_table: Mapping[str, TR1RItemData] = get_all_items()
+    _item_args: Dict[str, Tuple[ItemClassification, int]] = {
+        name: (data.classification, data.ap_id) for name, data in item_table.items()
+    }
+
     # Item/location name <-> ID mappings
     item_name_to_id: Dict[str, int] = {
-        name: data.ap_id for name, data in get_all_items().items()
+        name: data.ap_id for name, data in item_table.items()
         if data.ap_id is not None
     }
     location_name_to_id: Dict[str, int] = {
-        name: data.ap_id for name, data in location_table.items()
+        name: data.ap_id for name, data in get_location_table().items()
         if data.ap_id is not None
     }
 
+    # Levels in the order this player plays them (see level_order.py), and
+    # the progress counter tables for that order; set in generate_early
+    level_order: Order = vanilla_level_order()
+    progress: ProgressTables = progress_tables(level_order)
+
+    # This player's locations by name, filled in by create_regions
+    locations_by_name: Dict[str, Location]
+
+    @timed_stage
+    def generate_early(self) -> None:
+        if self.options.level_order.value == 1:
+            self.level_order = shuffle_level_order(self.random)
+            self.progress = progress_tables(self.level_order)
+        if self.options.key_gated_regions.value and not load_region_table():
+            logger.warning("TR1R player %d: key_gated_regions is on, but data/tr1r_regions.json is "
+                           "missing or stale; pickups stay in their level regions", self.player)
+
+    @timed_stage
     def create_regions(self) -> None:
-        create_regions(self)
+        self.locations_by_name = create_regions(self)
 
+    @timed_stage
     def create_items(self) -> None:
-        item_pool: List[str] = []
-        all_items = get_all_items()
-        locations_count = len([
-            loc for loc in location_table.values()
-            if loc.category != "level_complete"
-        ])
+        self.multiworld.itempool += self.create_item_batch(self.get_item_pool())
+
+        # Create level completion events (not in item pool)
+        location_table = get_location_table()
+        for loc_name in get_locations_by_category("level_complete"):
+            event_item_name = f"Level Complete - {location_table[loc_name].level}"
+            if event_item_name in self.item_table:
+                self.locations_by_name[loc_name].place_locked_item(
+                    self.create_event(event_item_name)
+                )
 
-        # Add all key items (always in pool)
-        for name, data in KEY_ITEMS.items():
-            item_pool.append(name)
+    def get_item_pool(self) -> List[str]:
+        """Names of every item this world puts in the multiworld pool."""
+        item_table = self.item_table
+        locations_count = (
+            len(get_location_table())
+            - len(get_locations_by_category("level_complete"))
+        )
 
-        # Add weapons
-        for name in WEAPONS:
-            item_pool.append(name)
+        # Add all key items and weapons (always in pool, `count` copies each)
+        item_pool: List[str] = [
+            name
+            for category in ("key_item", "weapon")
+            for name in get_items_by_category(category)
+            for _ in range(item_table[name].count)
+        ]
 
         # Calculate filler needed
-        filler_needed = locations_count - len(item_pool)
+        filler_needed = max(0, locations_count - len(item_pool))
 
         # Calculate traps
         trap_pct = self.options.trap_percentage.value
@@ -90,50 +142,43 @@ class TR1RWorld(World):
         filler_count = filler_needed - trap_count
 
         # Add filler items (ammo + medipacks)
-        filler_items = list(AMMO.keys()) + list(MEDIPACKS.keys())
-        for i in range(filler_count):
-            item_pool.append(filler_items[i % len(filler_items)])
+        filler_items = (
+            get_items_by_category("ammo")
+            + get_items_by_category("large_medipack")
+            + get_items_by_category("small_medipack")
+        )
+        item_pool.extend(islice(cycle(filler_items), filler_count))
 
         # Add traps
-        trap_names = list(TRAPS.keys())
-        for i in range(trap_count):
-            item_pool.append(trap_names[i % len(trap_names)])
-
-        # Create the actual item objects
-        for item_name in item_pool:
-            if item_name in all_items:
-                data = all_items[item_name]
-                self.multiworld.itempool.append(
-                    self.create_item(item_name)
-                )
+        item_pool.extend(islice(cycle(TRAPS), trap_count))
 
-        # Create level completion events (not in item pool)
-        for loc_name, loc_data in location_table.items():
-            if loc_data.category == "level_complete":
-                event_item_name = f"Level Complete - {loc_data.level}"
-                if event_item_name in EVENTS:
-                    event_location = self.multiworld.get_location(loc_name, self.player)
-                    event_location.place_locked_item(
-                        self.create_event(event_item_name)
-                    )
-
-    def create_item(self, name: str):
-        all_items = get_all_items()
-        data = all_items[name]
-        from BaseClasses import Item
-        return Item(name, data.classification, data.ap_id, self.player)
-
-    def create_event(self, name: str):
-        from BaseClasses import Item
-        data = EVENTS[name]
-        return Item(name, data.classification, data.ap_id, self.player)
+        return item_pool
+
+    def create_item_batch(self, names: Iterable[str]) -> List[Item]:
+        """Create many items in one pass over the frozen item table."""
+        item_args = self._item_args
+        player = self.player
+        items: List[Item] = []
+        for name in names:
+            classification, code = item_args[name]
+            items.append(Item(name, classification, code, player))
+        return items
 
+    def create_item(self, name: str) -> Item:
+        classification, code = self._item_args[name]
+        return Item(name, classification, code, self.player)
+
+    def create_event(self, name: str) -> Item:
+        return self.create_item(name)
+
+    @timed_stage
     def set_rules(self) -> None:
         set_rules(self)
 
     def get_filler_item_name(self) -> str:
         return "Small Medipack"
 
+    @timed_stage
     def fill_slot_data(self) -> Dict[str, Any]:
         """Data sent to the client for this player's slot."""
         return {
@@ -142,34 +187,66 @@ class TR1RWorld(World):
             "secrets_mode": self.options.secrets_mode.value,
             "death_link": self.options.death_link.value,
             "starting_weapons": self.options.starting_weapons.value,
-            "total_secrets": sum(SECRETS_PER_LEVEL),
-            "level_sequence": [level[1] for level in LEVELS],
+            "total_secrets": sum(get_secrets_per_level()),
+            "level_sequence": [get_levels()[level][1] for level in self.level_order],
+            "key_gated_regions": self.options.key_gated_regions.value,
+            "placement_manifest": encode_manifest(self.get_placements()),
         }
 
+    def get_placements(self) -> List[Placement]:
+        """What was placed at each of this world's locations (level-complete events excluded)."""
+        level_complete = set(get_locations_by_category("level_complete"))
+        return [
+            Placement(location.address, location.item.code, location.item.player,
+                      int(location.item.classification))
+            for location in self.multiworld.get_locations(self.player)
+            if location.address is not None and location.name not in level_complete
+            and location.item is not None and location.item.code is not None
+        ]
+
+    def collect(self, state: CollectionState, item: Item) -> bool:
+        changed = super().collect(state, item)
+        if changed:
+            on_collect(state.prog_items[self.player], self.progress, item.name)
+        return changed
+
+    def remove(self, state: CollectionState, item: Item) -> bool:
+        changed = super().remove(state, item)
+        if changed:
+            on_remove(state.prog_items[self.player], self.progress, item.name)
+        return changed
+
     def set_completion_rules(self) -> None:
         """Set the completion condition based on the selected goal."""
-        from worlds.generic.Rules import set_rule
-
         goal = self.options.goal.value
         player = self.player
 
-        if goal == 0:  # final_boss
-            self.multiworld.completion_condition[player] = \
-                lambda state: state.has("Level Complete - The Great Pyramid", player)
-        elif goal == 1:  # all_secrets
-            self.multiworld.completion_condition[player] = \
-                lambda state: all(
-                    state.can_reach(f"{level[0]} - Secret {s + 1}", "Location", player)
-                    for i, level in enumerate(LEVELS)
-                    for s in range(SECRETS_PER_LEVEL[i])
-                )
-        elif goal == 2:  # n_levels
+        # all_secrets and n_levels read the progress counters kept up to date
+        # by collect/remove (see progress.py), so each check is O(1).
+        if goal == 0:
+            name = "final_boss"
+            final_level = f"Level Complete - {get_levels()[self.level_order[-1]][0]}"
+            condition = lambda state: state.has(final_level, player)
+        elif goal == 1:
+            name = "all_secrets"
+            needed = secrets_needed_for_all(self.progress)
+            condition = lambda state: state.has(SECRETS_UNLOCKED, player, needed)
+        elif goal == 2:
+            name = "n_levels"
             required = self.options.levels_for_goal.value
-            self.multiworld.completion_condition[player] = \
-                lambda state, req=required: sum(
-                    1 for level in LEVELS
-                    if state.has(f"Level Complete - {level[0]}", player)
-                ) >= req
+            condition = lambda state: state.has(LEVELS_COMPLETED, player, required)
+        else:
+            return
+        self.multiworld.completion_condition[player] = instrument_rule(condition, "completion", name, player)
 
+    @timed_stage
     def generate_basic(self) -> None:
         self.set_completion_rules()
+
+    @classmethod
+    def stage_generate_output(cls, multiworld: MultiWorld, output_directory: str) -> None:
+        """Write the generation profile, when enabled (see profiling.py)."""
+        if PROFILING:
+            report, folded = write_reports(PROFILE_DIR)
+            logger.info("TR1R profile written to %s and %s", report, folded)
+            reset_profile()
@@ -0,0 +1,373 @@
+"""
+Shared game data for Tomb Raider 1 Remastered Archipelago World.
+
+Game data (exported by TRDataExporter) is loaded once per process and shared
+by items.py and locations.py. Every table derived from it is built on first
+use and cached, so importing the apworld only pays for what generation
+actually touches. Cached tables are exposed read-only because they are shared
+between all TR1RWorld instances.
+
+Files shipped in data/:
+  - tr1r_data.json:    the exporter's source of truth.
+  - tr1r_data.bin:     the same data in a compact binary form (see below),
+                       which loads much faster than parsing the JSON.
+  - tr1r_regions.json: key-gated sub-regions compiled from the room graphs in
+                       the JSON by tools/compile_regions.py (optional).
+
+The binary form is only used when its header matches FORMAT_VERSION and the
+SHA-256 of the shipped JSON; otherwise the JSON is parsed instead. Both paths
+produce the same GameData, with pickup/key item tables packed into fixed-size
+records rather than dicts.
+
+Binary layout (little-endian):
+  header:   b"TR1R", u16 version, 32-byte SHA-256 of tr1r_data.json
+  strings:  u32 count, then per string: u16 byte length + UTF-8 bytes
+            (string 0 is always "", used for unset fields)
+  levels:   u16 count, then per level:
+              u16 name, u16 file, u16 region (string indexes), u16 sequence,
+              u16 pickup count, u16 key item count, u16 secret count,
+              pickup records, key item records (ENTITY_RECORD each),
+              u16 secret index per secret
+  items:    u16 count, then per definition:
+              u16 key, i32 id, u16 name, u16 category, u16 classification
+  sequence: u16 count, then u16 string index per level file
+"""
+
+import hashlib
+import json
+import pkgutil
+import struct
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from .ids import ITEM_BASE_ID, KEY_ITEM, PICKUP_TYPES, decode_item_id
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+FORMAT_MAGIC = b"TR1R"
+FORMAT_VERSION = 1
+
+# entity index, type, category, alias, name (string indexes), x, y, z, room
+ENTITY_RECORD = struct.Struct("<HHHHHiiih")
+
+_HEADER = struct.Struct("<4sH32s")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_LEVEL_HEADER = struct.Struct("<7H")
+_ITEM_DEFINITION = struct.Struct("<HiHHH")
+
+
+class EntityRecord(NamedTuple):
+    entity_index: int
+    type: str
+    category: str  # pickups only ("weapon", "ammo", ...), "" for key items
+    alias: str     # key items only, "" for pickups
+    name: str      # key items only, "" for pickups
+    x: int
+    y: int
+    z: int
+    room: int
+
+
+class EntityTable:
+    """
+    Pickups or key items of one level, packed as ENTITY_RECORD structs.
+
+    String fields are indexes into the string pool shared by the whole data
+    set; rows are decoded on iteration.
+    """
+
+    __slots__ = ("_buffer", "_strings")
+
+    def __init__(self, buffer: bytes, strings: Sequence[str]):
+        self._buffer = buffer
+        self._strings = strings
+
+    def __len__(self) -> int:
+        return len(self._buffer) // ENTITY_RECORD.size
+
+    def __iter__(self) -> Iterator[EntityRecord]:
+        strings = self._strings
+        for entity_index, type_id, category, alias, name, x, y, z, room \
+                in ENTITY_RECORD.iter_unpack(self._buffer):
+            yield EntityRecord(entity_index, strings[type_id], strings[category],
+                               strings[alias], strings[name], x, y, z, room)
+
+    @property
+    def buffer(self) -> bytes:
+        return self._buffer
+
+
+class LevelData(NamedTuple):
+    name: str
+    file: str
+    region: str
+    sequence: int
+    pickups: EntityTable
+    key_items: EntityTable
+    secrets: Tuple[int, ...]  # secret indexes
+
+
+class ItemDefinition(NamedTuple):
+    id: int
+    name: str
+    category: str
+    ap_classification: str
+
+
+class GameData(NamedTuple):
+    levels: Tuple[LevelData, ...]
+    item_definitions: Mapping[str, ItemDefinition]
+    level_sequence: Tuple[str, ...]
+
+
+class DataFormatError(ValueError):
+    """The binary data is malformed, from another format version, or stale."""
+
+
+@lru_cache(maxsize=None)
+def load_game_data() -> GameData:
+    """Load exported game data (ZIP-safe, loaded once), preferring the binary form."""
+    source = pkgutil.get_data(__package__, "data/tr1r_data.json")
+    try:
+        packed = pkgutil.get_data(__package__, "data/tr1r_data.bin")
+    except OSError:
+        packed = None
+
+    if packed is not None:
+        try:
+            return decode_game_data(packed, hashlib.sha256(source).digest())
+        except DataFormatError:
+            pass
+    return parse_json_game_data(source)
+
+
+def parse_json_game_data(source: bytes) -> GameData:
+    """Build GameData from the exporter's JSON."""
+    raw = json.loads(source.decode("utf-8"))
+    strings: List[str] = [""]
+    string_ids: Dict[str, int] = {"": 0}
+
+    def intern(value: Optional[str]) -> int:
+        value = value or ""
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(strings)
+            strings.append(value)
+        return index
+
+    def pack(entities: List[dict], key_items: bool) -> bytes:
+        return b"".join(
+            ENTITY_RECORD.pack(
+                entity["entityIndex"],
+                intern(entity["type"]),
+                0 if key_items else intern(entity.get("category")),
+                intern(entity.get("alias")) if key_items else 0,
+                intern(entity.get("name")) if key_items else 0,
+                entity.get("x", 0), entity.get("y", 0), entity.get("z", 0),
+                entity.get("room", 0),
+            )
+            for entity in entities
+        )
+
+    packed_levels = [
+        (level, pack(level["pickups"], False), pack(level["keyItems"], True))
+        for level in raw["levels"]
+    ]
+    levels = tuple(
+        LevelData(
+            name=level["name"],
+            file=level["file"],
+            region=level["region"],
+            sequence=level.get("sequence", i + 1),
+            pickups=EntityTable(pickups, strings),
+            key_items=EntityTable(key_items, strings),
+            secrets=tuple(secret["index"] for secret in level["secrets"]),
+        )
+        for i, (level, pickups, key_items) in enumerate(packed_levels)
+    )
+    item_definitions = {
+        key: ItemDefinition(item["id"], item["name"], item["category"], item["apClassification"])
+        for key, item in raw["itemDefinitions"].items()
+    }
+    _check_item_ids(item_definitions)
+    return GameData(levels, MappingProxyType(item_definitions), tuple(raw.get("levelSequence", ())))
+
+
+def decode_game_data(packed: bytes, source_hash: Optional[bytes] = None) -> GameData:
+    """
+    Decode the binary form of the game data.
+
+    If source_hash is given, it must match the JSON hash recorded in the
+    header. Raises DataFormatError if the data can't be used.
+    """
+    try:
+        magic, version, recorded_hash = _HEADER.unpack_from(packed, 0)
+        if magic != FORMAT_MAGIC or version != FORMAT_VERSION:
+            raise DataFormatError(f"unsupported data format {magic!r} v{version}")
+        if source_hash is not None and recorded_hash != source_hash:
+            raise DataFormatError("binary data does not match tr1r_data.json")
+        game_data = _decode_body(memoryview(packed), _HEADER.size)
+    except (struct.error, IndexError, UnicodeDecodeError) as ex:
+        raise DataFormatError(f"malformed binary data: {ex}") from ex
+    _check_item_ids(game_data.item_definitions)
+    return game_data
+
+
+def _decode_body(view: memoryview, offset: int) -> GameData:
+    (string_count,) = _U32.unpack_from(view, offset)
+    offset += _U32.size
+    strings: List[str] = []
+    for _ in range(string_count):
+        (length,) = _U16.unpack_from(view, offset)
+        offset += _U16.size
+        strings.append(str(view[offset:offset + length], "utf-8"))
+        offset += length
+
+    (level_count,) = _U16.unpack_from(view, offset)
+    offset += _U16.size
+    levels: List[LevelData] = []
+    for _ in range(level_count):
+        name, file, region, sequence, pickup_count, key_count, secret_count = \
+            _LEVEL_HEADER.unpack_from(view, offset)
+        offset += _LEVEL_HEADER.size
+        pickups_end = offset + pickup_count * ENTITY_RECORD.size
+        keys_end = pickups_end + key_count * ENTITY_RECORD.size
+        secrets = struct.unpack_from(f"<{secret_count}H", view, keys_end)
+        levels.append(LevelData(
+            name=strings[name],
+            file=strings[file],
+            region=strings[region],
+            sequence=sequence,
+            pickups=EntityTable(bytes(view[offset:pickups_end]), strings),
+            key_items=EntityTable(bytes(view[pickups_end:keys_end]), strings),
+            secrets=secrets,
+        ))
+        offset = keys_end + secret_count * _U16.size
+
+    (item_count,) = _U16.unpack_from(view, offset)
+    offset += _U16.size
+    item_definitions: Dict[str, ItemDefinition] = {}
+    for key, item_id, name, category, classification in \
+            _ITEM_DEFINITION.iter_unpack(view[offset:offset + item_count * _ITEM_DEFINITION.size]):
+        item_definitions[strings[key]] = ItemDefinition(
+            item_id, strings[name], strings[category], strings[classification]
+        )
+    offset += item_count * _ITEM_DEFINITION.size
+
+    (sequence_count,) = _U16.unpack_from(view, offset)
+    offset += _U16.size
+    level_sequence = tuple(strings[i] for i in struct.unpack_from(f"<{sequence_count}H", view, offset))
+
+    return GameData(tuple(levels), MappingProxyType(item_definitions), level_sequence)
+
+
+# Item definition keys are camel-cased in the exporters' JSON ("shotgun_S_P")
+_PICKUP_TYPES_BY_KEY = {name.lower(): value for name, value in PICKUP_TYPES.items()}
+
+
+def _check_item_ids(item_definitions: Mapping[str, ItemDefinition]) -> None:
+    """
+    Reject item IDs that don't follow ids.py: key items are 770000 + their
+    TR1Type alias, pickup types 770000 + their TR1Type. The client maps
+    received items back to entities by these IDs, so a table exported with
+    another scheme would hand out the wrong items.
+    """
+    for key, item in item_definitions.items():
+        if item.category == "key_item":
+            valid = decode_item_id(item.id)[0] == KEY_ITEM
+        else:
+            type_value = _PICKUP_TYPES_BY_KEY.get(key.lower())
+            valid = type_value is not None and item.id == ITEM_BASE_ID + type_value
+        if not valid:
+            raise ValueError(
+                f"tr1r_data.json: item {key} has ID {item.id}, which doesn't follow ids.py; "
+                "re-export with TRDataExporter or tools/export_data.py"
+            )
+
+
+class SubRegion(NamedTuple):
+    name: str
+    requires: Tuple[FrozenSet[str], ...]  # any one of these item sets opens it
+    locations: FrozenSet[int]             # location IDs placed in it
+
+
+REGION_TABLE_VERSION = 2  # tools/compile_regions.py TABLE_VERSION
+
+
+@lru_cache(maxsize=None)
+def load_region_table() -> Mapping[str, Tuple[SubRegion, ...]]:
+    """
+    Key-gated sub-regions per level, from data/tr1r_regions.json.
+
+    The table is compiled ahead of time by tools/compile_regions.py. Levels
+    without gated locations are absent, and the whole table is empty if the
+    file is missing or was compiled from a different tr1r_data.json.
+    """
+    try:
+        packed = pkgutil.get_data(__package__, "data/tr1r_regions.json")
+    except OSError:
+        return MappingProxyType({})
+
+    raw = json.loads(packed.decode("utf-8"))
+    source = pkgutil.get_data(__package__, "data/tr1r_data.json")
+    if raw.get("version") != REGION_TABLE_VERSION \
+            or raw.get("source_sha256") != hashlib.sha256(source).hexdigest():
+        return MappingProxyType({})
+
+    return MappingProxyType({
+        level: tuple(
+            SubRegion(
+                area["name"],
+                tuple(frozenset(keys) for keys in area["requires"]),
+                frozenset(area["locations"]),
+            )
+            for area in areas
+        )
+        for level, areas in raw["levels"].items()
+    })
+
+
+@lru_cache(maxsize=None)
+def get_levels() -> Tuple[Tuple[str, str, str], ...]:
+    """Level info in game order: ((name, file, region), ...)."""
+    return tuple(
+        (level.name, level.file, level.region)
+        for level in load_game_data().levels
+    )
+
+
+@lru_cache(maxsize=None)
+def get_secrets_per_level() -> Tuple[int, ...]:
+    """Secret counts per level, in game order (from actual data, not hardcoded to 3)."""
+    return tuple(len(level.secrets) for level in load_game_data().levels)
+
+
+def build_index(table: Mapping[str, T], key: Callable[[T], K]) -> Mapping[K, Tuple[str, ...]]:
+    """Group the names of a table by a key, preserving table order."""
+    groups: Dict[K, List[str]] = {}
+    for name, data in table.items():
+        groups.setdefault(key(data), []).append(name)
+    return MappingProxyType({k: tuple(names) for k, names in groups.items()})
+
+
+def build_id_index(table: Mapping[str, Any]) -> Mapping[int, str]:
+    """Reverse lookup: AP ID -> name, skipping entries without an ID."""
+    return MappingProxyType({
+        data.ap_id: name for name, data in table.items() if data.ap_id is not None
+    })
@@ -0,0 +1,229 @@
+"""
+Archipelago ID codec for Tomb Raider 1 Remastered.
+
+The one place the ID schema is defined in the APWorld; locations.py,
+items.py and game_data.py build and read IDs through it. The client's
+LocationMapper.cs and ItemMapper.cs, and the tools that run without the
+APWorld (export_data.py, compile_regions.py, save_tracker.py), keep copies
+of the constants they need; tests/test_ids.py fails if any copy drifts.
+
+Location IDs:
+  Pickups and key items: 780000 + level_index * 1000 + entity_index
+  Level completion:      795000 + level_index
+  Secrets:               796000 + level_index * 10 + secret_index
+
+Item IDs:
+  Pickup types:          770000 + TR1Type value (weapons, ammo, medipacks)
+  Key items:             770000 + TR1Type key item alias
+  Traps:                 769000 + trap_index
+  Events:                795000 + level_index (same as the level's completion location)
+
+The location ranges don't overlap. Key item aliases are TR-Rando's TR1Type
+values for each individual key (e.g. Cistern_K3_RustyKeyMainRoom = 17295):
+TR1Type.CavesKeyItemBase (10000) + level_index * 1000 + a number of the
+key's own, so they fill 10000..24999 and never meet the pickup types. The
+exporters write these IDs into the item table, and game_data.py rejects a
+table that doesn't follow them.
+
+Single IDs are built by the *_id functions and read by decode_location_id
+and decode_item_id. The bulk functions take any iterable of IDs and return
+compact arrays (array module; the APWorld can't depend on NumPy). They
+decode through lookup tables built once per process rather than running
+the range checks per ID, so tracker and spoiler tooling can classify and
+split millions of IDs in a few C-level passes.
+"""
+
+from array import array
+from functools import lru_cache
+from itertools import repeat
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Sequence, Tuple
+
+LEVEL_COUNT = 15
+
+PICKUP_BASE_ID = 780_000
+LEVEL_COMPLETE_BASE_ID = 795_000
+SECRET_BASE_ID = 796_000
+PICKUP_LEVEL_STRIDE = 1000
+SECRET_LEVEL_STRIDE = 10
+
+ITEM_BASE_ID = 770_000
+TRAP_BASE_ID = 769_000
+KEY_ITEM_ALIAS_BASE = 10_000  # TR1Type.CavesKeyItemBase; +1000 per level
+KEY_ITEM_LEVEL_STRIDE = 1000
+KEY_ITEM_ALIAS_END = KEY_ITEM_ALIAS_BASE + LEVEL_COUNT * KEY_ITEM_LEVEL_STRIDE
+EVENT_BASE_ID = LEVEL_COMPLETE_BASE_ID
+
+# TR1Type values of the pickup types that are items, as in the client's ItemMapper
+PICKUP_TYPES: Mapping[str, int] = MappingProxyType({
+    "Shotgun_S_P": 85,
+    "Magnums_S_P": 86,
+    "Uzis_S_P": 87,
+    "ShotgunAmmo_S_P": 89,
+    "MagnumAmmo_S_P": 90,
+    "UziAmmo_S_P": 91,
+    "SmallMed_S_P": 93,
+    "LargeMed_S_P": 94,
+})
+
+# Location kinds
+PICKUP = 0
+SECRET = 1
+LEVEL_COMPLETE = 2
+# Item kinds
+PICKUP_TYPE = 0
+KEY_ITEM = 1
+TRAP = 2
+EVENT = 3
+
+UNKNOWN = -1
+
+LOCATION_KINDS = ("pickup", "secret", "level_complete")
+ITEM_KINDS = ("pickup_type", "key_item", "trap", "event")
+
+# Decoded ID: (kind, level index or -1, index within the level / type value)
+Decoded = Tuple[int, int, int]
+
+_UNKNOWN: Decoded = (UNKNOWN, -1, -1)
+
+_LOCATION_LOW = PICKUP_BASE_ID
+_LOCATION_HIGH = SECRET_BASE_ID + LEVEL_COUNT * SECRET_LEVEL_STRIDE
+_ITEM_LOW = TRAP_BASE_ID
+_ITEM_HIGH = EVENT_BASE_ID + LEVEL_COUNT
+
+
+# -- Scalars --
+
+def pickup_location_id(level_index: int, entity_index: int) -> int:
+    return PICKUP_BASE_ID + level_index * PICKUP_LEVEL_STRIDE + entity_index
+
+
+def secret_location_id(level_index: int, secret_index: int) -> int:
+    return SECRET_BASE_ID + level_index * SECRET_LEVEL_STRIDE + secret_index
+
+
+def level_complete_location_id(level_index: int) -> int:
+    return LEVEL_COMPLETE_BASE_ID + level_index
+
+
+def pickup_type_item_id(type_value: int) -> int:
+    return ITEM_BASE_ID + type_value
+
+
+def key_item_id(level_index: int, alias_offset: int) -> int:
+    return ITEM_BASE_ID + KEY_ITEM_ALIAS_BASE + level_index * KEY_ITEM_LEVEL_STRIDE + alias_offset
+
+
+def trap_item_id(trap_index: int) -> int:
+    return TRAP_BASE_ID + trap_index
+
+
+def event_item_id(level_index: int) -> int:
+    return EVENT_BASE_ID + level_index
+
+
+def decode_location_id(location_id: int) -> Decoded:
+    """(kind, level index, entity/secret index) of a location ID; kind is UNKNOWN outside the schema."""
+    if LEVEL_COMPLETE_BASE_ID <= location_id < LEVEL_COMPLETE_BASE_ID + LEVEL_COUNT:
+        return LEVEL_COMPLETE, location_id - LEVEL_COMPLETE_BASE_ID, 0
+    if SECRET_BASE_ID <= location_id < SECRET_BASE_ID + LEVEL_COUNT * SECRET_LEVEL_STRIDE:
+        return (SECRET, *divmod(location_id - SECRET_BASE_ID, SECRET_LEVEL_STRIDE))
+    if PICKUP_BASE_ID <= location_id < PICKUP_BASE_ID + LEVEL_COUNT * PICKUP_LEVEL_STRIDE:
+        return (PICKUP, *divmod(location_id - PICKUP_BASE_ID, PICKUP_LEVEL_STRIDE))
+    return _UNKNOWN
+
+
+def decode_item_id(item_id: int) -> Decoded:
+    """
+    (kind, level index, value) of an item ID. The value is the TR1Type for
+    pickup types, the alias offset for key items and the trap index for
+    traps; the level index is -1 where the kind has none.
+    """
+    if EVENT_BASE_ID <= item_id < EVENT_BASE_ID + LEVEL_COUNT:
+        return EVENT, item_id - EVENT_BASE_ID, 0
+    offset = item_id - ITEM_BASE_ID
+    if KEY_ITEM_ALIAS_BASE <= offset < KEY_ITEM_ALIAS_END:
+        return (KEY_ITEM, *divmod(offset - KEY_ITEM_ALIAS_BASE, KEY_ITEM_LEVEL_STRIDE))
+    if 0 <= offset < KEY_ITEM_ALIAS_BASE:
+        return PICKUP_TYPE, -1, offset
+    if TRAP_BASE_ID <= item_id < ITEM_BASE_ID:
+        return TRAP, -1, item_id - TRAP_BASE_ID
+    return _UNKNOWN
+
+
+# -- Bulk --
+
+class _Tables:
+    """ID -> kind / level / index lookups over an ID range; IDs outside it decode as UNKNOWN."""
+
+    def __init__(self, low: int, high: int, decode) -> None:
+        decoded = {item_id: decode(item_id) for item_id in range(low, high)}
+        self.kinds = {item_id: kind for item_id, (kind, _level, _index) in decoded.items()}
+        self.levels = {item_id: level for item_id, (_kind, level, _index) in decoded.items()}
+        self.indexes = {item_id: index for item_id, (_kind, _level, index) in decoded.items()}
+
+
+@lru_cache(maxsize=None)
+def _location_tables() -> _Tables:
+    return _Tables(_LOCATION_LOW, _LOCATION_HIGH, decode_location_id)
+
+
+@lru_cache(maxsize=None)
+def _item_tables() -> _Tables:
+    return _Tables(_ITEM_LOW, _ITEM_HIGH, decode_item_id)
+
+
+def _kinds(tables: _Tables, ids: Iterable[int]) -> array:
+    return array("b", map(tables.kinds.get, ids, repeat(UNKNOWN)))
+
+
+def _decode(tables: _Tables, ids: Iterable[int]) -> Tuple[array, array, array]:
+    ids = _reusable(ids)
+    return (
+        array("b", map(tables.kinds.get, ids, repeat(UNKNOWN))),
+        array("b", map(tables.levels.get, ids, repeat(-1))),
+        array("l", map(tables.indexes.get, ids, repeat(-1))),
+    )
+
+
+def _split(tables: _Tables, ids: Iterable[int], names: Tuple[str, ...]) -> Dict[str, array]:
+    ids = _reusable(ids)
+    groups: Dict[str, array] = {name: array("q") for name in names + ("unknown",)}
+    appenders = [group.append for group in groups.values()]  # UNKNOWN (-1) is the last one
+    for item_id, kind in zip(ids, _kinds(tables, ids)):
+        appenders[kind](item_id)
+    return groups
+
+
+def _reusable(ids: Iterable[int]) -> Sequence[int]:
+    return ids if isinstance(ids, (list, tuple, array, range)) else list(ids)
+
+
+def location_kinds(location_ids: Iterable[int]) -> array:
+    """Kind of every location ID (PICKUP, SECRET, LEVEL_COMPLETE or UNKNOWN), as array('b')."""
+    return _kinds(_location_tables(), location_ids)
+
+
+def decode_location_ids(location_ids: Iterable[int]) -> Tuple[array, array, array]:
+    """decode_location_id for every ID, as three parallel arrays: kinds, level indexes, indexes."""
+    return _decode(_location_tables(), location_ids)
+
+
+def split_location_ids(location_ids: Iterable[int]) -> Dict[str, array]:
+    """Location IDs grouped by kind name (LOCATION_KINDS, plus "unknown"), in input order."""
+    return _split(_location_tables(), location_ids, LOCATION_KINDS)
+
+
+def item_kinds(item_ids: Iterable[int]) -> array:
+    """Kind of every item ID (PICKUP_TYPE, KEY_ITEM, TRAP, EVENT or UNKNOWN), as array('b')."""
+    return _kinds(_item_tables(), item_ids)
+
+
+def decode_item_ids(item_ids: Iterable[int]) -> Tuple[array, array, array]:
+    """decode_item_id for every ID, as three parallel arrays: kinds, level indexes, values."""
+    return _decode(_item_tables(), item_ids)
+
+
+def split_item_ids(item_ids: Iterable[int]) -> Dict[str, array]:
+    """Item IDs grouped by kind name (ITEM_KINDS, plus "unknown"), in input order."""
+    return _split(_item_tables(), item_ids, ITEM_KINDS)
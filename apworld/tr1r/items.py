@@ -3,18 +3,22 @@ Item definitions for Tomb Raider 1 Remastered Archipelago World.
 Key items, weapons, ammo, and medipacks loaded from tr1r_data.json.
 Traps and events are AP-only (not in game data).
 
-ID Schema:
+ID Schema (ids.py):
   - Key items/weapons/ammo/meds: from itemDefinitions in tr1r_data.json
   - Traps: 769000 + trap_index
   - Events: 795000 + level_index (matches level completion location IDs)
 """
 
-import json
-import pkgutil
-from typing import Dict, NamedTuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
 
 from BaseClasses import ItemClassification
 
+from .game_data import build_id_index, build_index, get_levels, load_game_data
+# LEVEL_COMPLETE_BASE_ID and TRAP_BASE_ID are re-exported for existing importers
+from .ids import ITEM_BASE_ID, LEVEL_COMPLETE_BASE_ID, TRAP_BASE_ID, event_item_id, trap_item_id  # noqa: F401
+
 
 class TR1RItemData(NamedTuple):
     ap_id: Optional[int]
@@ -30,32 +34,21 @@ _CLASSIFICATION_MAP = {
 }
 
 
-_cached_data: Optional[dict] = None
-
-
-def _load_data() -> dict:
-    """Load exported game data from tr1r_data.json (ZIP-safe, cached)."""
-    global _cached_data
-    if _cached_data is None:
-        raw = pkgutil.get_data(__package__, "data/tr1r_data.json")
-        _cached_data = json.loads(raw.decode("utf-8"))
-    return _cached_data
-
-
+@lru_cache(maxsize=None)
 def _build_items_from_data():
-    """Build item dictionaries from exported game data."""
-    data = _load_data()
+    """Build item dictionaries from exported game data (once, on first use)."""
+    data = load_game_data()
     key_items: Dict[str, TR1RItemData] = {}
     weapons: Dict[str, TR1RItemData] = {}
     ammo: Dict[str, TR1RItemData] = {}
     medipacks: Dict[str, TR1RItemData] = {}
 
-    for item_def in data["itemDefinitions"].values():
-        name = item_def["name"]
-        ap_id = item_def["id"]
-        category = item_def["category"]
+    for item_def in data.item_definitions.values():
+        name = item_def.name
+        ap_id = item_def.id
+        category = item_def.category
         classification = _CLASSIFICATION_MAP.get(
-            item_def["apClassification"], ItemClassification.filler
+            item_def.ap_classification, ItemClassification.filler
         )
         item_data = TR1RItemData(ap_id, classification, category)
 
@@ -68,52 +61,81 @@ def _build_items_from_data():
         elif category in ("small_medipack", "large_medipack"):
             medipacks[name] = item_data
 
-    return key_items, weapons, ammo, medipacks
-
+    return (
+        MappingProxyType(key_items),
+        MappingProxyType(weapons),
+        MappingProxyType(ammo),
+        MappingProxyType(medipacks),
+    )
 
-# Load items from game data
-KEY_ITEMS, WEAPONS, AMMO, MEDIPACKS = _build_items_from_data()
 
 # Base ID (for reference, actual IDs come from JSON)
-BASE_ID = 770_000
+BASE_ID = ITEM_BASE_ID
 
 # -- Traps (AP-only, not in game data) --
-TRAP_BASE_ID = 769_000
 TRAPS: Dict[str, TR1RItemData] = {
-    "Damage Trap": TR1RItemData(TRAP_BASE_ID + 1, ItemClassification.trap, "trap"),
-    "Ammo Drain":  TR1RItemData(TRAP_BASE_ID + 2, ItemClassification.trap, "trap"),
-    "Small Drain": TR1RItemData(TRAP_BASE_ID + 3, ItemClassification.trap, "trap"),
+    "Damage Trap": TR1RItemData(trap_item_id(1), ItemClassification.trap, "trap"),
+    "Ammo Drain":  TR1RItemData(trap_item_id(2), ItemClassification.trap, "trap"),
+    "Small Drain": TR1RItemData(trap_item_id(3), ItemClassification.trap, "trap"),
 }
 
 # -- Level Completion Events (locked items, real AP IDs matching location IDs) --
-LEVEL_COMPLETE_BASE_ID = 795_000
-_game_data = _load_data()
-EVENTS: Dict[str, TR1RItemData] = {
-    f"Level Complete - {level['name']}": TR1RItemData(
-        LEVEL_COMPLETE_BASE_ID + i, ItemClassification.progression, "event"
-    )
-    for i, level in enumerate(_game_data["levels"])
-}
 
 
-def get_all_items() -> Dict[str, TR1RItemData]:
-    """Returns all item definitions merged into a single dict (includes events)."""
+@lru_cache(maxsize=None)
+def _build_events() -> Mapping[str, TR1RItemData]:
+    return MappingProxyType({
+        f"Level Complete - {name}": TR1RItemData(
+            event_item_id(i), ItemClassification.progression, "event"
+        )
+        for i, (name, _file, _region) in enumerate(get_levels())
+    })
+
+
+@lru_cache(maxsize=None)
+def get_all_items() -> Mapping[str, TR1RItemData]:
+    """Returns all item definitions merged into one read-only table (includes events), built once."""
+    key_items, weapons, ammo, medipacks = _build_items_from_data()
     all_items: Dict[str, TR1RItemData] = {}
-    all_items.update(KEY_ITEMS)
-    all_items.update(WEAPONS)
-    all_items.update(AMMO)
-    all_items.update(MEDIPACKS)
+    all_items.update(key_items)
+    all_items.update(weapons)
+    all_items.update(ammo)
+    all_items.update(medipacks)
     all_items.update(TRAPS)
-    all_items.update(EVENTS)
-    return all_items
+    all_items.update(_build_events())
+    return MappingProxyType(all_items)
+
+
+@lru_cache(maxsize=None)
+def _category_index() -> Mapping[str, Tuple[str, ...]]:
+    return build_index(get_all_items(), lambda data: data.category)
+
+
+@lru_cache(maxsize=None)
+def _id_index() -> Mapping[int, str]:
+    return build_id_index(get_all_items())
 
 
-# Reverse lookup: AP ID -> item name
-_id_to_name: Dict[int, str] = {}
-for _name, _data in get_all_items().items():
-    if _data.ap_id is not None:
-        _id_to_name[_data.ap_id] = _name
+def get_items_by_category(category: str) -> Tuple[str, ...]:
+    """Names of all items of a category ("key_item", "weapon", "ammo", "trap", ...)."""
+    return _category_index().get(category, ())
 
 
 def get_item_name_from_id(item_id: int) -> Optional[str]:
-    return _id_to_name.get(item_id)
+    return _id_index().get(item_id)
+
+
+# Lazily resolved module attributes, kept for existing importers.
+_LAZY_ATTRIBUTES = {
+    "KEY_ITEMS": lambda: _build_items_from_data()[0],
+    "WEAPONS": lambda: _build_items_from_data()[1],
+    "AMMO": lambda: _build_items_from_data()[2],
+    "MEDIPACKS": lambda: _build_items_from_data()[3],
+    "EVENTS": _build_events,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,123 @@
+"""
+Level order shuffling for Tomb Raider 1 Remastered.
+
+An order is a tuple of level indices (game order) in the order they are
+played; the final level always stays last, since its ending is the game's.
+regions.get_region_connections() lays the level chain out in that order and
+progress.progress_tables() counts completed levels along it.
+
+A shuffled order is only kept if is_feasible() accepts it. The check runs on
+key-requirement bitsets precomputed once per process (one bit per key item
+the logic mentions), so rejecting an order costs microseconds rather than a
+failed fill. It walks the order as a solo player would: before the k-th
+level can be completed, every key it and the levels before it need must fit
+in the locations already open, i.e. those of the first k+1 levels that are
+reachable with the keys of the first k. Keys placed in other worlds only
+make an accepted order easier.
+"""
+
+from functools import lru_cache
+from random import Random
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from .game_data import get_levels, load_region_table
+from .locations import get_location_table
+from .regions import get_location_regions
+from .rules import LEVEL_COMPLETE_REQUIREMENTS
+
+Order = Tuple[int, ...]
+
+# Shuffles tried before falling back to the vanilla order
+MAX_SHUFFLE_ATTEMPTS = 1000
+
+
+class LevelKeys(NamedTuple):
+    needs: int  # key mask required to complete the level
+    # (alternative key masks opening the group, locations in it); (0,) is always open
+    slots: Tuple[Tuple[Tuple[int, ...], int], ...]
+
+
+@lru_cache(maxsize=None)
+def vanilla_level_order() -> Order:
+    return tuple(range(len(get_levels())))
+
+
+def order_from_sequence(files: Sequence[str]) -> Order:
+    """The order behind a slot's level_sequence (level files, in the order played)."""
+    index = {file: level for level, (_name, file, _region) in enumerate(get_levels())}
+    return tuple(index[file] for file in files)
+
+
+@lru_cache(maxsize=None)
+def _level_keys() -> Tuple[LevelKeys, ...]:
+    """Per level, in game order: its completion key mask and its location groups."""
+    region_table = load_region_table()
+    names = sorted(
+        {item for items in LEVEL_COMPLETE_REQUIREMENTS.values() for item in items}
+        | {item for areas in region_table.values() for area in areas
+           for items in area.requires for item in items}
+    )
+    bits = {name: 1 << bit for bit, name in enumerate(names)}
+
+    def mask(items) -> int:
+        result = 0
+        for item in items:
+            result |= bits[item]
+        return result
+
+    gates: Dict[str, Tuple[int, ...]] = {
+        area.name: tuple(mask(items) for items in area.requires)
+        for areas in region_table.values() for area in areas
+    }
+    location_table = get_location_table()
+    counts: Dict[str, int] = {}
+    for loc_name, region in get_location_regions().items():
+        if location_table[loc_name].category != "level_complete":
+            counts[region] = counts.get(region, 0) + 1
+
+    levels: List[LevelKeys] = []
+    for name, _file, _region in get_levels():
+        groups = [name] + [area.name for area in region_table.get(name, ())]
+        levels.append(LevelKeys(
+            mask(LEVEL_COMPLETE_REQUIREMENTS.get(f"{name} - Complete", ())),
+            tuple((gates.get(group, (0,)), counts.get(group, 0)) for group in groups),
+        ))
+    return tuple(levels)
+
+
+def is_feasible(order: Order) -> bool:
+    """
+    Whether a solo fill can place every completion key along this order (see
+    module docstring). With the shipped data every order passes, since each
+    level has far more open locations than completion keys; the check only
+    matters once key_gated_regions shuts locations behind keys.
+    """
+    levels = _level_keys()
+    held = needed = slots = 0
+    locked: List[Tuple[Tuple[int, ...], int]] = []  # location groups of open levels not yet reachable
+    for level in order:
+        still_locked = []
+        for gate, count in locked + list(levels[level].slots):
+            if any(held & mask == mask for mask in gate):
+                slots += count
+            else:
+                still_locked.append((gate, count))
+        locked = still_locked
+
+        needed |= levels[level].needs
+        if bin(needed).count("1") > slots:
+            return False
+        held = needed
+    return True
+
+
+def shuffle_level_order(random: Random) -> Order:
+    """A random feasible order with the final level last, or the vanilla order if none turns up."""
+    order = list(vanilla_level_order())
+    head = order[:-1]
+    for _ in range(MAX_SHUFFLE_ATTEMPTS):
+        random.shuffle(head)
+        candidate = (*head, order[-1])
+        if is_feasible(candidate):
+            return candidate
+    return vanilla_level_order()
@@ -1,16 +1,33 @@
 """
 Location definitions for Tomb Raider 1 Remastered Archipelago World.
-All data loaded from tr1r_data.json (exported by TRDataExporter).
+All data loaded from tr1r_data.json (exported by TRDataExporter) via game_data.
+Tables are built on first use; see game_data.py.
 
-ID Schema (must match client LocationMapper.cs):
+ID Schema (ids.py; must match client LocationMapper.cs):
   - Pickup/Key item locations: 780000 + level_index * 1000 + entity_index
-  - Secret locations:          790000 + level_index * 10 + secret_index
   - Level completion:          795000 + level_index
+  - Secret locations:          796000 + level_index * 10 + secret_index
 """
 
-import json
-import pkgutil
-from typing import Dict, List, NamedTuple, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from .game_data import (
+    build_id_index,
+    build_index,
+    get_levels,
+    get_secrets_per_level,
+    load_game_data,
+)
+from .ids import (  # the base IDs are re-exported for existing importers
+    LEVEL_COMPLETE_BASE_ID,  # noqa: F401
+    PICKUP_BASE_ID,  # noqa: F401
+    SECRET_BASE_ID,  # noqa: F401
+    level_complete_location_id,
+    pickup_location_id,
+    secret_location_id,
+)
 
 
 class TR1RLocationData(NamedTuple):
@@ -20,11 +37,6 @@ class TR1RLocationData(NamedTuple):
     category: str  # "pickup", "key_item", "secret", "level_complete"
 
 
-# Base IDs (must match client LocationMapper.cs)
-PICKUP_BASE_ID = 780_000
-SECRET_BASE_ID = 790_000
-LEVEL_COMPLETE_BASE_ID = 795_000
-
 # Friendly names for pickup types
 _PICKUP_TYPE_NAMES = {
     "SmallMed_S_P": "Small Medipack",
@@ -38,41 +50,20 @@ _PICKUP_TYPE_NAMES = {
 }
 
 
-def _load_data() -> dict:
-    """Load exported game data from tr1r_data.json (ZIP-safe)."""
-    raw = pkgutil.get_data(__package__, "data/tr1r_data.json")
-    return json.loads(raw.decode("utf-8"))
-
-
-# Load once at module level
-_game_data = _load_data()
-
-# Level info list: [(name, file, region), ...]
-LEVELS: List[tuple] = [
-    (level["name"], level["file"], level["region"])
-    for level in _game_data["levels"]
-]
-
-# Secret counts per level (from actual data, not hardcoded to 3)
-SECRETS_PER_LEVEL: List[int] = [
-    len(level["secrets"]) for level in _game_data["levels"]
-]
-
-
 def build_locations() -> Dict[str, TR1RLocationData]:
     """Build all location definitions from exported game data."""
     locations: Dict[str, TR1RLocationData] = {}
 
-    for level_idx, level in enumerate(_game_data["levels"]):
-        level_name = level["name"]
-        region = level["region"]
+    for level_idx, level in enumerate(load_game_data().levels):
+        level_name = level.name
+        region = level.region
 
         # -- Standard pickup locations --
         type_counters: Dict[str, int] = {}
-        for pickup in level["pickups"]:
-            entity_idx = pickup["entityIndex"]
-            ap_id = PICKUP_BASE_ID + level_idx * 1000 + entity_idx
-            pickup_type = pickup["type"]
+        for pickup in level.pickups:
+            entity_idx = pickup.entity_index
+            ap_id = pickup_location_id(level_idx, entity_idx)
+            pickup_type = pickup.type
 
             # Sequential numbering per type within the level
             type_counters[pickup_type] = type_counters.get(pickup_type, 0) + 1
@@ -88,10 +79,10 @@ def build_locations() -> Dict[str, TR1RLocationData]:
             )
 
         # -- Key item locations --
-        for key_item in level["keyItems"]:
-            entity_idx = key_item["entityIndex"]
-            ap_id = PICKUP_BASE_ID + level_idx * 1000 + entity_idx
-            loc_name = key_item["name"]  # e.g. "City of Vilcabamba - Silver Key"
+        for key_item in level.key_items:
+            entity_idx = key_item.entity_index
+            ap_id = pickup_location_id(level_idx, entity_idx)
+            loc_name = key_item.name  # e.g. "City of Vilcabamba - Silver Key"
 
             locations[loc_name] = TR1RLocationData(
                 ap_id=ap_id,
@@ -101,9 +92,8 @@ def build_locations() -> Dict[str, TR1RLocationData]:
             )
 
         # -- Secret locations (variable count per level) --
-        for secret in level["secrets"]:
-            secret_idx = secret["index"]
-            ap_id = SECRET_BASE_ID + level_idx * 10 + secret_idx
+        for secret_idx in level.secrets:
+            ap_id = secret_location_id(level_idx, secret_idx)
             loc_name = f"{level_name} - Secret {secret_idx + 1}"
 
             locations[loc_name] = TR1RLocationData(
@@ -114,7 +104,7 @@ def build_locations() -> Dict[str, TR1RLocationData]:
             )
 
         # -- Level completion event --
-        ap_id = LEVEL_COMPLETE_BASE_ID + level_idx
+        ap_id = level_complete_location_id(level_idx)
         loc_name = f"{level_name} - Complete"
         locations[loc_name] = TR1RLocationData(
             ap_id=ap_id,
@@ -126,10 +116,51 @@ def build_locations() -> Dict[str, TR1RLocationData]:
     return locations
 
 
-# Pre-built location table
-location_table: Dict[str, TR1RLocationData] = build_locations()
+@lru_cache(maxsize=None)
+def get_location_table() -> Mapping[str, TR1RLocationData]:
+    """All location definitions, built once on first use."""
+    return MappingProxyType(build_locations())
+
+
+@lru_cache(maxsize=None)
+def _level_index() -> Mapping[str, Tuple[str, ...]]:
+    return build_index(get_location_table(), lambda data: data.level)
+
+
+@lru_cache(maxsize=None)
+def _category_index() -> Mapping[str, Tuple[str, ...]]:
+    return build_index(get_location_table(), lambda data: data.category)
 
-# Reverse lookup: AP ID -> location name
-location_id_to_name: Dict[int, str] = {
-    data.ap_id: name for name, data in location_table.items() if data.ap_id is not None
+
+@lru_cache(maxsize=None)
+def _id_index() -> Mapping[int, str]:
+    return build_id_index(get_location_table())
+
+
+def get_locations_by_level(level: str) -> Tuple[str, ...]:
+    """Names of all locations in a level, in table order."""
+    return _level_index().get(level, ())
+
+
+def get_locations_by_category(category: str) -> Tuple[str, ...]:
+    """Names of all locations of a category ("pickup", "key_item", "secret", "level_complete")."""
+    return _category_index().get(category, ())
+
+
+def get_location_name_from_id(location_id: int) -> Optional[str]:
+    return _id_index().get(location_id)
+
+
+# Lazily resolved module attributes, kept for existing importers.
+_LAZY_ATTRIBUTES = {
+    "LEVELS": get_levels,
+    "SECRETS_PER_LEVEL": get_secrets_per_level,
+    "location_table": get_location_table,
+    "location_id_to_name": _id_index,
 }
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,210 @@
+"""
+The world's full access logic as a declarative table, and an incremental
+evaluator for trackers.
+
+build_logic_table() flattens the same sources generation uses into plain
+data: the region chain (regions.get_region_connections, in the slot's level
+order), the key-gated areas of the compiled region table (with the
+key_gated_regions option), the level
+completion requirements (rules.LEVEL_COMPLETE_REQUIREMENTS) and the goal
+conditions. A requirement
+is a list of alternative item sets: any one set, fully held, is enough, and
+[[]] is always met. Table layout:
+
+  {
+    "version": 1,
+    "game": "Tomb Raider 1 Remastered",
+    "start": "Menu",
+    "regions": ["Menu", ...],
+    "entrances": [{"name": ..., "from": ..., "to": ..., "requires": [[...]]}],
+    "locations": [{"name": ..., "id": ..., "region": ..., "requires": [[...]],
+                   "event": "Level Complete - <level>"},   # event locations only
+                  ...],
+    "goals": {
+      "final_boss":  {"requires": [["Level Complete - The Great Pyramid"]]},
+      "all_secrets": {"locations": [<every secret location>]},
+      "n_levels":    {"items": [<level events>], "count_option": "levels_for_goal"}
+    }
+  }
+
+Bump LOGIC_TABLE_VERSION on any change to the layout. tools/export_logic.py
+writes the table as JSON.
+
+LogicTracker keeps reachability up to date as items arrive. Every entrance
+and location is indexed by the items its requirement mentions, so a new
+item only re-examines those, plus whatever a newly reached region opens up.
+Event locations collect their event as soon as they are reachable, as an
+Archipelago sweep does. Items only ever arrive; start a new tracker to
+take one away.
+"""
+
+from collections import Counter, defaultdict, deque
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .game_data import get_levels
+from .level_order import Order, vanilla_level_order
+from .locations import get_location_table
+from .regions import REGION_NAMES, get_location_regions, get_region_connections, get_region_table
+from .rules import LEVEL_COMPLETE_REQUIREMENTS
+
+LOGIC_TABLE_VERSION = 1
+GAME = "Tomb Raider 1 Remastered"
+START_REGION = "Menu"
+
+
+def _requirement(alternatives: Iterable[Iterable[str]]) -> List[List[str]]:
+    return [sorted(items) for items in alternatives]
+
+
+def build_logic_table(order: Optional[Order] = None, key_gated: bool = False) -> Dict[str, Any]:
+    """
+    The world's logic as JSON-ready data (see the module docstring for the
+    layout), for the vanilla level order or a slot's shuffled one, and a
+    slot's key_gated_regions setting.
+    """
+    order = order or vanilla_level_order()
+    level_names = [name for name, _file, _region in get_levels()]
+    region_table = get_region_table(key_gated)
+
+    entrances = [
+        {"name": f"{source} -> {target}", "from": source, "to": target,
+         "requires": _requirement([(event,)] if event else [()])}
+        for source, target, event in get_region_connections(order)
+    ]
+    regions = list(REGION_NAMES)
+    for level_name, areas in region_table.items():
+        for area in areas:
+            regions.append(area.name)
+            entrances.append({"name": f"{level_name} -> {area.name}", "from": level_name, "to": area.name,
+                              "requires": _requirement(area.requires)})
+
+    events = {f"{name} - Complete": f"Level Complete - {name}" for name in level_names}
+    location_table = get_location_table()
+    locations = []
+    for name, region in get_location_regions(key_gated).items():
+        location: Dict[str, Any] = {
+            "name": name,
+            "id": location_table[name].ap_id,
+            "region": region,
+            "requires": _requirement([LEVEL_COMPLETE_REQUIREMENTS.get(name, ())]),
+        }
+        if name in events:
+            location["event"] = events[name]
+        locations.append(location)
+
+    return {
+        "version": LOGIC_TABLE_VERSION,
+        "game": GAME,
+        "start": START_REGION,
+        "regions": regions,
+        "entrances": entrances,
+        "locations": locations,
+        "goals": {
+            "final_boss": {"requires": [[f"Level Complete - {level_names[order[-1]]}"]]},
+            "all_secrets": {"locations": [name for name, data in location_table.items()
+                                          if data.category == "secret"]},
+            "n_levels": {"items": [f"Level Complete - {name}" for name in level_names],
+                         "count_option": "levels_for_goal"},
+        },
+    }
+
+
+class LogicTracker:
+    """Incremental reachability over a logic table, for one player's items."""
+
+    def __init__(self, table: Mapping[str, Any]):
+        if table.get("version") != LOGIC_TABLE_VERSION:
+            raise ValueError(f"unsupported logic table version {table.get('version')!r}")
+        self.table = table
+        self.items: Counter = Counter()
+        self.regions: Set[str] = set()
+        self.locations: Set[str] = set()
+
+        # Requirements as frozensets; watchers: item -> entrances/locations mentioning it
+        self._entrances: List[Tuple[str, str, Tuple[frozenset, ...]]] = [
+            (entrance["from"], entrance["to"], tuple(frozenset(items) for items in entrance["requires"]))
+            for entrance in table["entrances"]
+        ]
+        self._locations: List[Tuple[str, str, Tuple[frozenset, ...], Optional[str]]] = [
+            (location["name"], location["region"], tuple(frozenset(items) for items in location["requires"]),
+             location.get("event"))
+            for location in table["locations"]
+        ]
+        self._exits: Dict[str, List[int]] = defaultdict(list)
+        self._region_locations: Dict[str, List[int]] = defaultdict(list)
+        self._entrance_watchers: Dict[str, List[int]] = defaultdict(list)
+        self._location_watchers: Dict[str, List[int]] = defaultdict(list)
+        for index, (source, _target, requires) in enumerate(self._entrances):
+            self._exits[source].append(index)
+            for item in set().union(*requires):
+                self._entrance_watchers[item].append(index)
+        for index, (_name, region, requires, _event) in enumerate(self._locations):
+            self._region_locations[region].append(index)
+            for item in set().union(*requires):
+                self._location_watchers[item].append(index)
+
+        self._pending_regions: Deque[str] = deque()
+        self._pending_items: Deque[str] = deque()
+        self._reach(table["start"])
+        self._settle()
+
+    def _met(self, requires: Tuple[frozenset, ...]) -> bool:
+        held = self.items
+        return any(all(held[item] > 0 for item in items) for items in requires)
+
+    def _reach(self, region: str) -> None:
+        if region not in self.regions:
+            self.regions.add(region)
+            self._pending_regions.append(region)
+
+    def _check_entrance(self, index: int) -> None:
+        source, target, requires = self._entrances[index]
+        if source in self.regions and target not in self.regions and self._met(requires):
+            self._reach(target)
+
+    def _check_location(self, index: int) -> None:
+        name, region, requires, event = self._locations[index]
+        if name not in self.locations and region in self.regions and self._met(requires):
+            self.locations.add(name)
+            if event is not None:
+                self._pending_items.append(event)
+
+    def _settle(self) -> None:
+        """Work through newly reached regions and newly held items until nothing changes."""
+        while self._pending_regions or self._pending_items:
+            while self._pending_regions:
+                region = self._pending_regions.popleft()
+                for index in self._exits.get(region, ()):
+                    self._check_entrance(index)
+                for index in self._region_locations.get(region, ()):
+                    self._check_location(index)
+            if self._pending_items:
+                item = self._pending_items.popleft()
+                self.items[item] += 1
+                if self.items[item] == 1:
+                    for index in self._entrance_watchers.get(item, ()):
+                        self._check_entrance(index)
+                    for index in self._location_watchers.get(item, ()):
+                        self._check_location(index)
+
+    def collect(self, item: str) -> Set[str]:
+        """Add one copy of an item; returns the locations that became reachable."""
+        known = set(self.locations)
+        self._pending_items.append(item)
+        self._settle()
+        return self.locations - known
+
+    def collect_all(self, items: Iterable[str]) -> None:
+        """Add several items at once, settling reachability only at the end."""
+        self._pending_items.extend(items)
+        self._settle()
+
+    def goal_reached(self, goal: str, levels_for_goal: Optional[int] = None) -> bool:
+        """Whether a goal ("final_boss", "all_secrets" or "n_levels") is met with the items so far."""
+        condition = self.table["goals"][goal]
+        if "requires" in condition:
+            return self._met(tuple(frozenset(items) for items in condition["requires"]))
+        if "locations" in condition:
+            return self.locations.issuperset(condition["locations"])
+        needed = len(condition["items"]) if levels_for_goal is None else levels_for_goal
+        return sum(1 for item in condition["items"] if self.items[item] > 0) >= needed
@@ -0,0 +1,97 @@
+"""
+Placement manifest for Tomb Raider 1 Remastered slot data.
+
+Lists what was placed at each of this slot's locations, so the client can
+show "you found X for Y" without asking the server about every location.
+
+Encoding (version 1): placements are sorted by location ID and written as a
+stream of unsigned LEB128 varints, three per placement:
+  - location ID delta from the previous placement (first one from 0)
+  - item ID delta from the previous placement, zigzag-encoded (signed)
+  - receiving player << 5 | item classification flags (low 5 bits)
+The stream is zlib-compressed and base64-encoded so it fits in JSON slot data.
+
+Must stay in sync with the client's Core/PlacementManifest.cs.
+"""
+
+import base64
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+MANIFEST_VERSION = 1
+
+# Compressed manifest bytes a full 396-location slot must stay under, even
+# when most items go to other games with large, scattered item IDs.
+MANIFEST_SIZE_BUDGET = 4096
+
+_CLASSIFICATION_BITS = 5
+_CLASSIFICATION_MASK = (1 << _CLASSIFICATION_BITS) - 1
+
+
+class Placement(NamedTuple):
+    location_id: int
+    item_id: int
+    player: int
+    classification: int
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, offset: int):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_manifest(placements: Iterable[Placement]) -> Dict[str, Any]:
+    """Encode placements into the slot data form of the manifest."""
+    rows = sorted(placements)
+    stream = bytearray()
+    previous_location = previous_item = 0
+    for location_id, item_id, player, classification in rows:
+        item_delta = item_id - previous_item
+        _write_varint(stream, location_id - previous_location)
+        _write_varint(stream, (item_delta << 1) ^ (item_delta >> 63))
+        _write_varint(stream, (player << _CLASSIFICATION_BITS) | (classification & _CLASSIFICATION_MASK))
+        previous_location, previous_item = location_id, item_id
+
+    return {
+        "version": MANIFEST_VERSION,
+        "count": len(rows),
+        "data": base64.b64encode(zlib.compress(bytes(stream), 9)).decode("ascii"),
+    }
+
+
+def decode_manifest(manifest: Dict[str, Any]) -> List[Placement]:
+    """Decode the slot data form of the manifest back into placements."""
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported placement manifest version: {manifest.get('version')}")
+
+    stream = zlib.decompress(base64.b64decode(manifest["data"]))
+    placements: List[Placement] = []
+    offset = location_id = item_id = 0
+    for _ in range(manifest["count"]):
+        location_delta, offset = _read_varint(stream, offset)
+        item_delta, offset = _read_varint(stream, offset)
+        packed, offset = _read_varint(stream, offset)
+        location_id += location_delta
+        item_id += (item_delta >> 1) ^ -(item_delta & 1)
+        placements.append(Placement(
+            location_id, item_id, packed >> _CLASSIFICATION_BITS, packed & _CLASSIFICATION_MASK
+        ))
+    return placements
+
+
+def manifest_size(manifest: Dict[str, Any]) -> int:
+    """Size in bytes of the compressed stream (before base64)."""
+    return len(base64.b64decode(manifest["data"]))
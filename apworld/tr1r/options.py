@@ -35,6 +35,33 @@ class LevelsForGoal(Range):
     default = 15
 
 
+class LevelOrder(Choice):
+    """
+    The order the levels are played in.
+
+    Vanilla: Peru, Greece, Egypt, then Atlantis, as in the original game.
+    Shuffled: A random order, checked to be completable before the seed is
+    filled. The Great Pyramid always stays last. The client puts each level's
+    files in place of the level at its position, so cutscenes and the
+    between-level story follow the position, not the level.
+    """
+    display_name = "Level Order"
+    option_vanilla = 0
+    option_shuffled = 1
+    default = 0
+
+
+class KeyGatedRegions(Toggle):
+    """
+    Logic tracks which key doors each pickup sits behind, instead of treating
+    every pickup in a level as reachable once the level is.
+
+    Needs the compiled region table (data/tr1r_regions.json, see
+    tools/compile_regions.py); without it this has no effect.
+    """
+    display_name = "Key-Gated Regions"
+
+
 class SecretsMode(Choice):
     """
     How secrets are handled in the randomization.
@@ -79,6 +106,8 @@ class StartingWeapons(Choice):
 class TR1ROptions(PerGameCommonOptions):
     goal: Goal
     levels_for_goal: LevelsForGoal
+    level_order: LevelOrder
+    key_gated_regions: KeyGatedRegions
     secrets_mode: SecretsMode
     trap_percentage: TrapPercentage
     starting_weapons: StartingWeapons
@@ -0,0 +1,117 @@
+"""
+Opt-in generation profiling for Tomb Raider 1 Remastered.
+
+Set TR1R_PROFILE to a directory before generating to enable it:
+
+    TR1R_PROFILE=profile python Generate.py
+
+Every location, entrance and completion rule the world sets is then wrapped
+with a call counter and a cumulative timer, and each TR1RWorld stage is
+timed. At the end of generation (stage_generate_output) two files are
+written to that directory, and the counters start over for the next
+generation in the same process:
+
+  tr1r_profile.txt     per-stage times, then every rule by total time spent
+  tr1r_profile.folded  collapsed stacks (flamegraph.pl, speedscope, ...),
+                       weighted in microseconds
+
+With TR1R_PROFILE unset, instrument_rule and timed_stage hand back the
+rule or method they were given, so there is no cost at all.
+"""
+
+import functools
+import os
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from .rules import AccessRule
+
+PROFILE_DIR = os.environ.get("TR1R_PROFILE", "")
+ENABLED = bool(PROFILE_DIR)
+
+REPORT_FILE = "tr1r_profile.txt"
+FOLDED_FILE = "tr1r_profile.folded"
+
+F = TypeVar("F", bound=Callable)
+
+# (kind, player, name) -> [calls, total ns]; kind is location, entrance or completion
+_rule_stats: Dict[Tuple[str, int, str], List[int]] = {}
+# (player, stage) -> total ns
+_stage_times: Counter = Counter()
+
+
+def instrument_rule(rule: "AccessRule", kind: str, name: str, player: int) -> "AccessRule":
+    """Wrap an access rule with a call counter and timer (or return it as-is when disabled)."""
+    if not ENABLED:
+        return rule
+
+    stats = _rule_stats.setdefault((kind, player, name), [0, 0])
+    clock = time.perf_counter_ns
+
+    def timed_rule(state) -> bool:
+        start = clock()
+        result = rule(state)
+        stats[1] += clock() - start
+        stats[0] += 1
+        return result
+
+    return timed_rule
+
+
+def timed_stage(method: F) -> F:
+    """Decorator timing a TR1RWorld stage method per player (a no-op when disabled)."""
+    if not ENABLED:
+        return method
+
+    @functools.wraps(method)
+    def timed(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _stage_times[(self.player, method.__name__)] += time.perf_counter_ns() - start
+
+    return timed  # type: ignore[return-value]
+
+
+def _frame(name: str) -> str:
+    # ';' separates frames in the collapsed format
+    return name.replace(";", ",")
+
+
+def write_reports(directory: str) -> Tuple[str, str]:
+    """Write the text report and the collapsed-stack file; returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    report_path = os.path.join(directory, REPORT_FILE)
+    folded_path = os.path.join(directory, FOLDED_FILE)
+    rules = sorted(_rule_stats.items(), key=lambda entry: entry[1][1], reverse=True)
+
+    with open(report_path, "w", encoding="utf-8") as report:
+        report.write("TR1R generation profile\n\nStages:\n")
+        for (player, stage), ns in sorted(_stage_times.items()):
+            report.write(f"  player {player:<4} {stage:<20} {ns / 1e6:10.2f} ms\n")
+
+        total_calls = sum(calls for calls, _ns in _rule_stats.values())
+        total_ns = sum(ns for _calls, ns in _rule_stats.values())
+        report.write(f"\nRules: {len(rules)} rules, {total_calls} calls, {total_ns / 1e6:.2f} ms\n")
+        report.write(f"  {'kind':<11} {'player':>6} {'calls':>10} {'total ms':>10} {'mean us':>8}  name\n")
+        for (kind, player, name), (calls, ns) in rules:
+            mean = ns / calls / 1e3 if calls else 0.0
+            report.write(f"  {kind:<11} {player:>6} {calls:>10} {ns / 1e6:>10.2f} {mean:>8.2f}  {name}\n")
+
+    with open(folded_path, "w", encoding="utf-8") as folded:
+        for (player, stage), ns in sorted(_stage_times.items()):
+            folded.write(f"TR1R;player {player};stage;{_frame(stage)} {ns // 1000}\n")
+        for (kind, player, name), (_calls, ns) in rules:
+            if ns >= 1000:
+                folded.write(f"TR1R;player {player};{kind};{_frame(name)} {ns // 1000}\n")
+
+    return report_path, folded_path
+
+
+def reset() -> None:
+    """Forget everything recorded so far, once it has been written out."""
+    _rule_stats.clear()
+    _stage_times.clear()
@@ -0,0 +1,104 @@
+"""
+Incremental progress counters for Tomb Raider 1 Remastered goal evaluation.
+
+The counters live in CollectionState.prog_items[player] next to the real item
+counts, under names that can never be item names. TR1RWorld.collect/remove
+update them whenever a "Level Complete - <Level>" event changes, so goal
+checks are a single count lookup instead of 15 state.has() calls or 45
+can_reach() calls.
+
+Counters:
+  LEVELS_COMPLETED:      number of distinct levels completed.
+  COMPLETED_LEVELS_MASK: bit i set when the i-th level played is completed.
+  SECRETS_UNLOCKED:      secrets in levels opened up by completing the levels
+                         before them. The first level is always open, so its
+                         secrets are not counted; see secrets_reachable().
+
+Secret reachability mirrors the level chain in regions.py: the i-th level
+played is reachable once the ones before it are all complete, and secret
+locations have no rules of their own. "Played" follows the world's level
+order, so the lookups are built per order (progress_tables).
+"""
+
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping, NamedTuple, Tuple
+
+from .game_data import get_levels, get_secrets_per_level
+
+if TYPE_CHECKING:
+    from BaseClasses import CollectionState
+
+LEVELS_COMPLETED = "<TR1R: Levels Completed>"
+COMPLETED_LEVELS_MASK = "<TR1R: Completed Levels Mask>"
+SECRETS_UNLOCKED = "<TR1R: Secrets Unlocked>"
+
+
+class ProgressTables(NamedTuple):
+    """The per-level-order lookups behind the counters."""
+    # Level completion event name -> bit in COMPLETED_LEVELS_MASK
+    level_bits: Mapping[str, int]
+    # Completed-prefix length -> secrets in the levels that prefix opens up
+    secrets_by_prefix: Tuple[int, ...]
+    # Secrets of the first level, open from the start
+    first_level_secrets: int
+
+
+@lru_cache(maxsize=None)
+def progress_tables(order: Tuple[int, ...]) -> ProgressTables:
+    """Tables for a level order (level indices in game order, see level_order.py)."""
+    levels = get_levels()
+    secrets = [get_secrets_per_level()[level] for level in order]
+    unlocked = [0]
+    for completed in range(1, len(secrets) + 1):
+        opened = secrets[completed] if completed < len(secrets) else 0
+        unlocked.append(unlocked[-1] + opened)
+    return ProgressTables(
+        MappingProxyType({
+            f"Level Complete - {levels[level][0]}": 1 << position
+            for position, level in enumerate(order)
+        }),
+        tuple(unlocked),
+        secrets[0] if secrets else 0,
+    )
+
+
+def _completed_prefix(mask: int) -> int:
+    """Number of consecutive completed levels from the first (trailing set bits)."""
+    return ((mask + 1) & ~mask).bit_length() - 1
+
+
+def _update(counts: Counter, tables: ProgressTables, bit: int, delta: int) -> None:
+    mask = counts[COMPLETED_LEVELS_MASK] ^ bit
+    counts[COMPLETED_LEVELS_MASK] = mask
+    counts[LEVELS_COMPLETED] += delta
+    counts[SECRETS_UNLOCKED] = tables.secrets_by_prefix[_completed_prefix(mask)]
+
+
+def on_collect(counts: Counter, tables: ProgressTables, item_name: str) -> None:
+    """Update the counters after item_name was added to a player's counts."""
+    bit = tables.level_bits.get(item_name)
+    if bit is not None and counts[item_name] == 1:
+        _update(counts, tables, bit, 1)
+
+
+def on_remove(counts: Counter, tables: ProgressTables, item_name: str) -> None:
+    """Update the counters after item_name was removed from a player's counts."""
+    bit = tables.level_bits.get(item_name)
+    if bit is not None and counts[item_name] == 0:
+        _update(counts, tables, bit, -1)
+
+
+def secrets_needed_for_all(tables: ProgressTables) -> int:
+    """SECRETS_UNLOCKED value at which every secret is reachable."""
+    return tables.secrets_by_prefix[-1]
+
+
+def levels_completed(state: "CollectionState", player: int) -> int:
+    return state.prog_items[player][LEVELS_COMPLETED]
+
+
+def secrets_reachable(state: "CollectionState", player: int, tables: ProgressTables) -> int:
+    """Secret locations reachable for a player, including the first level's."""
+    return tables.first_level_secrets + state.prog_items[player][SECRETS_UNLOCKED]
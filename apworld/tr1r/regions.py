@@ -7,116 +7,205 @@ Hierarchy:
        -> Egypt Hub -> [Khamoon, Obelisk, Sanctuary]
        -> Atlantis Hub -> [Mines, Atlantis, Pyramid]
 
-Each level is a region. Sub-regions within levels (based on key item gates)
-will be added in Phase 4 using routes.json data.
+Each level is a region. With the key_gated_regions option, pickups behind
+key doors go in key-gated sub-regions of their level (e.g. "City of
+Vilcabamba - Area 1"), taken from the region table precompiled by
+tools/compile_regions.py; no graph work is done here. Without the option or
+the table every location stays in its level region.
+
+With the level_order option the levels are chained in a shuffled order
+(see level_order.py); REGION_CONNECTIONS is the vanilla chain.
+
+None of this depends on the player beyond the level order and that option,
+so it is worked out once per combination (get_region_template) and each
+TR1R slot only instantiates it.
 """
 
-from typing import TYPE_CHECKING, Dict, List, Set
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Tuple
 
-from BaseClasses import Entrance, Region
+from BaseClasses import Entrance, Location, Region
 
-from .locations import TR1RLocationData, location_table
+from .game_data import SubRegion, get_levels, load_region_table
+from .locations import get_location_table, get_locations_by_level
+from .profiling import instrument_rule
+from .rules import AccessRule, compile_any_requirement
 
 if TYPE_CHECKING:
     from . import TR1RWorld
 
 
-def create_regions(world: "TR1RWorld") -> None:
-    """Create all regions and connect them."""
-    multiworld = world.multiworld
-    player = world.player
-
-    # Create all regions
-    regions: Dict[str, Region] = {}
-
-    region_names = [
-        "Menu",
-        # Hub regions
-        "Peru Hub",
-        "Greece Hub",
-        "Egypt Hub",
-        "Atlantis Hub",
-        # Level regions
-        "Caves",
-        "City of Vilcabamba",
-        "Lost Valley",
-        "Tomb of Qualopec",
-        "St. Francis' Folly",
-        "Colosseum",
-        "Palace Midas",
-        "The Cistern",
-        "Tomb of Tihocan",
-        "City of Khamoon",
-        "Obelisk of Khamoon",
-        "Sanctuary of the Scion",
-        "Natla's Mines",
-        "Atlantis",
-        "The Great Pyramid",
-    ]
-
-    for name in region_names:
-        region = Region(name, player, multiworld)
-        regions[name] = region
-        multiworld.regions.append(region)
-
-    # Place locations in their level regions
-    for loc_name, loc_data in location_table.items():
-        level_name = loc_data.level
-        if level_name in regions:
-            from BaseClasses import Location
-            location = Location(player, loc_name, loc_data.ap_id, regions[level_name])
-            regions[level_name].locations.append(location)
-
-    # -- Connect regions --
-
+REGION_NAMES: Tuple[str, ...] = (
+    "Menu",
+    # Hub regions
+    "Peru Hub",
+    "Greece Hub",
+    "Egypt Hub",
+    "Atlantis Hub",
+    # Level regions
+    "Caves",
+    "City of Vilcabamba",
+    "Lost Valley",
+    "Tomb of Qualopec",
+    "St. Francis' Folly",
+    "Colosseum",
+    "Palace Midas",
+    "The Cistern",
+    "Tomb of Tihocan",
+    "City of Khamoon",
+    "Obelisk of Khamoon",
+    "Sanctuary of the Scion",
+    "Natla's Mines",
+    "Atlantis",
+    "The Great Pyramid",
+)
+
+# (source, target, event required to pass or None). Declared as data so tools
+# (e.g. tools/spheres.py) can compile the same graph without building regions.
+REGION_CONNECTIONS: Tuple[Tuple[str, str, Optional[str]], ...] = (
     # Menu -> Peru Hub (always accessible)
-    _connect(regions, "Menu", "Peru Hub")
+    ("Menu", "Peru Hub", None),
 
     # Peru Hub -> individual Peru levels (sequential)
-    _connect(regions, "Peru Hub", "Caves")
-    _connect(regions, "Caves", "City of Vilcabamba",
-             lambda state: state.has("Level Complete - Caves", player))
-    _connect(regions, "City of Vilcabamba", "Lost Valley",
-             lambda state: state.has("Level Complete - City of Vilcabamba", player))
-    _connect(regions, "Lost Valley", "Tomb of Qualopec",
-             lambda state: state.has("Level Complete - Lost Valley", player))
+    ("Peru Hub", "Caves", None),
+    ("Caves", "City of Vilcabamba", "Level Complete - Caves"),
+    ("City of Vilcabamba", "Lost Valley", "Level Complete - City of Vilcabamba"),
+    ("Lost Valley", "Tomb of Qualopec", "Level Complete - Lost Valley"),
 
     # Peru -> Greece Hub (requires completing Qualopec)
-    _connect(regions, "Tomb of Qualopec", "Greece Hub",
-             lambda state: state.has("Level Complete - Tomb of Qualopec", player))
+    ("Tomb of Qualopec", "Greece Hub", "Level Complete - Tomb of Qualopec"),
 
     # Greece Hub -> individual Greece levels (sequential)
-    _connect(regions, "Greece Hub", "St. Francis' Folly")
-    _connect(regions, "St. Francis' Folly", "Colosseum",
-             lambda state: state.has("Level Complete - St. Francis' Folly", player))
-    _connect(regions, "Colosseum", "Palace Midas",
-             lambda state: state.has("Level Complete - Colosseum", player))
-    _connect(regions, "Palace Midas", "The Cistern",
-             lambda state: state.has("Level Complete - Palace Midas", player))
-    _connect(regions, "The Cistern", "Tomb of Tihocan",
-             lambda state: state.has("Level Complete - The Cistern", player))
+    ("Greece Hub", "St. Francis' Folly", None),
+    ("St. Francis' Folly", "Colosseum", "Level Complete - St. Francis' Folly"),
+    ("Colosseum", "Palace Midas", "Level Complete - Colosseum"),
+    ("Palace Midas", "The Cistern", "Level Complete - Palace Midas"),
+    ("The Cistern", "Tomb of Tihocan", "Level Complete - The Cistern"),
 
     # Greece -> Egypt Hub (requires completing Tihocan)
-    _connect(regions, "Tomb of Tihocan", "Egypt Hub",
-             lambda state: state.has("Level Complete - Tomb of Tihocan", player))
+    ("Tomb of Tihocan", "Egypt Hub", "Level Complete - Tomb of Tihocan"),
 
     # Egypt Hub -> individual Egypt levels (sequential)
-    _connect(regions, "Egypt Hub", "City of Khamoon")
-    _connect(regions, "City of Khamoon", "Obelisk of Khamoon",
-             lambda state: state.has("Level Complete - City of Khamoon", player))
-    _connect(regions, "Obelisk of Khamoon", "Sanctuary of the Scion",
-             lambda state: state.has("Level Complete - Obelisk of Khamoon", player))
+    ("Egypt Hub", "City of Khamoon", None),
+    ("City of Khamoon", "Obelisk of Khamoon", "Level Complete - City of Khamoon"),
+    ("Obelisk of Khamoon", "Sanctuary of the Scion", "Level Complete - Obelisk of Khamoon"),
 
     # Egypt -> Atlantis Hub (requires completing Sanctuary)
-    _connect(regions, "Sanctuary of the Scion", "Atlantis Hub",
-             lambda state: state.has("Level Complete - Sanctuary of the Scion", player))
+    ("Sanctuary of the Scion", "Atlantis Hub", "Level Complete - Sanctuary of the Scion"),
 
     # Atlantis Hub -> individual Atlantis levels (sequential)
-    _connect(regions, "Atlantis Hub", "Natla's Mines")
-    _connect(regions, "Natla's Mines", "Atlantis",
-             lambda state: state.has("Level Complete - Natla's Mines", player))
-    _connect(regions, "Atlantis", "The Great Pyramid",
-             lambda state: state.has("Level Complete - Atlantis", player))
+    ("Atlantis Hub", "Natla's Mines", None),
+    ("Natla's Mines", "Atlantis", "Level Complete - Natla's Mines"),
+    ("Atlantis", "The Great Pyramid", "Level Complete - Atlantis"),
+)
+
+
+@lru_cache(maxsize=None)
+def get_region_connections(order: Tuple[int, ...]) -> Tuple[Tuple[str, str, Optional[str]], ...]:
+    """
+    REGION_CONNECTIONS with the levels played in the given order (level
+    indices in game order, see level_order.py). Each level takes the place
+    in the chain of the vanilla level at its position, so the hubs stay
+    where they are and only the levels between them change.
+    """
+    names = [name for name, _file, _region in get_levels()]
+    renamed = {names[position]: names[level] for position, level in enumerate(order)}
+    events = {f"Level Complete - {vanilla}": f"Level Complete - {level}" for vanilla, level in renamed.items()}
+    return tuple(
+        (renamed.get(source, source), renamed.get(target, target), events.get(event, event))
+        for source, target, event in REGION_CONNECTIONS
+    )
+
+
+@lru_cache(maxsize=None)
+def get_region_table(key_gated: bool) -> Mapping[str, Tuple[SubRegion, ...]]:
+    """The key-gated sub-regions per level if key_gated_regions is on, else none."""
+    return load_region_table() if key_gated else MappingProxyType({})
+
+
+@lru_cache(maxsize=None)
+def get_location_regions(key_gated: bool = False) -> Mapping[str, str]:
+    """Location name -> region it is placed in (its level, or a key-gated area of it)."""
+    location_table = get_location_table()
+    region_table = get_region_table(key_gated)
+    placement: Dict[str, str] = {}
+    for level_name, _file, _region in get_levels():
+        areas = region_table.get(level_name, ())
+        for loc_name in get_locations_by_level(level_name):
+            ap_id = location_table[loc_name].ap_id
+            placement[loc_name] = next(
+                (area.name for area in areas if ap_id in area.locations), level_name
+            )
+    return MappingProxyType(placement)
+
+
+class RegionTemplate(NamedTuple):
+    """
+    The player-independent part of create_regions, built once per level order
+    and key_gated_regions setting and shared by every TR1R slot using them.
+    Requirements are alternative item sets (any one is enough); () means the
+    entrance is always open.
+    """
+    # (region name, ((location name, location id), ...)) in creation order
+    regions: Tuple[Tuple[str, Tuple[Tuple[str, int], ...]], ...]
+    # (source, target, requirement)
+    entrances: Tuple[Tuple[str, str, Tuple[FrozenSet[str], ...]], ...]
+
+
+@lru_cache(maxsize=None)
+def get_region_template(order: Tuple[int, ...], key_gated: bool = False) -> RegionTemplate:
+    region_table = get_region_table(key_gated)
+    names = list(REGION_NAMES)
+    names += [area.name for areas in region_table.values() for area in areas]
+
+    location_table = get_location_table()
+    placed: Dict[str, List[Tuple[str, int]]] = {name: [] for name in names}
+    for loc_name, region_name in get_location_regions(key_gated).items():
+        placed[region_name].append((loc_name, location_table[loc_name].ap_id))
+
+    # Sub-region entrances first, then the level chain, as they were always created
+    entrances = [
+        (level_name, area.name, area.requires)
+        for level_name, areas in region_table.items()
+        for area in areas
+    ]
+    entrances += [
+        (source, target, () if event is None else (frozenset((event,)),))
+        for source, target, event in get_region_connections(order)
+    ]
+    return RegionTemplate(
+        tuple((name, tuple(placed[name])) for name in names),
+        tuple(entrances),
+    )
+
+
+def create_regions(world: "TR1RWorld") -> Dict[str, Location]:
+    """
+    Create all regions and connect them, in one pass over the shared template.
+    Returns this player's locations by name.
+    """
+    multiworld = world.multiworld
+    player = world.player
+    template = get_region_template(world.level_order, bool(world.options.key_gated_regions.value))
+
+    regions: Dict[str, Region] = {}
+    for name, region_locations in template.regions:
+        region = regions[name] = Region(name, player, multiworld)
+        region.locations += [Location(player, loc_name, ap_id, region) for loc_name, ap_id in region_locations]
+    multiworld.regions += regions.values()
+
+    # Entrances with the same requirement share one compiled rule
+    rules: Dict[Tuple[FrozenSet[str], ...], AccessRule] = {}
+    for source, target, requires in template.entrances:
+        rule = None
+        if requires:
+            rule = rules.get(requires)
+            if rule is None:
+                rule = rules[requires] = compile_any_requirement(requires, player)
+        _connect(regions, source, target, rule)
+
+    return {location.name: location for region in regions.values() for location in region.locations}
 
 
 def _connect(regions: Dict[str, Region], source: str, target: str,
@@ -124,5 +213,5 @@ def _connect(regions: Dict[str, Region], source: str, target: str,
     """Helper to connect two regions with an optional access rule."""
     entrance = regions[source].connect(regions[target])
     if rule is not None:
-        entrance.access_rule = rule
+        entrance.access_rule = instrument_rule(rule, "entrance", entrance.name, entrance.player)
     return entrance
@@ -5,99 +5,148 @@ Rules define which items are required to reach specific locations within levels.
 Key items gate progression within levels (e.g., need Silver Key to open a door).
 Level completion gates progression between levels (handled in regions.py).
 
-Phase 4 will add detailed intra-level rules based on routes.json sub-regions.
+Requirements are declared as plain item-name sets and compiled once per world
+into single-step access rules, so the fill algorithm does one count lookup per
+rule instead of walking a chain of separate state.has() calls.
+
+Key-gated sub-regions within levels come from the precompiled region table
+(see regions.py); their entrances use the same compiled rules.
 """
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Tuple
 
-from BaseClasses import CollectionState
+from .profiling import instrument_rule
 
 if TYPE_CHECKING:
+    from BaseClasses import CollectionState
+
     from . import TR1RWorld
 
 
-def set_rules(world: "TR1RWorld") -> None:
-    """Set access rules for all locations."""
-    player = world.player
-    multiworld = world.multiworld
+AccessRule = Callable[["CollectionState"], bool]
 
-    # -- Intra-level key item rules --
-    # These ensure key items are required to reach certain locations within levels.
-    # For now, we use a simplified model where key items gate the level completion.
-    # Phase 4 will add sub-region rules based on routes.json for finer granularity.
 
+# -- Intra-level key item requirements --
+# Key items gate level completion. Pickups behind key doors are handled by the
+# sub-regions from the compiled region table instead.
+LEVEL_COMPLETE_REQUIREMENTS: Dict[str, Tuple[str, ...]] = {
     # Vilcabamba: need Silver Key and Gold Idol to complete
-    _set_rule(multiworld, player, "City of Vilcabamba - Complete",
-              lambda state: state.has("Vilcabamba Silver Key", player)
-              and state.has("Vilcabamba Gold Idol", player))
-
+    "City of Vilcabamba - Complete": (
+        "Vilcabamba Silver Key",
+        "Vilcabamba Gold Idol",
+    ),
     # Lost Valley: need all 3 cogs to complete
-    _set_rule(multiworld, player, "Lost Valley - Complete",
-              lambda state: state.has("Lost Valley Cog (Above Pool)", player)
-              and state.has("Lost Valley Cog (Bridge)", player)
-              and state.has("Lost Valley Cog (Temple)", player))
-
+    "Lost Valley - Complete": (
+        "Lost Valley Cog (Above Pool)",
+        "Lost Valley Cog (Bridge)",
+        "Lost Valley Cog (Temple)",
+    ),
     # Folly: need all 4 keys to complete
-    _set_rule(multiworld, player, "St. Francis' Folly - Complete",
-              lambda state: state.has("Folly Neptune Key", player)
-              and state.has("Folly Atlas Key", player)
-              and state.has("Folly Damocles Key", player)
-              and state.has("Folly Thor Key", player))
-
+    "St. Francis' Folly - Complete": (
+        "Folly Neptune Key",
+        "Folly Atlas Key",
+        "Folly Damocles Key",
+        "Folly Thor Key",
+    ),
     # Colosseum: need Rusty Key to complete
-    _set_rule(multiworld, player, "Colosseum - Complete",
-              lambda state: state.has("Colosseum Rusty Key", player))
-
+    "Colosseum - Complete": (
+        "Colosseum Rusty Key",
+    ),
     # Palace Midas: need all 3 lead bars
-    _set_rule(multiworld, player, "Palace Midas - Complete",
-              lambda state: state.has("Midas Lead Bar (Fire Room)", player)
-              and state.has("Midas Lead Bar (Spike Room)", player)
-              and state.has("Midas Lead Bar (Temple Roof)", player))
-
+    "Palace Midas - Complete": (
+        "Midas Lead Bar (Fire Room)",
+        "Midas Lead Bar (Spike Room)",
+        "Midas Lead Bar (Temple Roof)",
+    ),
     # Cistern: need Gold Key, Silver Keys, and Rusty Keys
-    _set_rule(multiworld, player, "The Cistern - Complete",
-              lambda state: state.has("Cistern Gold Key", player)
-              and state.has("Cistern Silver Key (Behind Door)", player)
-              and state.has("Cistern Silver Key (Between Doors)", player)
-              and state.has("Cistern Rusty Key (Main Room)", player))
-
+    "The Cistern - Complete": (
+        "Cistern Gold Key",
+        "Cistern Silver Key (Behind Door)",
+        "Cistern Silver Key (Between Doors)",
+        "Cistern Rusty Key (Main Room)",
+    ),
     # Tihocan: need Gold Keys and Rusty Keys
-    _set_rule(multiworld, player, "Tomb of Tihocan - Complete",
-              lambda state: state.has("Tihocan Gold Key (Flip Map)", player)
-              and state.has("Tihocan Rusty Key (Boulders)", player))
-
+    "Tomb of Tihocan - Complete": (
+        "Tihocan Gold Key (Flip Map)",
+        "Tihocan Rusty Key (Boulders)",
+    ),
     # Khamoon: need Sapphire Keys
-    _set_rule(multiworld, player, "City of Khamoon - Complete",
-              lambda state: state.has("Khamoon Sapphire Key (End)", player)
-              and state.has("Khamoon Sapphire Key (Start)", player))
-
+    "City of Khamoon - Complete": (
+        "Khamoon Sapphire Key (End)",
+        "Khamoon Sapphire Key (Start)",
+    ),
     # Obelisk: need Sapphire Keys and all 4 puzzle items
-    _set_rule(multiworld, player, "Obelisk of Khamoon - Complete",
-              lambda state: state.has("Obelisk Sapphire Key (End)", player)
-              and state.has("Obelisk Sapphire Key (Start)", player)
-              and state.has("Obelisk Eye of Horus", player)
-              and state.has("Obelisk Scarab", player)
-              and state.has("Obelisk Seal of Anubis", player)
-              and state.has("Obelisk Ankh", player))
-
+    "Obelisk of Khamoon - Complete": (
+        "Obelisk Sapphire Key (End)",
+        "Obelisk Sapphire Key (Start)",
+        "Obelisk Eye of Horus",
+        "Obelisk Scarab",
+        "Obelisk Seal of Anubis",
+        "Obelisk Ankh",
+    ),
     # Sanctuary: need Gold Key, Ankhs, and Scarab
-    _set_rule(multiworld, player, "Sanctuary of the Scion - Complete",
-              lambda state: state.has("Sanctuary Gold Key", player)
-              and state.has("Sanctuary Ankh (After Key)", player)
-              and state.has("Sanctuary Ankh (Behind Sphinx)", player)
-              and state.has("Sanctuary Scarab", player))
-
+    "Sanctuary of the Scion - Complete": (
+        "Sanctuary Gold Key",
+        "Sanctuary Ankh (After Key)",
+        "Sanctuary Ankh (Behind Sphinx)",
+        "Sanctuary Scarab",
+    ),
     # Mines: need Rusty Key, Fuses, and Pyramid Key
-    _set_rule(multiworld, player, "Natla's Mines - Complete",
-              lambda state: state.has("Mines Rusty Key", player)
-              and state.has("Mines Fuse (Boulder)", player)
-              and state.has("Mines Fuse (Conveyor)", player)
-              and state.has("Mines Fuse (Cowboy)", player)
-              and state.has("Mines Pyramid Key", player))
-
-
-def _set_rule(multiworld, player: int, location_name: str, rule) -> None:
-    """Set an access rule on a location, if it exists."""
-    location = multiworld.get_location(location_name, player)
-    if location is not None:
-        location.access_rule = rule
+    "Natla's Mines - Complete": (
+        "Mines Rusty Key",
+        "Mines Fuse (Boulder)",
+        "Mines Fuse (Conveyor)",
+        "Mines Fuse (Cowboy)",
+        "Mines Pyramid Key",
+    ),
+}
+
+
+def compile_requirement(items: Iterable[str], player: int) -> AccessRule:
+    """
+    Compile a set of required item names into a single access rule.
+
+    The names are frozen into a set and checked against the keys of the
+    player's item counts with one C-level subset test. Archipelago deletes
+    an item's entry when its count drops to zero, so key presence is
+    equivalent to ``state.has(item, player)`` for every required item.
+    """
+    required = frozenset(items)
+
+    if not required:
+        return lambda state: True
+    return lambda state: state.prog_items[player].keys() >= required
+
+
+def compile_any_requirement(alternatives: Iterable[Iterable[str]], player: int) -> AccessRule:
+    """
+    Compile alternative item sets (any one is enough) into a single access rule.
+
+    Used for sub-regions behind doors that more than one key fits.
+    """
+    options = tuple(frozenset(items) for items in alternatives)
+
+    if len(options) == 1 or not all(options):
+        return compile_requirement(min(options, key=len), player)
+    return lambda state: any(state.prog_items[player].keys() >= items for items in options)
+
+
+def compile_requirements(requirements: Dict[str, Tuple[str, ...]],
+                         player: int) -> Dict[str, AccessRule]:
+    """Compile a location -> requirement table into location -> access rule."""
+    return {
+        location_name: compile_requirement(items, player)
+        for location_name, items in requirements.items()
+    }
+
+
+def set_rules(world: "TR1RWorld") -> None:
+    """Set access rules for all locations."""
+    player = world.player
+    locations = world.locations_by_name
+
+    rules = compile_requirements(LEVEL_COMPLETE_REQUIREMENTS, player)
+    for location_name, rule in rules.items():
+        location = locations.get(location_name)
+        if location is not None:
+            location.access_rule = instrument_rule(rule, "location", location_name, player)
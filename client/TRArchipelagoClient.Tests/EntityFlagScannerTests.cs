@@ -0,0 +1,97 @@
+using System.Diagnostics;
+using TRArchipelagoClient.GameInterface;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// EntityFlagScanner against one ReadInt16 per tracked entity, as the watcher
+/// used to poll, on synthetic entities arrays served from a file. Both must
+/// report the same changes; the time per poll of each is written to the test
+/// output.
+/// </summary>
+public class EntityFlagScannerTests : IDisposable
+{
+    private const int Polls = 2_000;
+    private static readonly IntPtr EntitiesBase = new(0x1_0000_0000);
+
+    private readonly ITestOutputHelper _output;
+    private readonly string _path = Path.GetTempFileName();
+
+    public EntityFlagScannerTests(ITestOutputHelper output)
+    {
+        _output = output;
+    }
+
+    public void Dispose() => File.Delete(_path);
+
+    private static IntPtr FlagsAddress(int entity) => EntitiesBase + entity * TR1RMemoryMap.EntitySize + TR1RMemoryMap.Item_Flags;
+
+    // (entities in the level, every how many entities a tracked pickup sits)
+    [Theory]
+    [InlineData(300, 3)]
+    [InlineData(250, 12)]
+    public void ScannerMatchesPerEntityReads(int entityCount, int spacing)
+    {
+        int[] tracked = Enumerable.Range(8, entityCount - 8).Where(i => i % spacing == 0).ToArray();
+        byte[] dump = new byte[entityCount * TR1RMemoryMap.EntitySize];
+        foreach (int entity in tracked)
+            BitConverter.TryWriteBytes(dump.AsSpan(entity * TR1RMemoryMap.EntitySize + TR1RMemoryMap.Item_Flags), (short)0x3E00);
+        File.WriteAllBytes(_path, dump);
+        using var memory = new FileBackedMemory(_path, EntitiesBase, writable: true);
+
+        var flags = tracked.ToDictionary(entity => entity, entity => memory.ReadInt16(FlagsAddress(entity)));
+        var scanner = new EntityFlagScanner(memory);
+        scanner.Track(0, tracked);
+        Assert.True(scanner.Snapshot(EntitiesBase));
+
+        // Picking up every fifth tracked entity, a few at a time, plus an untracked one
+        var random = new Random(1);
+        for (int round = 0; round < 20; round++)
+        {
+            foreach (int entity in tracked.Where((_, i) => i % 5 == round % 5).Take(3))
+                memory.WriteInt16(FlagsAddress(entity), (short)random.Next(short.MaxValue));
+            memory.WriteInt16(FlagsAddress(1 + round % 7), 0x4000);
+
+            var changed = new List<int>();
+            foreach (int entity in tracked)
+            {
+                short current = memory.ReadInt16(FlagsAddress(entity));
+                if (current != flags[entity])
+                {
+                    flags[entity] = current;
+                    changed.Add(entity);
+                }
+            }
+            Assert.Equal(changed, scanner.Scan(EntitiesBase));
+        }
+        // One read per run of tracked entities at most MergeDistance apart
+        int runs = 1 + tracked.Zip(tracked.Skip(1)).Count(pair => pair.Second - pair.First > EntityFlagScanner.MergeDistance);
+        Assert.Equal(runs, scanner.ReadsPerPoll);
+
+        _output.WriteLine($"{tracked.Length} tracked entities of {entityCount}, {Polls} polls");
+        long reads = memory.ReadCount;
+        var stopwatch = Stopwatch.StartNew();
+        for (int poll = 0; poll < Polls; poll++)
+        {
+            foreach (int entity in tracked)
+            {
+                short current = memory.ReadInt16(FlagsAddress(entity));
+                if (current != flags[entity])
+                    flags[entity] = current;
+            }
+        }
+        stopwatch.Stop();
+        _output.WriteLine($"  per-entity reads: {stopwatch.Elapsed.TotalMilliseconds * 1000 / Polls,8:F2} us/poll, "
+            + $"{(double)(memory.ReadCount - reads) / Polls:F0} reads/poll");
+
+        reads = memory.ReadCount;
+        stopwatch.Restart();
+        for (int poll = 0; poll < Polls; poll++)
+            Assert.Empty(scanner.Scan(EntitiesBase));
+        stopwatch.Stop();
+        _output.WriteLine($"  scanner:          {stopwatch.Elapsed.TotalMilliseconds * 1000 / Polls,8:F2} us/poll, "
+            + $"{(double)(memory.ReadCount - reads) / Polls:F0} reads/poll, {scanner.BytesPerPoll / 1024} KB/poll");
+    }
+}
@@ -0,0 +1,18 @@
+using Xunit;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// A test that needs the game's level files: skipped unless TR1R_GAME_DIR
+/// points at the TR1-3 Remastered install (or its TR1 DATA directory).
+/// </summary>
+public sealed class GameFactAttribute : FactAttribute
+{
+    public static string? GameDir => Environment.GetEnvironmentVariable("TR1R_GAME_DIR");
+
+    public GameFactAttribute()
+    {
+        if (string.IsNullOrEmpty(GameDir))
+            Skip = "set TR1R_GAME_DIR to the TR1-3 Remastered game directory";
+    }
+}
@@ -0,0 +1,133 @@
+using System.Diagnostics;
+using TRArchipelagoClient.Core;
+using TRArchipelagoClient.GameInterface;
+using TRLevelControl.Model;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// InventoryManager.GiveRingItems against giving the same items one at a
+/// time, as live items are given, on a simulated tomb1.dll (a file). Both
+/// must leave the Main Ring, ammo counters and weapon flags the same. The
+/// memory accesses of a 300 item catch-up each way are written to the test
+/// output.
+/// </summary>
+public class InventoryManagerTests : IDisposable
+{
+    private const int Trials = 200;
+    private static readonly IntPtr Tomb1Base = new(0x7FF8_0000_0000);
+    private static readonly IntPtr Pistols = new(0x2_0000_0000);
+
+    private readonly ITestOutputHelper _output;
+    private readonly string _onePath = Path.GetTempFileName();
+    private readonly string _batchPath = Path.GetTempFileName();
+
+    public InventoryManagerTests(ITestOutputHelper output)
+    {
+        _output = output;
+    }
+
+    public void Dispose()
+    {
+        File.Delete(_onePath);
+        File.Delete(_batchPath);
+    }
+
+    private static byte[] RingState(ProcessMemory memory) =>
+        memory.ReadBytes(Tomb1Base + TR1RMemoryMap.MainRingCount, 2)
+            .Concat(memory.ReadBytes(Tomb1Base + TR1RMemoryMap.MainRingItems, TR1RMemoryMap.MaxRingItems * 8))
+            .Concat(memory.ReadBytes(Tomb1Base + TR1RMemoryMap.MainRingQtys, TR1RMemoryMap.MaxRingItems * 2))
+            .Concat(memory.ReadBytes(Tomb1Base + TR1RMemoryMap.Lara_MagnumAmmo, 0x14))
+            .Concat(memory.ReadBytes(Tomb1Base + TR1RMemoryMap.WorldStateBackup + TR1RMemoryMap.Save_WeaponsConfig, 1))
+            .ToArray();
+
+    [Fact]
+    public void BatchMatchesOneAtATime()
+    {
+        int size = TR1RMemoryMap.WorldStateBackup + TR1RMemoryMap.Save_WeaponsConfig + 1;
+        var pool = new[]
+        {
+            TR1Type.Shotgun_S_P, TR1Type.Magnums_S_P, TR1Type.Uzis_S_P,
+            TR1Type.ShotgunAmmo_S_P, TR1Type.MagnumAmmo_S_P, TR1Type.UziAmmo_S_P,
+            TR1Type.SmallMed_S_P, TR1Type.LargeMed_S_P,
+        }.Select(type => 770_000L + (int)type).ToArray();
+
+        var random = new Random(1);
+        var stdout = Console.Out;
+        for (int trial = 0; trial < Trials; trial++)
+        {
+            // Compass and Pistols (so the Pistols pointer is found), then random extras
+            byte[] dump = new byte[size];
+            var ring = new List<IntPtr> { Pistols + 6 * TR1RMemoryMap.InventoryItemStride, Pistols };
+            int extras = random.Next(trial % 4 == 0 ? TR1RMemoryMap.MaxRingItems - 1 : 6);
+            for (int i = 0; i < extras && ring.Count < TR1RMemoryMap.MaxRingItems; i++)
+            {
+                var item = Pistols + random.Next(-12, 14) * TR1RMemoryMap.InventoryItemStride;
+                if (!ring.Contains(item))
+                    ring.Add(item);
+            }
+            BitConverter.TryWriteBytes(dump.AsSpan(TR1RMemoryMap.MainRingCount), (short)ring.Count);
+            for (int i = 0; i < ring.Count; i++)
+            {
+                BitConverter.TryWriteBytes(dump.AsSpan(TR1RMemoryMap.MainRingItems + i * 8), ring[i].ToInt64());
+                BitConverter.TryWriteBytes(dump.AsSpan(TR1RMemoryMap.MainRingQtys + i * 2), (short)random.Next(1, 250));
+            }
+            foreach (int offset in new[] { TR1RMemoryMap.Lara_MagnumAmmo, TR1RMemoryMap.Lara_UziAmmo, TR1RMemoryMap.Lara_ShotgunAmmo })
+                BitConverter.TryWriteBytes(dump.AsSpan(offset), random.Next(1_000_000));
+            dump[TR1RMemoryMap.WorldStateBackup + TR1RMemoryMap.Save_WeaponsConfig] = (byte)random.Next(32);
+            File.WriteAllBytes(_onePath, dump);
+            File.WriteAllBytes(_batchPath, dump);
+
+            // The last (JIT-warm) trial is the one reported
+            int count = trial == Trials - 1 ? 300 : random.Next(2, 301);
+            var items = Enumerable.Range(0, count)
+                .Select(_ => pool[random.Next(pool.Length)])
+                .Select(id => (id, ItemMapper.GetCategory(id)))
+                .ToList();
+
+            using var oneMemory = new FileBackedMemory(_onePath, Tomb1Base, writable: true);
+            using var batchMemory = new FileBackedMemory(_batchPath, Tomb1Base, writable: true);
+            var oneStopwatch = new Stopwatch();
+            var batchStopwatch = new Stopwatch();
+
+            // InventoryManager logs every item it gives
+            Console.SetOut(TextWriter.Null);
+            try
+            {
+                var inventory = new InventoryManager(oneMemory);
+                oneStopwatch.Start();
+                foreach (var (itemId, category) in items)
+                {
+                    switch (category)
+                    {
+                        case ItemMapper.ItemCategory.Weapon: inventory.GiveWeapon(itemId); break;
+                        case ItemMapper.ItemCategory.Ammo: inventory.GiveAmmo(itemId); break;
+                        case ItemMapper.ItemCategory.Medipack: inventory.GiveMedipack(itemId); break;
+                    }
+                }
+                oneStopwatch.Stop();
+
+                batchStopwatch.Start();
+                new InventoryManager(batchMemory).GiveRingItems(items);
+                batchStopwatch.Stop();
+            }
+            finally
+            {
+                Console.SetOut(stdout);
+            }
+
+            Assert.True(RingState(oneMemory).SequenceEqual(RingState(batchMemory)),
+                $"Trial {trial} ({count} items, ring of {ring.Count}): batch result differs");
+
+            if (trial == Trials - 1)
+            {
+                _output.WriteLine($"{count} items one at a time: {oneMemory.ReadCount} reads, {oneMemory.WriteCount} writes, "
+                    + $"{oneStopwatch.Elapsed.TotalMilliseconds:F2} ms");
+                _output.WriteLine($"{count} items in one batch:  {batchMemory.ReadCount} reads, {batchMemory.WriteCount} writes, "
+                    + $"{batchStopwatch.Elapsed.TotalMilliseconds:F2} ms");
+            }
+        }
+    }
+}
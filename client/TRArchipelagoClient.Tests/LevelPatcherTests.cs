@@ -0,0 +1,15 @@
+using TRArchipelagoClient.Patching;
+using Xunit;
+
+namespace TRArchipelagoClient.Tests;
+
+public class LevelPatcherTests
+{
+    [GameFact]
+    public void InPlacePatchingMatchesFullRewrite()
+    {
+        Assert.True(Directory.Exists(GameFactAttribute.GameDir), $"Game directory not found: {GameFactAttribute.GameDir}");
+        // Reports the first differing byte of each level that differs
+        Assert.True(LevelPatcher.VerifyInPlacePatching(GameFactAttribute.GameDir!));
+    }
+}
@@ -0,0 +1,115 @@
+using TRArchipelagoClient.Core;
+using TRArchipelagoClient.Patching;
+using Xunit;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// LevelSequence from slot data, and BackupManager.PlaceLevels on a game
+/// directory of stand-in level files, each holding its own file name. After a
+/// placement every position must hold the files of the level the sequence
+/// plays there; placing another order, the vanilla order or restoring must
+/// bring the originals back.
+/// </summary>
+public class LevelSequenceTests : IDisposable
+{
+    private static readonly string[] Extensions = { ".PHD", ".PDP", ".MAP" };
+
+    private readonly string _dir = Directory.CreateTempSubdirectory("tr1r_levels_").FullName;
+
+    public LevelSequenceTests()
+    {
+        foreach (string file in LevelFiles())
+            foreach (string ext in Extensions)
+                File.WriteAllText(Path.Combine(_dir, file + ext), file + ext);
+    }
+
+    public void Dispose() => Directory.Delete(_dir, true);
+
+    private static IEnumerable<string> LevelFiles() =>
+        Enumerable.Range(0, LocationMapper.LevelCount).Select(i => Path.GetFileNameWithoutExtension(LocationMapper.GetLevelFile(i)));
+
+    private static List<string> Shuffled(int seed)
+    {
+        // The final level stays last, as in the world's shuffle
+        var files = Enumerable.Range(0, LocationMapper.LevelCount).Select(LocationMapper.GetLevelFile).ToList();
+        var random = new Random(seed);
+        var order = files.Take(files.Count - 1).OrderBy(_ => random.Next()).ToList();
+        order.Add(files[^1]);
+        return order;
+    }
+
+    private void AssertPlaced(LevelSequence sequence)
+    {
+        var files = LevelFiles().ToList();
+        for (int position = 0; position < files.Count; position++)
+        {
+            foreach (string ext in Extensions)
+            {
+                string held = File.ReadAllText(Path.Combine(_dir, files[position] + ext));
+                Assert.Equal(files[sequence.LevelAt(position)] + ext, held);
+            }
+        }
+    }
+
+    [Fact]
+    public void EmptySequenceIsVanilla()
+    {
+        Assert.Same(LevelSequence.Vanilla, LevelSequence.FromFiles(new List<string>()));
+        Assert.Same(LevelSequence.Vanilla, LevelSequence.FromFiles(null));
+        Assert.True(LevelSequence.Vanilla.IsVanilla);
+        Assert.Equal(5, LevelSequence.Vanilla.LevelAt(5));
+        Assert.Equal(-1, LevelSequence.Vanilla.LevelAt(-1));
+        Assert.Equal(-1, LevelSequence.Vanilla.LevelAt(LocationMapper.LevelCount));
+    }
+
+    [Fact]
+    public void SequenceMapsPositionsToLevels()
+    {
+        var files = Shuffled(3);
+        var sequence = LevelSequence.FromFiles(files.Select(f => f.ToLowerInvariant()).ToList());
+
+        Assert.False(sequence.IsVanilla);
+        for (int position = 0; position < files.Count; position++)
+        {
+            Assert.Equal(LocationMapper.GetLevelIndex(files[position]), sequence.LevelAt(position));
+            Assert.Equal(position, sequence.PositionOf(sequence.LevelAt(position)));
+        }
+    }
+
+    [Fact]
+    public void RejectsSequencesThatAreNotAnOrderOfAllLevels()
+    {
+        var files = Shuffled(3);
+        Assert.Throws<InvalidDataException>(() => LevelSequence.FromFiles(files.Skip(1).ToList()));
+        Assert.Throws<InvalidDataException>(() => LevelSequence.FromFiles(files.Append(files[0]).ToList()));
+        Assert.Throws<InvalidDataException>(() => LevelSequence.FromFiles(files.Select((f, i) => i == 4 ? files[5] : f).ToList()));
+        Assert.Throws<InvalidDataException>(() => LevelSequence.FromFiles(files.Select((f, i) => i == 4 ? "LEVEL99.PHD" : f).ToList()));
+    }
+
+    [Fact]
+    public void PlacesAndRestoresLevelFiles()
+    {
+        var backups = new BackupManager(_dir);
+        backups.BackupAll();
+
+        var first = LevelSequence.FromFiles(Shuffled(3));
+        backups.PlaceLevels(first);
+        AssertPlaced(first);
+
+        // A later session with another order starts from the placed files
+        var second = LevelSequence.FromFiles(Shuffled(8));
+        backups.BackupAll();
+        backups.PlaceLevels(second);
+        AssertPlaced(second);
+
+        backups.PlaceLevels(LevelSequence.Vanilla);
+        AssertPlaced(LevelSequence.Vanilla);
+
+        backups.PlaceLevels(first);
+        backups.RestoreAll();
+        AssertPlaced(LevelSequence.Vanilla);
+        Assert.Empty(Directory.GetFiles(_dir, "*.apbak"));
+        Assert.Equal(LocationMapper.LevelCount * Extensions.Length, Directory.GetFiles(_dir).Length);
+    }
+}
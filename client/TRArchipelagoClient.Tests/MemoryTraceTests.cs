@@ -0,0 +1,82 @@
+using TRArchipelagoClient.GameInterface;
+using Xunit;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// RecordingMemory and ReplayMemory on a synthetic memory dump served from a
+/// file. A "poll loop" reads and writes a few values per tick while a
+/// background task scans the whole dump through Background, as the inventory
+/// scanner does. The replay must serve the poll loop exactly what it read,
+/// however the two interleaved, and the scans must stay out of the trace.
+/// </summary>
+public class MemoryTraceTests : IDisposable
+{
+    private const int Ticks = 200;
+    private const int DumpSize = 256 * 1024;
+    private static readonly IntPtr Base = new(0x1_0000_0000);
+
+    private readonly string _dumpPath = Path.GetTempFileName();
+    private readonly string _tracePath = Path.GetTempFileName();
+
+    public void Dispose()
+    {
+        File.Delete(_dumpPath);
+        File.Delete(_tracePath);
+    }
+
+    private static IEnumerable<IntPtr> PolledAddresses(int tick) =>
+        Enumerable.Range(0, 8).Select(i => Base + (i * 4099 + tick % 3 * 16) % (DumpSize - 4));
+
+    [Fact]
+    public async Task ReplayServesThePollLoopOnly()
+    {
+        var random = new Random(7);
+        byte[] dump = new byte[DumpSize];
+        random.NextBytes(dump);
+        File.WriteAllBytes(_dumpPath, dump);
+
+        var polled = new List<int>();
+        long scannedBytes = 0;
+        using (var recording = new RecordingMemory(new FileBackedMemory(_dumpPath, Base, writable: true), _tracePath))
+        {
+            using var stop = new CancellationTokenSource();
+            var scanner = Task.Run(() =>
+            {
+                while (!stop.IsCancellationRequested)
+                    scannedBytes += recording.Background.ReadBytes(Base, DumpSize).Length;
+            });
+
+            for (int tick = 0; tick < Ticks; tick++)
+            {
+                foreach (IntPtr address in PolledAddresses(tick))
+                    polled.Add(recording.ReadInt32(address));
+                recording.WriteInt16(Base + tick * 2, (short)random.Next(short.MaxValue));
+                recording.MarkTick();
+                if (tick % 20 == 0)
+                    await Task.Yield();
+            }
+            stop.Cancel();
+            await scanner;
+        }
+        Assert.True(scannedBytes > 0);
+        // Well under one scan: only the poll loop's reads and writes were recorded
+        Assert.True(new FileInfo(_tracePath).Length < DumpSize / 4);
+
+        using var replay = new ReplayMemory(_tracePath);
+        var served = new List<int>();
+        for (int tick = 0; tick < Ticks; tick++)
+        {
+            Assert.True(replay.NextTick());
+            foreach (IntPtr address in PolledAddresses(tick))
+                served.Add(replay.ReadInt32(address));
+            replay.WriteInt16(Base + tick * 2, 0);
+            // Background work finds nothing to scan, and does not move the poll loop's cursor
+            Assert.Empty(replay.Background.GetReadableRegions());
+            Assert.False(replay.Background.ReadBytes(Base, new byte[16], 16));
+        }
+        Assert.False(replay.NextTick());
+        Assert.Equal(polled, served);
+        Assert.Equal(0, replay.Misses);
+    }
+}
@@ -0,0 +1,62 @@
+using System.Diagnostics;
+using Newtonsoft.Json;
+using TRArchipelagoClient.Core;
+using TRArchipelagoClient.GameInterface;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// Replays a recorded trace through GameStateWatcher as fast as possible (no
+/// game, AP server or Windows needed) and writes the time and memory reads
+/// spent in each poll stage to the test output.
+/// </summary>
+public class ReplayTests
+{
+    private readonly ITestOutputHelper _output;
+
+    public ReplayTests(ITestOutputHelper output)
+    {
+        _output = output;
+    }
+
+    [TraceFact]
+    public async Task ReplayTrace()
+    {
+        string tracePath = TraceFactAttribute.TracePath!;
+        Assert.True(File.Exists(tracePath), $"Trace not found: {tracePath}");
+
+        using var memory = new ReplayMemory(tracePath);
+        Assert.True(memory.NextTick() && memory.SkipToAttached(), "The trace never attaches to tomb1.dll.");
+        var entityLocations = JsonConvert.DeserializeObject<Dictionary<int, Dictionary<int, long>>>(memory.Context ?? "")
+            ?? new Dictionary<int, Dictionary<int, long>>();
+
+        // Offline session (checks go nowhere) and state files of its own
+        var session = new APSession();
+        string stateDir = Directory.CreateTempSubdirectory("tr1r_replay_").FullName;
+        var watcher = new GameStateWatcher(session, memory, entityLocations, new SaveStateStore("replay", "", stateDir));
+        var profiler = new PollProfiler(memory);
+        watcher.Profiler = profiler;
+
+        try
+        {
+            await watcher.WaitForGameAsync();
+
+            var stopwatch = Stopwatch.StartNew();
+            do
+            {
+                watcher.PollOnce();
+            } while (memory.NextTick());
+            stopwatch.Stop();
+
+            profiler.Report(_output.WriteLine);
+            _output.WriteLine($"{memory.Ticks} ticks in {stopwatch.Elapsed.TotalMilliseconds:F0} ms, "
+                + $"{(double)memory.ReadCount / memory.Ticks:F1} reads/tick, {memory.Misses} reads off the recording");
+        }
+        finally
+        {
+            Directory.Delete(stateDir, recursive: true);
+        }
+    }
+}
@@ -0,0 +1,153 @@
+using System.Diagnostics;
+using Newtonsoft.Json;
+using TRArchipelagoClient.GameInterface;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// SaveFileReader's one-read, changed-slots-only path against finding and
+/// decoding the latest slot with a Seek/Read per field, as it used to, on a
+/// synthetic savegame.dat. Every event saves over one slot, and both must
+/// find the same state. The time per event of each is written to the test
+/// output.
+/// </summary>
+public class SaveFileReaderTests : IDisposable
+{
+    private const int Events = 2000;
+
+    private readonly ITestOutputHelper _output;
+    private readonly string _path = Path.GetTempFileName();
+
+    public SaveFileReaderTests(ITestOutputHelper output)
+    {
+        _output = output;
+    }
+
+    public void Dispose() => File.Delete(_path);
+
+    [Fact]
+    public void MatchesPerFieldReads()
+    {
+        var random = new Random(1);
+        byte[] file = new byte[TR1RMemoryMap.SaveFileSize];
+        random.NextBytes(file);
+        int saveNumber = 0;
+
+        void Save(int slot)
+        {
+            int slotBase = TR1RMemoryMap.SaveFileBaseOffset + slot * TR1RMemoryMap.SaveSlotSize;
+            random.NextBytes(file.AsSpan(slotBase, TR1RMemoryMap.SaveSlotSize));
+            file[slotBase + TR1RMemoryMap.Save_SlotStatus] = 1;
+            BitConverter.TryWriteBytes(file.AsSpan(slotBase + TR1RMemoryMap.Save_Number), ++saveNumber);
+            file[slotBase + TR1RMemoryMap.Save_LevelIndex] = (byte)random.Next(1, 20);
+        }
+
+        for (int slot = 0; slot < TR1RMemoryMap.MaxSaveSlots; slot++)
+        {
+            if (random.Next(4) > 0)
+                Save(slot);
+            else
+                file[TR1RMemoryMap.SaveFileBaseOffset + slot * TR1RMemoryMap.SaveSlotSize + TR1RMemoryMap.Save_SlotStatus] = 0;
+        }
+        File.WriteAllBytes(_path, file);
+
+        var reader = new SaveFileReader(_path);
+        reader.ReadLatestSlot();
+        var seekStopwatch = new Stopwatch();
+        var bulkStopwatch = new Stopwatch();
+        int changedSlots = 0;
+
+        for (int i = 0; i < Events; i++)
+        {
+            // The game saves over one TR1 slot, or (every fourth event) somewhere in the TR2/TR3 part of the file
+            int offset, length;
+            bool tr1 = i % 4 != 3;
+            if (tr1)
+            {
+                int slot = random.Next(TR1RMemoryMap.MaxSaveSlots);
+                Save(slot);
+                (offset, length) = (TR1RMemoryMap.SaveFileBaseOffset + slot * TR1RMemoryMap.SaveSlotSize, TR1RMemoryMap.SaveSlotSize);
+            }
+            else
+            {
+                length = TR1RMemoryMap.SaveSlotSize;
+                offset = random.Next(TR1RMemoryMap.SaveFileMaxOffset, TR1RMemoryMap.SaveFileSize - length);
+                random.NextBytes(file.AsSpan(offset, length));
+            }
+            using (var handle = File.OpenHandle(_path, FileMode.Open, FileAccess.Write))
+                RandomAccess.Write(handle, file.AsSpan(offset, length), offset);
+
+            seekStopwatch.Start();
+            var expected = ReadLatestSlotBySeeks(_path);
+            seekStopwatch.Stop();
+
+            bulkStopwatch.Start();
+            var actual = reader.ReadLatestSlot(out int changed);
+            bulkStopwatch.Stop();
+            changedSlots += changed;
+
+            Assert.Equal(tr1 ? 1 : 0, changed);
+            Assert.Equal(reader.ChangedSlots.Count, changed);
+            Assert.True(JsonConvert.SerializeObject(expected) == JsonConvert.SerializeObject(actual), $"Event {i}: latest slot differs");
+        }
+
+        _output.WriteLine($"{Events} save events:");
+        _output.WriteLine($"  Seek/Read per field: {seekStopwatch.Elapsed.TotalMilliseconds * 1000 / Events,7:F1} us/event");
+        _output.WriteLine($"  one read, changed:   {bulkStopwatch.Elapsed.TotalMilliseconds * 1000 / Events,7:F1} us/event, "
+            + $"{(double)changedSlots / Events:F2} slots decoded/event");
+    }
+
+    private static SaveSlotState? ReadLatestSlotBySeeks(string path)
+    {
+        using var fs = new FileStream(path, FileMode.Open, FileAccess.Read, FileShare.ReadWrite);
+        using var reader = new BinaryReader(fs);
+
+        int latestBase = -1, latestIndex = -1, highestSaveNum = -1;
+        for (int i = 0; i < TR1RMemoryMap.MaxSaveSlots; i++)
+        {
+            int slotBase = TR1RMemoryMap.SaveFileBaseOffset + i * TR1RMemoryMap.SaveSlotSize;
+            fs.Seek(slotBase + TR1RMemoryMap.Save_SlotStatus, SeekOrigin.Begin);
+            if (reader.ReadByte() != 1) continue;
+
+            fs.Seek(slotBase + TR1RMemoryMap.Save_Number, SeekOrigin.Begin);
+            int saveNum = reader.ReadInt32();
+            if (saveNum > highestSaveNum)
+                (highestSaveNum, latestBase, latestIndex) = (saveNum, slotBase, i);
+        }
+        if (latestBase < 0)
+            return null;
+
+        BinaryReader At(int offset)
+        {
+            fs.Seek(latestBase + offset, SeekOrigin.Begin);
+            return reader;
+        }
+
+        byte levelIndex = At(TR1RMemoryMap.Save_LevelIndex).ReadByte();
+        int healthOffset = TR1RMemoryMap.GetSaveHealthOffset(levelIndex);
+        return new SaveSlotState
+        {
+            SlotIndex = latestIndex,
+            SaveNumber = At(TR1RMemoryMap.Save_Number).ReadInt32(),
+            GameMode = At(TR1RMemoryMap.Save_GameMode).ReadByte(),
+            LevelIndex = levelIndex,
+            Health = healthOffset > 0 ? At(healthOffset).ReadUInt16() : (ushort)0,
+            SecretsFound = At(TR1RMemoryMap.Save_SecretsFound).ReadUInt16(),
+            Pickups = At(TR1RMemoryMap.Save_Pickups).ReadByte(),
+            SmallMedipacks = At(TR1RMemoryMap.Save_SmallMedipacks).ReadByte(),
+            LargeMedipacks = At(TR1RMemoryMap.Save_LargeMedipacks).ReadByte(),
+            MagnumAmmo = At(TR1RMemoryMap.Save_MagnumAmmo).ReadUInt16(),
+            UziAmmo = At(TR1RMemoryMap.Save_UziAmmo).ReadUInt16(),
+            ShotgunAmmo = At(TR1RMemoryMap.Save_ShotgunAmmo).ReadUInt16(),
+            WeaponsConfig = At(TR1RMemoryMap.Save_WeaponsConfig).ReadByte(),
+            Kills = At(TR1RMemoryMap.Save_Kills).ReadInt32(),
+            TimeTaken = At(TR1RMemoryMap.Save_TimeTaken).ReadInt32(),
+            AmmoUsed = At(TR1RMemoryMap.Save_AmmoUsed).ReadInt32(),
+            Hits = At(TR1RMemoryMap.Save_Hits).ReadInt32(),
+            Distance = At(TR1RMemoryMap.Save_Distance).ReadUInt32(),
+            MedipacksUsed = At(TR1RMemoryMap.Save_MedipacksUsed).ReadByte(),
+        };
+    }
+}
@@ -0,0 +1,126 @@
+using System.Diagnostics;
+using Newtonsoft.Json;
+using TRArchipelagoClient.Core;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// SaveStateStore's journal against the old store, one indented JSON file
+/// rewritten on every save. A long synthetic run of saves goes through both,
+/// reloading the store now and then, and every snapshot must match. The time
+/// Persist takes against the full rewrite is written to the test output.
+/// </summary>
+public class SaveStateStoreTests : IDisposable
+{
+    private const int Saves = 500;
+
+    private readonly ITestOutputHelper _output;
+    private readonly string _dir = Directory.CreateTempSubdirectory("tr1r_state_").FullName;
+
+    public SaveStateStoreTests(ITestOutputHelper output)
+    {
+        _output = output;
+    }
+
+    public void Dispose() => Directory.Delete(_dir, true);
+
+    private static string Canonical(SaveSnapshot? snapshot) => snapshot == null ? "none" : JsonConvert.SerializeObject(new
+    {
+        snapshot.LevelId,
+        snapshot.MapperIndex,
+        snapshot.ItemsReceivedIndex,
+        snapshot.ReceivedRingItems,
+        ReceivedKeyItems = snapshot.ReceivedKeyItems.OrderBy(kv => kv.Key),
+        UsedKeyItems = snapshot.UsedKeyItems.OrderBy(kv => kv.Key),
+        CheckedEntityLocations = snapshot.CheckedEntityLocations.Order(),
+        CheckedSecretLocations = snapshot.CheckedSecretLocations.Order(),
+    });
+
+    [Fact]
+    public void JournalMatchesFullRewrites()
+    {
+        var random = new Random(1);
+        var store = new SaveStateStore("verify", "seed", _dir);
+        var reference = new SaveStateFile { Seed = "seed" };
+        string referencePath = Path.Combine(_dir, "reference.json");
+        var live = new SaveSnapshot();
+        long storeTicks = 0, referenceTicks = 0;
+
+        void CheckAll(int lastSave)
+        {
+            for (int saveNumber = 0; saveNumber <= lastSave + 1; saveNumber++)
+            {
+                Assert.Equal(reference.Snapshots.ContainsKey(saveNumber), store.HasSnapshot(saveNumber));
+                string expected = Canonical(reference.Snapshots.GetValueOrDefault(saveNumber));
+                string actual = Canonical(store.GetSnapshot(saveNumber));
+                Assert.True(expected == actual, $"Save #{saveNumber} differs:\n  expected {expected}\n  got      {actual}");
+            }
+        }
+
+        for (int saveNumber = 1; saveNumber <= Saves; saveNumber++)
+        {
+            // Play on: items arrive, keys get used, locations get checked
+            for (int i = random.Next(4); i > 0; i--)
+                live.ReceivedRingItems.Add(770_000 + random.Next(40));
+            if (random.Next(4) == 0)
+            {
+                int mapperIdx = random.Next(15);
+                if (!live.ReceivedKeyItems.TryGetValue(mapperIdx, out var keys))
+                    live.ReceivedKeyItems[mapperIdx] = keys = new List<long>();
+                keys.Add(770_100 + random.Next(20));
+            }
+            if (random.Next(6) == 0)
+            {
+                long key = 770_100 + random.Next(20);
+                if (random.Next(3) == 0)
+                    live.UsedKeyItems.Remove(key);
+                else
+                    live.UsedKeyItems[key] = live.UsedKeyItems.GetValueOrDefault(key) + 1;
+            }
+            for (int i = random.Next(3); i > 0; i--)
+                live.CheckedEntityLocations.Add(770_000 + random.Next(1500));
+            if (random.Next(10) == 0)
+                live.CheckedSecretLocations.Add(771_500 + random.Next(60));
+            if (random.Next(8) == 0)
+                live.LevelId = random.Next(1, 16);
+            live.MapperIndex = live.LevelId - 1;
+            live.ItemsReceivedIndex = live.ReceivedRingItems.Count + live.ReceivedKeyItems.Values.Sum(keys => keys.Count);
+
+            store.RecordSave(saveNumber, live.Clone());
+            reference.Snapshots[saveNumber] = live.Clone();
+
+            // Pickups are added to the active snapshot in place, sometimes after loading an older save
+            if (random.Next(3) == 0)
+            {
+                int active = random.Next(4) == 0 ? random.Next(1, saveNumber + 1) : saveNumber;
+                long location = 770_000 + random.Next(1500);
+                store.GetSnapshot(active)!.CheckedEntityLocations.Add(location);
+                reference.Snapshots[active].CheckedEntityLocations.Add(location);
+            }
+
+            long start = Stopwatch.GetTimestamp();
+            store.Persist();
+            storeTicks += Stopwatch.GetTimestamp() - start;
+
+            start = Stopwatch.GetTimestamp();
+            File.WriteAllText(referencePath, JsonConvert.SerializeObject(reference, Formatting.Indented));
+            referenceTicks += Stopwatch.GetTimestamp() - start;
+
+            if (saveNumber % 75 == 0)
+            {
+                store = new SaveStateStore("verify", "seed", _dir);
+                CheckAll(saveNumber);
+            }
+        }
+
+        store = new SaveStateStore("verify", "seed", _dir);
+        CheckAll(Saves);
+
+        long storeBytes = Directory.GetFiles(_dir, "tr1r_ap_state_verify.*").Sum(path => new FileInfo(path).Length);
+        double ticksPerMs = Stopwatch.Frequency / 1000.0;
+        _output.WriteLine($"{Saves} saves: Persist {storeTicks / ticksPerMs / Saves:F3} ms/save, {storeBytes / 1024} KB on disk; "
+            + $"full JSON rewrite {referenceTicks / ticksPerMs / Saves:F3} ms/save, {new FileInfo(referencePath).Length / 1024} KB");
+    }
+}
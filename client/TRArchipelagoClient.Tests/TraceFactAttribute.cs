@@ -0,0 +1,18 @@
+using Xunit;
+
+namespace TRArchipelagoClient.Tests;
+
+/// <summary>
+/// A test that replays a memory trace recorded with the client's --record:
+/// skipped unless TR1R_TRACE points at the trace file.
+/// </summary>
+public sealed class TraceFactAttribute : FactAttribute
+{
+    public static string? TracePath => Environment.GetEnvironmentVariable("TR1R_TRACE");
+
+    public TraceFactAttribute()
+    {
+        if (string.IsNullOrEmpty(TracePath))
+            Skip = "set TR1R_TRACE to a trace recorded with --record";
+    }
+}
@@ -156,6 +156,24 @@ public class APSession
         return _session?.Items.GetItemName(itemId) ?? $"Unknown Item ({itemId})";
     }
 
+    /// <summary>
+    /// Resolves the item placed at one of our locations, and who receives it,
+    /// from the slot's placement manifest. No server round trip.
+    /// </summary>
+    public bool TryDescribePlacement(long locationId, out string itemName, out string playerName)
+    {
+        if (SlotData?.Placements?.TryGet(locationId, out var placement) != true)
+        {
+            itemName = playerName = "";
+            return false;
+        }
+
+        string? game = _session?.Players.GetPlayerInfo(placement.Player)?.Game;
+        itemName = _session?.Items.GetItemName(placement.ItemId, game) ?? $"Unknown Item ({placement.ItemId})";
+        playerName = GetPlayerName(placement.Player);
+        return true;
+    }
+
     public string GetPlayerName(int slot)
     {
         return _session?.Players.GetPlayerName(slot) ?? $"Player {slot}";
@@ -0,0 +1,51 @@
+namespace TRArchipelagoClient.Core;
+
+/// <summary>
+/// The order this slot's levels are played in (slot data level_sequence).
+///
+/// The game always plays its level files in the vanilla order, so a shuffled
+/// order is applied by putting each level's files in the place of the vanilla
+/// level at its position (BackupManager.PlaceLevels). The game's level IDs
+/// then count positions, and LevelAt turns a position back into the level
+/// whose locations, key items and completion it holds. Positions and levels
+/// are both LocationMapper indices (0-based, 0 = Caves).
+/// </summary>
+public sealed class LevelSequence
+{
+    private readonly int[] _levels; // position -> level
+
+    public static LevelSequence Vanilla { get; } = new(Enumerable.Range(0, LocationMapper.LevelCount).ToArray());
+
+    private LevelSequence(int[] levels)
+    {
+        _levels = levels;
+    }
+
+    public int Count => _levels.Length;
+
+    public bool IsVanilla => _levels.Select((level, position) => level == position).All(same => same);
+
+    /// <summary>
+    /// The sequence from slot data: level files in the order played. An empty
+    /// list (slot data from before the option existed) is the vanilla order.
+    /// Anything other than an order of all the levels throws
+    /// InvalidDataException, since the client and the server would disagree
+    /// about every location.
+    /// </summary>
+    public static LevelSequence FromFiles(IReadOnlyList<string>? files)
+    {
+        if (files == null || files.Count == 0)
+            return Vanilla;
+
+        int[] levels = files.Select(LocationMapper.GetLevelIndex).ToArray();
+        if (levels.Length != LocationMapper.LevelCount || levels.Contains(-1) || levels.Distinct().Count() != levels.Length)
+            throw new InvalidDataException($"level_sequence is not an order of the {LocationMapper.LevelCount} levels: {string.Join(", ", files)}");
+        return new LevelSequence(levels);
+    }
+
+    /// <summary>Level played at a position, or -1 for positions outside the sequence.</summary>
+    public int LevelAt(int position) => position >= 0 && position < _levels.Length ? _levels[position] : -1;
+
+    /// <summary>Position a level is played at, or -1.</summary>
+    public int PositionOf(int level) => Array.IndexOf(_levels, level);
+}
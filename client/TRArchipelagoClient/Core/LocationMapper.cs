@@ -5,14 +5,14 @@ namespace TRArchipelagoClient.Core;
 ///
 /// ID Schema:
 ///   Pickup locations:    780000 + level_index * 1000 + entity_index
-///   Secret locations:    790000 + level_index * 10 + secret_index
 ///   Level completion:    795000 + level_index
+///   Secret locations:    796000 + level_index * 10 + secret_index
 /// </summary>
 public static class LocationMapper
 {
     private const int PickupBaseId = 780_000;
-    private const int SecretBaseId = 790_000;
     private const int LevelCompleteBaseId = 795_000;
+    private const int SecretBaseId = 796_000;
 
     private static readonly string[] LevelFiles =
     {
@@ -33,6 +33,9 @@ public static class LocationMapper
         "LEVEL10C.PHD", // 14 Pyramid
     };
 
+    /// <summary>Number of TR1 levels (excluding Home and the Unfinished Business levels).</summary>
+    public static int LevelCount => LevelFiles.Length;
+
     public enum LocationType
     {
         Pickup,
@@ -52,11 +55,11 @@ public static class LocationMapper
 
     public static LocationType GetLocationType(long locationId)
     {
-        if (locationId >= LevelCompleteBaseId)
-            return LocationType.LevelComplete;
-        if (locationId >= SecretBaseId)
+        if (locationId >= SecretBaseId && locationId < SecretBaseId + LevelFiles.Length * 10)
             return LocationType.Secret;
-        if (locationId >= PickupBaseId)
+        if (locationId >= LevelCompleteBaseId && locationId < LevelCompleteBaseId + LevelFiles.Length)
+            return LocationType.LevelComplete;
+        if (locationId >= PickupBaseId && locationId < PickupBaseId + LevelFiles.Length * 1000)
             return LocationType.Pickup;
         return LocationType.Unknown;
     }
@@ -0,0 +1,102 @@
+using System.IO.Compression;
+using Newtonsoft.Json.Linq;
+
+namespace TRArchipelagoClient.Core;
+
+/// <summary>
+/// A single placement from the manifest: what sits at one of our locations.
+/// </summary>
+public readonly record struct Placement(long LocationId, long ItemId, int Player, int Classification);
+
+/// <summary>
+/// Placement manifest sent in slot data ("placement_manifest").
+/// Lets the client name the item and receiving player for each of this slot's
+/// locations without scouting them on the server.
+///
+/// Encoding (version 1), must match apworld/tr1r/manifest.py:
+///   base64(zlib(varint stream)), three unsigned LEB128 varints per placement,
+///   sorted by location ID:
+///     location ID delta, zigzag item ID delta, player &lt;&lt; 5 | classification
+/// </summary>
+public class PlacementManifest
+{
+    public const int Version = 1;
+    private const int ClassificationBits = 5;
+    private const int ClassificationMask = (1 << ClassificationBits) - 1;
+
+    private readonly Dictionary<long, Placement> _byLocation;
+
+    private PlacementManifest(Dictionary<long, Placement> byLocation)
+    {
+        _byLocation = byLocation;
+    }
+
+    public int Count => _byLocation.Count;
+
+    public bool TryGet(long locationId, out Placement placement)
+        => _byLocation.TryGetValue(locationId, out placement);
+
+    /// <summary>
+    /// Decodes the manifest from slot data. Returns null if it is missing,
+    /// from an unknown version, or malformed.
+    /// </summary>
+    public static PlacementManifest? FromSlotData(object? value)
+    {
+        if (value is not JObject obj)
+            return null;
+
+        try
+        {
+            if (obj.Value<int>("version") != Version)
+                return null;
+
+            int count = obj.Value<int>("count");
+            byte[] stream = Decompress(Convert.FromBase64String(obj.Value<string>("data") ?? ""));
+
+            var byLocation = new Dictionary<long, Placement>(count);
+            int offset = 0;
+            long locationId = 0, itemId = 0;
+            for (int i = 0; i < count; i++)
+            {
+                locationId += (long)ReadVarint(stream, ref offset);
+                ulong zigzag = ReadVarint(stream, ref offset);
+                itemId += (long)(zigzag >> 1) ^ -(long)(zigzag & 1);
+                ulong packed = ReadVarint(stream, ref offset);
+
+                byLocation[locationId] = new Placement(
+                    locationId, itemId,
+                    (int)(packed >> ClassificationBits),
+                    (int)(packed & ClassificationMask));
+            }
+
+            return new PlacementManifest(byLocation);
+        }
+        catch (Exception ex) when (ex is FormatException or InvalidDataException or IndexOutOfRangeException)
+        {
+            return null;
+        }
+    }
+
+    private static byte[] Decompress(byte[] data)
+    {
+        using var input = new MemoryStream(data);
+        using var zlib = new ZLibStream(input, CompressionMode.Decompress);
+        using var output = new MemoryStream();
+        zlib.CopyTo(output);
+        return output.ToArray();
+    }
+
+    private static ulong ReadVarint(byte[] data, ref int offset)
+    {
+        ulong value = 0;
+        int shift = 0;
+        while (true)
+        {
+            byte b = data[offset++];
+            value |= (ulong)(b & 0x7F) << shift;
+            if (b < 0x80)
+                return value;
+            shift += 7;
+        }
+    }
+}
@@ -1,86 +1,269 @@
+using System.Text;
 using Newtonsoft.Json;
 using TRArchipelagoClient.UI;
 
 namespace TRArchipelagoClient.Core;
 
 /// <summary>
-/// Tracks AP state per save number in a local JSON file.
+/// Tracks AP state per save number in local files.
 /// When the player saves, a snapshot of the current AP state is recorded.
 /// When the player loads, the snapshot is used to reconcile without false pickups.
+///
+/// The state lives in a checkpoint (tr1r_ap_state_{slot}.json, every snapshot
+/// in full) and a journal next to it (.journal, one JSON line per persisted
+/// snapshot, see SnapshotDelta). Persist only appends the snapshots that
+/// changed since the last Persist, as deltas; every CompactEvery entries the
+/// journal is folded into a new checkpoint. A snapshot changed in place is
+/// persisted if it was recorded or fetched with GetSnapshot since the last
+/// Persist. Checkpoints are written to a temporary file and renamed over the
+/// old one, and carry a generation that the journal's header line must
+/// match, so a crash at any point leaves a state that loads. Snapshots are
+/// rebuilt from the journal when first asked for and kept for the session.
 /// </summary>
 public class SaveStateStore
 {
+    /// <summary>Journal entries after which Persist writes a new checkpoint instead.</summary>
+    public const int CompactEvery = 64;
+
+    private static readonly JsonSerializerSettings JournalSettings = new() { NullValueHandling = NullValueHandling.Ignore };
+
     private readonly string _filePath;
-    private SaveStateFile _data;
+    private readonly string _journalPath;
+    private readonly string _seed;
+
+    // Last checkpoint, and the journal entries since, in file order. Each entry's
+    // base resolved to an earlier entry (-1: the checkpoint's snapshot, if any).
+    private SaveStateFile _checkpoint;
+    private readonly List<SnapshotDelta> _journal = new();
+    private readonly List<int> _journalBases = new();
+    private readonly Dictionary<int, int> _latestEntry = new();
+    private bool _journalMatchesCheckpoint;
+    private int? _newestSave;
+
+    // Snapshots recorded or rebuilt this session, a copy of each as last
+    // persisted, and those recorded or handed out (so possibly changed in
+    // place, as the watcher does with new pickups) since the last Persist
+    private readonly Dictionary<int, SaveSnapshot> _snapshots = new();
+    private readonly Dictionary<int, SaveSnapshot> _persisted = new();
+    private readonly SortedSet<int> _dirty = new();
 
-    public SaveStateStore(string slotName, string seed)
+    public SaveStateStore(string slotName, string seed, string? directory = null)
     {
-        _filePath = Path.Combine(AppContext.BaseDirectory, $"tr1r_ap_state_{slotName}.json");
+        _filePath = Path.Combine(directory ?? AppContext.BaseDirectory, $"tr1r_ap_state_{slotName}.json");
+        _journalPath = Path.ChangeExtension(_filePath, ".journal");
+        _seed = seed;
 
         if (File.Exists(_filePath))
         {
             try
             {
                 string json = File.ReadAllText(_filePath);
-                _data = JsonConvert.DeserializeObject<SaveStateFile>(json) ?? new();
+                _checkpoint = JsonConvert.DeserializeObject<SaveStateFile>(json) ?? new();
 
-                if (_data.Seed != seed)
+                if (_checkpoint.Seed != seed)
                 {
-                    ConsoleUI.Warning($"[SAVE] Seed mismatch (file={_data.Seed}, server={seed}). Starting fresh.");
-                    _data = new SaveStateFile { Seed = seed };
+                    ConsoleUI.Warning($"[SAVE] Seed mismatch (file={_checkpoint.Seed}, server={seed}). Starting fresh.");
+                    _checkpoint = new SaveStateFile { Seed = seed };
                 }
                 else
                 {
-                    ConsoleUI.Info($"[SAVE] Loaded state file with {_data.Snapshots.Count} snapshots.");
+                    LoadJournal();
+                    ConsoleUI.Info($"[SAVE] Loaded state file with {AllSaves().Count()} snapshots ({_journal.Count} journal entries).");
                 }
             }
             catch (Exception ex)
             {
                 ConsoleUI.Warning($"[SAVE] Failed to load state file: {ex.Message}. Starting fresh.");
-                _data = new SaveStateFile { Seed = seed };
+                _checkpoint = new SaveStateFile { Seed = seed };
             }
         }
         else
         {
-            _data = new SaveStateFile { Seed = seed };
+            _checkpoint = new SaveStateFile { Seed = seed };
         }
     }
 
     public void RecordSave(int saveNumber, SaveSnapshot snapshot)
     {
-        _data.Snapshots[saveNumber] = snapshot;
+        _snapshots[saveNumber] = snapshot;
+        _dirty.Add(saveNumber);
     }
 
     public SaveSnapshot? GetSnapshot(int saveNumber)
     {
-        return _data.Snapshots.GetValueOrDefault(saveNumber);
+        if (_snapshots.TryGetValue(saveNumber, out var snapshot))
+        {
+            _dirty.Add(saveNumber);
+            return snapshot;
+        }
+
+        snapshot = Rebuild(saveNumber);
+        if (snapshot != null)
+        {
+            _snapshots[saveNumber] = snapshot;
+            _persisted[saveNumber] = snapshot.Clone();
+            _dirty.Add(saveNumber);
+        }
+        return snapshot;
     }
 
     public bool HasSnapshot(int saveNumber)
     {
-        return _data.Snapshots.ContainsKey(saveNumber);
+        return _snapshots.ContainsKey(saveNumber)
+            || _latestEntry.ContainsKey(saveNumber)
+            || _checkpoint.Snapshots.ContainsKey(saveNumber);
     }
 
     public void Persist()
     {
         try
         {
-            string json = JsonConvert.SerializeObject(_data, Formatting.Indented);
-            File.WriteAllText(_filePath, json);
+            if (!_journalMatchesCheckpoint || _journal.Count >= CompactEvery)
+            {
+                Compact();
+                return;
+            }
+
+            var lines = new StringBuilder();
+            foreach (int saveNumber in _dirty)
+            {
+                var snapshot = _snapshots[saveNumber];
+                // A snapshot persisted before is written against its old self,
+                // a new one against the newest save (it has most of its items)
+                int? baseSave = _persisted.ContainsKey(saveNumber) ? saveNumber : _newestSave;
+                SaveSnapshot? from = baseSave is int b ? _persisted.GetValueOrDefault(b) ?? Rebuild(b) : null;
+                var delta = SnapshotDelta.Between(saveNumber, baseSave, from, snapshot);
+                if (delta == null)
+                    continue;
+
+                AddEntry(delta);
+                _persisted[saveNumber] = snapshot.Clone();
+                lines.Append(JsonConvert.SerializeObject(delta, JournalSettings)).Append('\n');
+            }
+
+            if (lines.Length > 0)
+                File.AppendAllText(_journalPath, lines.ToString());
+            _dirty.Clear();
         }
         catch (Exception ex)
         {
+            // The journal no longer matches memory: the next Persist rewrites everything
+            _journalMatchesCheckpoint = false;
             ConsoleUI.Error($"[SAVE] Failed to persist state: {ex.Message}");
         }
     }
+
+    /// <summary>
+    /// Writes every snapshot to a new checkpoint and starts an empty journal for it.
+    /// </summary>
+    private void Compact()
+    {
+        var checkpoint = new SaveStateFile { Seed = _seed, Generation = _checkpoint.Generation + 1 };
+        foreach (int saveNumber in AllSaves())
+            checkpoint.Snapshots[saveNumber] = _snapshots.TryGetValue(saveNumber, out var snapshot) ? snapshot.Clone() : Rebuild(saveNumber)!;
+
+        WriteAtomically(_filePath, JsonConvert.SerializeObject(checkpoint));
+        WriteAtomically(_journalPath, JournalHeader(checkpoint) + "\n");
+
+        _checkpoint = checkpoint;
+        _journal.Clear();
+        _journalBases.Clear();
+        _latestEntry.Clear();
+        _journalMatchesCheckpoint = true;
+        _newestSave = checkpoint.Snapshots.Count > 0 ? checkpoint.Snapshots.Keys.Max() : null;
+
+        _persisted.Clear();
+        foreach (var (saveNumber, snapshot) in _snapshots)
+            _persisted[saveNumber] = snapshot.Clone();
+        _dirty.Clear();
+    }
+
+    /// <summary>
+    /// Reads the journal entries written since the checkpoint. A journal from
+    /// another checkpoint (left by a crash during Compact) is ignored, as is
+    /// a torn last line; either way the next Persist writes a fresh checkpoint.
+    /// </summary>
+    private void LoadJournal()
+    {
+        _newestSave = _checkpoint.Snapshots.Count > 0 ? _checkpoint.Snapshots.Keys.Max() : null;
+        if (!File.Exists(_journalPath))
+            return;
+
+        string[] lines = File.ReadAllLines(_journalPath);
+        if (lines.Length == 0 || lines[0] != JournalHeader(_checkpoint))
+            return;
+
+        _journalMatchesCheckpoint = true;
+        for (int i = 1; i < lines.Length; i++)
+        {
+            SnapshotDelta? delta;
+            try
+            {
+                delta = JsonConvert.DeserializeObject<SnapshotDelta>(lines[i]);
+            }
+            catch (JsonException)
+            {
+                delta = null;
+            }
+
+            if (delta == null)
+            {
+                ConsoleUI.Warning($"[SAVE] Ignoring unreadable journal entry {i} and anything after it.");
+                _journalMatchesCheckpoint = false;
+                return;
+            }
+            AddEntry(delta);
+        }
+    }
+
+    private void AddEntry(SnapshotDelta delta)
+    {
+        _journalBases.Add(delta.Base is int b ? _latestEntry.GetValueOrDefault(b, -1) : -1);
+        _latestEntry[delta.Save] = _journal.Count;
+        _journal.Add(delta);
+        _newestSave = Math.Max(_newestSave ?? delta.Save, delta.Save);
+    }
+
+    /// <summary>The save's snapshot as persisted, rebuilt from the checkpoint and journal, or null.</summary>
+    private SaveSnapshot? Rebuild(int saveNumber)
+    {
+        if (!_latestEntry.TryGetValue(saveNumber, out int entry))
+            return _checkpoint.Snapshots.GetValueOrDefault(saveNumber)?.Clone();
+
+        var chain = new Stack<int>();
+        for (; entry >= 0; entry = _journalBases[entry])
+            chain.Push(entry);
+
+        int? rootBase = _journal[chain.Peek()].Base;
+        SaveSnapshot? snapshot = rootBase is int b ? _checkpoint.Snapshots.GetValueOrDefault(b) : null;
+        while (chain.Count > 0)
+            snapshot = _journal[chain.Pop()].ApplyTo(snapshot);
+        return snapshot;
+    }
+
+    private IEnumerable<int> AllSaves() => _checkpoint.Snapshots.Keys.Union(_latestEntry.Keys).Union(_snapshots.Keys);
+
+    private static string JournalHeader(SaveStateFile checkpoint)
+        => JsonConvert.SerializeObject(new { checkpoint.Seed, checkpoint.Generation });
+
+    private static void WriteAtomically(string path, string contents)
+    {
+        string tempPath = path + ".tmp";
+        File.WriteAllText(tempPath, contents);
+        File.Move(tempPath, path, overwrite: true);
+    }
 }
 
 /// <summary>
-/// Root object persisted to JSON.
+/// Root object persisted to JSON (SaveStateStore's checkpoint).
 /// </summary>
 public class SaveStateFile
 {
     public string Seed { get; set; } = "";
+
+    /// <summary>Bumped by every checkpoint; the journal written after it repeats it.</summary>
+    public int Generation { get; set; }
+
     public Dictionary<int, SaveSnapshot> Snapshots { get; set; } = new();
 }
 
@@ -112,4 +295,16 @@ public class SaveSnapshot
 
     /// <summary>Index into the AP item stream at the time of save.</summary>
     public int ItemsReceivedIndex { get; set; }
+
+    public SaveSnapshot Clone() => new()
+    {
+        LevelId = LevelId,
+        MapperIndex = MapperIndex,
+        ReceivedRingItems = ReceivedRingItems.ToList(),
+        ReceivedKeyItems = ReceivedKeyItems.ToDictionary(kv => kv.Key, kv => kv.Value.ToList()),
+        UsedKeyItems = new Dictionary<long, int>(UsedKeyItems),
+        CheckedEntityLocations = new HashSet<long>(CheckedEntityLocations),
+        CheckedSecretLocations = new HashSet<long>(CheckedSecretLocations),
+        ItemsReceivedIndex = ItemsReceivedIndex,
+    };
 }
@@ -17,6 +17,9 @@ public class SlotData
     public int TotalSecrets { get; set; }
     public List<string> LevelSequence { get; set; } = new();
 
+    /// <summary>What was placed at each of this slot's locations (null if not sent).</summary>
+    public PlacementManifest? Placements { get; set; }
+
     public static SlotData FromDictionary(IReadOnlyDictionary<string, object> data)
     {
         var slotData = new SlotData
@@ -38,6 +41,8 @@ public class SlotData
             slotData.TotalSecrets = Convert.ToInt32(totalSecrets);
         if (data.TryGetValue("level_sequence", out var levelSeq) && levelSeq is JArray arr)
             slotData.LevelSequence = arr.ToObject<List<string>>() ?? new();
+        if (data.TryGetValue("placement_manifest", out var manifest))
+            slotData.Placements = PlacementManifest.FromSlotData(manifest);
 
         return slotData;
     }
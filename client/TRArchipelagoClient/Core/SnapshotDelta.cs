@@ -0,0 +1,137 @@
+namespace TRArchipelagoClient.Core;
+
+/// <summary>
+/// One entry of SaveStateStore's journal: a save's snapshot written as its
+/// differences from another snapshot (its base), normally the previous save's.
+/// Received ring items only ever grow between saves, so most entries are a
+/// few new item IDs and location checks. Unchanged fields are left null so
+/// they are not serialized.
+/// </summary>
+public class SnapshotDelta
+{
+    /// <summary>Save number this entry records.</summary>
+    public int Save { get; set; }
+
+    /// <summary>Save number whose snapshot (as of this point in the journal) this applies to; null for an empty one.</summary>
+    public int? Base { get; set; }
+
+    public int LevelId { get; set; }
+    public int MapperIndex { get; set; }
+    public int ItemsReceivedIndex { get; set; }
+
+    /// <summary>ReceivedRingItems is this many of the base's, followed by RingItemsAdded.</summary>
+    public int RingItemsKept { get; set; }
+    public List<long>? RingItemsAdded { get; set; }
+
+    /// <summary>Mapper indices whose received key item lists were replaced, and those removed.</summary>
+    public Dictionary<int, List<long>>? KeyItemsChanged { get; set; }
+    public List<int>? KeyItemsRemoved { get; set; }
+
+    public Dictionary<long, int>? UsedKeyItemsChanged { get; set; }
+    public List<long>? UsedKeyItemsRemoved { get; set; }
+
+    public List<long>? EntitiesAdded { get; set; }
+    public List<long>? EntitiesRemoved { get; set; }
+    public List<long>? SecretsAdded { get; set; }
+    public List<long>? SecretsRemoved { get; set; }
+
+    /// <summary>
+    /// The entry turning from (null: an empty snapshot) into to, or null if
+    /// from is an earlier version of the same save and to is no different.
+    /// </summary>
+    public static SnapshotDelta? Between(int save, int? baseSave, SaveSnapshot? from, SaveSnapshot to)
+    {
+        var fromRing = from?.ReceivedRingItems ?? new List<long>();
+        int kept = 0;
+        while (kept < fromRing.Count && kept < to.ReceivedRingItems.Count && fromRing[kept] == to.ReceivedRingItems[kept])
+            kept++;
+
+        var delta = new SnapshotDelta
+        {
+            Save = save,
+            Base = baseSave,
+            LevelId = to.LevelId,
+            MapperIndex = to.MapperIndex,
+            ItemsReceivedIndex = to.ItemsReceivedIndex,
+            RingItemsKept = kept,
+            RingItemsAdded = NullIfEmpty(to.ReceivedRingItems.Skip(kept).ToList()),
+        };
+
+        var fromKeys = from?.ReceivedKeyItems ?? new Dictionary<int, List<long>>();
+        delta.KeyItemsChanged = NullIfEmpty(to.ReceivedKeyItems
+            .Where(kv => !fromKeys.TryGetValue(kv.Key, out var items) || !items.SequenceEqual(kv.Value))
+            .ToDictionary(kv => kv.Key, kv => kv.Value.ToList()));
+        delta.KeyItemsRemoved = NullIfEmpty(fromKeys.Keys.Where(key => !to.ReceivedKeyItems.ContainsKey(key)).ToList());
+
+        var fromUsed = from?.UsedKeyItems ?? new Dictionary<long, int>();
+        delta.UsedKeyItemsChanged = NullIfEmpty(to.UsedKeyItems
+            .Where(kv => !fromUsed.TryGetValue(kv.Key, out int count) || count != kv.Value)
+            .ToDictionary(kv => kv.Key, kv => kv.Value));
+        delta.UsedKeyItemsRemoved = NullIfEmpty(fromUsed.Keys.Where(key => !to.UsedKeyItems.ContainsKey(key)).ToList());
+
+        var fromEntities = from?.CheckedEntityLocations ?? new HashSet<long>();
+        delta.EntitiesAdded = NullIfEmpty(to.CheckedEntityLocations.Except(fromEntities).ToList());
+        delta.EntitiesRemoved = NullIfEmpty(fromEntities.Except(to.CheckedEntityLocations).ToList());
+
+        var fromSecrets = from?.CheckedSecretLocations ?? new HashSet<long>();
+        delta.SecretsAdded = NullIfEmpty(to.CheckedSecretLocations.Except(fromSecrets).ToList());
+        delta.SecretsRemoved = NullIfEmpty(fromSecrets.Except(to.CheckedSecretLocations).ToList());
+
+        bool unchanged = from != null && baseSave == save
+            && from.LevelId == to.LevelId
+            && from.MapperIndex == to.MapperIndex
+            && from.ItemsReceivedIndex == to.ItemsReceivedIndex
+            && kept == fromRing.Count
+            && delta.RingItemsAdded == null
+            && delta.KeyItemsChanged == null && delta.KeyItemsRemoved == null
+            && delta.UsedKeyItemsChanged == null && delta.UsedKeyItemsRemoved == null
+            && delta.EntitiesAdded == null && delta.EntitiesRemoved == null
+            && delta.SecretsAdded == null && delta.SecretsRemoved == null;
+        return unchanged ? null : delta;
+    }
+
+    /// <summary>Builds this entry's snapshot on top of from (null: an empty snapshot), leaving from untouched.</summary>
+    public SaveSnapshot ApplyTo(SaveSnapshot? from)
+    {
+        var snapshot = new SaveSnapshot
+        {
+            LevelId = LevelId,
+            MapperIndex = MapperIndex,
+            ItemsReceivedIndex = ItemsReceivedIndex,
+            ReceivedRingItems = (from?.ReceivedRingItems ?? new List<long>()).Take(RingItemsKept).ToList(),
+            ReceivedKeyItems = from?.ReceivedKeyItems.ToDictionary(kv => kv.Key, kv => kv.Value.ToList()) ?? new(),
+            UsedKeyItems = from != null ? new Dictionary<long, int>(from.UsedKeyItems) : new(),
+            CheckedEntityLocations = from != null ? new HashSet<long>(from.CheckedEntityLocations) : new(),
+            CheckedSecretLocations = from != null ? new HashSet<long>(from.CheckedSecretLocations) : new(),
+        };
+
+        if (RingItemsAdded != null)
+            snapshot.ReceivedRingItems.AddRange(RingItemsAdded);
+
+        foreach (int key in KeyItemsRemoved ?? new List<int>())
+            snapshot.ReceivedKeyItems.Remove(key);
+        foreach (var (key, items) in KeyItemsChanged ?? new Dictionary<int, List<long>>())
+            snapshot.ReceivedKeyItems[key] = items.ToList();
+
+        foreach (long key in UsedKeyItemsRemoved ?? new List<long>())
+            snapshot.UsedKeyItems.Remove(key);
+        foreach (var (key, count) in UsedKeyItemsChanged ?? new Dictionary<long, int>())
+            snapshot.UsedKeyItems[key] = count;
+
+        if (EntitiesRemoved != null)
+            snapshot.CheckedEntityLocations.ExceptWith(EntitiesRemoved);
+        if (EntitiesAdded != null)
+            snapshot.CheckedEntityLocations.UnionWith(EntitiesAdded);
+        if (SecretsRemoved != null)
+            snapshot.CheckedSecretLocations.ExceptWith(SecretsRemoved);
+        if (SecretsAdded != null)
+            snapshot.CheckedSecretLocations.UnionWith(SecretsAdded);
+
+        return snapshot;
+    }
+
+    private static List<T>? NullIfEmpty<T>(List<T> list) => list.Count > 0 ? list : null;
+
+    private static Dictionary<TKey, TValue>? NullIfEmpty<TKey, TValue>(Dictionary<TKey, TValue> dictionary) where TKey : notnull
+        => dictionary.Count > 0 ? dictionary : null;
+}
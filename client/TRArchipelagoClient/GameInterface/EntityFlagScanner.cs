@@ -0,0 +1,165 @@
+using System.Buffers.Binary;
+
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// Watches the flags of a level's tracked entities (AP pickup locations) with
+/// a memory read per cluster of entities instead of one ReadInt16 per entity.
+///
+/// Tracked entities at most MergeDistance apart in the entities array share a
+/// read, which spans from the first one's Item_Flags to the last one's, into a
+/// buffer reused across polls. A level whose pickups are close together is
+/// read in one go; a long stretch of untracked entities splits the read
+/// instead, since copying it would cost more than the extra read
+/// (EntitySize is 0xE50 bytes per entity).
+///
+/// The flags are gathered into an array and compared with the previous poll's
+/// in one vectorized pass; only entities whose flags changed are reported.
+/// </summary>
+public class EntityFlagScanner
+{
+    /// <summary>Tracked entities whose indices differ by at most this share a read.</summary>
+    public const int MergeDistance = 4;
+
+    // One read: byte offset of its first Item_Flags in the entities array,
+    // length, and the tracked entities it covers (First..First+Count-1)
+    private readonly record struct ReadRange(int Start, int Size, int First, int Count);
+
+    private readonly ProcessMemory _memory;
+
+    // Tracked level (LocationMapper index) and its entity indices, ascending
+    private int _level = -1;
+    private int[] _entities = Array.Empty<int>();
+
+    // Reads per poll, and where each tracked entity's flags sit in its range
+    private ReadRange[] _ranges = Array.Empty<ReadRange>();
+    private int[] _flagOffsets = Array.Empty<int>();
+    private byte[] _buffer = Array.Empty<byte>();
+
+    // Flags at the last poll and at this one (swapped after every scan)
+    private short[] _previous = Array.Empty<short>();
+    private short[] _current = Array.Empty<short>();
+    private bool _hasBaseline;
+
+    private readonly List<int> _changed = new();
+
+    public EntityFlagScanner(ProcessMemory memory)
+    {
+        _memory = memory;
+    }
+
+    /// <summary>Number of entities being watched.</summary>
+    public int Count => _entities.Length;
+
+    /// <summary>Memory reads per poll.</summary>
+    public int ReadsPerPoll => _ranges.Length;
+
+    /// <summary>Bytes read per poll.</summary>
+    public int BytesPerPoll => _ranges.Sum(range => range.Size);
+
+    /// <summary>
+    /// Sets the entities to watch for a level. Does nothing if that level is
+    /// already tracked; otherwise the baseline is dropped.
+    /// </summary>
+    public void Track(int level, IEnumerable<int> entityIndices)
+    {
+        if (level == _level)
+            return;
+
+        _level = level;
+        _entities = entityIndices.Order().ToArray();
+        _hasBaseline = false;
+
+        var ranges = new List<ReadRange>();
+        _flagOffsets = new int[_entities.Length];
+        int first = 0;
+        for (int i = 0; i < _entities.Length; i++)
+        {
+            if (i > first && _entities[i] - _entities[i - 1] > MergeDistance)
+            {
+                ranges.Add(RangeOf(first, i));
+                first = i;
+            }
+            _flagOffsets[i] = (_entities[i] - _entities[first]) * TR1RMemoryMap.EntitySize;
+        }
+        if (_entities.Length > 0)
+            ranges.Add(RangeOf(first, _entities.Length));
+        _ranges = ranges.ToArray();
+
+        int largest = _ranges.Length > 0 ? _ranges.Max(range => range.Size) : 0;
+        if (_buffer.Length < largest)
+            _buffer = new byte[largest];
+        _previous = new short[_entities.Length];
+        _current = new short[_entities.Length];
+    }
+
+    /// <summary>Forgets the baseline; the next Snapshot or Scan takes a fresh one.</summary>
+    public void Reset()
+    {
+        _hasBaseline = false;
+    }
+
+    /// <summary>
+    /// Reads the current flags as the baseline for the next Scan.
+    /// Returns false if the entities array could not be read.
+    /// </summary>
+    public bool Snapshot(IntPtr entitiesBase)
+    {
+        _hasBaseline = ReadFlags(entitiesBase, _previous);
+        return _hasBaseline;
+    }
+
+    /// <summary>
+    /// Reads the current flags and returns the indices of the entities whose
+    /// flags changed since the last poll, ascending. Without a baseline this
+    /// read becomes the baseline and nothing is reported; a failed read reports
+    /// nothing. The returned list is reused by the next call.
+    /// </summary>
+    public IReadOnlyList<int> Scan(IntPtr entitiesBase)
+    {
+        _changed.Clear();
+
+        if (!_hasBaseline)
+        {
+            Snapshot(entitiesBase);
+            return _changed;
+        }
+
+        if (!ReadFlags(entitiesBase, _current))
+            return _changed;
+
+        // Nearly every poll changes nothing: SequenceEqual settles that in one vectorized pass
+        if (!_current.AsSpan().SequenceEqual(_previous))
+        {
+            for (int i = 0; i < _current.Length; i++)
+            {
+                if (_current[i] != _previous[i])
+                    _changed.Add(_entities[i]);
+            }
+        }
+
+        (_previous, _current) = (_current, _previous);
+        return _changed;
+    }
+
+    private ReadRange RangeOf(int first, int end)
+    {
+        int start = _entities[first] * TR1RMemoryMap.EntitySize + TR1RMemoryMap.Item_Flags;
+        int size = (_entities[end - 1] - _entities[first]) * TR1RMemoryMap.EntitySize + sizeof(short);
+        return new ReadRange(start, size, first, end - first);
+    }
+
+    private bool ReadFlags(IntPtr entitiesBase, short[] flags)
+    {
+        ReadOnlySpan<byte> buffer = _buffer;
+        foreach (var range in _ranges)
+        {
+            if (!_memory.ReadBytes(entitiesBase + range.Start, _buffer, range.Size))
+                return false;
+
+            for (int i = range.First; i < range.First + range.Count; i++)
+                flags[i] = BinaryPrimitives.ReadInt16LittleEndian(buffer[_flagOffsets[i]..]);
+        }
+        return true;
+    }
+}
@@ -0,0 +1,50 @@
+using Microsoft.Win32.SafeHandles;
+
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// ProcessMemory served from a file (a memory dump mapped at a base address)
+/// instead of a live process, for benchmarking poll code without the game.
+/// Each read is one positioned file read, i.e. one syscall, like a
+/// ReadProcessMemory call. Writes go to the file if it was opened writable
+/// and fail otherwise. The base address doubles as Tomb1Base, so a dump of
+/// tomb1.dll can stand in for the game's globals.
+/// </summary>
+public class FileBackedMemory : ProcessMemory
+{
+    private readonly SafeFileHandle _file;
+    private readonly long _baseAddress;
+    private readonly bool _writable;
+
+    public FileBackedMemory(string path, IntPtr baseAddress, bool writable = false)
+    {
+        _file = File.OpenHandle(path, FileMode.Open, writable ? FileAccess.ReadWrite : FileAccess.Read);
+        _baseAddress = (long)baseAddress;
+        _writable = writable;
+    }
+
+    public override IntPtr Tomb1Base => new(_baseAddress);
+
+    protected override bool ReadCore(IntPtr address, byte[] buffer, int size)
+    {
+        long offset = (long)address - _baseAddress;
+        if (offset < 0)
+            return false;
+        return RandomAccess.Read(_file, buffer.AsSpan(0, size), offset) == size;
+    }
+
+    protected override bool WriteCore(IntPtr address, byte[] data)
+    {
+        long offset = (long)address - _baseAddress;
+        if (!_writable || offset < 0)
+            return false;
+        RandomAccess.Write(_file, data, offset);
+        return true;
+    }
+
+    public override void Dispose()
+    {
+        _file.Dispose();
+        base.Dispose();
+    }
+}
@@ -28,6 +28,10 @@ public class GameStateWatcher : IDisposable
     private readonly InventoryScanner _scanner;
     private readonly SaveStateStore _stateStore;
     private readonly KeyItemMonitor _keyMonitor;
+    private readonly EntityFlagScanner _entityScanner;
+
+    // Which level is played at each position of the game's level chain
+    private readonly LevelSequence _levelSequence;
 
     // Cached base addresses
     private IntPtr _tomb1Base;
@@ -52,9 +56,6 @@ public class GameStateWatcher : IDisposable
     // Saved Lara pointer to detect heap shifts (real load vs inventory open)
     private IntPtr _laraPtrBeforeTransition;
 
-    // Entity tracking: entityIndex -> last known flags value
-    private readonly Dictionary<int, short> _entityFlags = new();
-
     // Items waiting for ring injection (deferred until Pistols pointer is found)
     private readonly Queue<(long ItemId, ItemMapper.ItemCategory Category)> _pendingItems = new();
 
@@ -73,11 +74,15 @@ public class GameStateWatcher : IDisposable
     // Completed tracking
     private readonly HashSet<int> _completedLevels = new();
 
+    /// <summary>Per-stage poll timings (replay test); null when not profiling.</summary>
+    public PollProfiler? Profiler { get; set; }
+
     public GameStateWatcher(
         APSession session,
         ProcessMemory memory,
         Dictionary<int, Dictionary<int, long>> levelEntityLocations,
-        SaveStateStore stateStore)
+        SaveStateStore stateStore,
+        LevelSequence? levelSequence = null)
     {
         _session = session;
         _memory = memory;
@@ -87,6 +92,25 @@ public class GameStateWatcher : IDisposable
         _levelEntityLocations = levelEntityLocations;
         _stateStore = stateStore;
         _keyMonitor = new KeyItemMonitor(memory);
+        _entityScanner = new EntityFlagScanner(memory);
+        _levelSequence = levelSequence ?? LevelSequence.Vanilla;
+    }
+
+    /// <summary>
+    /// The LocationMapper index of the level played at a runtime level ID.
+    /// The runtime ID is the position in the chain; LevelPatcher placed the
+    /// slot's level for that position in its files.
+    /// </summary>
+    private int LevelIndex(int levelId) =>
+        _levelSequence.LevelAt(TR1RMemoryMap.ToLocationMapperIndex(levelId));
+
+    /// <summary>The name of the level played at a runtime level ID.</summary>
+    private string LevelName(int levelId)
+    {
+        int levelIdx = LevelIndex(levelId);
+        return levelIdx >= 0
+            ? TR1RMemoryMap.LevelNames.GetValueOrDefault(levelIdx + 1, $"Level {levelId}")
+            : TR1RMemoryMap.LevelNames.GetValueOrDefault(levelId, $"Level {levelId}");
     }
 
     /// <summary>
@@ -138,12 +162,13 @@ public class GameStateWatcher : IDisposable
         {
             try
             {
-                PollGameState();
+                PollOnce();
             }
             catch (Exception ex)
             {
                 ConsoleUI.Error($"Poll error: {ex.Message}");
             }
+            _memory.MarkTick();
 
             await Task.Delay(PollIntervalMs, ct);
         }
@@ -151,6 +176,16 @@ public class GameStateWatcher : IDisposable
         ConsoleUI.Info("Game process ended.");
     }
 
+    /// <summary>
+    /// Polls the game state once (one iteration of RunAsync, without the
+    /// delay). Replays drive the watcher through this.
+    /// </summary>
+    public void PollOnce()
+    {
+        using (Profiler?.Time(PollProfiler.Poll))
+            PollGameState();
+    }
+
     private void PollGameState()
     {
         // Check if we're in-game (not menu/loading)
@@ -227,7 +262,7 @@ public class GameStateWatcher : IDisposable
                 // loads (different counter), but if the player reloads the exact
                 // same save (counter unchanged), only this block detects it.
                 _keyMonitor.Pause();
-                _entityFlags.Clear();
+                _entityScanner.Reset();
                 SnapshotEntityFlags(levelId);
                 _inventory.ResetSentinelRemovals();
 
@@ -257,40 +292,52 @@ public class GameStateWatcher : IDisposable
         // Detect save/load events via Save_Number change in WSB.
         // MUST be before CheckEntityPickups — after a reload, entity flags revert
         // to the saved state, so we need to re-snapshot before checking for changes.
-        int saveNumber = _memory.ReadInt32(
-            _memory.Tomb1Base + TR1RMemoryMap.WorldStateBackup + TR1RMemoryMap.WSB_SaveCounter);
-        if (_lastSaveNumber >= 0 && saveNumber != _lastSaveNumber)
+        using (Profiler?.Time("save/load"))
         {
-            HandleSaveNumberChange(saveNumber, levelId);
+            int saveNumber = _memory.ReadInt32(
+                _memory.Tomb1Base + TR1RMemoryMap.WorldStateBackup + TR1RMemoryMap.WSB_SaveCounter);
+            if (_lastSaveNumber >= 0 && saveNumber != _lastSaveNumber)
+            {
+                HandleSaveNumberChange(saveNumber, levelId);
+            }
+            _lastSaveNumber = saveNumber;
         }
-        _lastSaveNumber = saveNumber;
 
         // Check entity pickups (real-time!)
-        CheckEntityPickups(levelId);
+        using (Profiler?.Time("entity pickups"))
+            CheckEntityPickups(levelId);
 
         // Check secrets
-        CheckSecrets(levelId);
+        using (Profiler?.Time("secrets"))
+            CheckSecrets(levelId);
 
         // Check level completion flag
-        CheckLevelCompletion(levelId);
+        using (Profiler?.Time("level completion"))
+            CheckLevelCompletion(levelId);
 
         // Check health / death
-        CheckHealth();
+        using (Profiler?.Time("health"))
+            CheckHealth();
 
         // Detect key items consumed in doors/locks
-        CheckKeyItemUsage(levelId);
+        using (Profiler?.Time("key item usage"))
+            CheckKeyItemUsage(levelId);
 
         // Auto-find live inventory address
-        _scanner.Poll(_tomb1Base);
+        using (Profiler?.Time("inventory scan"))
+            _scanner.Poll(_tomb1Base);
 
         // Process received items from AP
-        ProcessReceivedItems(levelId);
+        using (Profiler?.Time("received items"))
+            ProcessReceivedItems(levelId);
 
         // Remove parasitic small medipacks from sentinel pickups
-        _inventory.ProcessSentinelRemovals();
+        using (Profiler?.Time("sentinel removal"))
+            _inventory.ProcessSentinelRemovals();
 
         // Ensure received key items are present in Keys Ring
-        _inventory.EnsureKeyItemsInRing(levelId);
+        using (Profiler?.Time("keys ring"))
+            _inventory.EnsureKeyItemsInRing(LevelIndex(levelId));
 
         // Once key items stabilize in the ring, re-snapshot the KeyItemMonitor
         // so it can detect future usage (key disappearing from ring = used in a door).
@@ -331,7 +378,7 @@ public class GameStateWatcher : IDisposable
     /// </summary>
     private void OnGameSaved(int saveNumber, int levelId)
     {
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+        int mapperIdx = LevelIndex(levelId);
 
         // Build checked location sets from AP session
         var checkedEntities = new HashSet<long>();
@@ -382,7 +429,7 @@ public class GameStateWatcher : IDisposable
         ConsoleUI.Info($"[SAVE] Save loaded (save #{saveNumber})");
 
         // Re-snapshot entity flags for the current game state (post-load)
-        _entityFlags.Clear();
+        _entityScanner.Reset();
         SnapshotEntityFlags(levelId);
 
         // Reset inventory pointers (heap shifts on any load)
@@ -414,7 +461,7 @@ public class GameStateWatcher : IDisposable
     /// </summary>
     private void ReconcileAfterLoad(SaveSnapshot snapshot, int levelId)
     {
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+        int mapperIdx = LevelIndex(levelId);
 
         // Set used key items so EnsureKeyItemsInRing skips them
         _inventory.SetUsedKeyItems(new Dictionary<long, int>(snapshot.UsedKeyItems));
@@ -440,7 +487,7 @@ public class GameStateWatcher : IDisposable
 
     private void OnLevelChanged(int previousLevelId, int newLevelId)
     {
-        string newName = TR1RMemoryMap.LevelNames.GetValueOrDefault(newLevelId, $"Level {newLevelId}");
+        string newName = LevelName(newLevelId);
 
         // Level completion is handled by CheckLevelCompletion (LevelCompleted flag),
         // NOT here — OnLevelChanged also fires on save loads.
@@ -461,7 +508,7 @@ public class GameStateWatcher : IDisposable
         _inventory.ResetSentinelRemovals();
 
         // Reset per-level state
-        _entityFlags.Clear();
+        _entityScanner.Reset();
         _lastSecretsFound = 0;
         _lastLevelCompleted = 0;
         _lastHealth = TR1RMemoryMap.MaxHealth;
@@ -488,7 +535,7 @@ public class GameStateWatcher : IDisposable
         DrainReceivedItemQueue(levelId);
 
         // Fresh snapshots from now-stable game state
-        _entityFlags.Clear();
+        _entityScanner.Reset();
         SnapshotEntityFlags(levelId);
 
         _lastSecretsFound = _memory.ReadUInt16(
@@ -548,9 +595,9 @@ public class GameStateWatcher : IDisposable
     /// </summary>
     private void SnapshotEntityFlags(int levelId)
     {
-        _entityFlags.Clear();
+        _entityScanner.Reset();
 
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+        int mapperIdx = LevelIndex(levelId);
         if (mapperIdx < 0 || !_levelEntityLocations.ContainsKey(mapperIdx))
             return;
 
@@ -559,22 +606,18 @@ public class GameStateWatcher : IDisposable
         if (_entitiesBase == IntPtr.Zero)
             return;
 
-        var entityLocations = _levelEntityLocations[mapperIdx];
-        foreach (int entityIndex in entityLocations.Keys)
-        {
-            IntPtr entityAddr = _entitiesBase + (entityIndex * TR1RMemoryMap.EntitySize);
-            short flags = _memory.ReadInt16(entityAddr + TR1RMemoryMap.Item_Flags);
-            _entityFlags[entityIndex] = flags;
-        }
+        _entityScanner.Track(mapperIdx, _levelEntityLocations[mapperIdx].Keys);
+        _entityScanner.Snapshot(_entitiesBase);
     }
 
     /// <summary>
-    /// Checks each tracked entity for flag changes (pickup detection).
+    /// Checks the tracked entities for flag changes (pickup detection), reading
+    /// them all in one go through the EntityFlagScanner.
     /// Uses the active save snapshot to distinguish real pickups from reload artifacts.
     /// </summary>
     private void CheckEntityPickups(int levelId)
     {
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+        int mapperIdx = LevelIndex(levelId);
         if (mapperIdx < 0 || !_levelEntityLocations.ContainsKey(mapperIdx))
             return;
 
@@ -584,47 +627,42 @@ public class GameStateWatcher : IDisposable
             if (_entitiesBase == IntPtr.Zero) return;
         }
 
+        var entityLocations = _levelEntityLocations[mapperIdx];
+        _entityScanner.Track(mapperIdx, entityLocations.Keys);
+
+        // Without a baseline (first poll of the level) this only records the flags
+        IReadOnlyList<int> changed = _entityScanner.Scan(_entitiesBase);
+        if (changed.Count == 0)
+            return;
+
         // Get the active snapshot for save-aware checking
         var activeSnapshot = _stateStore.GetSnapshot(_activeSaveNumber);
 
-        var entityLocations = _levelEntityLocations[mapperIdx];
-        foreach (var (entityIndex, locationId) in entityLocations)
+        foreach (int entityIndex in changed)
         {
-            IntPtr entityAddr = _entitiesBase + (entityIndex * TR1RMemoryMap.EntitySize);
-            short currentFlags = _memory.ReadInt16(entityAddr + TR1RMemoryMap.Item_Flags);
+            long locationId = entityLocations[entityIndex];
 
-            if (_entityFlags.TryGetValue(entityIndex, out short previousFlags))
-            {
-                if (currentFlags != previousFlags)
-                {
-                    _entityFlags[entityIndex] = currentFlags;
-
-                    // If this location was already checked in the active snapshot,
-                    // this is a reload artifact — skip both the AP send and sentinel removal.
-                    if (activeSnapshot != null && activeSnapshot.CheckedEntityLocations.Contains(locationId))
-                        continue;
-
-                    bool isNew = _session.SendLocationCheck(locationId);
-                    if (isNew)
-                    {
-                        string locName = _session.GetLocationName(locationId);
-                        ConsoleUI.ItemSent(locName, "Archipelago");
-                    }
-
-                    // Update the active snapshot with the new check
-                    activeSnapshot?.CheckedEntityLocations.Add(locationId);
-
-                    // Queue sentinel removal for real pickups.
-                    // Suppressed during level completion (end-of-level flag cleanup).
-                    if (_lastLevelCompleted != 1)
-                        _inventory.QueueSentinelRemoval();
-                }
-            }
-            else
+            // If this location was already checked in the active snapshot,
+            // this is a reload artifact — skip both the AP send and sentinel removal.
+            if (activeSnapshot != null && activeSnapshot.CheckedEntityLocations.Contains(locationId))
+                continue;
+
+            bool isNew = _session.SendLocationCheck(locationId);
+            if (isNew)
             {
-                // First time seeing this entity
-                _entityFlags[entityIndex] = currentFlags;
+                if (_session.TryDescribePlacement(locationId, out string itemName, out string playerName))
+                    ConsoleUI.ItemSent(itemName, playerName);
+                else
+                    ConsoleUI.ItemSent(_session.GetLocationName(locationId), "Archipelago");
             }
+
+            // Update the active snapshot with the new check
+            activeSnapshot?.CheckedEntityLocations.Add(locationId);
+
+            // Queue sentinel removal for real pickups.
+            // Suppressed during level completion (end-of-level flag cleanup).
+            if (_lastLevelCompleted != 1)
+                _inventory.QueueSentinelRemoval();
         }
     }
 
@@ -633,7 +671,7 @@ public class GameStateWatcher : IDisposable
     /// </summary>
     private void CheckSecrets(int levelId)
     {
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+        int mapperIdx = LevelIndex(levelId);
         if (mapperIdx < 0) return;
 
         ReadSecretsState();
@@ -648,7 +686,7 @@ public class GameStateWatcher : IDisposable
         if (secrets != _lastSecretsFound)
         {
             ushort newBits = (ushort)(secrets & ~_lastSecretsFound);
-            int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(_lastLevelId);
+            int mapperIdx = LevelIndex(_lastLevelId);
 
             for (int s = 0; s < 16; s++)
             {
@@ -657,7 +695,7 @@ public class GameStateWatcher : IDisposable
                     long secretLocId = LocationMapper.GetSecretLocationId(mapperIdx, s);
                     _session.SendLocationCheck(secretLocId);
 
-                    string levelName = TR1RMemoryMap.LevelNames.GetValueOrDefault(_lastLevelId, "Unknown");
+                    string levelName = LevelName(_lastLevelId);
                     ConsoleUI.SecretFound(s + 1, levelName);
                 }
             }
@@ -675,14 +713,14 @@ public class GameStateWatcher : IDisposable
 
         if (completed == 1 && _lastLevelCompleted != 1)
         {
-            int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+            int mapperIdx = LevelIndex(levelId);
             if (mapperIdx >= 0 && !_completedLevels.Contains(levelId))
             {
                 long locId = LocationMapper.GetLevelCompleteId(mapperIdx);
                 _session.SendLocationCheck(locId);
                 _completedLevels.Add(levelId);
 
-                string levelName = TR1RMemoryMap.LevelNames.GetValueOrDefault(levelId, $"Level {levelId}");
+                string levelName = LevelName(levelId);
                 ConsoleUI.Success($"Completed: {levelName}");
 
                 CheckVictory();
@@ -719,7 +757,7 @@ public class GameStateWatcher : IDisposable
     /// </summary>
     private void CheckKeyItemUsage(int levelId)
     {
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(levelId);
+        int mapperIdx = LevelIndex(levelId);
         if (mapperIdx < 0) return;
 
         var usedKeys = _keyMonitor.DetectUsedKeys();
@@ -762,7 +800,7 @@ public class GameStateWatcher : IDisposable
                 // Store key items so EnsureKeyItemsInRing can inject them later.
                 // GiveKeyItem only needs memory for immediate injection (same level);
                 // cross-level items are just stored in _receivedKeyItems.
-                _inventory.GiveKeyItem(item.ItemId, levelId);
+                _inventory.GiveKeyItem(item.ItemId, LevelIndex(levelId));
             }
             else if (category != ItemMapper.ItemCategory.Trap)
             {
@@ -802,7 +840,7 @@ public class GameStateWatcher : IDisposable
             }
             if (category == ItemMapper.ItemCategory.KeyItem)
             {
-                _inventory.GiveKeyItem(item.ItemId, levelId);
+                _inventory.GiveKeyItem(item.ItemId, LevelIndex(levelId));
                 continue;
             }
 
@@ -816,6 +854,14 @@ public class GameStateWatcher : IDisposable
         if (_levelSettleTicks > 0) return; // wait for game to finish initializing
         if (!_inventory.IsInventoryReady()) return;
 
+        // A backlog (reconnect, reload or new game replay) goes in as one batch
+        if (_pendingItems.Count > 1)
+        {
+            if (_inventory.GiveRingItems(_pendingItems))
+                _pendingItems.Clear();
+            return;
+        }
+
         while (_pendingItems.Count > 0)
         {
             var (itemId, category) = _pendingItems.Dequeue();
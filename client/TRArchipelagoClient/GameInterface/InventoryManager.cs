@@ -82,14 +82,7 @@ public class InventoryManager
         var type = ItemMapper.GetTR1Type(apItemId);
         if (type == null) return;
 
-        int relIdx = type.Value switch
-        {
-            TR1Type.Shotgun_S_P => TR1RMemoryMap.InvItemRelIndex.Shotgun,
-            TR1Type.Magnums_S_P => TR1RMemoryMap.InvItemRelIndex.Magnums,
-            TR1Type.Uzis_S_P => TR1RMemoryMap.InvItemRelIndex.Uzis,
-            _ => int.MinValue,
-        };
-
+        var (relIdx, weaponFlag, ammoRelIdx, laraAmmoOffset, ammoPerPickup) = WeaponInfo(type.Value);
         if (relIdx == int.MinValue) return;
 
         // Inject into Main Ring for immediate visibility
@@ -106,14 +99,6 @@ public class InventoryManager
         }
 
         // Also set WSB weapon flag for save persistence
-        byte weaponFlag = type.Value switch
-        {
-            TR1Type.Shotgun_S_P => TR1RMemoryMap.Weapon_Shotgun,
-            TR1Type.Magnums_S_P => TR1RMemoryMap.Weapon_Magnums,
-            TR1Type.Uzis_S_P => TR1RMemoryMap.Weapon_Uzis,
-            _ => (byte)0,
-        };
-
         if (weaponFlag != 0)
         {
             IntPtr weaponAddr = WorldStateAddr + TR1RMemoryMap.Save_WeaponsConfig;
@@ -121,20 +106,6 @@ public class InventoryManager
             _memory.Write(weaponAddr, (byte)(weaponByte | weaponFlag));
         }
 
-        // Convert any existing ammo items in the ring to LARA_INFO, then give starting ammo
-        (int ammoRelIdx, int laraAmmoOffset, int ammoPerPickup) = type.Value switch
-        {
-            TR1Type.Shotgun_S_P => (TR1RMemoryMap.InvItemRelIndex.ShotgunAmmo,
-                TR1RMemoryMap.Lara_ShotgunAmmo, 2 * TR1RMemoryMap.ShotgunAmmoMultiplier),
-            TR1Type.Magnums_S_P => (TR1RMemoryMap.InvItemRelIndex.MagnumAmmo,
-                TR1RMemoryMap.Lara_MagnumAmmo, 50),
-            TR1Type.Uzis_S_P => (TR1RMemoryMap.InvItemRelIndex.UziAmmo,
-                TR1RMemoryMap.Lara_UziAmmo, 100),
-            _ => (int.MinValue, -1, 0),
-        };
-
-        if (laraAmmoOffset < 0) return;
-
         // Remove ammo item from ring if it exists, and convert its qty to LARA_INFO
         short ammoQty = RemoveFromRing(
             TR1RMemoryMap.MainRingCount, TR1RMemoryMap.MainRingItems,
@@ -161,17 +132,7 @@ public class InventoryManager
         if (type == null) return;
 
         // Map ammo type to its weapon relIdx and ammo relIdx
-        (int weaponRelIdx, int ammoRelIdx, int laraInfoOffset, int amount) = type.Value switch
-        {
-            TR1Type.ShotgunAmmo_S_P => (TR1RMemoryMap.InvItemRelIndex.Shotgun, TR1RMemoryMap.InvItemRelIndex.ShotgunAmmo,
-                TR1RMemoryMap.Lara_ShotgunAmmo, 2 * TR1RMemoryMap.ShotgunAmmoMultiplier),
-            TR1Type.MagnumAmmo_S_P => (TR1RMemoryMap.InvItemRelIndex.Magnums, TR1RMemoryMap.InvItemRelIndex.MagnumAmmo,
-                TR1RMemoryMap.Lara_MagnumAmmo, 50),
-            TR1Type.UziAmmo_S_P => (TR1RMemoryMap.InvItemRelIndex.Uzis, TR1RMemoryMap.InvItemRelIndex.UziAmmo,
-                TR1RMemoryMap.Lara_UziAmmo, 100),
-            _ => (int.MinValue, int.MinValue, -1, 0),
-        };
-
+        var (weaponRelIdx, ammoRelIdx, laraInfoOffset, amount) = AmmoInfo(type.Value);
         if (laraInfoOffset < 0) return;
 
         // Check if the player has the weapon in the Main Ring
@@ -213,13 +174,7 @@ public class InventoryManager
         var type = ItemMapper.GetTR1Type(apItemId);
         if (type == null) return;
 
-        int relIdx = type.Value switch
-        {
-            TR1Type.SmallMed_S_P => TR1RMemoryMap.InvItemRelIndex.SmallMedipack,
-            TR1Type.LargeMed_S_P => TR1RMemoryMap.InvItemRelIndex.LargeMedipack,
-            _ => int.MinValue,
-        };
-
+        int relIdx = MedipackRelIndex(type.Value);
         if (relIdx == int.MinValue) return;
 
         if (EnsurePistolsPointer())
@@ -235,17 +190,148 @@ public class InventoryManager
         }
     }
 
+    /// <summary>
+    /// Gives a backlog of ring items (weapons, ammo, medipacks) in one pass,
+    /// e.g. everything received after a save when it is reloaded. The Main
+    /// Ring, the LARA_INFO ammo counters and the WSB weapon flags are read
+    /// once, the items are applied to those copies in order with the same
+    /// rules as GiveWeapon, GiveAmmo and GiveMedipack, and each is written
+    /// back once. Returns false, giving nothing, if the ring isn't readable yet.
+    /// </summary>
+    public bool GiveRingItems(IReadOnlyCollection<(long ItemId, ItemMapper.ItemCategory Category)> items)
+    {
+        if (!EnsurePistolsPointer()) return false;
+
+        var ring = InventoryRing.Read(_memory,
+            TR1RMemoryMap.MainRingCount, TR1RMemoryMap.MainRingItems, TR1RMemoryMap.MainRingQtys);
+        if (ring == null) return false;
+
+        IntPtr weaponAddr = WorldStateAddr + TR1RMemoryMap.Save_WeaponsConfig;
+        byte weaponsBefore = _memory.ReadByte(weaponAddr);
+        byte weapons = weaponsBefore;
+
+        // The three ammo counters sit 8 bytes apart: one read covers them
+        const int ammoSpan = TR1RMemoryMap.Lara_ShotgunAmmo + sizeof(int) - TR1RMemoryMap.Lara_MagnumAmmo;
+        byte[] ammoBytes = _memory.ReadBytes(_memory.Tomb1Base + TR1RMemoryMap.Lara_MagnumAmmo, ammoSpan);
+        var ammoBefore = new[] { TR1RMemoryMap.Lara_MagnumAmmo, TR1RMemoryMap.Lara_UziAmmo, TR1RMemoryMap.Lara_ShotgunAmmo }
+            .ToDictionary(offset => offset, offset => BitConverter.ToInt32(ammoBytes, offset - TR1RMemoryMap.Lara_MagnumAmmo));
+        var ammo = new Dictionary<int, int>(ammoBefore);
+
+        IntPtr ItemPtr(int relIdx) => _pistolsPtr + relIdx * TR1RMemoryMap.InventoryItemStride;
+
+        int given = 0, failed = 0;
+        foreach (var (itemId, category) in items)
+        {
+            var type = ItemMapper.GetTR1Type(itemId);
+            if (type == null) continue;
+
+            switch (category)
+            {
+                case ItemMapper.ItemCategory.Weapon:
+                {
+                    var (relIdx, weaponFlag, ammoRelIdx, laraAmmoOffset, ammoPerPickup) = WeaponInfo(type.Value);
+                    if (relIdx == int.MinValue) continue;
+
+                    if (!ring.Add(ItemPtr(relIdx), 1))
+                        failed++;
+                    weapons |= weaponFlag;
+                    short ammoQty = ring.Remove(ItemPtr(ammoRelIdx));
+                    ammo[laraAmmoOffset] = Math.Min(ammo[laraAmmoOffset] + ammoQty * ammoPerPickup + ammoPerPickup, 999999);
+                    break;
+                }
+                case ItemMapper.ItemCategory.Ammo:
+                {
+                    var (weaponRelIdx, ammoRelIdx, laraInfoOffset, amount) = AmmoInfo(type.Value);
+                    if (laraInfoOffset < 0) continue;
+
+                    if (ring.Contains(ItemPtr(weaponRelIdx)))
+                        ammo[laraInfoOffset] = Math.Min(ammo[laraInfoOffset] + amount, 999999);
+                    else if (!ring.Add(ItemPtr(ammoRelIdx), 1))
+                        failed++;
+                    break;
+                }
+                case ItemMapper.ItemCategory.Medipack:
+                {
+                    int relIdx = MedipackRelIndex(type.Value);
+                    if (relIdx == int.MinValue) continue;
+
+                    if (!ring.Add(ItemPtr(relIdx), 1))
+                        failed++;
+                    break;
+                }
+                default:
+                    continue;
+            }
+            given++;
+        }
+
+        int writes = ring.Commit();
+        if (weapons != weaponsBefore)
+        {
+            _memory.Write(weaponAddr, weapons);
+            writes++;
+        }
+        foreach (var (offset, value) in ammo)
+        {
+            if (value == ammoBefore[offset]) continue;
+            _memory.Write(_memory.Tomb1Base + offset, value);
+            writes++;
+        }
+
+        ConsoleUI.Info($"[INV] Gave {given} ring items in one pass ({writes} writes, Main Ring {ring.Count} items)");
+        if (failed > 0)
+            ConsoleUI.Warning($"[INV] Main Ring full: {failed} items could not be injected");
+        return true;
+    }
+
+    /// <summary>
+    /// Main Ring relIdx, WSB flag, ammo item relIdx, LARA_INFO ammo offset and
+    /// ammo per pickup of a weapon; relIdx is int.MinValue for other types.
+    /// </summary>
+    private static (int RelIdx, byte WeaponFlag, int AmmoRelIdx, int LaraAmmoOffset, int AmmoPerPickup) WeaponInfo(TR1Type type) => type switch
+    {
+        TR1Type.Shotgun_S_P => (TR1RMemoryMap.InvItemRelIndex.Shotgun, TR1RMemoryMap.Weapon_Shotgun,
+            TR1RMemoryMap.InvItemRelIndex.ShotgunAmmo, TR1RMemoryMap.Lara_ShotgunAmmo, 2 * TR1RMemoryMap.ShotgunAmmoMultiplier),
+        TR1Type.Magnums_S_P => (TR1RMemoryMap.InvItemRelIndex.Magnums, TR1RMemoryMap.Weapon_Magnums,
+            TR1RMemoryMap.InvItemRelIndex.MagnumAmmo, TR1RMemoryMap.Lara_MagnumAmmo, 50),
+        TR1Type.Uzis_S_P => (TR1RMemoryMap.InvItemRelIndex.Uzis, TR1RMemoryMap.Weapon_Uzis,
+            TR1RMemoryMap.InvItemRelIndex.UziAmmo, TR1RMemoryMap.Lara_UziAmmo, 100),
+        _ => (int.MinValue, 0, int.MinValue, -1, 0),
+    };
+
+    /// <summary>
+    /// Weapon relIdx, ammo item relIdx, LARA_INFO offset and amount of an ammo
+    /// type; the offset is -1 for other types.
+    /// </summary>
+    private static (int WeaponRelIdx, int AmmoRelIdx, int LaraInfoOffset, int Amount) AmmoInfo(TR1Type type) => type switch
+    {
+        TR1Type.ShotgunAmmo_S_P => (TR1RMemoryMap.InvItemRelIndex.Shotgun, TR1RMemoryMap.InvItemRelIndex.ShotgunAmmo,
+            TR1RMemoryMap.Lara_ShotgunAmmo, 2 * TR1RMemoryMap.ShotgunAmmoMultiplier),
+        TR1Type.MagnumAmmo_S_P => (TR1RMemoryMap.InvItemRelIndex.Magnums, TR1RMemoryMap.InvItemRelIndex.MagnumAmmo,
+            TR1RMemoryMap.Lara_MagnumAmmo, 50),
+        TR1Type.UziAmmo_S_P => (TR1RMemoryMap.InvItemRelIndex.Uzis, TR1RMemoryMap.InvItemRelIndex.UziAmmo,
+            TR1RMemoryMap.Lara_UziAmmo, 100),
+        _ => (int.MinValue, int.MinValue, -1, 0),
+    };
+
+    private static int MedipackRelIndex(TR1Type type) => type switch
+    {
+        TR1Type.SmallMed_S_P => TR1RMemoryMap.InvItemRelIndex.SmallMedipack,
+        TR1Type.LargeMed_S_P => TR1RMemoryMap.InvItemRelIndex.LargeMedipack,
+        _ => int.MinValue,
+    };
+
     /// <summary>
     /// Handles a key item. If the target level is currently active, injects
     /// into the Keys Ring. Otherwise, stores for later when that level is loaded.
+    /// currentMapperIdx is the LocationMapper index of the level being played.
     /// </summary>
-    public void GiveKeyItem(long apItemId, int currentRuntimeLevelId)
+    public void GiveKeyItem(long apItemId, int currentMapperIdx)
     {
         string? targetLevelFile = ItemMapper.GetKeyItemLevel(apItemId);
         if (targetLevelFile == null) return;
 
         int targetMapperIdx = LocationMapper.GetLevelIndex(targetLevelFile);
-        int currentMapperIdx = TR1RMemoryMap.ToLocationMapperIndex(currentRuntimeLevelId);
 
         // Always store for idempotent re-injection (death/reload/reconnect)
         if (!_receivedKeyItems.ContainsKey(targetMapperIdx))
@@ -353,12 +439,12 @@ public class InventoryManager
     ///   - OnLevelChanged: new level → inject all items for that level
     ///   - Save_Number change: save/load detected → re-compare ring vs AP items
     ///   - New AP item received: GiveKeyItem → inject the new item
+    ///
+    /// mapperIdx is the LocationMapper index of the level being played.
     /// </summary>
-    public void EnsureKeyItemsInRing(int currentRuntimeLevelId)
+    public void EnsureKeyItemsInRing(int mapperIdx)
     {
         if (_keyItemsEnsured) return;
-
-        int mapperIdx = TR1RMemoryMap.ToLocationMapperIndex(currentRuntimeLevelId);
         if (mapperIdx < 0) return;
 
         var items = GetReceivedKeyItems(mapperIdx);
@@ -382,35 +468,26 @@ public class InventoryManager
             expectedQty[ptr] = (short)(current + 1);
         }
 
-        // Inject missing items and fix qty on existing ones
-        IntPtr t1 = _memory.Tomb1Base;
-        short ringCount = _memory.ReadInt16(t1 + TR1RMemoryMap.KeysRingCount);
+        // Inject missing items and fix qty on existing ones, on a copy of the ring written back once
+        var ring = InventoryRing.Read(_memory,
+            TR1RMemoryMap.KeysRingCount, TR1RMemoryMap.KeysRingItems, TR1RMemoryMap.KeysRingQtys);
+        if (ring == null) return;
         bool injectedAny = false;
 
         foreach (var (targetPtr, targetQty) in expectedQty)
         {
-            int ringIdx = -1;
-            for (int i = 0; i < ringCount; i++)
-            {
-                if (_memory.ReadPointer(t1 + TR1RMemoryMap.KeysRingItems + i * 8) == targetPtr)
-                { ringIdx = i; break; }
-            }
-
+            int ringIdx = ring.IndexOf(targetPtr);
             if (ringIdx >= 0)
             {
-                short currentQty = _memory.ReadInt16(t1 + TR1RMemoryMap.KeysRingQtys + ringIdx * 2);
-                if (currentQty < targetQty)
-                    _memory.Write(t1 + TR1RMemoryMap.KeysRingQtys + ringIdx * 2, targetQty);
+                if (ring.QtyAt(ringIdx) < targetQty)
+                    ring.SetQty(ringIdx, targetQty);
             }
-            else if (ringCount < TR1RMemoryMap.MaxRingItems)
+            else if (ring.Add(targetPtr, targetQty))
             {
-                _memory.Write(t1 + TR1RMemoryMap.KeysRingItems + ringCount * 8, targetPtr.ToInt64());
-                _memory.Write(t1 + TR1RMemoryMap.KeysRingQtys + ringCount * 2, targetQty);
-                ringCount++;
-                _memory.Write(t1 + TR1RMemoryMap.KeysRingCount, ringCount);
                 injectedAny = true;
             }
         }
+        ring.Commit();
 
         if (injectedAny)
         {
@@ -485,6 +562,11 @@ public class InventoryManager
         if (!EnsurePistolsPointer())
             return;
 
+        var ring = InventoryRing.Read(_memory,
+            TR1RMemoryMap.KeysRingCount, TR1RMemoryMap.KeysRingItems, TR1RMemoryMap.KeysRingQtys);
+        if (ring == null)
+            return;
+
         var remainingUsed = new Dictionary<long, int>(usedKeyItems);
         foreach (long apItemId in items)
         {
@@ -499,12 +581,9 @@ public class InventoryManager
             if (targetPtr == IntPtr.Zero) continue;
 
             ConsoleUI.Info($"[INV] Reconcile: re-injecting key item AP#{apItemId} (ptr=0x{targetPtr:X})");
-            InjectToRingRaw(
-                TR1RMemoryMap.KeysRingCount,
-                TR1RMemoryMap.KeysRingItems,
-                TR1RMemoryMap.KeysRingQtys,
-                targetPtr, 1);
+            ring.Add(targetPtr, 1);
         }
+        ring.Commit();
 
         _keyItemsEnsured = false;
         _keyItemEnsureCooldown = KeyItemEnsureCooldownTicks;
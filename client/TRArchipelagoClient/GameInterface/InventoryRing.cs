@@ -0,0 +1,165 @@
+using System.Buffers.Binary;
+
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// A local copy of one inventory ring (Main Ring or Keys Ring), for applying
+/// many changes with a read and a write per array instead of a read or write
+/// per slot.
+///
+/// Read copies the count and the whole items[] and qtys[] arrays. Add, Remove
+/// and SetQty then change the copy with the same rules InventoryManager's
+/// single-item injection follows (qty capped at 255, append only while there
+/// is room, later items shift down on removal), and Commit writes back the
+/// span of slots that changed in each array, then the count. A ring that
+/// grows thus never shows a slot before its item is in place, as with the
+/// single-item writes.
+/// </summary>
+public class InventoryRing
+{
+    private readonly ProcessMemory _memory;
+    private readonly IntPtr _countAddr;
+    private readonly IntPtr _itemsAddr;
+    private readonly IntPtr _qtysAddr;
+
+    private readonly long[] _items = new long[TR1RMemoryMap.MaxRingItems];
+    private readonly short[] _qtys = new short[TR1RMemoryMap.MaxRingItems];
+    private readonly long[] _readItems = new long[TR1RMemoryMap.MaxRingItems];
+    private readonly short[] _readQtys = new short[TR1RMemoryMap.MaxRingItems];
+    private short _readCount;
+
+    /// <summary>Items in the ring.</summary>
+    public short Count { get; private set; }
+
+    private InventoryRing(ProcessMemory memory, int ringCountOffset, int ringItemsOffset, int ringQtysOffset)
+    {
+        _memory = memory;
+        _countAddr = memory.Tomb1Base + ringCountOffset;
+        _itemsAddr = memory.Tomb1Base + ringItemsOffset;
+        _qtysAddr = memory.Tomb1Base + ringQtysOffset;
+    }
+
+    /// <summary>
+    /// Copies a ring out of the game. Returns null if it could not be read.
+    /// </summary>
+    public static InventoryRing? Read(ProcessMemory memory, int ringCountOffset, int ringItemsOffset, int ringQtysOffset)
+    {
+        var ring = new InventoryRing(memory, ringCountOffset, ringItemsOffset, ringQtysOffset);
+        var itemBytes = new byte[TR1RMemoryMap.MaxRingItems * 8];
+        var qtyBytes = new byte[TR1RMemoryMap.MaxRingItems * 2];
+        if (!memory.ReadBytes(ring._itemsAddr, itemBytes, itemBytes.Length)
+            || !memory.ReadBytes(ring._qtysAddr, qtyBytes, qtyBytes.Length))
+            return null;
+
+        for (int i = 0; i < TR1RMemoryMap.MaxRingItems; i++)
+        {
+            ring._items[i] = BinaryPrimitives.ReadInt64LittleEndian(itemBytes.AsSpan(i * 8));
+            ring._qtys[i] = BinaryPrimitives.ReadInt16LittleEndian(qtyBytes.AsSpan(i * 2));
+        }
+        ring.Count = (short)Math.Clamp((int)memory.ReadInt16(ring._countAddr), 0, TR1RMemoryMap.MaxRingItems);
+
+        ring._readCount = ring.Count;
+        ring._items.CopyTo(ring._readItems, 0);
+        ring._qtys.CopyTo(ring._readQtys, 0);
+        return ring;
+    }
+
+    /// <summary>Slot holding the item, or -1.</summary>
+    public int IndexOf(IntPtr item) => Array.IndexOf(_items, item.ToInt64(), 0, Count);
+
+    public bool Contains(IntPtr item) => IndexOf(item) >= 0;
+
+    public short QtyAt(int slot) => _qtys[slot];
+
+    public void SetQty(int slot, short qty) => _qtys[slot] = qty;
+
+    /// <summary>
+    /// Adds qty of the item: raises its qty (up to 255) if it is in the ring,
+    /// otherwise appends it. Returns false if the ring is full.
+    /// </summary>
+    public bool Add(IntPtr item, short qty)
+    {
+        int slot = IndexOf(item);
+        if (slot >= 0)
+        {
+            _qtys[slot] = (short)Math.Min(_qtys[slot] + qty, 255);
+            return true;
+        }
+
+        if (Count >= TR1RMemoryMap.MaxRingItems)
+            return false;
+
+        _items[Count] = item.ToInt64();
+        _qtys[Count] = qty;
+        Count++;
+        return true;
+    }
+
+    /// <summary>
+    /// Removes the item, shifting later items down. Returns the qty it had,
+    /// or 0 if it was not in the ring.
+    /// </summary>
+    public short Remove(IntPtr item)
+    {
+        int slot = IndexOf(item);
+        if (slot < 0)
+            return 0;
+
+        short qty = _qtys[slot];
+        Array.Copy(_items, slot + 1, _items, slot, Count - slot - 1);
+        Array.Copy(_qtys, slot + 1, _qtys, slot, Count - slot - 1);
+        Count--;
+        _items[Count] = 0;
+        _qtys[Count] = 0;
+        return qty;
+    }
+
+    /// <summary>
+    /// Writes the changes since Read back to the game: at most one write per
+    /// array and one for the count. Returns the number of writes.
+    /// </summary>
+    public int Commit()
+    {
+        int writes = 0;
+        if (ChangedSpan(_items, _readItems, out int first, out int length))
+        {
+            var bytes = new byte[length * 8];
+            for (int i = 0; i < length; i++)
+                BinaryPrimitives.WriteInt64LittleEndian(bytes.AsSpan(i * 8), _items[first + i]);
+            _memory.WriteBytes(_itemsAddr + first * 8, bytes);
+            writes++;
+        }
+        if (ChangedSpan(_qtys, _readQtys, out first, out length))
+        {
+            var bytes = new byte[length * 2];
+            for (int i = 0; i < length; i++)
+                BinaryPrimitives.WriteInt16LittleEndian(bytes.AsSpan(i * 2), _qtys[first + i]);
+            _memory.WriteBytes(_qtysAddr + first * 2, bytes);
+            writes++;
+        }
+        if (Count != _readCount)
+        {
+            _memory.Write(_countAddr, Count);
+            writes++;
+        }
+
+        _readCount = Count;
+        _items.CopyTo(_readItems, 0);
+        _qtys.CopyTo(_readQtys, 0);
+        return writes;
+    }
+
+    private static bool ChangedSpan<T>(T[] current, T[] read, out int first, out int length) where T : IEquatable<T>
+    {
+        first = 0;
+        while (first < current.Length && current[first].Equals(read[first]))
+            first++;
+
+        int last = current.Length - 1;
+        while (last >= first && current[last].Equals(read[last]))
+            last--;
+
+        length = last - first + 1;
+        return length > 0;
+    }
+}
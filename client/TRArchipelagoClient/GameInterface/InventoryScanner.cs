@@ -13,10 +13,14 @@ namespace TRArchipelagoClient.GameInterface;
 /// Once found, the address can be used for writing (injecting items).
 /// The address is stable within a level but may shift on level load,
 /// so the scanner re-runs automatically when a level change is detected.
+///
+/// The scans run on the thread pool and go through ProcessMemory.Background,
+/// so a recording leaves them out of the trace.
 /// </summary>
 public class InventoryScanner
 {
     private readonly ProcessMemory _memory;
+    private readonly ProcessMemory _background;
 
     // Scan state
     private byte _lastWsbSmallMed;
@@ -29,6 +33,7 @@ public class InventoryScanner
     public InventoryScanner(ProcessMemory memory)
     {
         _memory = memory;
+        _background = memory.Background;
     }
 
     /// <summary>True when the live inventory address has been found.</summary>
@@ -70,7 +75,7 @@ public class InventoryScanner
             {
                 try
                 {
-                    _regions = _memory.GetReadableRegions();
+                    _regions = _background.GetReadableRegions();
                     _candidates = ScanForValue(_lastWsbSmallMed);
                     _scanPhase = 1;
                     ConsoleUI.Info($"[Scanner] Baseline: {_candidates.Count} candidates for value {_lastWsbSmallMed}");
@@ -110,15 +115,15 @@ public class InventoryScanner
                         foreach (long addr in _candidates)
                         {
                             IntPtr ptr = new IntPtr(addr);
-                            byte before = _memory.ReadByte(ptr);
-                            _memory.Write(ptr, (byte)(before + 5));
+                            byte before = _background.ReadByte(ptr);
+                            _background.Write(ptr, (byte)(before + 5));
                             // Read WSB to see if it was affected (if so, it's just a WSB mirror)
-                            byte wsbCheck = _memory.ReadByte(
-                                _memory.Tomb1Base + TR1RMemoryMap.WorldStateBackup + 0x626);
-                            _memory.Write(ptr, before); // restore
+                            byte wsbCheck = _background.ReadByte(
+                                _background.Tomb1Base + TR1RMemoryMap.WorldStateBackup + 0x626);
+                            _background.Write(ptr, before); // restore
 
                             // Skip if this address IS the WSB
-                            long tomb1Start = (long)_memory.Tomb1Base;
+                            long tomb1Start = (long)_background.Tomb1Base;
                             if (addr >= tomb1Start && addr < tomb1Start + 0x500000)
                                 continue;
 
@@ -160,7 +165,7 @@ public class InventoryScanner
     private HashSet<long> ScanForValue(byte value)
     {
         var results = new HashSet<long>();
-        long tomb1Start = (long)_memory.Tomb1Base;
+        long tomb1Start = (long)_background.Tomb1Base;
         long tomb1End = tomb1Start + 0x500000;
 
         foreach (var (regionAddr, regionSize) in _regions!)
@@ -172,7 +177,7 @@ public class InventoryScanner
 
             try
             {
-                byte[] data = _memory.ReadBytes(regionAddr, regionSize);
+                byte[] data = _background.ReadBytes(regionAddr, regionSize);
                 for (int i = 0; i < data.Length; i++)
                 {
                     if (data[i] == value)
@@ -205,7 +210,7 @@ public class InventoryScanner
 
             try
             {
-                byte[] data = _memory.ReadBytes(regionAddr, regionSize);
+                byte[] data = _background.ReadBytes(regionAddr, regionSize);
                 foreach (long addr in regionCandidates)
                 {
                     int offset = (int)(addr - rStart);
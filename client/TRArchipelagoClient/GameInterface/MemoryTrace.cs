@@ -0,0 +1,72 @@
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// Format of the memory traces written by RecordingMemory and served by
+/// ReplayMemory.
+///
+/// A trace is the "TR1RTRC" magic and a version byte, followed by one block
+/// per tick (one GameStateWatcher poll; the first block also holds attaching
+/// and everything before the first poll). A block is its length as a varint,
+/// then its records in the order the calls were made. Each record starts with
+/// a RecordKind byte:
+///
+///   Read, Write        address, size, then size bytes of data
+///   ReadRepeat         address, size; the data is the same as the last read
+///                      of that address and size, so it is not repeated
+///   ReadFailed         address, size
+///   Attach             result, attached (bytes), exe base, tomb1 base (int64)
+///   Regions            count, then address (int64) and size per region
+///   Context            length, then that many bytes of UTF-8 text
+///
+/// Addresses are stored as the zigzag varint of the difference from the
+/// previous record's address, sizes and counts as varints. Most polls read
+/// the same addresses and see the same values, so a typical read record is
+/// three or four bytes.
+///
+/// Only the poll loop is traced: calls made through ProcessMemory.Background
+/// are not recorded.
+/// </summary>
+public static class MemoryTrace
+{
+    public static readonly byte[] Magic = "TR1RTRC"u8.ToArray();
+    public const byte Version = 1;
+
+    public enum RecordKind : byte
+    {
+        Read = 0,
+        ReadRepeat = 1,
+        ReadFailed = 2,
+        Write = 3,
+        Attach = 4,
+        Regions = 5,
+        Context = 6,
+    }
+
+    /// <summary>Appends value as an unsigned LEB128 varint.</summary>
+    public static void WriteVarint(List<byte> output, ulong value)
+    {
+        while (value >= 0x80)
+        {
+            output.Add((byte)(value | 0x80));
+            value >>= 7;
+        }
+        output.Add((byte)value);
+    }
+
+    /// <summary>Reads an unsigned LEB128 varint at position, advancing it.</summary>
+    public static ulong ReadVarint(ReadOnlySpan<byte> input, ref int position)
+    {
+        ulong value = 0;
+        for (int shift = 0; ; shift += 7)
+        {
+            byte b = input[position++];
+            value |= (ulong)(b & 0x7F) << shift;
+            if (b < 0x80)
+                return value;
+        }
+    }
+
+    public static ulong ZigZag(long value) => (ulong)((value << 1) ^ (value >> 63));
+
+    public static long UnZigZag(ulong value) => (long)(value >> 1) ^ -(long)(value & 1);
+}
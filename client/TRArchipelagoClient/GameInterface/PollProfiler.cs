@@ -0,0 +1,86 @@
+using System.Diagnostics;
+
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// Time and memory reads spent in each stage of GameStateWatcher's polls.
+/// Set as GameStateWatcher.Profiler (the replay test does); when it is
+/// null, the watcher's stage scopes cost nothing.
+/// </summary>
+public class PollProfiler
+{
+    /// <summary>Stage name of a whole poll.</summary>
+    public const string Poll = "poll";
+
+    private class Stage
+    {
+        public long Calls;
+        public long Ticks;
+        public long Reads;
+    }
+
+    private readonly ProcessMemory _memory;
+    private readonly Dictionary<string, Stage> _stages = new();
+    private readonly List<string> _order = new();
+
+    public PollProfiler(ProcessMemory memory)
+    {
+        _memory = memory;
+    }
+
+    /// <summary>Starts timing a stage; disposing the returned scope stops it.</summary>
+    public Scope Time(string stage) => new(this, stage, Stopwatch.GetTimestamp(), _memory.ReadCount);
+
+    public readonly struct Scope : IDisposable
+    {
+        private readonly PollProfiler _profiler;
+        private readonly string _stage;
+        private readonly long _start;
+        private readonly long _reads;
+
+        internal Scope(PollProfiler profiler, string stage, long start, long reads)
+        {
+            _profiler = profiler;
+            _stage = stage;
+            _start = start;
+            _reads = reads;
+        }
+
+        public void Dispose()
+        {
+            _profiler.Add(_stage, Stopwatch.GetTimestamp() - _start, _profiler._memory.ReadCount - _reads);
+        }
+    }
+
+    private void Add(string name, long ticks, long reads)
+    {
+        if (!_stages.TryGetValue(name, out var stage))
+        {
+            _stages[name] = stage = new Stage();
+            _order.Add(name);
+        }
+        stage.Calls++;
+        stage.Ticks += ticks;
+        stage.Reads += reads;
+    }
+
+    /// <summary>Writes every stage's total time, time per poll and reads per poll, a line at a time.</summary>
+    public void Report(Action<string> writeLine)
+    {
+        long polls = _stages.TryGetValue(Poll, out var poll) ? poll.Calls : 0;
+        if (polls == 0)
+        {
+            writeLine("No polls recorded.");
+            return;
+        }
+
+        writeLine($"{polls} polls");
+        writeLine($"  {"stage",-20} {"total ms",10} {"us/poll",9} {"reads/poll",11}");
+        foreach (string name in _order.OrderBy(name => name == Poll ? 1 : 0))
+        {
+            var stage = _stages[name];
+            double ms = stage.Ticks * 1000.0 / Stopwatch.Frequency;
+            writeLine($"  {name,-20} {ms,10:F2} {ms * 1000 / polls,9:F2} {(double)stage.Reads / polls,11:F1}");
+        }
+    }
+}
@@ -7,6 +7,12 @@ namespace TRArchipelagoClient.GameInterface;
 /// Low-level process memory access using P/Invoke on Windows.
 /// Attaches to tomb123.exe and resolves tomb1.dll module base address.
 /// Provides read/write methods for polling game state at runtime.
+///
+/// Every typed read and write goes through ReadCore / WriteCore, and the
+/// attach state through the virtual members below, so a subclass can stand
+/// in for the live process: RecordingMemory records another source to a
+/// trace, ReplayMemory serves a trace back and FileBackedMemory reads a dump
+/// file.
 /// </summary>
 public class ProcessMemory : IDisposable
 {
@@ -32,19 +38,25 @@ public class ProcessMemory : IDisposable
     private IntPtr _exeBaseAddress;
     private IntPtr _tomb1DllBase;
 
-    public bool IsAttached => _processHandle != IntPtr.Zero && _gameProcess is { HasExited: false };
+    public virtual bool IsAttached => _processHandle != IntPtr.Zero && _gameProcess is { HasExited: false };
 
     /// <summary>Base address of tomb123.exe module.</summary>
-    public IntPtr ExeBase => _exeBaseAddress;
+    public virtual IntPtr ExeBase => _exeBaseAddress;
 
     /// <summary>Base address of tomb1.dll module. Zero if not loaded.</summary>
-    public IntPtr Tomb1Base => _tomb1DllBase;
+    public virtual IntPtr Tomb1Base => _tomb1DllBase;
+
+    /// <summary>Number of reads made so far (every typed read counts once).</summary>
+    public long ReadCount { get; private set; }
+
+    /// <summary>Number of writes made so far.</summary>
+    public long WriteCount { get; private set; }
 
     /// <summary>
     /// Tries to find and attach to the tomb123.exe process.
     /// Also resolves tomb1.dll module base address.
     /// </summary>
-    public bool TryAttach()
+    public virtual bool TryAttach()
     {
         var processes = Process.GetProcessesByName(TR1RMemoryMap.HostProcessName);
         if (processes.Length == 0)
@@ -69,7 +81,7 @@ public class ProcessMemory : IDisposable
     /// <summary>
     /// Refreshes the tomb1.dll base address (call if DLL was loaded after attach).
     /// </summary>
-    public bool RefreshTomb1Base()
+    public virtual bool RefreshTomb1Base()
     {
         if (!IsAttached) return false;
 
@@ -118,10 +130,27 @@ public class ProcessMemory : IDisposable
     public byte[] ReadBytes(IntPtr address, int size)
     {
         byte[] buffer = new byte[size];
-        ReadProcessMemory(_processHandle, address, buffer, size, out _);
+        ReadBytes(address, buffer, size);
         return buffer;
     }
 
+    /// <summary>
+    /// Reads size bytes into the start of a caller-owned buffer (no allocation).
+    /// Returns false if the range could not be read in full.
+    /// Every other read method goes through this one.
+    /// </summary>
+    public bool ReadBytes(IntPtr address, byte[] buffer, int size)
+    {
+        ReadCount++;
+        return ReadCore(address, buffer, size);
+    }
+
+    /// <summary>Performs one read for ReadBytes.</summary>
+    protected virtual bool ReadCore(IntPtr address, byte[] buffer, int size)
+    {
+        return ReadProcessMemory(_processHandle, address, buffer, size, out int read) && read == size;
+    }
+
     /// <summary>Reads a struct from process memory.</summary>
     public T Read<T>(IntPtr address) where T : struct
     {
@@ -203,6 +232,13 @@ public class ProcessMemory : IDisposable
 
     /// <summary>Writes raw bytes to process memory.</summary>
     public bool WriteBytes(IntPtr address, byte[] data)
+    {
+        WriteCount++;
+        return WriteCore(address, data);
+    }
+
+    /// <summary>Performs one write for WriteBytes.</summary>
+    protected virtual bool WriteCore(IntPtr address, byte[] data)
     {
         return WriteProcessMemory(_processHandle, address, data, data.Length, out _);
     }
@@ -266,7 +302,7 @@ public class ProcessMemory : IDisposable
     /// Enumerates all readable/writable committed memory regions of the process.
     /// Returns list of (baseAddress, size) tuples.
     /// </summary>
-    public List<(IntPtr Address, int Size)> GetReadableRegions(long maxAddress = 0x7FFFFFFFFFFF)
+    public virtual List<(IntPtr Address, int Size)> GetReadableRegions(long maxAddress = 0x7FFFFFFFFFFF)
     {
         var regions = new List<(IntPtr, int)>();
         IntPtr address = IntPtr.Zero;
@@ -314,7 +350,23 @@ public class ProcessMemory : IDisposable
         return IntPtr.Zero;
     }
 
-    public void Dispose()
+    /// <summary>
+    /// Memory access for work done off the poll loop, such as the inventory
+    /// scanner's region scans. Here it is this same memory; RecordingMemory
+    /// keeps it out of the trace and ReplayMemory serves nothing through it,
+    /// so background work cannot change what the poll loop is served.
+    /// </summary>
+    public virtual ProcessMemory Background => this;
+
+    /// <summary>
+    /// Marks the end of one poll of the game state. Does nothing here;
+    /// RecordingMemory uses it to split its trace into ticks.
+    /// </summary>
+    public virtual void MarkTick()
+    {
+    }
+
+    public virtual void Dispose()
     {
         if (_processHandle != IntPtr.Zero)
         {
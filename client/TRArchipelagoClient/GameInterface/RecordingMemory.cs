@@ -0,0 +1,180 @@
+using System.Buffers.Binary;
+using System.Runtime.InteropServices;
+using System.Text;
+using static TRArchipelagoClient.GameInterface.MemoryTrace;
+
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// Wraps another memory source (normally the live process), recording every
+/// read, write and attach made through it to a trace file (see MemoryTrace)
+/// that ReplayMemory can serve back later without the game. Ticks are
+/// delimited by MarkTick, which the watcher calls after every poll; each one
+/// is written out as a single block.
+///
+/// Only the poll loop is recorded. Background work (the inventory scanner's
+/// region scans, hundreds of MB each) goes through Background, straight to
+/// the source, so it neither bloats the trace nor interleaves with the poll
+/// records in an order a replay could not reproduce. Calls are recorded one
+/// at a time under a lock, whichever thread makes them.
+/// </summary>
+public class RecordingMemory : ProcessMemory
+{
+    private readonly ProcessMemory _source;
+    private readonly FileStream _file;
+    private readonly object _gate = new();
+    private readonly List<byte> _block = new();
+    private readonly List<byte> _length = new();
+    private long _lastAddress;
+
+    // Last value seen per (address, size), for ReadRepeat
+    private readonly Dictionary<(long Address, int Size), byte[]> _lastValues = new();
+
+    public RecordingMemory(ProcessMemory source, string path)
+    {
+        _source = source;
+        _file = new FileStream(path, FileMode.Create, FileAccess.Write, FileShare.Read);
+        _file.Write(Magic);
+        _file.WriteByte(MemoryTrace.Version);
+    }
+
+    /// <summary>
+    /// Stores free-form text in the trace (e.g. the entity location mappings a
+    /// replay needs), read back as ReplayMemory.Context.
+    /// </summary>
+    public void RecordContext(string text)
+    {
+        byte[] bytes = Encoding.UTF8.GetBytes(text);
+        lock (_gate)
+        {
+            _block.Add((byte)RecordKind.Context);
+            WriteVarint(_block, (ulong)bytes.Length);
+            _block.AddRange(bytes);
+        }
+    }
+
+    public override bool IsAttached => _source.IsAttached;
+    public override IntPtr ExeBase => _source.ExeBase;
+    public override IntPtr Tomb1Base => _source.Tomb1Base;
+    public override ProcessMemory Background => _source.Background;
+
+    public override bool TryAttach()
+    {
+        lock (_gate)
+        {
+            bool result = _source.TryAttach();
+            RecordAttach(result);
+            return result;
+        }
+    }
+
+    public override bool RefreshTomb1Base()
+    {
+        lock (_gate)
+        {
+            bool result = _source.RefreshTomb1Base();
+            RecordAttach(result);
+            return result;
+        }
+    }
+
+    protected override bool ReadCore(IntPtr address, byte[] buffer, int size)
+    {
+        lock (_gate)
+        {
+            bool ok = _source.ReadBytes(address, buffer, size);
+            var key = ((long)address, size);
+
+            if (!ok)
+            {
+                RecordAddress(RecordKind.ReadFailed, key.Item1, size);
+            }
+            else if (_lastValues.TryGetValue(key, out byte[]? last) && buffer.AsSpan(0, size).SequenceEqual(last))
+            {
+                RecordAddress(RecordKind.ReadRepeat, key.Item1, size);
+            }
+            else
+            {
+                RecordAddress(RecordKind.Read, key.Item1, size);
+                AddBytes(buffer.AsSpan(0, size));
+                _lastValues[key] = buffer[..size];
+            }
+            return ok;
+        }
+    }
+
+    protected override bool WriteCore(IntPtr address, byte[] data)
+    {
+        lock (_gate)
+        {
+            bool ok = _source.WriteBytes(address, data);
+            RecordAddress(RecordKind.Write, (long)address, data.Length);
+            _block.AddRange(data);
+            return ok;
+        }
+    }
+
+    public override List<(IntPtr Address, int Size)> GetReadableRegions(long maxAddress = 0x7FFFFFFFFFFF)
+    {
+        lock (_gate)
+        {
+            var regions = _source.GetReadableRegions(maxAddress);
+            _block.Add((byte)RecordKind.Regions);
+            WriteVarint(_block, (ulong)regions.Count);
+            Span<byte> value = stackalloc byte[8];
+            foreach (var (regionAddress, regionSize) in regions)
+            {
+                BinaryPrimitives.WriteInt64LittleEndian(value, (long)regionAddress);
+                AddBytes(value);
+                WriteVarint(_block, (ulong)regionSize);
+            }
+            return regions;
+        }
+    }
+
+    public override void MarkTick()
+    {
+        lock (_gate)
+        {
+            _length.Clear();
+            WriteVarint(_length, (ulong)_block.Count);
+            _file.Write(CollectionsMarshal.AsSpan(_length));
+            _file.Write(CollectionsMarshal.AsSpan(_block));
+            _block.Clear();
+        }
+    }
+
+    public override void Dispose()
+    {
+        lock (_gate)
+        {
+            if (_block.Count > 0)
+                MarkTick();
+            _file.Dispose();
+        }
+        _source.Dispose();
+        base.Dispose();
+    }
+
+    private void RecordAttach(bool result)
+    {
+        _block.Add((byte)RecordKind.Attach);
+        _block.Add(result ? (byte)1 : (byte)0);
+        _block.Add(IsAttached ? (byte)1 : (byte)0);
+        Span<byte> value = stackalloc byte[8];
+        BinaryPrimitives.WriteInt64LittleEndian(value, (long)ExeBase);
+        AddBytes(value);
+        BinaryPrimitives.WriteInt64LittleEndian(value, (long)Tomb1Base);
+        AddBytes(value);
+    }
+
+    private void RecordAddress(RecordKind kind, long address, int size)
+    {
+        _block.Add((byte)kind);
+        WriteVarint(_block, ZigZag(address - _lastAddress));
+        WriteVarint(_block, (ulong)size);
+        _lastAddress = address;
+    }
+
+    private void AddBytes(ReadOnlySpan<byte> bytes) => _block.AddRange(bytes);
+}
@@ -0,0 +1,305 @@
+using System.Buffers.Binary;
+using System.IO.MemoryMappedFiles;
+using System.Text;
+using static TRArchipelagoClient.GameInterface.MemoryTrace;
+
+namespace TRArchipelagoClient.GameInterface;
+
+/// <summary>
+/// Serves a trace recorded by RecordingMemory (see MemoryTrace) in place of
+/// the live process, so the poll loop can run without the game, e.g. on Linux.
+///
+/// The trace is memory-mapped and consumed one tick at a time: NextTick
+/// decodes the next block, and every read, write or attach call is answered
+/// by the next matching record in it. When the client runs the same code as
+/// when recording, that is always the next record. If it strays (e.g. no AP
+/// items arrive during a replay, so none get injected), a read is answered by
+/// a later record of the same address and size in the tick; failing that, it
+/// counts as a miss and gets the last value recorded for it. Writes change
+/// nothing.
+/// Background work was not recorded (see RecordingMemory), so Background has
+/// no regions and reads nothing; it never touches the poll loop's records.
+/// Replays are deterministic: the same trace always serves the same values.
+/// </summary>
+public class ReplayMemory : ProcessMemory
+{
+    private readonly record struct Record(RecordKind Kind, long Address, int Size, int Offset);
+
+    /// <summary>Stands in for the memory background work used while recording.</summary>
+    private sealed class UnrecordedMemory : ProcessMemory
+    {
+        protected override bool ReadCore(IntPtr address, byte[] buffer, int size)
+        {
+            Array.Clear(buffer, 0, size);
+            return false;
+        }
+
+        protected override bool WriteCore(IntPtr address, byte[] data) => false;
+
+        public override List<(IntPtr Address, int Size)> GetReadableRegions(long maxAddress = 0x7FFFFFFFFFFF) => new();
+    }
+
+    private readonly MemoryMappedFile _file;
+    private readonly MemoryMappedViewAccessor _view;
+    private readonly long _length;
+    private long _position;
+
+    // Current tick: its raw block, decoded records, their data, and the next record due
+    private byte[] _block = Array.Empty<byte>();
+    private readonly List<Record> _records = new();
+    private byte[] _data = new byte[4096];
+    private int _dataLength;
+    private int _cursor;
+    private long _lastAddress;
+
+    // Last value recorded per (address, size), up to the end of the current tick
+    private readonly Dictionary<(long Address, int Size), byte[]> _lastValues = new();
+
+    private bool _attached;
+    private IntPtr _exeBase;
+    private IntPtr _tomb1Base;
+
+    /// <summary>Ticks served so far.</summary>
+    public long Ticks { get; private set; }
+
+    /// <summary>Reads with no matching record left in their tick (the replay strayed from the recording).</summary>
+    public long Misses { get; private set; }
+
+    /// <summary>Text stored with RecordingMemory.RecordContext, once its tick has been reached.</summary>
+    public string? Context { get; private set; }
+
+    public ReplayMemory(string path)
+    {
+        _file = MemoryMappedFile.CreateFromFile(path, FileMode.Open, null, 0, MemoryMappedFileAccess.Read);
+        _view = _file.CreateViewAccessor(0, 0, MemoryMappedFileAccess.Read);
+        _length = new FileInfo(path).Length;
+
+        byte[] header = new byte[Magic.Length + 1];
+        _view.ReadArray(0, header, 0, header.Length);
+        if (!header.AsSpan(0, Magic.Length).SequenceEqual(Magic) || header[^1] != MemoryTrace.Version)
+            throw new InvalidDataException($"{path} is not a version {MemoryTrace.Version} memory trace");
+        _position = header.Length;
+    }
+
+    public override bool IsAttached => _attached;
+    public override IntPtr ExeBase => _exeBase;
+    public override IntPtr Tomb1Base => _tomb1Base;
+    public override ProcessMemory Background { get; } = new UnrecordedMemory();
+
+    /// <summary>
+    /// Moves on to the next tick of the trace. Returns false at the end of the
+    /// trace, after which the game reads as detached.
+    /// </summary>
+    public bool NextTick()
+    {
+        _records.Clear();
+        _dataLength = 0;
+        _cursor = 0;
+
+        if (_position >= _length)
+        {
+            _attached = false;
+            return false;
+        }
+
+        // Block length varint (at most 10 bytes), then the block itself
+        byte[] prefix = new byte[(int)Math.Min(10, _length - _position)];
+        _view.ReadArray(_position, prefix, 0, prefix.Length);
+        int prefixLength = 0;
+        int blockLength = (int)ReadVarint(prefix, ref prefixLength);
+        if (_block.Length < blockLength)
+            _block = new byte[Math.Max(blockLength, _block.Length * 2)];
+        _view.ReadArray(_position + prefixLength, _block, 0, blockLength);
+        _position += prefixLength + blockLength;
+
+        Decode(_block.AsSpan(0, blockLength));
+        Ticks++;
+        return true;
+    }
+
+    /// <summary>
+    /// Applies every attach of the current tick up to the one that found
+    /// tomb1.dll, so a replay can skip the watcher's attach retries (which wait
+    /// a second each). Returns whether tomb1.dll is now loaded.
+    /// </summary>
+    public bool SkipToAttached()
+    {
+        while (_tomb1Base == IntPtr.Zero && ApplyNextAttach(out _))
+        {
+        }
+        return _tomb1Base != IntPtr.Zero;
+    }
+
+    public override bool TryAttach() => ApplyNextAttach(out bool result) ? result : _attached;
+
+    public override bool RefreshTomb1Base() => ApplyNextAttach(out bool result) ? result : _tomb1Base != IntPtr.Zero;
+
+    protected override bool ReadCore(IntPtr address, byte[] buffer, int size)
+    {
+        var key = ((long)address, size);
+        int index = Find(key.Item1, size, write: false);
+        if (index >= 0)
+        {
+            _cursor = index + 1;
+            var record = _records[index];
+            if (record.Kind == RecordKind.ReadFailed)
+            {
+                Array.Clear(buffer, 0, size);
+                return false;
+            }
+            _data.AsSpan(record.Offset, size).CopyTo(buffer);
+            return true;
+        }
+
+        Misses++;
+        if (_lastValues.TryGetValue(key, out byte[]? value))
+        {
+            value.CopyTo(buffer, 0);
+            return true;
+        }
+        Array.Clear(buffer, 0, size);
+        return false;
+    }
+
+    protected override bool WriteCore(IntPtr address, byte[] data)
+    {
+        int index = Find((long)address, data.Length, write: true);
+        if (index >= 0)
+            _cursor = index + 1;
+        return true;
+    }
+
+    public override List<(IntPtr Address, int Size)> GetReadableRegions(long maxAddress = 0x7FFFFFFFFFFF)
+    {
+        var regions = new List<(IntPtr, int)>();
+        for (int i = _cursor; i < _records.Count; i++)
+        {
+            if (_records[i].Kind != RecordKind.Regions)
+                continue;
+
+            _cursor = i + 1;
+            ReadOnlySpan<byte> data = _data.AsSpan(_records[i].Offset);
+            int position = 0;
+            for (int region = 0; region < _records[i].Size; region++)
+            {
+                long regionAddress = BinaryPrimitives.ReadInt64LittleEndian(data[position..]);
+                position += 8;
+                regions.Add((new IntPtr(regionAddress), (int)ReadVarint(data, ref position)));
+            }
+            break;
+        }
+        return regions;
+    }
+
+    public override void Dispose()
+    {
+        _view.Dispose();
+        _file.Dispose();
+        base.Dispose();
+    }
+
+    /// <summary>Index of the first read (or write) record for this address and size from the cursor on, or -1.</summary>
+    private int Find(long address, int size, bool write)
+    {
+        for (int i = _cursor; i < _records.Count; i++)
+        {
+            var record = _records[i];
+            bool isWrite = record.Kind == RecordKind.Write;
+            bool isRead = record.Kind is RecordKind.Read or RecordKind.ReadRepeat or RecordKind.ReadFailed;
+            if ((write ? isWrite : isRead) && record.Address == address && record.Size == size)
+                return i;
+        }
+        return -1;
+    }
+
+    private bool ApplyNextAttach(out bool result)
+    {
+        for (int i = _cursor; i < _records.Count; i++)
+        {
+            if (_records[i].Kind != RecordKind.Attach)
+                continue;
+
+            _cursor = i + 1;
+            ReadOnlySpan<byte> data = _data.AsSpan(_records[i].Offset, 18);
+            result = data[0] != 0;
+            _attached = data[1] != 0;
+            _exeBase = new IntPtr(BinaryPrimitives.ReadInt64LittleEndian(data[2..]));
+            _tomb1Base = new IntPtr(BinaryPrimitives.ReadInt64LittleEndian(data[10..]));
+            return true;
+        }
+        result = false;
+        return false;
+    }
+
+    private void Decode(ReadOnlySpan<byte> block)
+    {
+        int position = 0;
+        while (position < block.Length)
+        {
+            var kind = (RecordKind)block[position++];
+            switch (kind)
+            {
+                case RecordKind.Read:
+                case RecordKind.ReadRepeat:
+                case RecordKind.ReadFailed:
+                case RecordKind.Write:
+                {
+                    long address = _lastAddress + UnZigZag(ReadVarint(block, ref position));
+                    int size = (int)ReadVarint(block, ref position);
+                    _lastAddress = address;
+
+                    var key = (address, size);
+                    int offset = _dataLength;
+                    if (kind is RecordKind.Read or RecordKind.Write)
+                    {
+                        AddData(block.Slice(position, size));
+                        position += size;
+                        if (kind == RecordKind.Read)
+                            _lastValues[key] = block.Slice(position - size, size).ToArray();
+                    }
+                    else if (kind == RecordKind.ReadRepeat)
+                    {
+                        AddData(_lastValues[key]);
+                    }
+                    _records.Add(new Record(kind, address, size, offset));
+                    break;
+                }
+                case RecordKind.Attach:
+                    _records.Add(new Record(kind, 0, 0, _dataLength));
+                    AddData(block.Slice(position, 18));
+                    position += 18;
+                    break;
+                case RecordKind.Regions:
+                {
+                    int count = (int)ReadVarint(block, ref position);
+                    int first = position;
+                    for (int region = 0; region < count; region++)
+                    {
+                        position += 8;
+                        ReadVarint(block, ref position);
+                    }
+                    _records.Add(new Record(kind, 0, count, _dataLength));
+                    AddData(block[first..position]);
+                    break;
+                }
+                case RecordKind.Context:
+                {
+                    int length = (int)ReadVarint(block, ref position);
+                    Context = Encoding.UTF8.GetString(block.Slice(position, length));
+                    position += length;
+                    break;
+                }
+                default:
+                    throw new InvalidDataException($"Unknown memory trace record kind {(byte)kind}");
+            }
+        }
+    }
+
+    private void AddData(ReadOnlySpan<byte> bytes)
+    {
+        if (_dataLength + bytes.Length > _data.Length)
+            Array.Resize(ref _data, Math.Max(_data.Length * 2, _dataLength + bytes.Length));
+        bytes.CopyTo(_data.AsSpan(_dataLength));
+        _dataLength += bytes.Length;
+    }
+}
@@ -28,6 +28,7 @@ public class SaveFileGameWatcher : IDisposable
     private readonly APSession _session;
     private readonly SaveFileReader _reader;
     private readonly SaveFileInventoryWriter _writer;
+    private readonly LevelSequence _levelSequence;
     private FileSystemWatcher? _fileWatcher;
 
     // State tracking
@@ -44,11 +45,24 @@ public class SaveFileGameWatcher : IDisposable
     // Cancellation for the async wait loop
     private CancellationTokenSource? _cts;
 
-    public SaveFileGameWatcher(APSession session, string saveFilePath)
+    public SaveFileGameWatcher(APSession session, string saveFilePath, LevelSequence? levelSequence = null)
     {
         _session = session;
         _reader = new SaveFileReader(saveFilePath);
         _writer = new SaveFileInventoryWriter(saveFilePath);
+        _levelSequence = levelSequence ?? LevelSequence.Vanilla;
+    }
+
+    /// <summary>
+    /// The LocationMapper index of the level played at a 1-based save level
+    /// index, which counts positions in the slot's level sequence.
+    /// </summary>
+    private int MapperIndex(int levelIndex) => _levelSequence.LevelAt(levelIndex - 1);
+
+    private string LevelName(int levelIndex)
+    {
+        int mapperIdx = MapperIndex(levelIndex);
+        return TR1RMemoryMap.LevelNames.GetValueOrDefault(mapperIdx >= 0 ? mapperIdx + 1 : levelIndex, $"Level {levelIndex}");
     }
 
     /// <summary>
@@ -83,7 +97,7 @@ public class SaveFileGameWatcher : IDisposable
         {
             _lastLevelIndex = _previousState.LevelIndex;
             _levelSecretStates[_previousState.LevelIndex] = _previousState.SecretsFound;
-            ConsoleUI.Info($"Current state: {_previousState.LevelName}, " +
+            ConsoleUI.Info($"Current state: {LevelName(_previousState.LevelIndex)}, " +
                           $"HP: {_previousState.Health}/{TR1RMemoryMap.MaxHealth}, " +
                           $"Secrets: {_previousState.SecretCount}");
         }
@@ -146,14 +160,18 @@ public class SaveFileGameWatcher : IDisposable
     {
         try
         {
-            var newState = _reader.ReadLatestSlot();
+            var newState = _reader.ReadLatestSlot(out int changedSlots);
             if (newState == null) return;
 
+            // Skip if no TR1 slot changed (e.g. a TR2/TR3 save in the shared file)
+            if (changedSlots == 0)
+                return;
+
             // Skip if this is the exact same save (no actual change)
             if (_previousState != null && newState.SaveNumber == _previousState.SaveNumber)
                 return;
 
-            ConsoleUI.Info($"Save #{newState.SaveNumber} detected - {newState.LevelName}, " +
+            ConsoleUI.Info($"Save #{newState.SaveNumber} detected - {LevelName(newState.LevelIndex)}, " +
                           $"HP: {newState.Health}/{TR1RMemoryMap.MaxHealth}");
 
             DetectLevelChange(newState);
@@ -182,20 +200,19 @@ public class SaveFileGameWatcher : IDisposable
         // Player moved to a new level — mark the previous level as complete
         if (!_completedLevels.Contains(_lastLevelIndex))
         {
-            // Convert 1-based save index to 0-based LocationMapper index
-            int mapperIdx = _lastLevelIndex - 1;
+            int mapperIdx = MapperIndex(_lastLevelIndex);
             if (mapperIdx >= 0)
             {
                 long locId = LocationMapper.GetLevelCompleteId(mapperIdx);
                 _session.SendLocationCheck(locId);
                 _completedLevels.Add(_lastLevelIndex);
 
-                string prevName = TR1RMemoryMap.LevelNames.GetValueOrDefault(_lastLevelIndex, $"Level {_lastLevelIndex}");
+                string prevName = LevelName(_lastLevelIndex);
                 ConsoleUI.Success($"Completed: {prevName}");
             }
         }
 
-        ConsoleUI.LevelChange(newState.LevelName);
+        ConsoleUI.LevelChange(LevelName(newState.LevelIndex));
 
         // Reset per-level secret tracking for the new level if we haven't seen it
         if (!_levelSecretStates.ContainsKey(newState.LevelIndex))
@@ -217,7 +234,7 @@ public class SaveFileGameWatcher : IDisposable
 
         // Find newly discovered secrets (bits that are set now but weren't before)
         ushort newBits = (ushort)(currentSecrets & ~previousSecrets);
-        int mapperIdx = level - 1; // 0-based for LocationMapper
+        int mapperIdx = MapperIndex(level);
 
         for (int s = 0; s < 16; s++)
         {
@@ -229,7 +246,7 @@ public class SaveFileGameWatcher : IDisposable
                     _session.SendLocationCheck(secretLocId);
                 }
 
-                ConsoleUI.SecretFound(s + 1, newState.LevelName);
+                ConsoleUI.SecretFound(s + 1, LevelName(level));
             }
         }
 
@@ -1,3 +1,6 @@
+using System.Buffers;
+using System.Buffers.Binary;
+
 namespace TRArchipelagoClient.GameInterface;
 
 /// <summary>
@@ -65,10 +68,32 @@ public class SaveSlotState
 ///
 /// The savegame.dat file is shared across TR1/TR2/TR3 Remastered.
 /// TR1 saves occupy offsets 0x2000 to 0x72000, with each slot being 0x3800 bytes.
+///
+/// Every read pulls the whole TR1 region in with one file read, into a pooled
+/// buffer, and fingerprints each slot's decoded fields. Only slots whose
+/// fingerprint changed since the last read are decoded again (a save changes
+/// one slot); the others are served from the previous read. ChangedSlots
+/// lists them.
 /// </summary>
 public class SaveFileReader
 {
+    private const int RegionSize = TR1RMemoryMap.SaveFileMaxOffset - TR1RMemoryMap.SaveFileBaseOffset;
+
+    // Bytes of a slot that SaveSlotState is decoded from, besides health
+    // (whose offset depends on the level): the header, the inventory and the statistics
+    private static readonly (int Offset, int Length)[] DecodedRanges =
+    {
+        (0, TR1RMemoryMap.Save_Number + sizeof(int)),
+        (TR1RMemoryMap.Save_MagnumAmmo, TR1RMemoryMap.Save_WeaponsConfig + 1 - TR1RMemoryMap.Save_MagnumAmmo),
+        (TR1RMemoryMap.Save_TimeTaken, TR1RMemoryMap.Save_LevelIndex + 1 - TR1RMemoryMap.Save_TimeTaken),
+    };
+
     private readonly string _saveFilePath;
+    private readonly object _lock = new();
+
+    // Per slot, as of the last read: fingerprint and decoded state (null if empty)
+    private readonly int[] _fingerprints = new int[TR1RMemoryMap.MaxSaveSlots];
+    private readonly SaveSlotState?[] _slots = new SaveSlotState?[TR1RMemoryMap.MaxSaveSlots];
 
     public SaveFileReader(string saveFilePath)
     {
@@ -78,53 +103,45 @@ public class SaveFileReader
     public bool SaveFileExists => File.Exists(_saveFilePath);
     public string SaveFilePath => _saveFilePath;
 
+    /// <summary>
+    /// 0-based slots whose state changed at the last read (saved to, emptied,
+    /// or edited by SaveFileInventoryWriter), ascending. At the first read,
+    /// every occupied slot. Empty if the last read failed.
+    /// </summary>
+    public IReadOnlyList<int> ChangedSlots { get; private set; } = Array.Empty<int>();
+
     /// <summary>
     /// Reads the most recent TR1 save slot (highest save number).
     /// Returns null if no occupied TR1 save slots are found.
     /// </summary>
-    public SaveSlotState? ReadLatestSlot()
-    {
-        if (!File.Exists(_saveFilePath))
-            return null;
+    public SaveSlotState? ReadLatestSlot() => ReadLatestSlot(out _);
 
-        try
+    /// <summary>
+    /// ReadLatestSlot, also giving the number of slots this read found changed
+    /// (ChangedSlots.Count, taken under the same lock, so another thread's read
+    /// can't replace it in between).
+    /// </summary>
+    public SaveSlotState? ReadLatestSlot(out int changedSlots)
+    {
+        lock (_lock)
         {
-            using var fs = new FileStream(_saveFilePath, FileMode.Open, FileAccess.Read, FileShare.ReadWrite);
-            using var reader = new BinaryReader(fs);
-
-            if (fs.Length < TR1RMemoryMap.SaveFileBaseOffset)
+            bool read = Refresh();
+            changedSlots = ChangedSlots.Count;
+            if (!read)
                 return null;
 
             SaveSlotState? latest = null;
             int highestSaveNum = -1;
-
-            for (int i = 0; i < TR1RMemoryMap.MaxSaveSlots; i++)
+            foreach (var slot in _slots)
             {
-                int slotBase = TR1RMemoryMap.SaveFileBaseOffset + (i * TR1RMemoryMap.SaveSlotSize);
-
-                if (slotBase + TR1RMemoryMap.SaveSlotSize > TR1RMemoryMap.SaveFileMaxOffset)
-                    break;
-
-                fs.Seek(slotBase + TR1RMemoryMap.Save_SlotStatus, SeekOrigin.Begin);
-                byte status = reader.ReadByte();
-                if (status != 1) continue;
-
-                fs.Seek(slotBase + TR1RMemoryMap.Save_Number, SeekOrigin.Begin);
-                int saveNum = reader.ReadInt32();
-
-                if (saveNum > highestSaveNum)
+                if (slot != null && slot.SaveNumber > highestSaveNum)
                 {
-                    highestSaveNum = saveNum;
-                    latest = ReadSlot(reader, fs, slotBase, i);
+                    highestSaveNum = slot.SaveNumber;
+                    latest = slot;
                 }
             }
-
             return latest;
         }
-        catch (IOException)
-        {
-            return null;
-        }
     }
 
     /// <summary>
@@ -132,31 +149,12 @@ public class SaveFileReader
     /// </summary>
     public List<SaveSlotState> ReadAllSlots()
     {
-        var slots = new List<SaveSlotState>();
-        if (!File.Exists(_saveFilePath))
-            return slots;
-
-        try
+        lock (_lock)
         {
-            using var fs = new FileStream(_saveFilePath, FileMode.Open, FileAccess.Read, FileShare.ReadWrite);
-            using var reader = new BinaryReader(fs);
-
-            for (int i = 0; i < TR1RMemoryMap.MaxSaveSlots; i++)
-            {
-                int slotBase = TR1RMemoryMap.SaveFileBaseOffset + (i * TR1RMemoryMap.SaveSlotSize);
-                if (slotBase + TR1RMemoryMap.SaveSlotSize > TR1RMemoryMap.SaveFileMaxOffset)
-                    break;
-
-                fs.Seek(slotBase + TR1RMemoryMap.Save_SlotStatus, SeekOrigin.Begin);
-                byte status = reader.ReadByte();
-                if (status != 1) continue;
-
-                slots.Add(ReadSlot(reader, fs, slotBase, i));
-            }
+            if (!Refresh())
+                return new List<SaveSlotState>();
+            return _slots.OfType<SaveSlotState>().ToList();
         }
-        catch (IOException) { }
-
-        return slots;
     }
 
     /// <summary>
@@ -165,86 +163,116 @@ public class SaveFileReader
     /// </summary>
     public SaveSlotState? ReadSlot(int slotIndex)
     {
-        if (!File.Exists(_saveFilePath) || slotIndex < 0 || slotIndex >= TR1RMemoryMap.MaxSaveSlots)
+        if (slotIndex < 0 || slotIndex >= TR1RMemoryMap.MaxSaveSlots)
             return null;
 
+        lock (_lock)
+        {
+            return Refresh() ? _slots[slotIndex] : null;
+        }
+    }
+
+    /// <summary>
+    /// Reads the TR1 region and re-decodes the slots whose fingerprint changed.
+    /// Returns false (changing nothing) if the file could not be read.
+    /// </summary>
+    private bool Refresh()
+    {
+        ChangedSlots = Array.Empty<int>();
+        if (!File.Exists(_saveFilePath))
+            return false;
+
+        byte[] region = ArrayPool<byte>.Shared.Rent(RegionSize);
         try
         {
-            using var fs = new FileStream(_saveFilePath, FileMode.Open, FileAccess.Read, FileShare.ReadWrite);
-            using var reader = new BinaryReader(fs);
+            int length = 0;
+            using (var file = File.OpenHandle(_saveFilePath, FileMode.Open, FileAccess.Read, FileShare.ReadWrite))
+            {
+                int read;
+                while (length < RegionSize
+                    && (read = RandomAccess.Read(file, region.AsSpan(length, RegionSize - length), TR1RMemoryMap.SaveFileBaseOffset + length)) > 0)
+                    length += read;
+            }
 
-            int slotBase = TR1RMemoryMap.SaveFileBaseOffset + (slotIndex * TR1RMemoryMap.SaveSlotSize);
-            if (slotBase + TR1RMemoryMap.SaveSlotSize > TR1RMemoryMap.SaveFileMaxOffset)
-                return null;
+            var changed = new List<int>();
+            for (int i = 0; i < TR1RMemoryMap.MaxSaveSlots; i++)
+            {
+                int slotBase = i * TR1RMemoryMap.SaveSlotSize;
+                if (slotBase + TR1RMemoryMap.SaveSlotSize > RegionSize)
+                    break;
+
+                // A slot cut short by the end of the file counts as empty
+                ReadOnlySpan<byte> slot = slotBase + TR1RMemoryMap.SaveSlotSize <= length
+                    ? region.AsSpan(slotBase, TR1RMemoryMap.SaveSlotSize)
+                    : ReadOnlySpan<byte>.Empty;
+                bool occupied = !slot.IsEmpty && slot[TR1RMemoryMap.Save_SlotStatus] == 1;
+                int fingerprint = occupied ? Fingerprint(slot) : 0;
 
-            fs.Seek(slotBase + TR1RMemoryMap.Save_SlotStatus, SeekOrigin.Begin);
-            byte status = reader.ReadByte();
-            if (status != 1) return null;
+                if (occupied == (_slots[i] != null) && fingerprint == _fingerprints[i])
+                    continue;
 
-            return ReadSlot(reader, fs, slotBase, slotIndex);
+                _fingerprints[i] = fingerprint;
+                _slots[i] = occupied ? DecodeSlot(slot, i) : null;
+                changed.Add(i);
+            }
+
+            ChangedSlots = changed;
+            return true;
         }
         catch (IOException)
         {
-            return null;
+            return false;
         }
+        finally
+        {
+            ArrayPool<byte>.Shared.Return(region);
+        }
+    }
+
+    private static int Fingerprint(ReadOnlySpan<byte> slot)
+    {
+        var hash = new HashCode();
+        foreach (var (offset, length) in DecodedRanges)
+            hash.AddBytes(slot.Slice(offset, length));
+
+        int healthOffset = TR1RMemoryMap.GetSaveHealthOffset(slot[TR1RMemoryMap.Save_LevelIndex]);
+        if (healthOffset > 0)
+            hash.AddBytes(slot.Slice(healthOffset, sizeof(ushort)));
+        return hash.ToHashCode();
     }
 
-    private static SaveSlotState ReadSlot(BinaryReader reader, FileStream fs, int slotBase, int slotIndex)
+    private static SaveSlotState DecodeSlot(ReadOnlySpan<byte> slot, int slotIndex)
     {
-        byte levelIndex = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_LevelIndex);
+        byte levelIndex = slot[TR1RMemoryMap.Save_LevelIndex];
 
         ushort health = 0;
         int healthOffset = TR1RMemoryMap.GetSaveHealthOffset(levelIndex);
         if (healthOffset > 0)
         {
-            health = ReadUInt16At(reader, fs, slotBase + healthOffset);
+            health = BinaryPrimitives.ReadUInt16LittleEndian(slot[healthOffset..]);
         }
 
         return new SaveSlotState
         {
             SlotIndex = slotIndex,
-            SaveNumber = ReadInt32At(reader, fs, slotBase + TR1RMemoryMap.Save_Number),
-            GameMode = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_GameMode),
+            SaveNumber = BinaryPrimitives.ReadInt32LittleEndian(slot[TR1RMemoryMap.Save_Number..]),
+            GameMode = slot[TR1RMemoryMap.Save_GameMode],
             LevelIndex = levelIndex,
             Health = health,
-            SecretsFound = ReadUInt16At(reader, fs, slotBase + TR1RMemoryMap.Save_SecretsFound),
-            Pickups = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_Pickups),
-            SmallMedipacks = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_SmallMedipacks),
-            LargeMedipacks = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_LargeMedipacks),
-            MagnumAmmo = ReadUInt16At(reader, fs, slotBase + TR1RMemoryMap.Save_MagnumAmmo),
-            UziAmmo = ReadUInt16At(reader, fs, slotBase + TR1RMemoryMap.Save_UziAmmo),
-            ShotgunAmmo = ReadUInt16At(reader, fs, slotBase + TR1RMemoryMap.Save_ShotgunAmmo),
-            WeaponsConfig = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_WeaponsConfig),
-            Kills = ReadInt32At(reader, fs, slotBase + TR1RMemoryMap.Save_Kills),
-            TimeTaken = ReadInt32At(reader, fs, slotBase + TR1RMemoryMap.Save_TimeTaken),
-            AmmoUsed = ReadInt32At(reader, fs, slotBase + TR1RMemoryMap.Save_AmmoUsed),
-            Hits = ReadInt32At(reader, fs, slotBase + TR1RMemoryMap.Save_Hits),
-            Distance = ReadUInt32At(reader, fs, slotBase + TR1RMemoryMap.Save_Distance),
-            MedipacksUsed = ReadByteAt(reader, fs, slotBase + TR1RMemoryMap.Save_MedipacksUsed),
+            SecretsFound = BinaryPrimitives.ReadUInt16LittleEndian(slot[TR1RMemoryMap.Save_SecretsFound..]),
+            Pickups = slot[TR1RMemoryMap.Save_Pickups],
+            SmallMedipacks = slot[TR1RMemoryMap.Save_SmallMedipacks],
+            LargeMedipacks = slot[TR1RMemoryMap.Save_LargeMedipacks],
+            MagnumAmmo = BinaryPrimitives.ReadUInt16LittleEndian(slot[TR1RMemoryMap.Save_MagnumAmmo..]),
+            UziAmmo = BinaryPrimitives.ReadUInt16LittleEndian(slot[TR1RMemoryMap.Save_UziAmmo..]),
+            ShotgunAmmo = BinaryPrimitives.ReadUInt16LittleEndian(slot[TR1RMemoryMap.Save_ShotgunAmmo..]),
+            WeaponsConfig = slot[TR1RMemoryMap.Save_WeaponsConfig],
+            Kills = BinaryPrimitives.ReadInt32LittleEndian(slot[TR1RMemoryMap.Save_Kills..]),
+            TimeTaken = BinaryPrimitives.ReadInt32LittleEndian(slot[TR1RMemoryMap.Save_TimeTaken..]),
+            AmmoUsed = BinaryPrimitives.ReadInt32LittleEndian(slot[TR1RMemoryMap.Save_AmmoUsed..]),
+            Hits = BinaryPrimitives.ReadInt32LittleEndian(slot[TR1RMemoryMap.Save_Hits..]),
+            Distance = BinaryPrimitives.ReadUInt32LittleEndian(slot[TR1RMemoryMap.Save_Distance..]),
+            MedipacksUsed = slot[TR1RMemoryMap.Save_MedipacksUsed],
         };
     }
-
-    private static byte ReadByteAt(BinaryReader reader, FileStream fs, int offset)
-    {
-        fs.Seek(offset, SeekOrigin.Begin);
-        return reader.ReadByte();
-    }
-
-    private static ushort ReadUInt16At(BinaryReader reader, FileStream fs, int offset)
-    {
-        fs.Seek(offset, SeekOrigin.Begin);
-        return reader.ReadUInt16();
-    }
-
-    private static int ReadInt32At(BinaryReader reader, FileStream fs, int offset)
-    {
-        fs.Seek(offset, SeekOrigin.Begin);
-        return reader.ReadInt32();
-    }
-
-    private static uint ReadUInt32At(BinaryReader reader, FileStream fs, int offset)
-    {
-        fs.Seek(offset, SeekOrigin.Begin);
-        return reader.ReadUInt32();
-    }
 }
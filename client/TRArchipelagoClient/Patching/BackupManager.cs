@@ -1,13 +1,21 @@
+using TRArchipelagoClient.Core;
+
 namespace TRArchipelagoClient.Patching;
 
 /// <summary>
 /// Manages backup and restoration of original level files.
 /// Creates backups before patching, restores on session end.
+/// For a shuffled level order it also moves levels between file names
+/// (PlaceLevels), recording where each one is so later sessions and
+/// RestoreAll can put them back.
 /// </summary>
 public class BackupManager
 {
     private const string BackupSuffix = ".apbak";
 
+    // Which level's files each level file name holds, when not its own
+    private const string PlacementFile = "APLEVELORDER.txt";
+
     private readonly string _gameDir;
 
     // TR1 level file extensions to backup
@@ -83,9 +91,71 @@ public class BackupManager
             }
         }
 
+        File.Delete(Path.Combine(dataDir, PlacementFile));
         Console.WriteLine($"[Backup] Restored {count} files.");
     }
 
+    /// <summary>
+    /// Puts the original files of the level played at each position of the
+    /// sequence in place of the vanilla level at that position, so the game,
+    /// which plays its files in the vanilla order, plays the levels in the
+    /// sequence's. Only file names whose level changed since the last
+    /// placement are copied. Call after BackupAll; the files copied in are
+    /// unpatched.
+    /// </summary>
+    public void PlaceLevels(LevelSequence sequence)
+    {
+        string dataDir = FindDataDir();
+        if (dataDir == null) return;
+
+        string placementPath = Path.Combine(dataDir, PlacementFile);
+        int[] placed = ReadPlacement(placementPath);
+
+        int count = 0;
+        for (int position = 0; position < LevelFiles.Length; position++)
+        {
+            int level = sequence.LevelAt(position);
+            if (placed[position] == level)
+                continue;
+
+            foreach (string ext in LevelExtensions)
+            {
+                string source = Path.Combine(dataDir, LevelFiles[level] + ext);
+                if (File.Exists(source + BackupSuffix))
+                    source += BackupSuffix;
+                if (File.Exists(source))
+                {
+                    File.Copy(source, Path.Combine(dataDir, LevelFiles[position] + ext), overwrite: true);
+                    count++;
+                }
+            }
+            placed[position] = level;
+        }
+
+        if (sequence.IsVanilla)
+            File.Delete(placementPath);
+        else
+            File.WriteAllText(placementPath, string.Join(",", placed));
+        if (count > 0)
+            Console.WriteLine($"[Backup] Placed {count} files for the level order.");
+    }
+
+    /// <summary>The level at each position after the last PlaceLevels (each its own if none).</summary>
+    private static int[] ReadPlacement(string path)
+    {
+        int[] placed = Enumerable.Range(0, LevelFiles.Length).ToArray();
+        if (!File.Exists(path))
+            return placed;
+
+        string[] fields = File.ReadAllText(path).Trim().Split(',');
+        for (int position = 0; position < Math.Min(fields.Length, placed.Length); position++)
+        {
+            // An unreadable entry forces that file name to be copied again
+            placed[position] = int.TryParse(fields[position], out int level) ? level : -1;
+        }
+        return placed;
+    }
+
     /// <summary>
     /// Check if backups exist (indicates a previous patching session).
     /// </summary>
@@ -110,6 +180,18 @@ public class BackupManager
         return File.Exists(path) ? path : null;
     }
 
+    /// <summary>
+    /// Get the path to the unpatched content of a level file: its backup if
+    /// there is one, otherwise the level file itself.
+    /// </summary>
+    public string GetOriginalLevelPath(string levelFile)
+    {
+        string path = GetLevelPath(levelFile);
+        if (path == null) return null;
+        string backup = path + BackupSuffix;
+        return File.Exists(backup) ? backup : path;
+    }
+
     /// <summary>
     /// Find the data directory containing level files.
     /// TR1-3 Remastered stores levels in a subdirectory structure.
@@ -0,0 +1,170 @@
+using System.Security.Cryptography;
+using Newtonsoft.Json;
+
+namespace TRArchipelagoClient.Patching;
+
+/// <summary>
+/// Where a TR1 level's entity table starts, so LevelPatcher can rewrite entity
+/// types in place instead of re-serializing the whole level.
+///
+/// Locate walks the chunk layout of TR1LevelControl.Read, skipping every chunk
+/// by its length prefix, and must stay in sync with it (tools/phd.py walks the
+/// same layout). Each entity is 22 bytes with its type as the first Int16.
+/// </summary>
+public record EntityTableIndex(long Offset, int Count)
+{
+    public const int EntitySize = 22;
+    private const uint TR1FileVersion = 0x20;
+    private const int TexturePageSize = 256 * 256;
+
+    // Fixed-size records after a u32 count, from the mesh pointers to the sound sources
+    private static readonly int[] SkippedRecordSizes =
+    {
+        4,  // mesh pointers
+        32, // animations
+        6,  // state changes
+        8,  // anim dispatches
+        2,  // anim commands
+        4,  // mesh trees
+        2,  // frames
+        18, // models
+        32, // static meshes
+        20, // object textures
+        16, // sprite textures
+        8,  // sprite sequences
+        16, // cameras
+        16, // sound sources
+    };
+
+    /// <summary>
+    /// Finds the entity table in a .PHD file.
+    /// Throws InvalidDataException if it is not a TR1 level or is truncated.
+    /// </summary>
+    public static EntityTableIndex Locate(string levelPath)
+    {
+        using var stream = File.OpenRead(levelPath);
+        using var reader = new BinaryReader(stream);
+
+        uint version = reader.ReadUInt32();
+        if (version != TR1FileVersion)
+            throw new InvalidDataException($"unexpected level version 0x{version:X}");
+
+        Skip(reader, (long)reader.ReadUInt32() * TexturePageSize);
+        Skip(reader, 4); // level number
+
+        ushort numRooms = reader.ReadUInt16();
+        for (int i = 0; i < numRooms; i++)
+        {
+            Skip(reader, 16);                               // room info
+            Skip(reader, (long)reader.ReadUInt32() * 2);    // room mesh
+            Skip(reader, reader.ReadUInt16() * 32);         // portals
+            int numZ = reader.ReadUInt16(), numX = reader.ReadUInt16();
+            Skip(reader, numZ * numX * 8);                  // sectors
+            Skip(reader, 2);                                // ambient intensity
+            Skip(reader, reader.ReadUInt16() * 18);         // lights
+            Skip(reader, reader.ReadUInt16() * 18);         // static meshes
+            Skip(reader, 4);                                // alternate room, flags
+        }
+
+        Skip(reader, (long)reader.ReadUInt32() * 2); // floor data
+        Skip(reader, (long)reader.ReadUInt32() * 2); // object mesh data
+        foreach (int size in SkippedRecordSizes)
+            Skip(reader, (long)reader.ReadUInt32() * size);
+
+        uint numBoxes = reader.ReadUInt32();
+        Skip(reader, numBoxes * 20L);                  // boxes
+        Skip(reader, (long)reader.ReadUInt32() * 2);   // overlaps
+        Skip(reader, numBoxes * 2L * 6);               // zones
+        Skip(reader, (long)reader.ReadUInt32() * 2);   // animated textures
+
+        int count = (int)reader.ReadUInt32();
+        long offset = stream.Position;
+        if (offset + (long)count * EntitySize > stream.Length)
+            throw new InvalidDataException("entity table runs past the end of the file");
+
+        return new EntityTableIndex(offset, count);
+    }
+
+    private static void Skip(BinaryReader reader, long size)
+    {
+        Stream stream = reader.BaseStream;
+        if (stream.Position + size > stream.Length)
+            throw new InvalidDataException("unexpected end of file");
+        stream.Seek(size, SeekOrigin.Current);
+    }
+
+    public static string HashFile(string path)
+    {
+        using var stream = File.OpenRead(path);
+        return Convert.ToHexString(SHA256.HashData(stream));
+    }
+}
+
+/// <summary>
+/// EntityTableIndex per level file content, kept in a local JSON file so
+/// re-patching after a reconnect doesn't walk the levels again.
+/// Keyed by the SHA-256 of the file: an in-place patch only changes entity
+/// types, so both the original and the patched content map to the same index.
+/// </summary>
+public class EntityIndexCache
+{
+    private readonly string _filePath;
+    private readonly Dictionary<string, EntityTableIndex> _indexes;
+    private bool _dirty;
+
+    public EntityIndexCache()
+    {
+        _filePath = Path.Combine(AppContext.BaseDirectory, "tr1r_ap_level_index.json");
+        _indexes = new();
+
+        if (File.Exists(_filePath))
+        {
+            try
+            {
+                _indexes = JsonConvert.DeserializeObject<Dictionary<string, EntityTableIndex>>(
+                    File.ReadAllText(_filePath)) ?? new();
+            }
+            catch (Exception ex) when (ex is JsonException or IOException)
+            {
+                Console.WriteLine($"[Patcher] Ignoring unreadable level index cache: {ex.Message}");
+            }
+        }
+    }
+
+    /// <summary>
+    /// The entity table of a level file, located on first sight of its content.
+    /// Returns the file's hash alongside, for Add after patching.
+    /// </summary>
+    public EntityTableIndex GetOrLocate(string levelPath, out string hash)
+    {
+        hash = EntityTableIndex.HashFile(levelPath);
+        if (_indexes.TryGetValue(hash, out var index))
+            return index;
+
+        index = EntityTableIndex.Locate(levelPath);
+        Add(hash, index);
+        return index;
+    }
+
+    public void Add(string hash, EntityTableIndex index)
+    {
+        _indexes[hash] = index;
+        _dirty = true;
+    }
+
+    public void Save()
+    {
+        if (!_dirty)
+            return;
+
+        try
+        {
+            File.WriteAllText(_filePath, JsonConvert.SerializeObject(_indexes, Formatting.Indented));
+            _dirty = false;
+        }
+        catch (IOException ex)
+        {
+            Console.WriteLine($"[Patcher] Failed to save level index cache: {ex.Message}");
+        }
+    }
+}
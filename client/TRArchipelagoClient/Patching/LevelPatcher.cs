@@ -1,3 +1,4 @@
+using System.IO.MemoryMappedFiles;
 using TRArchipelagoClient.Core;
 using TRLevelControl;
 using TRLevelControl.Helpers;
@@ -5,15 +6,29 @@ using TRLevelControl.Model;
 
 namespace TRArchipelagoClient.Patching;
 
+/// <summary>
+/// How LevelPatcher writes the sentinel types.
+/// InPlace rewrites only the 2-byte type of each affected entity; FullWrite
+/// reads and re-serializes the whole level through TR1LevelControl.
+/// </summary>
+public enum PatchMode
+{
+    InPlace,
+    FullWrite,
+}
+
 /// <summary>
 /// Patches TR1 level files for Archipelago multiworld.
 /// Replaces randomizable pickups with SmallMed_S_P (universal sentinel)
 /// and records entity-to-AP-location mappings.
+/// With a shuffled level order, each level is first put in place of the
+/// vanilla level at its position, and patched there with its own location IDs.
 /// </summary>
 public class LevelPatcher
 {
     private readonly string _gameDir;
     private readonly APSession _session;
+    private readonly LevelSequence _sequence;
     private readonly BackupManager _backupManager;
 
     // Mapping of (levelFile, entityIndex) -> AP location ID
@@ -29,28 +44,36 @@ public class LevelPatcher
     // Player picks up a "small medipack" visually, but the real AP item is determined by the server.
     private const TR1Type SentinelType = TR1Type.SmallMed_S_P;
 
-    public LevelPatcher(string gameDir, APSession session)
+    private readonly PatchMode _mode;
+    private readonly EntityIndexCache _indexCache = new();
+
+    public LevelPatcher(string gameDir, APSession session, LevelSequence? sequence = null, PatchMode mode = PatchMode.InPlace)
     {
         _gameDir = gameDir;
         _session = session;
+        _sequence = sequence ?? LevelSequence.Vanilla;
+        _mode = mode;
         _backupManager = new BackupManager(gameDir);
     }
 
     public BackupManager BackupManager => _backupManager;
 
     /// <summary>
-    /// Backup original files, then scan and patch all level files.
+    /// Backup original files, place the levels in the slot's order, then scan
+    /// and patch all level files.
     /// </summary>
     public void PatchAll()
     {
         _backupManager.BackupAll();
+        _backupManager.PlaceLevels(_sequence);
 
         var levels = TR1LevelNames.AsList;
 
-        for (int levelIdx = 0; levelIdx < levels.Count; levelIdx++)
+        for (int position = 0; position < levels.Count; position++)
         {
+            int levelIdx = _sequence.LevelAt(position);
             string levelFile = levels[levelIdx];
-            string levelPath = _backupManager.GetLevelPath(levelFile);
+            string levelPath = _backupManager.GetLevelPath(levels[position]);
 
             if (levelPath == null)
             {
@@ -60,13 +83,50 @@ public class LevelPatcher
 
             PatchLevel(levelFile, levelPath, levelIdx);
         }
+
+        _indexCache.Save();
     }
 
     /// <summary>
     /// Scan and patch a single level file.
     /// Replaces all pickup/key item entities with SmallMed_S_P sentinel.
+    /// In-place mode falls back to a full rewrite if the entity table can't be located.
     /// </summary>
     private void PatchLevel(string levelFile, string levelPath, int levelIndex)
+    {
+        if (_mode == PatchMode.InPlace)
+        {
+            try
+            {
+                var index = _indexCache.GetOrLocate(levelPath, out string hash);
+                var mapping = PatchEntityTypes(levelPath, index, levelIndex, out int written);
+
+                // The patched content has a new hash but the same layout
+                if (written > 0)
+                    _indexCache.Add(EntityTableIndex.HashFile(levelPath), index);
+
+                Console.WriteLine(written > 0
+                    ? $"[Patcher] {levelFile}: patched {written} pickups in place"
+                    : $"[Patcher] {levelFile}: already patched ({mapping.Count} pickups)");
+                _locationMappings[levelFile] = mapping;
+                return;
+            }
+            catch (Exception ex) when (ex is InvalidDataException or IOException)
+            {
+                Console.WriteLine($"[Patcher] {levelFile}: in-place patch failed ({ex.Message}), rewriting level");
+            }
+        }
+
+        var entityMapping = RewriteLevel(levelFile, levelPath, levelIndex);
+        if (entityMapping != null)
+            _locationMappings[levelFile] = entityMapping;
+    }
+
+    /// <summary>
+    /// Reads the level through TR1LevelControl, replaces trackable entities with
+    /// the sentinel and writes the whole level back. Returns null if it can't be read.
+    /// </summary>
+    private static Dictionary<int, long>? RewriteLevel(string levelFile, string levelPath, int levelIndex)
     {
         var control = new TR1LevelControl();
         TR1Level level;
@@ -78,7 +138,7 @@ public class LevelPatcher
         catch (Exception ex)
         {
             Console.WriteLine($"[Patcher] Failed to read {levelFile}: {ex.Message}");
-            return;
+            return null;
         }
 
         var entityMapping = new Dictionary<int, long>();
@@ -115,7 +175,94 @@ public class LevelPatcher
             }
         }
 
-        _locationMappings[levelFile] = entityMapping;
+        return entityMapping;
+    }
+
+    /// <summary>
+    /// Rewrites only the type field of trackable entities, through a memory-mapped
+    /// view of the entity table. Entities already holding the sentinel are left
+    /// alone, so re-patching an already patched level writes nothing.
+    /// </summary>
+    private static Dictionary<int, long> PatchEntityTypes(string levelPath, EntityTableIndex index, int levelIndex, out int written)
+    {
+        var entityMapping = new Dictionary<int, long>();
+        written = 0;
+
+        using var file = MemoryMappedFile.CreateFromFile(levelPath, FileMode.Open, null, 0, MemoryMappedFileAccess.ReadWrite);
+        using var view = file.CreateViewAccessor(index.Offset, (long)index.Count * EntityTableIndex.EntitySize);
+
+        for (int i = 0; i < index.Count; i++)
+        {
+            long position = (long)i * EntityTableIndex.EntitySize;
+            var type = (TR1Type)view.ReadInt16(position);
+            if (!_trackableTypes.Contains(type))
+                continue;
+
+            entityMapping[i] = LocationMapper.GetPickupLocationId(levelIndex, i);
+            if (type != SentinelType)
+            {
+                view.Write(position, (short)SentinelType);
+                written++;
+            }
+        }
+
+        view.Flush();
+        return entityMapping;
+    }
+
+    /// <summary>
+    /// Patches a copy of each original level both ways (full rewrite and in place)
+    /// and compares the results byte for byte. Returns false if any level differs.
+    /// </summary>
+    public static bool VerifyInPlacePatching(string gameDir)
+    {
+        var backupManager = new BackupManager(gameDir);
+        var levels = TR1LevelNames.AsList;
+        string tempDir = Path.Combine(Path.GetTempPath(), $"tr1r_ap_verify_{Environment.ProcessId}");
+        Directory.CreateDirectory(tempDir);
+        bool identical = true;
+
+        try
+        {
+            for (int levelIdx = 0; levelIdx < levels.Count; levelIdx++)
+            {
+                string levelFile = levels[levelIdx];
+                string? original = backupManager.GetOriginalLevelPath(levelFile);
+                if (original == null)
+                {
+                    Console.WriteLine($"[Verify] {levelFile}: not found, skipped");
+                    continue;
+                }
+
+                string rewritten = Path.Combine(tempDir, levelFile + ".rewrite");
+                string inPlace = Path.Combine(tempDir, levelFile + ".inplace");
+                File.Copy(original, rewritten, overwrite: true);
+                File.Copy(original, inPlace, overwrite: true);
+
+                var expected = RewriteLevel(levelFile, rewritten, levelIdx);
+                var actual = PatchEntityTypes(inPlace, EntityTableIndex.Locate(inPlace), levelIdx, out _);
+
+                byte[] a = File.ReadAllBytes(rewritten), b = File.ReadAllBytes(inPlace);
+                int firstDiff = a.AsSpan().CommonPrefixLength(b);
+                bool sameMapping = expected != null && expected.Count == actual.Count && !expected.Except(actual).Any();
+                if (firstDiff == a.Length && a.Length == b.Length && sameMapping)
+                {
+                    Console.WriteLine($"[Verify] {levelFile}: identical ({actual.Count} pickups)");
+                    continue;
+                }
+
+                identical = false;
+                Console.WriteLine(sameMapping
+                    ? $"[Verify] {levelFile}: DIFFERS at byte 0x{firstDiff:X} ({a.Length} vs {b.Length} bytes)"
+                    : $"[Verify] {levelFile}: location mappings differ");
+            }
+        }
+        finally
+        {
+            Directory.Delete(tempDir, recursive: true);
+        }
+
+        return identical;
     }
 
     /// <summary>
@@ -1,3 +1,4 @@
+using Newtonsoft.Json;
 using TRArchipelagoClient.Core;
 using TRArchipelagoClient.GameInterface;
 using TRArchipelagoClient.Patching;
@@ -48,6 +49,15 @@ class Program
             return;
         }
 
+        // --record <trace>: save every memory read of this session for the replay test
+        string? tracePath = null;
+        int recordIndex = Array.IndexOf(args, "--record");
+        if (recordIndex >= 0)
+        {
+            tracePath = GetArg(args, recordIndex + 1, null) ?? "tr1r_session.trace";
+            args = args.Where((_, i) => i != recordIndex && i != recordIndex + 1).ToArray();
+        }
+
         // --- Normal AP mode ---
         string server = GetArg(args, 0, null) ?? ConsoleUI.Prompt("Archipelago server (host:port)");
         string? slotName = GetArg(args, 1, null) ?? ConsoleUI.Prompt("Slot name");
@@ -81,7 +91,7 @@ class Program
         ConsoleUI.Info($"Connecting to {server} as {slotName}...");
 
         var session = new APSession();
-        var memory = new ProcessMemory();
+        ProcessMemory memory = tracePath != null ? new RecordingMemory(new ProcessMemory(), tracePath) : new ProcessMemory();
         var cts = new CancellationTokenSource();
         LevelPatcher? patcher = null;
 
@@ -104,8 +114,12 @@ class Program
 
             ConsoleUI.Success($"Connected! Game: {session.SlotData?.Game ?? "unknown"}");
 
+            var levelSequence = LevelSequence.FromFiles(session.SlotData?.LevelSequence);
+            if (!levelSequence.IsVanilla)
+                ConsoleUI.Info("Level order is shuffled; placing the levels in this slot's order.");
+
             ConsoleUI.Info("Backing up and patching level files...");
-            patcher = new LevelPatcher(gameDir, session);
+            patcher = new LevelPatcher(gameDir, session, levelSequence);
             patcher.PatchAll();
 
             ConsoleUI.Success("Level files patched (pickups replaced with sentinels).");
@@ -113,8 +127,14 @@ class Program
             var entityLocations = patcher.GetAllMappingsByLevelIndex();
             ConsoleUI.Info($"Tracking {entityLocations.Values.Sum(m => m.Count)} pickup locations across {entityLocations.Count} levels.");
 
+            if (memory is RecordingMemory recording)
+            {
+                recording.RecordContext(JsonConvert.SerializeObject(entityLocations));
+                ConsoleUI.Info($"Recording memory reads to {Path.GetFullPath(tracePath!)}");
+            }
+
             var stateStore = new SaveStateStore(session.SlotName, session.Seed);
-            var watcher = new GameStateWatcher(session, memory, entityLocations, stateStore);
+            var watcher = new GameStateWatcher(session, memory, entityLocations, stateStore, levelSequence);
 
             ConsoleUI.Info("Waiting for game to launch...");
             ConsoleUI.Info("Start tomb123.exe and begin playing TR1!\n");
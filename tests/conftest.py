@@ -0,0 +1,25 @@
+"""
+Test setup: the TR1R apworld on the Archipelago stand-ins, plus the tools.
+
+Tests run against tools/benchmarks/apstub.py, like the benchmarks, so no
+Archipelago checkout is needed. Tests that generate a world need the
+exporter output, apworld/tr1r/data/tr1r_data.json, and are skipped without it.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+GAME_DATA = ROOT / "apworld" / "tr1r" / "data" / "tr1r_data.json"
+
+sys.path[:0] = [str(ROOT / "tools"), str(ROOT / "tools" / "benchmarks")]
+
+import apstub  # noqa: E402
+
+apstub.install()
+
+requires_game_data = pytest.mark.skipif(
+    not GAME_DATA.exists(), reason="needs apworld/tr1r/data/tr1r_data.json (exporter output)"
+)
@@ -0,0 +1,86 @@
+"""
+Writes small synthetic TR1 .PHD files for the reader and exporter tests.
+
+Only the chunks tools/phd.py decodes carry data (rooms, floor data and
+entities); every chunk it skips is written empty, with its count prefix.
+"""
+
+import struct
+from typing import List, NamedTuple, Sequence, Tuple
+
+import phd
+
+SECTOR_SIZE = phd.SECTOR_SIZE
+
+
+class RoomSpec(NamedTuple):
+    x: int
+    z: int
+    portals: Sequence[int]
+    fd_indexes: Sequence[int]  # one sector per index, all in one column (num_x = 1)
+    alternate_room: int = -1
+
+
+class EntitySpec(NamedTuple):
+    type_id: int
+    room: int
+    x: int = 0
+    y: int = 0
+    z: int = 0
+
+
+def portal(room: int, last: bool = True) -> List[int]:
+    """Floor data words for a portal to room."""
+    return [phd.FD_PORTAL | (0x8000 if last else 0), room]
+
+
+def key_trigger(keyhole: int, targets: Sequence[int], last: bool = True) -> List[int]:
+    """Floor data words for a key trigger that opens the target entities."""
+    words = [phd.FD_TRIGGER | phd.TRIGGER_KEY << 8 | (0x8000 if last else 0), 0x3E00, keyhole]
+    for i, target in enumerate(targets):
+        words.append(phd.ACTION_OBJECT << 10 | target | (0x8000 if i == len(targets) - 1 else 0))
+    return words
+
+
+def build_level(rooms: Sequence[RoomSpec], floor_data: Sequence[int],
+                entities: Sequence[EntitySpec], version: int = phd.TR1_FILE_VERSION) -> bytes:
+    out = bytearray(struct.pack("<II", version, 0))  # no texture pages
+    out += struct.pack("<I", 1)                        # level number
+
+    out += struct.pack("<H", len(rooms))
+    for room in rooms:
+        out += struct.pack("<iiiiI", room.x, room.z, 0, -1024, 0)  # info, empty mesh
+        out += struct.pack("<H", len(room.portals))
+        for adjoining in room.portals:
+            out += struct.pack("<H", adjoining) + bytes(30)
+        out += struct.pack("<HH", len(room.fd_indexes), 1)
+        for fd_index in room.fd_indexes:
+            out += struct.pack("<HHBbBb", fd_index, 0, 255, -1, 255, -1)
+        out += struct.pack("<hHHhh", 0, 0, 0, room.alternate_room, 0)  # light, lights, statics, tail
+
+    out += struct.pack("<I", len(floor_data)) + struct.pack(f"<{len(floor_data)}H", *floor_data)
+    out += struct.pack("<I", 0)                            # object mesh data
+    out += struct.pack("<I", 0) * len(phd._SKIPPED_CHUNKS)
+    out += struct.pack("<III", 0, 0, 0)                    # boxes, overlaps, animated textures
+
+    out += struct.pack("<I", len(entities))
+    for entity in entities:
+        out += struct.pack("<hhiiihhH", entity.type_id, entity.room, entity.x, entity.y, entity.z, 0, -1, 0)
+    return bytes(out)
+
+
+def filler_entities(count: int, room: int = 0) -> List[EntitySpec]:
+    """Entities of a type the exporter ignores, to pad entity indexes."""
+    return [EntitySpec(1, room) for _ in range(count)]
+
+
+def place(entities: List[EntitySpec], index: int, entity: EntitySpec) -> None:
+    """Put an entity at a given index, padding with filler entities."""
+    if index >= len(entities):
+        entities += filler_entities(index + 1 - len(entities))
+    entities[index] = entity
+
+
+def sector_position(room: RoomSpec, sector: int) -> Tuple[int, int]:
+    """World x, z at the centre of one of a room's sectors."""
+    return room.x + SECTOR_SIZE // 2, room.z + sector * SECTOR_SIZE + SECTOR_SIZE // 2
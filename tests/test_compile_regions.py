@@ -0,0 +1,85 @@
+"""Key-gated sub-regions (tools/compile_regions.py) and the key_gated_regions option."""
+
+import json
+from types import MappingProxyType
+
+import pytest
+
+import bench_generation
+import compile_regions
+from conftest import requires_game_data
+from tr1r import regions
+from tr1r.game_data import SubRegion
+from tr1r.locations import get_location_table, get_locations_by_level
+
+
+def cistern_like_level() -> dict:
+    """
+    Room 0 (start) -> door A -> room 1 -> door B -> room 2, and room 0 ->
+    door C -> room 3. Doors A and C take a Rusty Key each, door B a Silver
+    Key, as the exporters pair keyholes with keys.
+    """
+    def link(source, target, keys=()):
+        return [{"from": source, "to": target, "keys": list(keys)},
+                {"from": target, "to": source, "keys": list(keys)}]
+
+    return {
+        "name": "Test Level",
+        "pickups": [{"entityIndex": index, "room": room} for index, room in ((1, 0), (2, 1), (3, 2), (4, 3))],
+        "keyItems": [],
+        "roomGraph": {
+            "startRoom": 0,
+            "roomCount": 4,
+            "links": link(0, 1, ["Rusty Key 1"]) + link(1, 2, ["Silver Key"]) + link(0, 3, ["Rusty Key 2"]),
+        },
+    }
+
+
+def test_each_door_needs_its_own_key() -> None:
+    areas = compile_regions.compile_level(cistern_like_level(), 0)
+    requires = {location: area["requires"] for area in areas for location in area["locations"]}
+
+    assert 780_001 not in requires  # start room, no keys needed
+    assert requires[780_002] == [["Rusty Key 1"]]
+    assert requires[780_003] == [["Rusty Key 1", "Silver Key"]]
+    # One Rusty Key can't open both rusty doors: room 3 needs the other one
+    assert requires[780_004] == [["Rusty Key 2"]]
+
+
+def test_link_needs_every_listed_key() -> None:
+    links = [{"from": 0, "to": 1, "keys": ["A", "B"]}]
+    keys = ["A", "B"]
+    assert compile_regions.reachable_rooms(0, links, keys, 0b01) == 0b01
+    assert compile_regions.reachable_rooms(0, links, keys, 0b11) == 0b11
+
+
+def test_table_records_version_and_source() -> None:
+    source = json.dumps({"levels": [cistern_like_level()]}).encode("utf-8")
+    table = compile_regions.compile_regions(source)
+    assert table["version"] == compile_regions.TABLE_VERSION
+    assert list(table["levels"]) == ["Test Level"]
+
+
+@requires_game_data
+@pytest.mark.parametrize("key_gated", [0, 1])
+def test_option_switches_region_table(monkeypatch, key_gated: int) -> None:
+    level = "City of Vilcabamba"
+    location = next(name for name in get_locations_by_level(level)
+                    if get_location_table()[name].category == "pickup")
+    area = SubRegion(f"{level} - Area 1", (frozenset({"Vilcabamba Silver Key"}),),
+                     frozenset({get_location_table()[location].ap_id}))
+    monkeypatch.setattr(regions, "load_region_table", lambda: MappingProxyType({level: (area,)}))
+    regions.get_region_table.cache_clear()
+    regions.get_location_regions.cache_clear()
+    regions.get_region_template.cache_clear()
+    try:
+        multiworld = bench_generation.create_multiworld(1, 0, key_gated_regions=key_gated)
+        multiworld.worlds[1].generate_early()
+        multiworld.worlds[1].create_regions()
+        region = multiworld.get_location(location, 1).parent_region.name
+    finally:
+        regions.get_region_table.cache_clear()
+        regions.get_location_regions.cache_clear()
+        regions.get_region_template.cache_clear()
+
+    assert region == (area.name if key_gated else level)
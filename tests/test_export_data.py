@@ -0,0 +1,131 @@
+"""
+tools/export_data.py on a synthetic Cistern, and against the C# exporter.
+
+The synthetic level has two Rusty Keys and three Rusty keyholes. Rooms:
+0 (start) -door 20-> 1 -door 21-> 2, and 0 -door 22-> 3. Keyhole 10 opens
+door 20, keyhole 11 door 21 and keyhole 12 door 22.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import compile_regions
+import export_data
+from phd_builder import EntitySpec, RoomSpec, build_level, key_trigger, place, portal, sector_position
+
+CISTERN = 7
+KEYHOLE3, KEY3, DOOR1, SMALL_MEDIPACK, SHOTGUN_AMMO = 139, 131, 57, 93, 89
+NEAR_PIERRE = "Cistern Rusty Key (Near Pierre)"  # entity 143
+MAIN_ROOM = "Cistern Rusty Key (Main Room)"      # entity 295
+
+
+def cistern_level() -> bytes:
+    floor_data: List[int] = [0]
+
+    def add(words: List[int]) -> int:
+        floor_data.extend(words)
+        return len(floor_data) - len(words)
+
+    rooms = [
+        RoomSpec(0, 0, [1, 3], [add(key_trigger(10, [20])), add(portal(1)), add(portal(3))]),
+        RoomSpec(0, 4096, [0, 2], [add(key_trigger(11, [21])), add(portal(0)), add(portal(2))]),
+        RoomSpec(0, 8192, [1], [add(key_trigger(12, [22]))]),
+        RoomSpec(0, 12288, [0], [0]),
+    ]
+
+    def at(room: int, sector: int, type_id: int) -> EntitySpec:
+        x, z = sector_position(rooms[room], sector)
+        return EntitySpec(type_id, room, x, 0, z)
+
+    entities: List[EntitySpec] = []
+    for index, entity in (
+        (0, at(0, 0, export_data.LARA)),
+        (10, at(0, 0, KEYHOLE3)), (11, at(1, 0, KEYHOLE3)), (12, at(2, 0, KEYHOLE3)),
+        (20, at(0, 1, DOOR1)), (21, at(1, 2, DOOR1)), (22, at(0, 2, DOOR1)),
+        (30, at(2, 0, SMALL_MEDIPACK)), (31, at(3, 0, SHOTGUN_AMMO)),
+        (143, at(0, 0, KEY3)), (295, at(1, 0, KEY3)),
+    ):
+        place(entities, index, entity)
+    return build_level(rooms, floor_data, entities)
+
+
+@pytest.fixture
+def game_dir(tmp_path: Path) -> str:
+    (tmp_path / export_data.LEVELS[CISTERN][0]).write_bytes(cistern_level())
+    return str(tmp_path)
+
+
+def test_exports_pickups_and_key_items(game_dir: str) -> None:
+    level, _log = export_data.export_level((CISTERN, game_dir))
+
+    assert [(p["entityIndex"], p["category"], p["room"]) for p in level["pickups"]] == [
+        (30, "small_medipack", 2), (31, "ammo", 3),
+    ]
+    assert [(k["entityIndex"], k["alias"], k["name"]) for k in level["keyItems"]] == [
+        (143, "Cistern_Key3", "The Cistern - Rusty Key"),
+        (295, "Cistern_Key3_2", "The Cistern - Rusty Key #2"),
+    ]
+    assert len(level["secrets"]) == export_data.LEVELS[CISTERN][4]
+
+
+def test_each_keyhole_takes_its_own_key(game_dir: str) -> None:
+    level, log = export_data.export_level((CISTERN, game_dir))
+    graph = level["roomGraph"]
+    links = {(link["from"], link["to"]): link["keys"] for link in graph["links"]}
+
+    assert graph["startRoom"] == 0
+    assert links[(0, 1)] == links[(1, 0)] == [NEAR_PIERRE]
+    assert links[(1, 2)] == links[(2, 1)] == [MAIN_ROOM]
+    # The third keyhole has no Rusty Key left, so its door never opens
+    assert (0, 3) not in links and (3, 0) not in links
+    assert any("keyhole #12 has no Key3_S_P of its own" in line for line in log)
+
+    areas = compile_regions.compile_level(level, CISTERN)
+    requires = {location: area["requires"] for area in areas for location in area["locations"]}
+    assert requires[780_000 + CISTERN * 1000 + 30] == [sorted([NEAR_PIERRE, MAIN_ROOM])]
+
+
+def test_missing_levels_are_exported_empty(game_dir: str) -> None:
+    data = export_data.export(game_dir, 1)
+
+    assert [level["file"] for level in data["levels"]] == [level[0] for level in export_data.LEVELS]
+    assert data["levels"][0]["pickups"] == [] and "roomGraph" not in data["levels"][0]
+    assert data["keyDependencies"]["Cistern_Key3_2"] == {
+        "level": "LEVEL7A.PHD", "baseType": "Key3_S_P", "unlocksRooms": [],
+    }
+
+
+def test_json_is_laid_out_like_newtonsoft(game_dir: str) -> None:
+    encoded = export_data.encode_json(export_data.export(game_dir, 1))
+
+    assert not encoded.endswith(b"\n") and os.linesep.encode() in encoded
+    decoded = json.loads(encoded)
+    # Dictionary keys are camel-cased, as CamelCasePropertyNamesContractResolver does
+    assert "cistern_K3_RustyKeyMainRoom" in decoded["itemDefinitions"]
+    assert "shotgun_S_P" in decoded["itemDefinitions"]
+    assert "cistern_Key3" in decoded["keyDependencies"]
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Cistern_K3_RustyKeyMainRoom", "cistern_K3_RustyKeyMainRoom"),
+    ("LargeMed_S_P", "largeMed_S_P"),
+    ("URLValue", "urlValue"),
+    ("ID", "id"),
+    ("", ""),
+])
+def test_camel_case_matches_newtonsoft(name: str, expected: str) -> None:
+    assert export_data.camel_case(name) == expected
+
+
+@pytest.mark.skipif(
+    not (os.environ.get("TR1R_GAME_DIR") and os.environ.get("TR1R_CSHARP_EXPORT")),
+    reason="set TR1R_GAME_DIR (the game's DATA directory) and TR1R_CSHARP_EXPORT "
+           "(TRDataExporter's tr1r_data.json for it, written on this platform)",
+)
+def test_matches_csharp_exporter() -> None:
+    data = export_data.export(os.environ["TR1R_GAME_DIR"], os.cpu_count() or 1)
+    assert export_data.encode_json(data) == Path(os.environ["TR1R_CSHARP_EXPORT"]).read_bytes()
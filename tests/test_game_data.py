@@ -0,0 +1,109 @@
+"""
+The binary form of the game data (tr1r_data.bin) against the JSON it is
+built from.
+
+tools/export_data.py writes the binary form; game_data.py must decode it to
+the same GameData the JSON parses to, and fall back to the JSON whenever the
+binary form is stale, from another format version or malformed.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict
+
+import pytest
+
+import export_data
+from conftest import GAME_DATA, requires_game_data
+from tr1r import game_data
+from tr1r.game_data import DataFormatError, GameData, decode_game_data, parse_json_game_data
+
+
+def synthetic_data() -> Dict[str, Any]:
+    def entity(index: int, **fields: Any) -> Dict[str, Any]:
+        return {"entityIndex": index, "x": -index * 1024, "y": -256, "z": index * 512, "room": index % 7, **fields}
+
+    return {
+        "game": "Tomb Raider 1 Remastered",
+        "levels": [
+            {
+                "name": "Caves", "file": "LEVEL1.PHD", "sequence": 1, "region": "Peru",
+                "pickups": [entity(12, type="SmallMed_S_P", category="small_medipack"),
+                            entity(40, type="Shotgun_S_P", category="weapon")],
+                "keyItems": [],
+                "secrets": [{"index": 0}, {"index": 1}, {"index": 2}],
+            },
+            {
+                "name": "St. Francis' Folly", "file": "LEVEL4.PHD", "sequence": 5, "region": "Greece",
+                "pickups": [entity(3, type="UziAmmo_S_P", category="ammo")],
+                "keyItems": [entity(131, type="Key1_S_P", alias="Folly_K1_NeptuneKey",
+                                    name="St. Francis' Folly - Neptune Key")],
+                "secrets": [{"index": 0}],
+            },
+        ],
+        "levelSequence": ["LEVEL1.PHD", "LEVEL4.PHD"],
+        "keyDependencies": {},
+        "itemDefinitions": export_data.build_item_definitions(),
+    }
+
+
+def flatten(data: GameData) -> Any:
+    return (
+        [(level.name, level.file, level.region, level.sequence,
+          list(level.pickups), list(level.key_items), level.secrets) for level in data.levels],
+        {key.lower(): item for key, item in data.item_definitions.items()},
+        data.level_sequence,
+    )
+
+
+def encode(data: Dict[str, Any]):
+    source = export_data.encode_json(data)
+    return source, export_data.encode_binary(data, source)
+
+
+def test_binary_matches_json() -> None:
+    source, packed = encode(synthetic_data())
+    decoded = decode_game_data(packed, hashlib.sha256(source).digest())
+    assert flatten(decoded) == flatten(parse_json_game_data(source))
+    assert len(decoded.levels[1].key_items.buffer) == game_data.ENTITY_RECORD.size
+
+
+@requires_game_data
+def test_binary_matches_shipped_json() -> None:
+    source = GAME_DATA.read_bytes()
+    packed = export_data.encode_binary(json.loads(source), source)
+    assert flatten(decode_game_data(packed)) == flatten(parse_json_game_data(source))
+
+
+def test_unusable_binary_is_rejected() -> None:
+    source, packed = encode(synthetic_data())
+    with pytest.raises(DataFormatError, match="does not match"):
+        decode_game_data(packed, b"\0" * 32)
+    with pytest.raises(DataFormatError, match="unsupported"):
+        decode_game_data(packed[:4] + b"\x63\x00" + packed[6:])
+    for end in range(0, len(packed) - 1, 7):
+        with pytest.raises(DataFormatError):
+            decode_game_data(packed[:end])
+
+
+@pytest.mark.parametrize("stale", [False, True])
+def test_loader_falls_back_to_json(monkeypatch, stale: bool) -> None:
+    data = synthetic_data()
+    source, packed = encode(data)
+    if stale:
+        data["levels"][0]["pickups"].pop()
+        packed = export_data.encode_binary(data, b"an older tr1r_data.json")
+    files = {"data/tr1r_data.json": source, "data/tr1r_data.bin": packed}
+    monkeypatch.setattr(game_data.pkgutil, "get_data", lambda _package, name: files[name])
+
+    parsed = []
+    monkeypatch.setattr(game_data, "parse_json_game_data",
+                        lambda raw: parsed.append(raw) or parse_json_game_data(raw))
+    game_data.load_game_data.cache_clear()
+    try:
+        loaded = game_data.load_game_data()
+    finally:
+        game_data.load_game_data.cache_clear()
+
+    assert parsed == ([source] if stale else [])
+    assert flatten(loaded) == flatten(parse_json_game_data(source))
@@ -0,0 +1,156 @@
+"""
+The ID codec (apworld/tr1r/ids.py) against the client's C# mappers, the
+tools' copies of its constants, TR-Rando's TR1Type aliases and the
+exporters' item table.
+
+The client's LocationMapper.cs and ItemMapper.cs constants (base IDs,
+per-level strides, the level file table, the key item alias range) are
+parsed and compared with ids.py, as are the constants of the tools that
+run without the APWorld, so no copy can drift unnoticed. With the game
+data, every location and item is decoded through the codec and must come
+back as its own kind and level, with no ID used twice.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+import compile_regions
+import export_data
+import save_tracker
+from conftest import ROOT, requires_game_data
+from tr1r import ids
+from tr1r.game_data import get_levels
+from tr1r.items import get_all_items
+from tr1r.locations import get_location_table
+
+CLIENT_CORE = ROOT / "client" / "TRArchipelagoClient" / "Core"
+TR1_TYPE = ROOT / "client" / "TRLevelControl" / "Model" / "TR1" / "Enums" / "TR1Type.cs"
+
+LEVEL_FILES = ["LEVEL1.PHD", "LEVEL2.PHD", "LEVEL3A.PHD", "LEVEL3B.PHD", "LEVEL4.PHD", "LEVEL5.PHD",
+               "LEVEL6.PHD", "LEVEL7A.PHD", "LEVEL7B.PHD", "LEVEL8A.PHD", "LEVEL8B.PHD", "LEVEL8C.PHD",
+               "LEVEL10A.PHD", "LEVEL10B.PHD", "LEVEL10C.PHD"]
+
+LOCATION_CATEGORY_KINDS = {
+    "pickup": ids.PICKUP,
+    "key_item": ids.PICKUP,
+    "secret": ids.SECRET,
+    "level_complete": ids.LEVEL_COMPLETE,
+}
+ITEM_CATEGORY_KINDS = {
+    "key_item": ids.KEY_ITEM,
+    "weapon": ids.PICKUP_TYPE,
+    "ammo": ids.PICKUP_TYPE,
+    "small_medipack": ids.PICKUP_TYPE,
+    "large_medipack": ids.PICKUP_TYPE,
+    "trap": ids.TRAP,
+    "event": ids.EVENT,
+}
+
+
+def constants(source: str) -> Dict[str, int]:
+    return {name: int(value.replace("_", ""))
+            for name, value in re.findall(r"const\s+int\s+(\w+)\s*=\s*([\d_]+)\s*;", source)}
+
+
+@pytest.fixture(scope="module")
+def location_mapper() -> str:
+    return (CLIENT_CORE / "LocationMapper.cs").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def item_mapper() -> str:
+    return (CLIENT_CORE / "ItemMapper.cs").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def tr1_types() -> Dict[str, int]:
+    source = TR1_TYPE.read_text(encoding="utf-8")
+    return {name: int(value) for name, value in re.findall(r"^\s*(\w+)\s*=\s*(\d+)\s*,", source, re.MULTILINE)}
+
+
+def test_location_mapper_matches(location_mapper: str) -> None:
+    assert constants(location_mapper) == {
+        "PickupBaseId": ids.PICKUP_BASE_ID,
+        "LevelCompleteBaseId": ids.LEVEL_COMPLETE_BASE_ID,
+        "SecretBaseId": ids.SECRET_BASE_ID,
+    }
+    strides = dict(re.findall(r"=>\s*(\w+)\s*\+\s*levelIndex\s*\*\s*(\d+)", location_mapper))
+    assert strides == {"PickupBaseId": str(ids.PICKUP_LEVEL_STRIDE), "SecretBaseId": str(ids.SECRET_LEVEL_STRIDE)}
+
+    table = location_mapper[location_mapper.index("LevelFiles"):]
+    assert re.findall(r'"(\w+\.PHD)"', table[:table.index("};")]) == LEVEL_FILES
+    assert len(LEVEL_FILES) == ids.LEVEL_COUNT
+
+
+def test_item_mapper_matches(item_mapper: str, tr1_types: Dict[str, int]) -> None:
+    assert constants(item_mapper) == {"BaseId": ids.ITEM_BASE_ID, "TrapBaseId": ids.TRAP_BASE_ID}
+    assert dict(re.findall(r"\[BaseId \+ (\d+)\] = TR1Type\.(\w+)", item_mapper)) \
+        == {str(value): name for name, value in ids.PICKUP_TYPES.items()}
+    assert {name: tr1_types[name] for name in ids.PICKUP_TYPES} == dict(ids.PICKUP_TYPES)
+
+    alias_range = re.search(r"offset\s*>=\s*(\d+)\s*&&\s*offset\s*<\s*(\d+)", item_mapper)
+    assert tuple(map(int, alias_range.groups())) == (ids.KEY_ITEM_ALIAS_BASE, ids.KEY_ITEM_ALIAS_END)
+    assert re.findall(r'\[(\d+)\]\s*=\s*"(\w+\.PHD)"', item_mapper) == [
+        (str(ids.KEY_ITEM_ALIAS_BASE + level * ids.KEY_ITEM_LEVEL_STRIDE), file)
+        for level, file in enumerate(LEVEL_FILES)
+    ]
+    assert tr1_types["CavesKeyItemBase"] == ids.KEY_ITEM_ALIAS_BASE
+
+
+def test_key_item_aliases_are_tr1_types(tr1_types: Dict[str, int]) -> None:
+    for name, value, _display in export_data.KEY_ITEM_ALIASES:
+        assert tr1_types.get(name) == value, name
+        assert ids.KEY_ITEM_ALIAS_BASE <= value < ids.KEY_ITEM_ALIAS_END, name
+
+
+def test_tool_constants_match() -> None:
+    assert (export_data.ITEM_BASE_ID, export_data.KEY_ITEM_ALIAS_BASE) == (ids.ITEM_BASE_ID, ids.KEY_ITEM_ALIAS_BASE)
+    assert (compile_regions.PICKUP_BASE_ID, compile_regions.PICKUP_LEVEL_STRIDE) \
+        == (ids.PICKUP_BASE_ID, ids.PICKUP_LEVEL_STRIDE)
+    assert (save_tracker.LEVEL_COMPLETE_BASE_ID, save_tracker.SECRET_BASE_ID, save_tracker.SECRET_LEVEL_STRIDE) \
+        == (ids.LEVEL_COMPLETE_BASE_ID, ids.SECRET_BASE_ID, ids.SECRET_LEVEL_STRIDE)
+    assert list(save_tracker.LEVEL_FILES) == LEVEL_FILES
+
+
+def test_exported_item_ids_decode() -> None:
+    aliases = {name: value for name, value, _display in export_data.KEY_ITEM_ALIASES}
+    for key, item in export_data.build_item_definitions().items():
+        kind, level, value = ids.decode_item_id(item["id"])
+        if item["category"] == "key_item":
+            assert kind == ids.KEY_ITEM, key
+            assert ids.KEY_ITEM_ALIAS_BASE + level * ids.KEY_ITEM_LEVEL_STRIDE + value == aliases[key]
+        else:
+            assert (kind, value) == (ids.PICKUP_TYPE, ids.PICKUP_TYPES[key]), key
+
+
+def test_location_ranges_are_disjoint() -> None:
+    built = [ids.pickup_location_id(level, entity)
+             for level in range(ids.LEVEL_COUNT) for entity in range(ids.PICKUP_LEVEL_STRIDE)]
+    built += [ids.secret_location_id(level, secret)
+              for level in range(ids.LEVEL_COUNT) for secret in range(ids.SECRET_LEVEL_STRIDE)]
+    built += [ids.level_complete_location_id(level) for level in range(ids.LEVEL_COUNT)]
+    assert len(set(built)) == len(built)
+
+    kinds, levels, indexes = ids.decode_location_ids(built)
+    assert [ids.decode_location_id(location_id) for location_id in built] == list(zip(kinds, levels, indexes))
+    assert kinds.count(ids.UNKNOWN) == 0
+    assert ids.decode_location_id(ids.PICKUP_BASE_ID - 1)[0] == ids.UNKNOWN
+    assert ids.decode_location_id(ids.secret_location_id(ids.LEVEL_COUNT, 0))[0] == ids.UNKNOWN
+
+
+@requires_game_data
+def test_game_data_ids_decode() -> None:
+    level_index = {name: i for i, (name, _file, _region) in enumerate(get_levels())}
+    assert [file for _name, file, _region in get_levels()] == LEVEL_FILES
+
+    seen: Dict[int, str] = {}
+    for name, data in get_location_table().items():
+        kind, level, _index = ids.decode_location_id(data.ap_id)
+        assert (kind, level) == (LOCATION_CATEGORY_KINDS[data.category], level_index[data.level]), name
+        assert seen.setdefault(data.ap_id, name) == name
+
+    for name, data in get_all_items().items():
+        assert ids.decode_item_id(data.ap_id)[0] == ITEM_CATEGORY_KINDS[data.category], name
@@ -0,0 +1,46 @@
+"""
+The level order shuffle (level_order.py).
+
+Shuffled seeds must keep the final level last, tell the client their order
+through level_sequence and stay beatable; is_feasible() must turn down an
+order whose first levels need more keys than they have locations.
+"""
+
+import pytest
+
+import apstub
+import bench_generation
+from conftest import requires_game_data
+from tr1r import level_order
+from tr1r.game_data import get_levels
+from tr1r.level_order import LevelKeys, is_feasible, order_from_sequence
+
+
+@requires_game_data
+@pytest.mark.parametrize("seed", range(5))
+def test_shuffled_seed_follows_its_sequence(seed: int) -> None:
+    multiworld = bench_generation.create_multiworld(1, seed, level_order=1)
+    bench_generation.generate(multiworld)
+    world = multiworld.worlds[1]
+    sequence = world.fill_slot_data()["level_sequence"]
+
+    assert world.level_order != level_order.vanilla_level_order()
+    assert sorted(sequence) == sorted(file for _name, file, _region in get_levels())
+    assert sequence[-1] == get_levels()[-1][1]
+    assert order_from_sequence(sequence) == world.level_order
+
+    state = apstub.CollectionState(multiworld)
+    state.sweep_for_advancements()
+    assert multiworld.can_beat_game(state)
+
+
+def test_over_gated_first_level_is_rejected(monkeypatch) -> None:
+    # Level 0 needs three keys and has two locations; level 1 needs none and has ten
+    levels = (
+        LevelKeys(needs=0b111, slots=(((0,), 2),)),
+        LevelKeys(needs=0, slots=(((0,), 10),)),
+    )
+    monkeypatch.setattr(level_order, "_level_keys", lambda: levels)
+
+    assert not is_feasible((0, 1))
+    assert is_feasible((1, 0))
@@ -0,0 +1,80 @@
+"""
+LogicTracker (logic_table.py) against the world it was exported from.
+
+Progression items are collected one at a time in a random order, both into
+a LogicTracker and, as an Archipelago sweep would, into a CollectionState
+on the generated regions. After every item both must reach the same
+locations and agree on the goal.
+"""
+
+import random
+from types import MappingProxyType
+
+import pytest
+
+import apstub
+import bench_generation
+from conftest import requires_game_data
+from tr1r import regions
+from tr1r.game_data import SubRegion, load_game_data
+from tr1r.locations import get_location_table, get_locations_by_level
+from tr1r.logic_table import LogicTracker, build_logic_table
+
+pytestmark = requires_game_data
+
+GOALS = ["final_boss", "all_secrets", "n_levels"]
+
+
+@pytest.fixture
+def key_gated_table(monkeypatch):
+    """Gate a few pickups of the first level with two key items behind those keys."""
+    level = next(level for level in load_game_data().levels if len(level.key_items) >= 2)
+    keys = [key.name for key in level.key_items]
+    pickups = [get_location_table()[name].ap_id for name in get_locations_by_level(level.name)
+               if get_location_table()[name].category == "pickup"]
+    areas = (
+        SubRegion(f"{level.name} - Area 1", (frozenset({keys[0]}),), frozenset(pickups[:3])),
+        SubRegion(f"{level.name} - Area 2", (frozenset(keys[:2]), frozenset({keys[-1]})), frozenset(pickups[3:5])),
+    )
+    monkeypatch.setattr(regions, "load_region_table", lambda: MappingProxyType({level.name: areas}))
+    regions.get_region_table.cache_clear()
+    regions.get_location_regions.cache_clear()
+    regions.get_region_template.cache_clear()
+    yield
+    regions.get_region_table.cache_clear()
+    regions.get_location_regions.cache_clear()
+    regions.get_region_template.cache_clear()
+
+
+def check_tracker(seed: int, goal: int, key_gated: int) -> None:
+    multiworld = bench_generation.create_multiworld(1, seed, goal=goal, key_gated_regions=key_gated)
+    for stage in bench_generation.STAGES:
+        getattr(multiworld.worlds[1], stage)()
+    world = multiworld.worlds[1]
+
+    tracker = LogicTracker(build_logic_table(key_gated=bool(key_gated)))
+    state = apstub.CollectionState(multiworld)
+    state.sweep_for_advancements()
+    locations = multiworld.get_locations(1)
+
+    items = [item.name for item in multiworld.itempool if item.advancement]
+    random.Random(seed).shuffle(items)
+    for item in [None] + items:
+        if item is not None:
+            tracker.collect(item)
+            state.collect(world.create_item(item))
+            state.sweep_for_advancements()
+        assert tracker.locations == {location.name for location in locations if location.can_reach(state)}, item
+        assert tracker.goal_reached(GOALS[goal], world.options.levels_for_goal.value) \
+            == multiworld.completion_condition[1](state), item
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("goal", [0, 1, 2])
+def test_tracker_matches_collection_state(goal: int, seed: int) -> None:
+    check_tracker(seed, goal, key_gated=0)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_tracker_matches_key_gated_regions(key_gated_table, seed: int) -> None:
+    check_tracker(seed, 0, key_gated=1)
@@ -0,0 +1,76 @@
+"""The placement manifest (manifest.py): round trip and size budget."""
+
+import random
+
+import pytest
+
+import bench_generation
+from conftest import requires_game_data
+from tr1r.locations import get_location_table, get_locations_by_category
+from tr1r.manifest import (
+    MANIFEST_SIZE_BUDGET,
+    Placement,
+    decode_manifest,
+    encode_manifest,
+    manifest_size,
+)
+
+
+@requires_game_data
+@pytest.mark.parametrize("seed", range(3))
+def test_generated_placement_round_trips(seed: int) -> None:
+    multiworld = bench_generation.create_multiworld(1, seed)
+    bench_generation.generate(multiworld)
+    world = multiworld.worlds[1]
+
+    placements = world.get_placements()
+    manifest = world.fill_slot_data()["placement_manifest"]
+
+    assert placements
+    assert decode_manifest(manifest) == sorted(placements)
+    assert manifest_size(manifest) <= MANIFEST_SIZE_BUDGET
+
+
+@requires_game_data
+def test_prefilled_locations_are_listed() -> None:
+    multiworld = bench_generation.create_multiworld(1, 0)
+    bench_generation.generate(multiworld)
+    world = multiworld.worlds[1]
+    # As plando leaves a location: locked, holding a real item
+    location = next(location for location in multiworld.get_locations(1)
+                    if get_location_table()[location.name].category == "pickup")
+    location.locked = True
+
+    placed = {placement.location_id for placement in world.get_placements()}
+    assert location.address in placed
+    assert not placed & {get_location_table()[name].ap_id
+                         for name in get_locations_by_category("level_complete")}
+
+
+@requires_game_data
+def test_worst_case_slot_fits_budget() -> None:
+    # Every location holds an item for another game, with large scattered IDs
+    rng = random.Random(0)
+    placements = [
+        Placement(data.ap_id, rng.randrange(1 << 40), rng.randrange(1, 1000), rng.randrange(32))
+        for data in get_location_table().values()
+        if data.category != "level_complete"
+    ]
+    manifest = encode_manifest(placements)
+
+    assert decode_manifest(manifest) == sorted(placements)
+    assert manifest_size(manifest) <= MANIFEST_SIZE_BUDGET
+
+
+def test_negative_item_deltas_and_empty_manifest() -> None:
+    placements = [Placement(780_005, 770_094, 1, 1), Placement(780_001, 5, 2, 4),
+                  Placement(790_000, 1 << 40, 999, 31)]
+    assert decode_manifest(encode_manifest(placements)) == sorted(placements)
+    assert decode_manifest(encode_manifest([])) == []
+
+
+def test_unknown_version_is_rejected() -> None:
+    manifest = encode_manifest([])
+    manifest["version"] += 1
+    with pytest.raises(ValueError):
+        decode_manifest(manifest)
@@ -0,0 +1,83 @@
+"""tools/phd.py on synthetic levels."""
+
+import pytest
+
+import phd
+from phd_builder import EntitySpec, RoomSpec, build_level, key_trigger, portal
+
+ROOMS = (
+    RoomSpec(0, 0, portals=[1], fd_indexes=[1, 5]),
+    RoomSpec(0, 2048, portals=[0], fd_indexes=[0, 8], alternate_room=0),
+)
+# 0: dummy; 1: key trigger (keyhole 1 opens door 2) then portal to room 1;
+# 5: portal to room 1; 7: unused; 8: portal to room 0
+FLOOR_DATA = [0] + key_trigger(1, [2], last=False) + portal(1) + [0] + portal(0)
+ENTITIES = (
+    EntitySpec(0, 0, 512, 0, 512),
+    EntitySpec(137, 0, 512, 0, 512),
+    EntitySpec(57, 0, 512, 0, 1536),
+)
+
+
+def level_bytes(**changes) -> bytes:
+    args = {"rooms": ROOMS, "floor_data": FLOOR_DATA, "entities": ENTITIES}
+    args.update(changes)
+    return build_level(**args)
+
+
+def test_reads_rooms_floor_data_and_entities() -> None:
+    level = phd.parse_level(level_bytes())
+
+    assert [room.portals for room in level.rooms] == [(1,), (0,)]
+    assert [room.alternate_room for room in level.rooms] == [-1, 0]
+    assert list(level.rooms[0].fd_indexes) == [1, 5]
+    assert list(level.floor_data) == FLOOR_DATA
+    assert [entity.type_id for entity in level.entities] == [0, 137, 57]
+    assert level.entities[2][:5] == (57, 0, 512, 0, 1536)
+
+
+def test_floor_data_portals_and_key_triggers() -> None:
+    level = phd.parse_level(level_bytes())
+
+    # The trigger sector also ends in a portal; both are found
+    entries = level.floor_entries(1)
+    assert entries.portal == 1
+    assert entries.triggers == (phd.Trigger(phd.TRIGGER_KEY, 1, ((phd.ACTION_OBJECT, 2),)),)
+
+    assert level.key_triggers() == {1: [entries.triggers[0]]}
+    assert level.door_room(0) == phd.NO_ROOM
+    door = level.entities[2]
+    assert level.door_room(level.rooms[door.room].sector_fd_index(door.x, door.z)) == 1
+
+
+def test_sector_lookup_clamps_to_the_room() -> None:
+    room = phd.parse_level(level_bytes()).rooms[0]
+    assert room.sector_fd_index(-5000, -5000) == 1
+    assert room.sector_fd_index(99999, 99999) == 5
+
+
+def test_reads_memory_mapped_file(tmp_path) -> None:
+    path = tmp_path / "LEVEL1.PHD"
+    path.write_bytes(level_bytes())
+    assert len(phd.read_level(str(path)).entities) == len(ENTITIES)
+
+
+def test_rejects_other_versions() -> None:
+    with pytest.raises(phd.LevelFormatError):
+        phd.parse_level(level_bytes(version=0x2D))
+
+
+def test_rejects_truncated_file() -> None:
+    data = level_bytes()
+    with pytest.raises(phd.LevelFormatError):
+        phd.parse_level(data[:len(data) // 2])
+
+
+def test_rejects_memory_mapped_file_truncated_anywhere(tmp_path) -> None:
+    # Every cut must surface as LevelFormatError, with no view left exported from the map
+    data = level_bytes()
+    path = tmp_path / "LEVEL1.PHD"
+    for end in range(len(data)):
+        path.write_bytes(data[:end])
+        with pytest.raises(phd.LevelFormatError):
+            phd.read_level(str(path))
@@ -0,0 +1,74 @@
+"""
+The progress counters (progress.py) against the rules they replace.
+
+Random sequences of level completion events are collected and removed, and
+after every step the counters and the goal conditions built on them must
+agree with the straightforward lambda rules: one state.has() per level, and
+can_reach() on every secret location.
+"""
+
+import random
+
+import pytest
+
+import apstub
+import bench_generation
+from conftest import requires_game_data
+from tr1r.game_data import get_levels
+from tr1r.locations import get_locations_by_category
+from tr1r.progress import levels_completed, secrets_reachable
+
+pytestmark = requires_game_data
+
+STEPS = 300
+
+
+def generate(seed: int, **option_values: int) -> apstub.MultiWorld:
+    multiworld = bench_generation.create_multiworld(1, seed, **option_values)
+    for stage in bench_generation.STAGES:
+        getattr(multiworld.worlds[1], stage)()
+    return multiworld
+
+
+def level_events(multiworld: apstub.MultiWorld) -> list:
+    world = multiworld.worlds[1]
+    return [world.create_event(f"Level Complete - {name}") for name, _, _ in get_levels()]
+
+
+def reference_goal(goal: int, state: apstub.CollectionState, multiworld: apstub.MultiWorld) -> bool:
+    world = multiworld.worlds[1]
+    if goal == 0:
+        return state.has(f"Level Complete - {get_levels()[-1][0]}", 1)
+    if goal == 1:
+        return all(multiworld.get_location(name, 1).can_reach(state)
+                   for name in get_locations_by_category("secret"))
+    completed = sum(state.has(f"Level Complete - {name}", 1) for name, _, _ in get_levels())
+    return completed >= world.options.levels_for_goal.value
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("goal", [0, 1, 2])
+def test_counters_match_lambda_rules(goal: int, seed: int) -> None:
+    multiworld = generate(seed, goal=goal)
+    world = multiworld.worlds[1]
+    events = level_events(multiworld)
+    secrets = [multiworld.get_location(name, 1) for name in get_locations_by_category("secret")]
+    rng = random.Random(seed)
+
+    state = apstub.CollectionState(multiworld)
+    held = []
+    for step in range(STEPS):
+        if held and rng.random() < 0.4:
+            item = held.pop(rng.randrange(len(held)))
+            assert state.remove(item)
+        else:
+            item = rng.choice(events)
+            assert state.collect(item)
+            held.append(item)
+
+        completed = sum(state.has(event.name, 1) for event in events)
+        assert levels_completed(state, 1) == completed, f"step {step}"
+        reachable = sum(location.can_reach(state) for location in secrets)
+        assert secrets_reachable(state, 1, world.progress) == reachable, f"step {step}"
+        assert multiworld.completion_condition[1](state) == reference_goal(goal, state, multiworld), \
+            f"step {step}"
@@ -0,0 +1,111 @@
+"""
+The offline save tracker's progress logic (tools/save_tracker.py).
+
+ProgressTracker turns decoded save slots into location IDs: the levels
+completed since the last save and the secrets newly found in the saved
+level. SaveFileWatcher.changed_slots must hand it only the slots whose bytes
+changed.
+"""
+
+import struct
+from typing import Dict
+
+import savefile
+from save_tracker import (
+    LEVEL_COMPLETE_BASE_ID,
+    LEVEL_FILES,
+    SECRET_BASE_ID,
+    SECRET_LEVEL_STRIDE,
+    ProgressTracker,
+    SaveFileWatcher,
+)
+
+
+def slot(save_number: int, level: int, secrets: int = 0) -> Dict[str, int]:
+    return {"status": savefile.SLOT_OCCUPIED, "save_number": save_number,
+            "level_index": level, "secrets_found": secrets}
+
+
+def completed(*levels: int) -> list:
+    return [LEVEL_COMPLETE_BASE_ID + level - 1 for level in levels]
+
+
+def secret(level: int, bit: int) -> int:
+    return SECRET_BASE_ID + (level - 1) * SECRET_LEVEL_STRIDE + bit
+
+
+def test_next_level_completes_the_previous_one() -> None:
+    tracker = ProgressTracker()
+    assert tracker.update([slot(1, 1)]) == []
+    assert tracker.update([slot(2, 2)]) == completed(1)
+    assert tracker.update([slot(3, 2)]) == []
+    assert tracker.completed_levels == {1}
+
+
+def test_skipped_levels_are_all_completed() -> None:
+    tracker = ProgressTracker()
+    tracker.update([slot(1, 2)])
+    assert tracker.update([slot(2, 6)]) == completed(2, 3, 4, 5)
+    # Loading an older level and saving forward again completes nothing twice
+    assert tracker.update([slot(3, 4)]) == []
+    assert tracker.update([slot(4, 7)]) == completed(6)
+
+
+def test_first_save_completes_nothing() -> None:
+    # Without an earlier save there is no telling which levels were played
+    tracker = ProgressTracker()
+    assert tracker.update([slot(1, 5)]) == []
+    assert tracker.level_index == 5
+
+
+def test_new_secret_bits_only() -> None:
+    tracker = ProgressTracker()
+    assert tracker.update([slot(1, 3, 0b001)]) == [secret(3, 0)]
+    assert tracker.update([slot(2, 3, 0b101)]) == [secret(3, 2)]
+    assert tracker.update([slot(3, 3, 0b101)]) == []
+    assert tracker.update([slot(4, 4, 0b011)]) == completed(3) + [secret(4, 0), secret(4, 1)]
+
+
+def test_secret_bits_past_the_stride_are_ignored() -> None:
+    # Bit 10 of level 1 would be the ID of level 2's first secret
+    tracker = ProgressTracker()
+    found = tracker.update([slot(1, 1, 0xFFFF)])
+    assert found == [secret(1, bit) for bit in range(SECRET_LEVEL_STRIDE)]
+    assert secret(2, 0) not in found
+
+
+def test_shuffled_positions_credit_the_level_played() -> None:
+    # Position 1 plays Lost Valley (level 3), position 2 Caves (level 1)
+    sequence = [LEVEL_FILES[2], LEVEL_FILES[0], LEVEL_FILES[1]] + list(LEVEL_FILES[3:])
+    tracker = ProgressTracker([file.lower() for file in sequence])
+    assert tracker.update([slot(1, 1, 0b1)]) == [secret(3, 0)]
+    assert tracker.update([slot(2, 3)]) == completed(3, 1)
+    assert tracker.update([slot(3, 4)]) == completed(2)
+
+
+def test_saves_are_applied_in_order_and_once() -> None:
+    tracker = ProgressTracker()
+    empty = {"status": 0, "save_number": 99, "level_index": 9, "secrets_found": 1}
+    assert tracker.update([slot(3, 3), empty, slot(2, 2), slot(1, 1)]) == completed(1, 2)
+    assert tracker.update([slot(2, 2, 1), slot(3, 3)]) == []
+    assert tracker.last_save_number == 3
+
+
+def test_watcher_decodes_changed_slots_only(tmp_path) -> None:
+    region = bytearray(savefile.SAVE_FILE_MAX_OFFSET - savefile.SAVE_FILE_BASE_OFFSET)
+    offsets = {name: offset for name, offset, _code in savefile.SLOT_FIELDS}
+
+    def save(index: int, save_number: int, level: int) -> None:
+        start = index * savefile.SAVE_SLOT_SIZE
+        region[start + offsets["status"]] = savefile.SLOT_OCCUPIED
+        struct.pack_into("<i", region, start + offsets["save_number"], save_number)
+        region[start + offsets["level_index"]] = level
+
+    watcher = SaveFileWatcher(str(tmp_path / "savegame.dat"), poll_interval=0.01, settle=0.01)
+    save(0, 1, 1)
+    assert len(watcher.changed_slots(bytes(region))) == savefile.MAX_SAVE_SLOTS
+    assert watcher.changed_slots(bytes(region)) == []
+
+    save(4, 2, 2)
+    changed = watcher.changed_slots(bytes(region))
+    assert [(slot["save_number"], slot["level_index"]) for slot in changed] == [(2, 2)]
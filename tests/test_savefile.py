@@ -0,0 +1,141 @@
+"""
+The bulk save file reader (tools/savefile.py) against the client's layout.
+
+Save files are built field by field at the Save_* offsets parsed from the
+client's TR1RMemoryMap.cs, not from savefile.SLOT_FIELDS, and the columnar
+decode must read back what was written: occupied and empty slots, files
+that end partway through the slot region, and files too short to hold a
+single slot.
+"""
+
+import re
+import struct
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+import savefile
+from conftest import ROOT
+
+MEMORY_MAP = ROOT / "client" / "TRArchipelagoClient" / "GameInterface" / "TR1RMemoryMap.cs"
+
+# savefile field -> TR1RMemoryMap constant
+CLIENT_FIELDS = {
+    "status": "Save_SlotStatus",
+    "game_mode": "Save_GameMode",
+    "save_number": "Save_Number",
+    "magnum_ammo": "Save_MagnumAmmo",
+    "uzi_ammo": "Save_UziAmmo",
+    "shotgun_ammo": "Save_ShotgunAmmo",
+    "small_medipacks": "Save_SmallMedipacks",
+    "large_medipacks": "Save_LargeMedipacks",
+    "weapons_config": "Save_WeaponsConfig",
+    "time_taken": "Save_TimeTaken",
+    "ammo_used": "Save_AmmoUsed",
+    "hits": "Save_Hits",
+    "kills": "Save_Kills",
+    "distance": "Save_Distance",
+    "secrets_found": "Save_SecretsFound",
+    "pickups": "Save_Pickups",
+    "medipacks_used": "Save_MedipacksUsed",
+    "level_index": "Save_LevelIndex",
+}
+
+
+@pytest.fixture(scope="module")
+def client_offsets() -> Dict[str, int]:
+    source = MEMORY_MAP.read_text(encoding="utf-8")
+    return {name: int(value, 0)
+            for name, value in re.findall(r"const\s+int\s+(\w+)\s*=\s*(0x[0-9A-Fa-f]+|\d+)\s*;", source)}
+
+
+def slot_values(index: int) -> Dict[str, int]:
+    return {
+        "status": savefile.SLOT_OCCUPIED, "game_mode": index % 2, "save_number": 1000 + index,
+        "magnum_ammo": 100 + index, "uzi_ammo": 200 + index, "shotgun_ammo": 300 + index,
+        "small_medipacks": index % 5, "large_medipacks": index % 3,
+        "weapons_config": savefile.WEAPON_PISTOLS | savefile.WEAPON_SHOTGUN,
+        "time_taken": 30 * 3600 + index, "ammo_used": 40 + index, "hits": index, "kills": 2 * index,
+        "distance": 0x8000_0000 + index, "secrets_found": 0b101 << index % 8, "pickups": index,
+        "medipacks_used": index % 4, "level_index": 1 + index % 15,
+    }
+
+
+def build_save_file(client_offsets: Dict[str, int], slots: Dict[int, Dict[str, int]], size: int) -> bytes:
+    """A save file of the given size with the given slots written field by field."""
+    data = bytearray(client_offsets["SaveFileSize"])
+    codes = {name: code for name, _offset, code in savefile.SLOT_FIELDS}
+    for index, values in slots.items():
+        slot = client_offsets["SaveFileBaseOffset"] + index * client_offsets["SaveSlotSize"]
+        for name, value in values.items():
+            struct.pack_into("<" + codes[name], data, slot + client_offsets[CLIENT_FIELDS[name]], value)
+    return bytes(data[:size])
+
+
+def test_layout_matches_client(client_offsets: Dict[str, int]) -> None:
+    assert savefile.SAVE_FILE_BASE_OFFSET == client_offsets["SaveFileBaseOffset"]
+    assert savefile.SAVE_FILE_MAX_OFFSET == client_offsets["SaveFileMaxOffset"]
+    assert savefile.SAVE_SLOT_SIZE == client_offsets["SaveSlotSize"]
+    assert savefile.MAX_SAVE_SLOTS == client_offsets["MaxSaveSlots"]
+    assert {name: offset for name, offset, _code in savefile.SLOT_FIELDS} \
+        == {name: client_offsets[constant] for name, constant in CLIENT_FIELDS.items()}
+
+
+def test_columns_hold_each_slot(client_offsets: Dict[str, int]) -> None:
+    written = {index: slot_values(index) for index in range(0, savefile.MAX_SAVE_SLOTS, 3)}
+    slots = savefile.decode_slots(build_save_file(client_offsets, written, client_offsets["SaveFileSize"]))
+
+    assert len(slots) == savefile.MAX_SAVE_SLOTS
+    assert slots.occupied() == sorted(written)
+    assert slots.latest() == max(written)
+    for index in range(savefile.MAX_SAVE_SLOTS):
+        expected = written.get(index, dict.fromkeys(savefile.FIELD_NAMES, 0))
+        assert slots.slot(index) == expected
+        assert {name: getattr(slots, name)[index] for name in savefile.FIELD_NAMES} == expected
+
+
+def test_row_decode_matches_columns(client_offsets: Dict[str, int]) -> None:
+    written = {index: slot_values(index) for index in (0, 7, savefile.MAX_SAVE_SLOTS - 1)}
+    data = build_save_file(client_offsets, written, client_offsets["SaveFileSize"])
+    slots = savefile.decode_slots(data)
+    region = data[savefile.SAVE_FILE_BASE_OFFSET:savefile.SAVE_FILE_MAX_OFFSET]
+
+    for index in range(savefile.MAX_SAVE_SLOTS):
+        assert savefile.decode_slot(data, index) == slots.slot(index)
+        assert savefile.decode_slot(region, index, base_offset=0) == slots.slot(index)
+
+
+@pytest.mark.parametrize("complete_slots", [0, 1, 5, savefile.MAX_SAVE_SLOTS])
+def test_short_files_decode_complete_slots(client_offsets: Dict[str, int], complete_slots: int) -> None:
+    written = {index: slot_values(index) for index in range(savefile.MAX_SAVE_SLOTS)}
+    # Cut partway into the next slot, past its status and save number
+    size = savefile.SAVE_FILE_BASE_OFFSET + complete_slots * savefile.SAVE_SLOT_SIZE + 0x100
+    slots = savefile.decode_slots(build_save_file(client_offsets, written, size))
+
+    assert len(slots) == complete_slots
+    assert all(len(getattr(slots, name)) == complete_slots for name in savefile.FIELD_NAMES)
+    assert slots.occupied() == list(range(complete_slots))
+    assert slots.latest() == (complete_slots - 1 if complete_slots else None)
+    assert [slots.slot(index) for index in range(complete_slots)] \
+        == [written[index] for index in range(complete_slots)]
+
+
+def test_empty_file_has_no_slots() -> None:
+    slots = savefile.decode_slots(b"")
+    assert len(slots) == 0
+    assert slots.occupied() == []
+    assert slots.latest() is None
+
+
+@pytest.mark.parametrize("size", [0, savefile.SAVE_FILE_BASE_OFFSET + 0x10,
+                                  savefile.SAVE_FILE_BASE_OFFSET + 2 * savefile.SAVE_SLOT_SIZE])
+def test_read_save_file_maps_the_file(client_offsets: Dict[str, int], tmp_path: Path, size: int) -> None:
+    written = {0: slot_values(0), 1: slot_values(1)}
+    path = tmp_path / "savegame.dat"
+    path.write_bytes(build_save_file(client_offsets, written, size))
+
+    slots = savefile.read_save_file(str(path))
+    assert len(slots) == max(0, size - savefile.SAVE_FILE_BASE_OFFSET) // savefile.SAVE_SLOT_SIZE
+    assert [slots.slot(index) for index in slots.occupied()] \
+        == [written[index] for index in range(len(slots))]
@@ -0,0 +1,121 @@
+"""
+The sphere analyzer (tools/spheres.py) on synthetic placements.
+
+Every key item is placed in the first two levels, so the levels open one
+sphere at a time and the minimal playthrough is exactly the keys the level
+completions ask for. Moving one of those keys into a later level makes the
+seed unbeatable.
+"""
+
+from typing import Dict
+
+import pytest
+
+import spheres
+from conftest import requires_game_data
+from tr1r.game_data import get_levels
+from tr1r.items import get_items_by_category
+from tr1r.locations import get_location_table, get_locations_by_level
+from tr1r.rules import LEVEL_COMPLETE_REQUIREMENTS
+
+pytestmark = requires_game_data
+
+
+def levels() -> list:
+    return [name for name, _file, _region in get_levels()]
+
+
+def pickups(level: str) -> list:
+    return [name for name in get_locations_by_level(level)
+            if get_location_table()[name].category == "pickup"]
+
+
+def early_keys() -> Dict[str, str]:
+    """Every key item at a pickup of Caves or City of Vilcabamba."""
+    first, second = levels()[:2]
+    return dict(zip(pickups(first) + pickups(second), get_items_by_category("key_item")))
+
+
+def move(placement: Dict[str, str], item: str, level: str) -> Dict[str, str]:
+    """The placement with item taken out, and placed in level if one is given."""
+    placement = {location: placed for location, placed in placement.items() if placed != item}
+    if level:
+        placement[pickups(level)[0]] = item
+    return placement
+
+
+@pytest.fixture(scope="module")
+def model() -> spheres.LogicModel:
+    return spheres.LogicModel()
+
+
+def test_levels_open_one_sphere_at_a_time(model: spheres.LogicModel) -> None:
+    report = spheres.analyze(model, early_keys())
+    names = levels()
+
+    assert report["beatable"]
+    assert report["external"] == []
+    assert report["reachable"] == report["locations"] == len(get_location_table())
+    # A level's locations open with the previous level's completion event
+    assert report["spheres"] == len(names)
+    assert report["sphere_sizes"] == [len(get_locations_by_level(level)) for level in names]
+    assert set(report["key_item_spheres"].values()) == {0, 1}
+
+
+def test_minimal_playthrough_holds_the_required_keys(model: spheres.LogicModel) -> None:
+    placement = early_keys()
+    report = spheres.analyze(model, placement)
+
+    required = {item for items in LEVEL_COMPLETE_REQUIREMENTS.values() for item in items}
+    found = {location: item for sphere in report["playthrough"] for location, item in sphere.items()}
+    assert set(found.values()) == required
+    assert all(placement[location] == item for location, item in found.items())
+
+
+def test_unlocks_are_the_locations_behind_a_key(model: spheres.LogicModel) -> None:
+    report = spheres.analyze(model, early_keys())
+
+    # Without a cog, Lost Valley cannot be completed: its completion and every later level are lost
+    names = levels()
+    behind = 1 + sum(len(get_locations_by_level(level)) for level in names[names.index("Lost Valley") + 1:])
+    for cog in LEVEL_COMPLETE_REQUIREMENTS["Lost Valley - Complete"]:
+        assert report["unlocks"][cog]["locations"] == behind
+        assert report["unlocks"][cog]["progression"] == []
+
+
+def test_unplaced_keys_come_from_other_worlds(model: spheres.LogicModel) -> None:
+    report = spheres.analyze(model, move(early_keys(), "Colosseum Rusty Key", ""))
+
+    assert report["beatable"]
+    assert report["external"] == ["Colosseum Rusty Key"]
+    assert "Colosseum Rusty Key" not in report["key_item_spheres"]
+
+
+def test_unbeatable_placement_has_no_playthrough(model: spheres.LogicModel, capsys) -> None:
+    # The Colosseum's key is found after the Colosseum
+    report = spheres.analyze(model, move(early_keys(), "Colosseum Rusty Key", "Palace Midas"))
+    open_levels = levels()[:levels().index("Colosseum") + 1]
+
+    assert not report["beatable"]
+    assert report["playthrough"] == []
+    assert report["spheres"] == len(open_levels)
+    # Everything up to the Colosseum but its completion
+    assert report["reachable"] == sum(len(get_locations_by_level(level)) for level in open_levels) - 1
+
+    spheres.print_report(report)
+    output = capsys.readouterr().out
+    assert "NOT BEATABLE" in output
+    assert "Minimal playthrough: none, the goal is not reachable" in output
+    assert "sphere 0:" not in output
+
+
+@pytest.mark.parametrize("goal, levels_for_goal, beatable", [
+    ("n_levels", 5, True), ("n_levels", 6, False), ("final_boss", 15, False),
+])
+def test_goal_settings(model: spheres.LogicModel, goal: str, levels_for_goal: int, beatable: bool) -> None:
+    # With the Colosseum's key after the Colosseum, five levels can still be completed
+    placement = move(early_keys(), "Colosseum Rusty Key", "Palace Midas")
+    report = spheres.analyze(model, placement, goal, levels_for_goal)
+
+    assert report["beatable"] == beatable
+    assert bool(report["playthrough"]) == beatable
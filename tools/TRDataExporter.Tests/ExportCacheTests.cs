@@ -0,0 +1,143 @@
+using Newtonsoft.Json;
+using Xunit;
+
+namespace TRDataExporter.Tests;
+
+/// <summary>
+/// An incremental export merges levels read back from tr1r_data.cache.json with
+/// freshly read ones. These tests check that a cached level serializes to exactly
+/// the bytes it had when it was first exported, so the merged tr1r_data.json is
+/// byte-identical to a clean export (TRDataExporter --verify checks the same on
+/// real game files).
+/// </summary>
+public class ExportCacheTests : IDisposable
+{
+    private readonly string _dir = Directory.CreateTempSubdirectory("tr1r-export-cache").FullName;
+
+    public void Dispose() => Directory.Delete(_dir, true);
+
+    private static LevelData SampleLevel(int i) => new()
+    {
+        Name = i == 4 ? "St. Francis' Folly" : $"Level {i}",
+        File = $"LEVEL{i}.PHD",
+        Sequence = i + 1,
+        Region = "Greece",
+        Pickups =
+        {
+            new() { EntityIndex = 5, Type = "MagnumAmmo_S_P", Category = "ammo", X = 8561, Y = -8339, Z = 11099, Room = 17 },
+            new() { EntityIndex = 40 + i, Type = "SmallMed_S_P", Category = "small_medipack", X = -1, Y = 0, Z = int.MaxValue, Room = short.MaxValue },
+        },
+        KeyItems =
+        {
+            new() { EntityIndex = 143, Type = "Key3_S_P", Alias = "Cistern_Key3", Name = "The Cistern - Rusty Key", X = 1, Y = 2, Z = 3, Room = 4 },
+        },
+        Secrets = { new() { Index = 0 }, new() { Index = 1, RewardEntities = { 7, 8 } } },
+        Routes = { new() { X = 1, Y = 2, Z = 3, Room = 4, KeyItemsLow = "a", Range = null, RequiresReturnPath = true } },
+        // Levels that fail to read have no room graph, which must stay absent
+        RoomGraph = i % 2 == 0 ? null : new()
+        {
+            StartRoom = 3,
+            RoomCount = 5,
+            Links =
+            {
+                new() { From = 0, To = 1, Keys = { "Cistern Rusty Key (Near Pierre)" } },
+                new() { From = 1, To = 0 },
+            },
+        },
+    };
+
+    private static string Serialize(IEnumerable<LevelData> levels)
+    {
+        var data = new TR1ArchipelagoData();
+        data.Levels.AddRange(levels);
+        data.LevelSequence = data.Levels.Select(l => l.File).ToList();
+        data.ItemDefinitions["Cistern_K3_RustyKeyMainRoom"] = new()
+        {
+            Id = 787295, Name = "Cistern Rusty Key (Main Room)", Category = "key_item", ApClassification = "progression",
+        };
+        return JsonConvert.SerializeObject(data, TR1ArchipelagoData.JsonSettings);
+    }
+
+    [Fact]
+    public void MergedExportMatchesCleanExport()
+    {
+        var clean = Enumerable.Range(0, 15).Select(SampleLevel).ToList();
+
+        string path = Path.Combine(_dir, "tr1r_data.cache.json");
+        var cache = new ExportCache();
+        cache.Validate("tables");
+        foreach (var level in clean)
+            cache.Store(level.File, $"hash-{level.File}", level, new() { $"  {level.Name}: 1 entities" });
+        cache.Save(path);
+
+        // Every other level comes from the cache, as after changing half the .PHD files
+        var reloaded = ExportCache.Load(path);
+        reloaded.Validate("tables");
+        var merged = clean.Select((level, i) =>
+        {
+            if (i % 2 == 1)
+                return SampleLevel(i);
+            Assert.True(reloaded.TryGet(level.File, $"hash-{level.File}", out CachedLevel cached));
+            Assert.Equal(new[] { $"  {level.Name}: 1 entities" }, cached.Log);
+            return cached.Level;
+        });
+
+        Assert.Equal(Serialize(clean), Serialize(merged));
+    }
+
+    [Fact]
+    public void ChangedTablesOrFormatDropTheCache()
+    {
+        var cache = new ExportCache();
+        cache.Validate("tables");
+        cache.Store("LEVEL1.PHD", "hash", SampleLevel(1), new());
+
+        cache.Validate("tables");
+        Assert.True(cache.TryGet("LEVEL1.PHD", "hash", out _));
+
+        cache.Validate("other tables");
+        Assert.False(cache.TryGet("LEVEL1.PHD", "hash", out _));
+
+        cache.Store("LEVEL1.PHD", "hash", SampleLevel(1), new());
+        cache.Version = ExportCache.FormatVersion - 1;
+        cache.Validate("other tables");
+        Assert.False(cache.TryGet("LEVEL1.PHD", "hash", out _));
+        Assert.Equal(ExportCache.FormatVersion, cache.Version);
+    }
+
+    [Fact]
+    public void ChangedOrMissingLevelFilesMiss()
+    {
+        var cache = new ExportCache();
+        cache.Validate("tables");
+        cache.Store("LEVEL1.PHD", "hash", SampleLevel(1), new());
+
+        Assert.False(cache.TryGet("LEVEL1.PHD", "changed", out _));
+        Assert.False(cache.TryGet("LEVEL1.PHD", null, out _));
+        Assert.False(cache.TryGet("LEVEL2.PHD", "hash", out _));
+
+        cache.Remove("LEVEL1.PHD");
+        Assert.False(cache.TryGet("LEVEL1.PHD", "hash", out _));
+    }
+
+    [Fact]
+    public void UnreadableCacheStartsEmpty()
+    {
+        string path = Path.Combine(_dir, "broken.cache.json");
+        File.WriteAllText(path, "{ not json");
+        Assert.Empty(ExportCache.Load(path).Levels);
+        Assert.Empty(ExportCache.Load(Path.Combine(_dir, "missing.cache.json")).Levels);
+    }
+
+    [Fact]
+    public void HashFileHashesContents()
+    {
+        string path = Path.Combine(_dir, "LEVEL1.PHD");
+        File.WriteAllBytes(path, new byte[] { 1, 2, 3 });
+        string first = ExportCache.HashFile(path);
+
+        File.WriteAllBytes(path, new byte[] { 1, 2, 4 });
+        Assert.NotEqual(first, ExportCache.HashFile(path));
+        Assert.Null(ExportCache.HashFile(Path.Combine(_dir, "missing.PHD")));
+    }
+}
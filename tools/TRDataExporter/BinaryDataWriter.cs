@@ -0,0 +1,129 @@
+using System.Security.Cryptography;
+using System.Text;
+
+namespace TRDataExporter;
+
+/// <summary>
+/// Writes the compact binary form of the exported data (tr1r_data.bin).
+///
+/// The APWorld loads this instead of parsing tr1r_data.json when the header
+/// matches its format version and the SHA-256 of the shipped JSON. The layout
+/// is documented in apworld/tr1r/game_data.py and must stay in sync with it;
+/// bump FormatVersion on any change.
+/// </summary>
+public static class BinaryDataWriter
+{
+    public const ushort FormatVersion = 1;
+    private static readonly byte[] Magic = "TR1R"u8.ToArray();
+
+    public static byte[] Write(TR1ArchipelagoData data, byte[] sourceJson)
+    {
+        var strings = new StringPool();
+
+        // Intern everything first so the string table can be written up front.
+        var levels = data.Levels.Select(level => new
+        {
+            Level = level,
+            Name = strings.Add(level.Name),
+            File = strings.Add(level.File),
+            Region = strings.Add(level.Region),
+            Pickups = level.Pickups.Select(p => new EntityRecord(
+                p.EntityIndex, strings.Add(p.Type), strings.Add(p.Category), 0, 0, p.X, p.Y, p.Z, p.Room)).ToList(),
+            KeyItems = level.KeyItems.Select(k => new EntityRecord(
+                k.EntityIndex, strings.Add(k.Type), 0, strings.Add(k.Alias), strings.Add(k.Name), k.X, k.Y, k.Z, k.Room)).ToList(),
+        }).ToList();
+
+        var items = data.ItemDefinitions.Select(kv => new
+        {
+            Key = strings.Add(kv.Key),
+            kv.Value.Id,
+            Name = strings.Add(kv.Value.Name),
+            Category = strings.Add(kv.Value.Category),
+            Classification = strings.Add(kv.Value.ApClassification),
+        }).ToList();
+
+        var sequence = data.LevelSequence.Select(strings.Add).ToList();
+
+        using var ms = new MemoryStream();
+        using var writer = new BinaryWriter(ms);
+
+        writer.Write(Magic);
+        writer.Write(FormatVersion);
+        writer.Write(SHA256.HashData(sourceJson));
+
+        writer.Write((uint)strings.Values.Count);
+        foreach (string value in strings.Values)
+        {
+            byte[] bytes = Encoding.UTF8.GetBytes(value);
+            writer.Write((ushort)bytes.Length);
+            writer.Write(bytes);
+        }
+
+        writer.Write((ushort)levels.Count);
+        foreach (var level in levels)
+        {
+            writer.Write(level.Name);
+            writer.Write(level.File);
+            writer.Write(level.Region);
+            writer.Write((ushort)level.Level.Sequence);
+            writer.Write((ushort)level.Pickups.Count);
+            writer.Write((ushort)level.KeyItems.Count);
+            writer.Write((ushort)level.Level.Secrets.Count);
+            level.Pickups.ForEach(r => r.Write(writer));
+            level.KeyItems.ForEach(r => r.Write(writer));
+            level.Level.Secrets.ForEach(s => writer.Write((ushort)s.Index));
+        }
+
+        writer.Write((ushort)items.Count);
+        foreach (var item in items)
+        {
+            writer.Write(item.Key);
+            writer.Write(item.Id);
+            writer.Write(item.Name);
+            writer.Write(item.Category);
+            writer.Write(item.Classification);
+        }
+
+        writer.Write((ushort)sequence.Count);
+        sequence.ForEach(writer.Write);
+
+        writer.Flush();
+        return ms.ToArray();
+    }
+
+    private readonly record struct EntityRecord(
+        int EntityIndex, ushort Type, ushort Category, ushort Alias, ushort Name,
+        int X, int Y, int Z, short Room)
+    {
+        public void Write(BinaryWriter writer)
+        {
+            writer.Write((ushort)EntityIndex);
+            writer.Write(Type);
+            writer.Write(Category);
+            writer.Write(Alias);
+            writer.Write(Name);
+            writer.Write(X);
+            writer.Write(Y);
+            writer.Write(Z);
+            writer.Write(Room);
+        }
+    }
+
+    private class StringPool
+    {
+        private readonly Dictionary<string, ushort> _ids = new() { [""] = 0 };
+        public List<string> Values { get; } = new() { "" };
+
+        public ushort Add(string value)
+        {
+            value ??= "";
+            if (!_ids.TryGetValue(value, out ushort id))
+            {
+                id = (ushort)Values.Count;
+                _ids[value] = id;
+                Values.Add(value);
+            }
+            return id;
+        }
+    }
+}
@@ -0,0 +1,109 @@
+using System.Security.Cryptography;
+using System.Text;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Serialization;
+
+namespace TRDataExporter;
+
+/// <summary>
+/// Per-level results of the previous export (tr1r_data.cache.json, next to
+/// the output), so a re-run only reads the .PHD files that changed.
+///
+/// Each level is keyed by the SHA-256 of its .PHD. The whole cache is keyed by
+/// a hash of the exporter's own tables (display names, key names, secret
+/// counts, item definitions...) and is dropped when any of them change; bump
+/// FormatVersion when the per-level export logic itself changes.
+/// </summary>
+public class ExportCache
+{
+    public const int FormatVersion = 2;
+
+    private static readonly JsonSerializerSettings _settings = new()
+    {
+        // Level file names are dictionary keys and must come back unchanged
+        ContractResolver = new DefaultContractResolver { NamingStrategy = new CamelCaseNamingStrategy() },
+        NullValueHandling = NullValueHandling.Ignore,
+    };
+
+    public int Version { get; set; } = FormatVersion;
+    public string TablesHash { get; set; }
+    public Dictionary<string, CachedLevel> Levels { get; set; } = new();
+
+    public static ExportCache Load(string path)
+    {
+        if (!File.Exists(path))
+            return new ExportCache();
+
+        try
+        {
+            return JsonConvert.DeserializeObject<ExportCache>(File.ReadAllText(path), _settings) ?? new ExportCache();
+        }
+        catch (Exception ex) when (ex is JsonException or IOException)
+        {
+            Console.WriteLine($"  WARNING: Ignoring unreadable export cache {path}: {ex.Message}");
+            return new ExportCache();
+        }
+    }
+
+    public void Save(string path)
+    {
+        File.WriteAllText(path, JsonConvert.SerializeObject(this, _settings));
+    }
+
+    /// <summary>Drops every cached level unless the cache was written with these tables.</summary>
+    public void Validate(string tablesHash)
+    {
+        if (Version != FormatVersion || TablesHash != tablesHash)
+        {
+            Levels.Clear();
+        }
+        Version = FormatVersion;
+        TablesHash = tablesHash;
+    }
+
+    public bool TryGet(string levelFile, string contentHash, out CachedLevel level)
+    {
+        return Levels.TryGetValue(levelFile, out level)
+            && contentHash != null
+            && level.ContentHash == contentHash
+            && level.Level != null;
+    }
+
+    public void Store(string levelFile, string contentHash, LevelData level, List<string> log)
+    {
+        Levels[levelFile] = new CachedLevel
+        {
+            ContentHash = contentHash,
+            Log = log,
+            Level = level,
+        };
+    }
+
+    public void Remove(string levelFile)
+    {
+        Levels.Remove(levelFile);
+    }
+
+    /// <summary>SHA-256 of a file's contents, or null if it doesn't exist.</summary>
+    public static string HashFile(string path)
+    {
+        if (!File.Exists(path))
+            return null;
+
+        using var stream = File.OpenRead(path);
+        return Convert.ToHexString(SHA256.HashData(stream));
+    }
+
+    public static string HashJson(object value)
+    {
+        byte[] json = Encoding.UTF8.GetBytes(JsonConvert.SerializeObject(value, _settings));
+        return Convert.ToHexString(SHA256.HashData(json));
+    }
+}
+
+public class CachedLevel
+{
+    public string ContentHash { get; set; }
+    public List<string> Log { get; set; } = new();
+    public LevelData Level { get; set; }
+}
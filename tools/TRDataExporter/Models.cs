@@ -1,7 +1,18 @@
+using Newtonsoft.Json;
+using Newtonsoft.Json.Serialization;
+
 namespace TRDataExporter;
 
 public class TR1ArchipelagoData
 {
+    /// <summary>How tr1r_data.json is written (and what tools/export_data.py mirrors).</summary>
+    public static readonly JsonSerializerSettings JsonSettings = new()
+    {
+        Formatting = Formatting.Indented,
+        ContractResolver = new CamelCasePropertyNamesContractResolver(),
+        NullValueHandling = NullValueHandling.Ignore
+    };
+
     public string Game { get; set; } = "Tomb Raider 1 Remastered";
     public List<LevelData> Levels { get; set; } = new();
     public List<string> LevelSequence { get; set; } = new();
@@ -19,6 +30,7 @@ public class LevelData
     public List<KeyItemData> KeyItems { get; set; } = new();
     public List<SecretData> Secrets { get; set; } = new();
     public List<RouteData> Routes { get; set; } = new();
+    public RoomGraphData RoomGraph { get; set; }
 }
 
 public class PickupData
@@ -62,6 +74,25 @@ public class RouteData
     public bool RequiresReturnPath { get; set; }
 }
 
+/// <summary>
+/// Room connectivity for one level, consumed by tools/compile_regions.py.
+/// Links are directed; a link with keys only opens holding all of those AP items
+/// (one per keyhole door, as keys are used up). Doors no key opens have no link.
+/// </summary>
+public class RoomGraphData
+{
+    public int StartRoom { get; set; }
+    public int RoomCount { get; set; }
+    public List<RoomLinkData> Links { get; set; } = new();
+}
+
+public class RoomLinkData
+{
+    public int From { get; set; }
+    public int To { get; set; }
+    public List<string> Keys { get; set; } = new();
+}
+
 public class KeyDependency
 {
     public string Level { get; set; }
@@ -1,10 +1,16 @@
+using System.Text;
 using Newtonsoft.Json;
-using Newtonsoft.Json.Serialization;
 using TRDataExporter;
 
 Console.WriteLine("TR1 Remastered -> Archipelago Data Exporter");
 Console.WriteLine("============================================");
 
+// --no-cache: ignore the per-level cache from the last run (it is rewritten)
+// --verify: also run a clean export and check the output is byte-identical
+bool useCache = !args.Contains("--no-cache");
+bool verify = args.Contains("--verify");
+args = args.Where(a => !a.StartsWith("--")).ToArray();
+
 // Game data directory (where .PHD files are)
 string defaultGameDir = @"C:\Program Files (x86)\Steam\steamapps\common\Tomb Raider I-III Remastered\1\DATA";
 string gameDataDir = args.Length > 0 ? args[0] : defaultGameDir;
@@ -17,7 +23,7 @@ string outputPath = args.Length > 1 ? args[1] : "tr1r_data.json";
 if (!Directory.Exists(gameDataDir))
 {
     Console.WriteLine($"ERROR: Game data directory not found: {gameDataDir}");
-    Console.WriteLine($"Usage: TRDataExporter [game_data_dir] [output_path]");
+    Console.WriteLine($"Usage: TRDataExporter [game_data_dir] [output_path] [--no-cache] [--verify]");
     Console.WriteLine($"  game_data_dir: Path to TR1 Remastered DATA directory (containing .PHD files)");
     return;
 }
@@ -26,23 +32,46 @@ Console.WriteLine($"Game data: {gameDataDir}");
 Console.WriteLine($"Resources: {resourceBase}");
 Console.WriteLine();
 
+// Per-level results from the last run; only changed .PHD files are read again
+string cachePath = Path.ChangeExtension(outputPath, ".cache.json");
+var cache = useCache ? ExportCache.Load(cachePath) : new ExportCache();
+
 var exporter = new TR1DataExporter(gameDataDir, resourceBase);
-var data = exporter.Export();
+var data = exporter.Export(cache);
 
-var settings = new JsonSerializerSettings
-{
-    Formatting = Formatting.Indented,
-    ContractResolver = new CamelCasePropertyNamesContractResolver(),
-    NullValueHandling = NullValueHandling.Ignore
-};
+var settings = TR1ArchipelagoData.JsonSettings;
 
 string json = JsonConvert.SerializeObject(data, settings);
-File.WriteAllText(outputPath, json);
+byte[] jsonBytes = Encoding.UTF8.GetBytes(json);
+File.WriteAllBytes(outputPath, jsonBytes);
+cache.Save(cachePath);
+
+// Compact binary form, loaded by the APWorld while it matches the JSON above
+string binaryPath = Path.ChangeExtension(outputPath, ".bin");
+File.WriteAllBytes(binaryPath, BinaryDataWriter.Write(data, jsonBytes));
 
 Console.WriteLine();
-Console.WriteLine($"Exported {data.Levels.Count} levels");
+Console.WriteLine($"Exported {data.Levels.Count} levels ({exporter.LevelsRead} read, {exporter.LevelsReused} unchanged)");
 Console.WriteLine($"  Total pickups:   {data.Levels.Sum(l => l.Pickups.Count)}");
 Console.WriteLine($"  Total key items: {data.Levels.Sum(l => l.KeyItems.Count)}");
 Console.WriteLine($"  Total secrets:   {data.Levels.Sum(l => l.Secrets.Count)}");
 Console.WriteLine($"  Item defs:       {data.ItemDefinitions.Count}");
 Console.WriteLine($"Written to: {Path.GetFullPath(outputPath)}");
+Console.WriteLine($"            {Path.GetFullPath(binaryPath)}");
+Console.WriteLine($"Cache:      {Path.GetFullPath(cachePath)}");
+
+if (verify)
+{
+    Console.WriteLine();
+    Console.WriteLine("Verifying against a clean export...");
+    byte[] cleanBytes = Encoding.UTF8.GetBytes(JsonConvert.SerializeObject(exporter.Export(), settings));
+    if (!cleanBytes.AsSpan().SequenceEqual(jsonBytes))
+    {
+        Console.WriteLine("ERROR: Incremental export differs from a clean export; rerun with --no-cache");
+        Environment.ExitCode = 1;
+    }
+    else
+    {
+        Console.WriteLine("  Identical");
+    }
+}
@@ -97,121 +97,186 @@ public class TR1DataExporter
         _resourceBase = resourceBase;
     }
 
-    public TR1ArchipelagoData Export()
+    public TR1ArchipelagoData Export() => Export(new ExportCache());
+
+    /// <summary>
+    /// Exports all levels, reusing the cached result for any level whose .PHD
+    /// (and the exporter's tables) are unchanged since the cache was written.
+    /// Levels that do need reading are parsed in parallel. The cache is updated
+    /// in place; the caller saves it.
+    /// </summary>
+    public TR1ArchipelagoData Export(ExportCache cache)
     {
         var data = new TR1ArchipelagoData();
         var levels = TR1LevelNames.AsList;
-        var reader = new TR1LevelControl();
 
         // Build item definitions (AP item types and IDs)
         BuildItemDefinitions(data);
+        cache.Validate(HashTables(data));
 
+        var results = new LevelExport[levels.Count];
+        var hashes = new string[levels.Count];
+        var toRead = new List<int>();
         for (int i = 0; i < levels.Count; i++)
         {
-            string levelFile = levels[i];
-            string displayName = _levelDisplayNames.GetValueOrDefault(levelFile, levelFile);
-            string region = _levelRegions.GetValueOrDefault(levelFile, "Unknown");
+            hashes[i] = ExportCache.HashFile(Path.Combine(_gameDataDir, levels[i]));
+            if (cache.TryGet(levels[i], hashes[i], out CachedLevel cached))
+                results[i] = new LevelExport(cached.Level, cached.Log, true);
+            else
+                toRead.Add(i);
+        }
 
-            var levelData = new LevelData
-            {
-                Name = displayName,
-                File = levelFile,
-                Sequence = i + 1,
-                Region = region,
-            };
-
-            // Read actual level file
-            string phdPath = Path.Combine(_gameDataDir, levelFile);
-            if (!File.Exists(phdPath))
-            {
-                Console.WriteLine($"  WARNING: {phdPath} not found, skipping");
-                data.Levels.Add(levelData);
-                continue;
-            }
+        Parallel.ForEach(toRead, i => results[i] = ExportLevel(i, levels[i], data));
 
-            TR1Level level;
-            try
-            {
-                level = reader.Read(phdPath);
-            }
-            catch (Exception ex)
-            {
-                Console.WriteLine($"  WARNING: Failed to read {levelFile}: {ex.Message}");
-                data.Levels.Add(levelData);
-                continue;
-            }
+        // Log and merge in level order, whichever order the levels finished in
+        for (int i = 0; i < levels.Count; i++)
+        {
+            results[i].Log.ForEach(Console.WriteLine);
+            data.Levels.Add(results[i].Level);
+        }
+
+        // Missing and unreadable levels are retried on every run
+        foreach (int i in toRead)
+        {
+            if (results[i].Cacheable)
+                cache.Store(levels[i], hashes[i], results[i].Level, results[i].Log);
+            else
+                cache.Remove(levels[i]);
+        }
+        LevelsRead = toRead.Count;
+        LevelsReused = levels.Count - toRead.Count;
+
+        data.LevelSequence = levels;
+
+        // Build key dependencies
+        BuildKeyDependencies(data);
+
+        return data;
+    }
+
+    /// <summary>Levels parsed and levels taken from the cache by the last Export.</summary>
+    public int LevelsRead { get; private set; }
+    public int LevelsReused { get; private set; }
 
-            Console.WriteLine($"  {displayName}: {level.Entities.Count} entities");
+    // Cacheable is false for levels that were missing or failed to read
+    private readonly record struct LevelExport(LevelData Level, List<string> Log, bool Cacheable);
 
-            // Extract pickups and key items from actual entities
-            for (int ei = 0; ei < level.Entities.Count; ei++)
+    // Runs concurrently with other levels: reads only shared tables and data.ItemDefinitions,
+    // and logs to a list that Export prints in level order.
+    private LevelExport ExportLevel(int i, string levelFile, TR1ArchipelagoData data)
+    {
+        var log = new List<string>();
+        string displayName = _levelDisplayNames.GetValueOrDefault(levelFile, levelFile);
+        string region = _levelRegions.GetValueOrDefault(levelFile, "Unknown");
+
+        var levelData = new LevelData
+        {
+            Name = displayName,
+            File = levelFile,
+            Sequence = i + 1,
+            Region = region,
+        };
+
+        // Read actual level file
+        string phdPath = Path.Combine(_gameDataDir, levelFile);
+        if (!File.Exists(phdPath))
+        {
+            log.Add($"  WARNING: {phdPath} not found, skipping");
+            return new LevelExport(levelData, log, false);
+        }
+
+        TR1Level level;
+        try
+        {
+            level = new TR1LevelControl().Read(phdPath);
+        }
+        catch (Exception ex)
+        {
+            log.Add($"  WARNING: Failed to read {levelFile}: {ex.Message}");
+            return new LevelExport(levelData, log, false);
+        }
+
+        log.Add($"  {displayName}: {level.Entities.Count} entities");
+
+        // Extract pickups and key items from actual entities
+        for (int ei = 0; ei < level.Entities.Count; ei++)
+        {
+            var entity = level.Entities[ei];
+
+            if (TR1TypeUtilities.IsKeyItemType(entity.TypeID)
+                || (levelFile == TR1LevelNames.TIHOCAN && entity.TypeID == TR1Type.ScionPiece2_S_P))
             {
-                var entity = level.Entities[ei];
+                string baseName = entity.TypeID.ToString();
+                int sameTypeCount = levelData.KeyItems.Count(k => k.Type == baseName);
+                string friendlyName = BuildKeyItemName(levelFile, displayName, entity.TypeID, sameTypeCount);
+                string alias = BuildKeyItemAlias(displayName, entity.TypeID, sameTypeCount);
 
-                if (TR1TypeUtilities.IsKeyItemType(entity.TypeID)
-                    || (levelFile == TR1LevelNames.TIHOCAN && entity.TypeID == TR1Type.ScionPiece2_S_P))
-                {
-                    string baseName = entity.TypeID.ToString();
-                    int sameTypeCount = levelData.KeyItems.Count(k => k.Type == baseName);
-                    string friendlyName = BuildKeyItemName(levelFile, displayName, entity.TypeID, sameTypeCount);
-                    string alias = BuildKeyItemAlias(displayName, entity.TypeID, sameTypeCount);
-
-                    levelData.KeyItems.Add(new KeyItemData
-                    {
-                        EntityIndex = ei,
-                        Type = baseName,
-                        Alias = alias,
-                        Name = friendlyName,
-                        X = entity.X,
-                        Y = entity.Y,
-                        Z = entity.Z,
-                        Room = entity.Room,
-                    });
-                }
-                else if (TR1TypeUtilities.IsStandardPickupType(entity.TypeID))
+                levelData.KeyItems.Add(new KeyItemData
                 {
-                    string category;
-                    if (TR1TypeUtilities.IsWeaponPickup(entity.TypeID))
-                        category = "weapon";
-                    else if (TR1TypeUtilities.IsAmmoPickup(entity.TypeID))
-                        category = "ammo";
-                    else if (TR1TypeUtilities.IsMediType(entity.TypeID))
-                        category = entity.TypeID == TR1Type.LargeMed_S_P ? "large_medipack" : "small_medipack";
-                    else
-                        category = "pickup";
-
-                    levelData.Pickups.Add(new PickupData
-                    {
-                        EntityIndex = ei,
-                        Type = entity.TypeID.ToString(),
-                        Category = category,
-                        X = entity.X,
-                        Y = entity.Y,
-                        Z = entity.Z,
-                        Room = entity.Room,
-                    });
-                }
+                    EntityIndex = ei,
+                    Type = baseName,
+                    Alias = alias,
+                    Name = friendlyName,
+                    X = entity.X,
+                    Y = entity.Y,
+                    Z = entity.Z,
+                    Room = entity.Room,
+                });
             }
-
-            // Secrets: use known counts per level
-            int secretCount = _secretCounts.GetValueOrDefault(levelFile, 0);
-            for (int s = 0; s < secretCount; s++)
+            else if (TR1TypeUtilities.IsStandardPickupType(entity.TypeID))
             {
-                levelData.Secrets.Add(new SecretData
+                string category;
+                if (TR1TypeUtilities.IsWeaponPickup(entity.TypeID))
+                    category = "weapon";
+                else if (TR1TypeUtilities.IsAmmoPickup(entity.TypeID))
+                    category = "ammo";
+                else if (TR1TypeUtilities.IsMediType(entity.TypeID))
+                    category = entity.TypeID == TR1Type.LargeMed_S_P ? "large_medipack" : "small_medipack";
+                else
+                    category = "pickup";
+
+                levelData.Pickups.Add(new PickupData
                 {
-                    Index = s,
+                    EntityIndex = ei,
+                    Type = entity.TypeID.ToString(),
+                    Category = category,
+                    X = entity.X,
+                    Y = entity.Y,
+                    Z = entity.Z,
+                    Room = entity.Room,
                 });
             }
-
-            data.Levels.Add(levelData);
         }
 
-        data.LevelSequence = levels;
+        levelData.RoomGraph = BuildRoomGraph(level, levelData, data, i, log);
 
-        // Build key dependencies
-        BuildKeyDependencies(data);
+        // Secrets: use known counts per level
+        int secretCount = _secretCounts.GetValueOrDefault(levelFile, 0);
+        for (int s = 0; s < secretCount; s++)
+        {
+            levelData.Secrets.Add(new SecretData
+            {
+                Index = s,
+            });
+        }
 
-        return data;
+        return new LevelExport(levelData, log, true);
+    }
+
+    // Everything that shapes a level's export besides its .PHD: a change to any
+    // of these tables invalidates the whole cache.
+    private static string HashTables(TR1ArchipelagoData data)
+    {
+        return ExportCache.HashJson(new
+        {
+            _levelDisplayNames,
+            _levelRegions,
+            KeyTypeNames = _keyTypeNames.Select(kv => new[] { kv.Key.level, kv.Key.baseType, kv.Value }),
+            _levelShortNames,
+            _secretCounts,
+            _keyholeKeys,
+            data.ItemDefinitions,
+        });
     }
 
     private static string GetKeyItemDisplayName(TR1Type alias, string baseName)
@@ -310,6 +375,118 @@ public class TR1DataExporter
         };
     }
 
+    // Keyholes and puzzle holes, and the pickup type that fits each
+    private static readonly Dictionary<TR1Type, TR1Type> _keyholeKeys = new()
+    {
+        [TR1Type.Keyhole1]    = TR1Type.Key1_S_P,
+        [TR1Type.Keyhole2]    = TR1Type.Key2_S_P,
+        [TR1Type.Keyhole3]    = TR1Type.Key3_S_P,
+        [TR1Type.Keyhole4]    = TR1Type.Key4_S_P,
+        [TR1Type.PuzzleHole1] = TR1Type.Puzzle1_S_P,
+        [TR1Type.PuzzleHole2] = TR1Type.Puzzle2_S_P,
+        [TR1Type.PuzzleHole3] = TR1Type.Puzzle3_S_P,
+        [TR1Type.PuzzleHole4] = TR1Type.Puzzle4_S_P,
+    };
+
+    private static RoomGraphData BuildRoomGraph(TR1Level level, LevelData levelData, TR1ArchipelagoData data, int levelIndex, List<string> log)
+    {
+        var graph = new RoomGraphData
+        {
+            StartRoom = level.Entities.Find(e => e.TypeID == TR1Type.Lara)?.Room ?? 0,
+            RoomCount = level.Rooms.Count,
+        };
+
+        // Doors opened from a keyhole: (room, room beyond the door) -> the AP item it takes.
+        // Keys are used up, so one key can't open every door of its type: the n-th
+        // keyhole of a type (in entity order) takes the n-th key of that type.
+        var gates = new Dictionary<(int, int), List<string>>();
+        var shut = new HashSet<(int, int)>();
+        var keyholesSeen = new Dictionary<TR1Type, int>();
+        for (int ei = 0; ei < level.Entities.Count; ei++)
+        {
+            if (!_keyholeKeys.TryGetValue(level.Entities[ei].TypeID, out TR1Type keyType))
+                continue;
+
+            int slot = keyholesSeen.GetValueOrDefault(keyType);
+            keyholesSeen[keyType] = slot + 1;
+            List<string> keys = GetKeyholeKeyItem(levelData, data, keyType, slot, levelIndex, out bool hasKey);
+            // Keys that stay vanilla are always in the level, so their doors are not gates
+            if (hasKey && keys.Count == 0)
+                continue;
+            if (!hasKey)
+                log.Add($"    WARNING: keyhole #{ei} has no {keyType} of its own, its doors stay shut");
+
+            var triggers = level.FloorData.GetSwitchKeyTriggers(ei).Where(t => t.TrigType == FDTrigType.Key);
+            foreach (var action in triggers.SelectMany(t => t.Actions).Where(a => a.Action == FDTrigAction.Object))
+            {
+                var door = level.Entities[action.Parameter];
+                var sector = level.Rooms[door.Room].GetSector(door.X, door.Z);
+                short beyond = level.FloorData.GetDoor(sector);
+                if (beyond == TRConsts.NoRoom)
+                {
+                    log.Add($"    WARNING: {door.TypeID} #{action.Parameter} (keyhole #{ei}) is not on a portal, not gated");
+                    continue;
+                }
+
+                if (!hasKey)
+                {
+                    shut.Add((door.Room, beyond));
+                    shut.Add((beyond, door.Room));
+                    continue;
+                }
+
+                gates[(door.Room, beyond)] = keys;
+                gates[(beyond, door.Room)] = keys;
+            }
+        }
+
+        var seen = new HashSet<(int, int)>();
+        void AddLink(int from, int to)
+        {
+            if (from != to && !shut.Contains((from, to)) && seen.Add((from, to)))
+            {
+                graph.Links.Add(new RoomLinkData
+                {
+                    From = from,
+                    To = to,
+                    Keys = gates.GetValueOrDefault((from, to)) ?? new(),
+                });
+            }
+        }
+
+        for (int r = 0; r < level.Rooms.Count; r++)
+        {
+            foreach (var portal in level.Rooms[r].Portals)
+                AddLink(r, portal.AdjoiningRoom);
+
+            // Flipmaps swap a room for its alternate; treat both as the same place
+            short alternate = level.Rooms[r].AlternateRoom;
+            if (alternate != -1)
+            {
+                AddLink(r, alternate);
+                AddLink(alternate, r);
+            }
+        }
+
+        return graph;
+    }
+
+    private static List<string> GetKeyholeKeyItem(LevelData levelData, TR1ArchipelagoData data, TR1Type keyType, int slot, int levelIndex, out bool hasKey)
+    {
+        // The slot-th key of keyType in the level; empty if it stays vanilla
+        var fitting = levelData.KeyItems.Where(k => k.Type == keyType.ToString()).ToList();
+        hasKey = slot < fitting.Count;
+        if (!hasKey)
+            return new();
+
+        // Key item aliases are the level's alias base + entity index (see TR1Type)
+        int aliasBase = (int)TR1Type.CavesKeyItemBase + levelIndex * 1000;
+        string alias = ((TR1Type)(aliasBase + fitting[slot].EntityIndex)).ToString();
+        return data.ItemDefinitions.TryGetValue(alias, out var definition)
+            ? new() { definition.Name }
+            : new();
+    }
+
     private void BuildKeyDependencies(TR1ArchipelagoData data)
     {
         // For each level's key items, record which level they belong to
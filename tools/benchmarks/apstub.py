@@ -0,0 +1,308 @@
+"""
+Minimal stand-ins for the parts of Archipelago the TR1R apworld imports.
+
+Installing the stubs registers fake ``BaseClasses``, ``Options`` and
+``worlds.*`` modules in ``sys.modules`` and puts ``apworld/`` on the path, so
+``import tr1r`` works without an Archipelago checkout. Only the behaviour the
+benchmarks depend on is modelled; semantics follow Archipelago's own classes.
+
+The region graph classes and MultiWorld are enough to run a world's
+generation stages and a reachability sweep, but there is no fill: callers
+place items themselves.
+"""
+
+import random
+import sys
+import types
+from collections import Counter, defaultdict, deque
+from enum import IntFlag
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+APWORLD_DIR = Path(__file__).resolve().parents[2] / "apworld"
+
+
+class ItemClassification(IntFlag):
+    filler = 0b0000
+    progression = 0b0001
+    useful = 0b0010
+    trap = 0b0100
+    skip_balancing = 0b1000
+    progression_skip_balancing = 0b1001
+
+
+class CollectionState:
+    """
+    Item counts and reachable regions per player, with Archipelago's
+    has/has_all semantics and its incremental region reachability update.
+    """
+
+    def __init__(self, multiworld=None):
+        self.multiworld = multiworld
+        self.prog_items: Dict[int, Counter] = defaultdict(Counter)
+        self.reachable_regions: Dict[int, Set["Region"]] = defaultdict(set)
+        self.blocked_connections: Dict[int, Set["Entrance"]] = defaultdict(set)
+        self.stale: Dict[int, bool] = defaultdict(lambda: True)
+        self.locations_checked: Set["Location"] = set()
+
+    def has(self, item: str, player: int, count: int = 1) -> bool:
+        return self.prog_items[player][item] >= count
+
+    def has_all(self, items: Iterable[str], player: int) -> bool:
+        return all(self.prog_items[player][item] for item in items)
+
+    def collect_name(self, item: str, player: int) -> None:
+        self.prog_items[player][item] += 1
+
+    def update_reachable_regions(self, player: int) -> None:
+        self.stale[player] = False
+        reachable = self.reachable_regions[player]
+        blocked = self.blocked_connections[player]
+        if not reachable:
+            start = self.multiworld.get_region("Menu", player)
+            reachable.add(start)
+            blocked.update(start.exits)
+
+        queue = deque(blocked)
+        while queue:
+            connection = queue.popleft()
+            region = connection.connected_region
+            if region in reachable:
+                blocked.discard(connection)
+            elif connection.can_reach(self):
+                reachable.add(region)
+                blocked.discard(connection)
+                blocked.update(region.exits)
+                queue.extend(region.exits)
+
+    def can_reach_region(self, region: "Region", player: int) -> bool:
+        if self.stale[player]:
+            self.update_reachable_regions(player)
+        return region in self.reachable_regions[player]
+
+    def collect(self, item: "Item", location: Optional["Location"] = None) -> bool:
+        if location is not None:
+            self.locations_checked.add(location)
+        changed = self.multiworld.worlds[item.player].collect(self, item)
+        if changed:
+            self.stale[item.player] = True
+        return changed
+
+    def remove(self, item: "Item") -> bool:
+        changed = self.multiworld.worlds[item.player].remove(self, item)
+        if changed:
+            # Reachability can only be rebuilt from scratch after a removal
+            self.reachable_regions[item.player] = set()
+            self.blocked_connections[item.player] = set()
+            self.stale[item.player] = True
+        return changed
+
+    def sweep_for_advancements(self, locations: Optional[Iterable["Location"]] = None) -> int:
+        """Collect progression items from reachable locations until none are left; return locations swept."""
+        if locations is None:
+            locations = self.multiworld.get_filled_locations()
+        pending = [location for location in locations
+                   if location.item is not None and location.item.advancement
+                   and location not in self.locations_checked]
+        swept = 0
+        while pending:
+            reachable = [location for location in pending if location.can_reach(self)]
+            if not reachable:
+                break
+            for location in reachable:
+                self.collect(location.item, location)
+            swept += len(reachable)
+            pending = [location for location in pending if location not in self.locations_checked]
+        return swept
+
+
+class Region:
+    def __init__(self, name: str, player: int, multiworld: "MultiWorld"):
+        self.name = name
+        self.player = player
+        self.multiworld = multiworld
+        self.locations: List["Location"] = []
+        self.exits: List["Entrance"] = []
+        self.entrances: List["Entrance"] = []
+
+    def can_reach(self, state: CollectionState) -> bool:
+        return state.can_reach_region(self, self.player)
+
+    def connect(self, connecting_region: "Region", name: Optional[str] = None,
+                rule: Optional[Callable[[CollectionState], bool]] = None) -> "Entrance":
+        entrance = Entrance(self.player, name or f"{self.name} -> {connecting_region.name}", self)
+        if rule is not None:
+            entrance.access_rule = rule
+        entrance.connected_region = connecting_region
+        connecting_region.entrances.append(entrance)
+        self.exits.append(entrance)
+        return entrance
+
+
+class Entrance:
+    access_rule: Callable[[CollectionState], bool] = staticmethod(lambda state: True)
+    connected_region: Optional[Region] = None
+
+    def __init__(self, player: int, name: str, parent: Region):
+        self.player = player
+        self.name = name
+        self.parent_region = parent
+
+    def can_reach(self, state: CollectionState) -> bool:
+        return self.parent_region.can_reach(state) and self.access_rule(state)
+
+
+class Location:
+    access_rule: Callable[[CollectionState], bool] = staticmethod(lambda state: True)
+    item: Optional["Item"] = None
+    locked: bool = False
+
+    def __init__(self, player: int, name: str, address: Optional[int], parent: Region):
+        self.player = player
+        self.name = name
+        self.address = address
+        self.parent_region = parent
+
+    def can_reach(self, state: CollectionState) -> bool:
+        return self.parent_region.can_reach(state) and self.access_rule(state)
+
+    def place_locked_item(self, item: "Item") -> None:
+        self.item = item
+        self.locked = True
+        item.location = self
+
+
+class Item:
+    location: Optional[Location] = None
+
+    def __init__(self, name: str, classification: ItemClassification, code: Optional[int], player: int):
+        self.name = name
+        self.classification = classification
+        self.code = code
+        self.player = player
+
+    @property
+    def advancement(self) -> bool:
+        return bool(self.classification & ItemClassification.progression)
+
+
+class MultiWorld:
+    """Regions, item pool and worlds of a generation, without any fill logic."""
+
+    def __init__(self, players: int):
+        self.players = players
+        self.player_ids = tuple(range(1, players + 1))
+        self.regions: List[Region] = []
+        self.itempool: List[Item] = []
+        self.worlds: Dict[int, "World"] = {}
+        self.completion_condition: Dict[int, Callable[[CollectionState], bool]] = {}
+        self.random = random.Random()
+        self._regions: Dict[Tuple[str, int], Region] = {}
+        self._locations: Dict[Tuple[str, int], Location] = {}
+
+    def get_region(self, name: str, player: int) -> Region:
+        if (name, player) not in self._regions:
+            self._regions = {(region.name, region.player): region for region in self.regions}
+        return self._regions[name, player]
+
+    def get_location(self, name: str, player: int) -> Location:
+        if (name, player) not in self._locations:
+            self._locations = {(location.name, location.player): location
+                               for location in self.get_locations()}
+        return self._locations[name, player]
+
+    def get_locations(self, player: Optional[int] = None) -> List[Location]:
+        return [location for region in self.regions for location in region.locations
+                if player is None or location.player == player]
+
+    def get_filled_locations(self, player: Optional[int] = None) -> List[Location]:
+        return [location for location in self.get_locations(player) if location.item is not None]
+
+    def can_beat_game(self, state: CollectionState) -> bool:
+        return all(condition(state) for condition in self.completion_condition.values())
+
+
+class Tutorial:
+    def __init__(self, *args):
+        self.args = args
+
+
+class WebWorld:
+    pass
+
+
+class World:
+    game: str = ""
+
+    def __init__(self, multiworld, player: int):
+        self.multiworld = multiworld
+        self.player = player
+        # Archipelago seeds every world's own Random from the multiworld's
+        self.random = random.Random(getattr(multiworld, "random", random).getrandbits(64))
+
+    def collect_item(self, state: CollectionState, item, remove: bool = False):
+        return item.name if item.advancement else None
+
+    def collect(self, state: CollectionState, item) -> bool:
+        name = self.collect_item(state, item)
+        if name:
+            state.prog_items[self.player][name] += 1
+            return True
+        return False
+
+    def remove(self, state: CollectionState, item) -> bool:
+        name = self.collect_item(state, item, True)
+        if name:
+            state.prog_items[self.player][name] -= 1
+            if state.prog_items[self.player][name] < 1:
+                del state.prog_items[self.player][name]
+            return True
+        return False
+
+
+class _Option:
+    default = 0
+
+    def __init__(self, value: int):
+        self.value = value
+
+
+def _make_option(name: str) -> type:
+    return type(name, (_Option,), {})
+
+
+def install() -> None:
+    """Register the stub modules and make the apworld importable."""
+    if "BaseClasses" in sys.modules:
+        return
+
+    base_classes = types.ModuleType("BaseClasses")
+    base_classes.ItemClassification = ItemClassification
+    base_classes.CollectionState = CollectionState
+    base_classes.Tutorial = Tutorial
+    base_classes.MultiWorld = MultiWorld
+    base_classes.Region = Region
+    base_classes.Entrance = Entrance
+    base_classes.Location = Location
+    base_classes.Item = Item
+
+    options = types.ModuleType("Options")
+    for name in ("Choice", "DeathLink", "DefaultOnToggle", "Range", "Toggle"):
+        setattr(options, name, _make_option(name))
+    options.PerGameCommonOptions = type("PerGameCommonOptions", (), {})
+
+    worlds = types.ModuleType("worlds")
+    worlds.__path__ = []
+    auto_world = types.ModuleType("worlds.AutoWorld")
+    auto_world.World = World
+    auto_world.WebWorld = WebWorld
+
+    sys.modules.update({
+        "BaseClasses": base_classes,
+        "Options": options,
+        "worlds": worlds,
+        "worlds.AutoWorld": auto_world,
+    })
+
+    if str(APWORLD_DIR) not in sys.path:
+        sys.path.insert(0, str(APWORLD_DIR))
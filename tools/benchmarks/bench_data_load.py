@@ -0,0 +1,95 @@
+"""
+Import-time benchmark: binary game data cache vs. parsing tr1r_data.json.
+
+Packs apworld/tr1r into two temporary .apworld zips, one shipping
+tr1r_data.bin and one without it, then imports the world from each in fresh
+interpreters (the way Archipelago loads .apworld files) and reports the
+import time and the time spent in load_game_data().
+
+Usage:
+    python tools/benchmarks/bench_data_load.py [--repeat 10]
+
+Requires apworld/tr1r/data/tr1r_data.json and tr1r_data.bin (exporter output).
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+import apstub
+
+WORLD_DIR = apstub.APWORLD_DIR / "tr1r"
+BINARY_NAME = "tr1r_data.bin"
+
+_CHILD = """
+import json, sys, time
+sys.path.insert(0, {bench_dir!r})
+import apstub
+apstub.install()
+sys.path.insert(0, {apworld!r})
+start = time.perf_counter()
+import tr1r
+imported = time.perf_counter()
+from tr1r import game_data
+game_data.load_game_data.cache_clear()
+game_data.load_game_data()
+loaded = time.perf_counter()
+print(json.dumps({{
+    "import": imported - start,
+    "load": loaded - imported,
+    "zipped": tr1r.__file__.startswith({apworld!r}),
+}}))
+"""
+
+
+def build_apworld(target: Path, include_binary: bool) -> Path:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(WORLD_DIR.rglob("*")):
+            if path.is_dir() or "__pycache__" in path.parts:
+                continue
+            if path.name == BINARY_NAME and not include_binary:
+                continue
+            archive.write(path, Path("tr1r") / path.relative_to(WORLD_DIR))
+    return target
+
+
+def run(apworld: Path, repeat: int) -> Dict[str, List[float]]:
+    code = _CHILD.format(bench_dir=str(Path(__file__).parent), apworld=str(apworld))
+    results: Dict[str, List[float]] = {"import": [], "load": []}
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], check=True,
+                                capture_output=True, text=True).stdout
+        sample = json.loads(output)
+        assert sample["zipped"], "tr1r was not imported from the .apworld"
+        results["import"].append(sample["import"])
+        results["load"].append(sample["load"])
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if not (WORLD_DIR / "data" / BINARY_NAME).exists():
+        sys.exit(f"{BINARY_NAME} not found in {WORLD_DIR / 'data'}; run TRDataExporter first.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        binary = run(build_apworld(Path(tmp) / "binary" / "tr1r.apworld", True), args.repeat)
+        source = run(build_apworld(Path(tmp) / "json" / "tr1r.apworld", False), args.repeat)
+
+    print(f"median of {args.repeat} fresh interpreters, importing from .apworld")
+    for label, results in (("json", source), ("binary", binary)):
+        print(f"  {label:7} import {statistics.median(results['import']) * 1000:7.2f} ms"
+              f"   load_game_data {statistics.median(results['load']) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Generation benchmark: TR1R world stages and a reachability sweep.
+
+Runs the world's generation stages the way Archipelago calls them
+(generate_early, create_regions, create_items, set_rules, generate_basic,
+each for every player before the next) on the apstub MultiWorld, places the
+item pool with a simple assumed fill, then times a full reachability sweep
+from an empty state. This is done for 1, 10 and 100 TR1R players by default.
+
+Timings are the median of --repeat runs; wall_time covers a whole run,
+including the fill. Peak memory is measured in a separate traced run, since
+tracemalloc slows everything it traces. The report is JSON (stdout, or
+--output).
+
+With --baseline, every stage's time and peak memory is compared against a
+previous report and the script exits with status 1 if any grew by more than
+--max-regression (a fraction; 0.25 = 25% slower). Differences under
+--noise-floor seconds / --memory-floor bytes are never counted, so tiny
+stages don't flap.
+
+Usage:
+    python tools/benchmarks/bench_generation.py [--players 1 10 100] [--repeat 3]
+        [--output report.json] [--baseline old.json] [--max-regression 0.25]
+
+Requires apworld/tr1r/data/tr1r_data.json (exporter output).
+"""
+
+import argparse
+import dataclasses
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import apstub
+
+apstub.install()
+
+import tr1r  # noqa: E402
+
+STAGES = ("generate_early", "create_regions", "create_items", "set_rules", "generate_basic")
+SWEEP = "sweep"
+
+# Progression items placed per fill round, as a fraction of those left;
+# smaller fractions spread keys over more spheres.
+_FILL_BATCH = 0.125
+
+
+def make_options(**values: int) -> tr1r.TR1ROptions:
+    """TR1R options at their defaults, except for the given option values."""
+    return tr1r.TR1ROptions(**{
+        field.name: field.type(values.get(field.name, field.type.default))
+        for field in dataclasses.fields(tr1r.TR1ROptions)
+    })
+
+
+def create_multiworld(players: int, seed: int, **option_values: int) -> apstub.MultiWorld:
+    multiworld = apstub.MultiWorld(players)
+    multiworld.random.seed(seed)
+    for player in multiworld.player_ids:
+        world = tr1r.TR1RWorld(multiworld, player)
+        world.options = make_options(**option_values)
+        multiworld.worlds[player] = world
+    return multiworld
+
+
+def generate(multiworld: apstub.MultiWorld) -> None:
+    """Run the world stages for every player, then fill the pool."""
+    worlds = list(multiworld.worlds.values())
+    for stage in STAGES:
+        for world in worlds:
+            getattr(world, stage)()
+    assumed_fill(multiworld)
+
+
+def assumed_fill(multiworld: apstub.MultiWorld) -> None:
+    """
+    Place the item pool so the seed is beatable, as Archipelago's fill does:
+    progression items go in batches into locations reachable while holding
+    every progression item not placed yet, and everything else fills the
+    remaining locations at random. Placing only into what is reachable now
+    would strand a level's keys once earlier batches used up its locations.
+    """
+    rng = multiworld.random
+    pool = list(multiworld.itempool)
+    rng.shuffle(pool)
+    progression = [item for item in pool if item.advancement]
+    filler = [item for item in pool if not item.advancement]
+    empty = {location for location in multiworld.get_locations() if location.item is None}
+
+    while progression:
+        batch = max(1, int(len(progression) * _FILL_BATCH))
+        placing, progression = progression[-batch:], progression[:-batch]
+        state = apstub.CollectionState(multiworld)
+        for item in progression:
+            state.collect(item)
+        state.sweep_for_advancements()
+
+        reachable = [location for location in empty if location.can_reach(state)]
+        if not reachable:
+            reachable = list(empty)
+        reachable.sort(key=lambda location: (location.player, location.address))
+        for location in rng.sample(reachable, min(len(placing), len(reachable))):
+            item = placing.pop()
+            location.item = item
+            item.location = location
+            empty.discard(location)
+        progression.extend(placing)
+
+    for location, item in zip(sorted(empty, key=lambda location: (location.player, location.address)), filler):
+        location.item = item
+        item.location = location
+
+
+def run_generation(players: int, seed: int, probe: Callable[[str, Callable[[], Any]], Any]) -> Dict[str, Any]:
+    """Run every stage through probe(name, fn) and return sweep statistics."""
+    multiworld = create_multiworld(players, seed)
+    worlds = list(multiworld.worlds.values())
+    for stage in STAGES:
+        probe(stage, lambda: [getattr(world, stage)() for world in worlds])
+
+    assumed_fill(multiworld)
+
+    state = apstub.CollectionState(multiworld)
+    swept = probe(SWEEP, state.sweep_for_advancements)
+    return {
+        "regions": len(multiworld.regions),
+        "locations": len(multiworld.get_locations()),
+        "swept": swept,
+        "beatable": multiworld.can_beat_game(state),
+    }
+
+
+def time_run(players: int, seed: int) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    times: Dict[str, float] = {}
+
+    def probe(stage: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = fn()
+        times[stage] = time.perf_counter() - start
+        return result
+
+    return times, run_generation(players, seed, probe)
+
+
+def memory_run(players: int, seed: int) -> Tuple[Dict[str, int], int]:
+    peaks: Dict[str, int] = {}
+
+    def probe(stage: str, fn: Callable[[], Any]) -> Any:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peaks[stage] = tracemalloc.get_traced_memory()[1] - base
+        return result
+
+    tracemalloc.start()
+    try:
+        run_generation(players, seed, probe)
+        overall = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peaks, overall
+
+
+def measure(players: int, repeat: int, seed: int) -> Dict[str, Any]:
+    samples: List[Dict[str, float]] = []
+    walls: List[float] = []
+    info: Dict[str, Any] = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        times, info = time_run(players, seed)
+        walls.append(time.perf_counter() - start)
+        samples.append(times)
+    peaks, overall = memory_run(players, seed)
+
+    return {
+        "players": players,
+        "wall_time": statistics.median(walls),
+        "peak_memory": overall,
+        "stages": {
+            stage: {
+                "time": statistics.median(sample[stage] for sample in samples),
+                "peak_memory": peaks[stage],
+            }
+            for stage in STAGES + (SWEEP,)
+        },
+        **info,
+    }
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float,
+                     noise_floor: float, memory_floor: int) -> List[str]:
+    previous = {run["players"]: run for run in baseline["runs"]}
+    regressions: List[str] = []
+    for run in report["runs"]:
+        old_run = previous.get(run["players"])
+        if old_run is None:
+            continue
+        for stage, result in run["stages"].items():
+            old = old_run["stages"].get(stage)
+            if old is None:
+                continue
+            for metric, floor in (("time", noise_floor), ("peak_memory", memory_floor)):
+                new_value, old_value = result[metric], old[metric]
+                if new_value - old_value > floor and new_value > old_value * (1 + max_regression):
+                    growth = f"+{new_value / old_value - 1:.0%}" if old_value else "new"
+                    regressions.append(
+                        f"{run['players']} players, {stage} {metric}: "
+                        f"{old_value:.6g} -> {new_value:.6g} ({growth})"
+                    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="previous report to check for regressions")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--noise-floor", type=float, default=0.002)
+    parser.add_argument("--memory-floor", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "runs": [measure(players, args.repeat, args.seed) for players in args.players],
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = find_regressions(report, baseline, args.max_regression,
+                                       args.noise_floor, args.memory_floor)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
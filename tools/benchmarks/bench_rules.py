@@ -0,0 +1,100 @@
+"""
+Sweep benchmark: compiled requirement rules vs. the old lambda chains.
+
+Simulates the fill algorithm's sweep for many TR1R slots: key items are
+collected in a random order and every still-locked "<Level> - Complete" rule
+is re-evaluated after each collection, until all rules pass.
+
+Usage:
+    python tools/benchmarks/bench_rules.py [--players 100] [--repeat 5] [--seed 0]
+
+Requires apworld/tr1r/data/tr1r_data.json (exporter output).
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+import apstub
+
+apstub.install()
+
+from tr1r.rules import LEVEL_COMPLETE_REQUIREMENTS, compile_requirements  # noqa: E402
+
+Rules = List[Tuple[int, Callable]]
+
+
+def build_legacy_rules(player: int) -> Dict[str, Callable]:
+    """Rebuild the pre-compilation rules: one chained state.has() per item."""
+    rules = {}
+    for location_name, items in LEVEL_COMPLETE_REQUIREMENTS.items():
+        source = "lambda state: " + " and ".join(
+            f"state.has({item!r}, player)" for item in items
+        )
+        rules[location_name] = eval(source, {"player": player})
+    return rules
+
+
+def build_rules(players: int, legacy: bool) -> Rules:
+    rules: Rules = []
+    for player in range(1, players + 1):
+        table = (build_legacy_rules(player) if legacy
+                 else compile_requirements(LEVEL_COMPLETE_REQUIREMENTS, player))
+        rules.extend((player, rule) for rule in table.values())
+    return rules
+
+
+def collection_order(players: int, seed: int) -> List[Tuple[str, int]]:
+    items = sorted({item for reqs in LEVEL_COMPLETE_REQUIREMENTS.values() for item in reqs})
+    order = [(item, player) for player in range(1, players + 1) for item in items]
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def sweep(rules: Rules, order: List[Tuple[str, int]]) -> int:
+    """Collect items one at a time, re-checking locked rules; return evaluations."""
+    state = apstub.CollectionState()
+    pending = list(rules)
+    evaluations = 0
+    for item, player in order:
+        state.collect_name(item, player)
+        evaluations += len(pending)
+        pending = [entry for entry in pending if not entry[1](state)]
+        if not pending:
+            break
+    assert not pending, "sweep ended with unsatisfied rules"
+    return evaluations
+
+
+def measure(players: int, repeat: int, seed: int, legacy: bool) -> Tuple[float, int]:
+    rules = build_rules(players, legacy)
+    order = collection_order(players, seed)
+    timings = []
+    evaluations = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        evaluations = sweep(rules, order)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), evaluations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    legacy_time, evaluations = measure(args.players, args.repeat, args.seed, legacy=True)
+    compiled_time, _ = measure(args.players, args.repeat, args.seed, legacy=False)
+
+    print(f"{args.players} TR1R slots, {evaluations} rule evaluations per sweep")
+    print(f"  lambda chains: {legacy_time * 1000:8.2f} ms")
+    print(f"  compiled:      {compiled_time * 1000:8.2f} ms")
+    print(f"  speedup:       {legacy_time / compiled_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
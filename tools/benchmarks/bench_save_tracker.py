@@ -0,0 +1,130 @@
+"""
+Latency benchmark for tools/save_tracker.py against a local stub server.
+
+Starts a stub Archipelago server (RoomInfo / Connected handshake, records
+LocationChecks), runs the tracker on a synthesized savegame.dat in a temp
+directory, then repeatedly "saves the game": each save bumps the save
+number and finds a new secret, and every fifth save moves on to the next
+level (completing the previous one).
+Latency is measured from the end of the file write to the moment the server
+receives the LocationChecks packet. Each save should arrive as exactly one
+packet holding all of its checks.
+
+Usage:
+    python tools/benchmarks/bench_save_tracker.py [--saves 50]
+        [--poll-interval 0.05] [--settle 0.1] [--coalesce 0.02]
+
+Requires the websockets package.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import statistics
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import websockets
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import save_tracker  # noqa: E402
+import savefile  # noqa: E402
+
+SAVE_FILE_SIZE = 0x152004
+_MAX_SAVES = 15 * 5
+
+
+class StubServer:
+    """Just enough of an Archipelago server to accept one slot's checks."""
+
+    def __init__(self) -> None:
+        self.received: "asyncio.Queue[Tuple[float, List[int]]]" = asyncio.Queue()
+
+    async def handler(self, socket) -> None:
+        await socket.send(json.dumps([{"cmd": "RoomInfo", "version": save_tracker.AP_VERSION}]))
+        async for message in socket:
+            for packet in json.loads(message):
+                if packet["cmd"] == "Connect":
+                    await socket.send(json.dumps([{
+                        "cmd": "Connected", "team": 0, "slot": 1, "checked_locations": [],
+                    }]))
+                elif packet["cmd"] == "LocationChecks":
+                    self.received.put_nowait((time.perf_counter(), packet["locations"]))
+
+
+def write_save(path: Path, slot: int, save_number: int, level: int, secrets: int) -> None:
+    """Write one slot in place, the way the game updates savegame.dat."""
+    base = savefile.SAVE_FILE_BASE_OFFSET + slot * savefile.SAVE_SLOT_SIZE
+    with open(path, "r+b") as file:
+        for offset, fmt, value in ((0x004, "<B", 1), (0x00C, "<i", save_number),
+                                   (0x628, "<H", secrets), (0x62C, "<B", level)):
+            file.seek(base + offset)
+            file.write(struct.pack(fmt, value))
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    server = StubServer()
+    with tempfile.TemporaryDirectory() as tmp:
+        save_path = Path(tmp) / "savegame.dat"
+        save_path.write_bytes(bytes(SAVE_FILE_SIZE))
+
+        async with websockets.serve(server.handler, "127.0.0.1", 0) as stub:
+            port = stub.sockets[0].getsockname()[1]
+            tracker_args = argparse.Namespace(
+                save_file=str(save_path), server=f"127.0.0.1:{port}", slot="Lara", password="",
+                poll_interval=args.poll_interval, settle=args.settle, coalesce=args.coalesce,
+                reconnect_delay=1.0,
+            )
+            tracker = asyncio.create_task(save_tracker.run(tracker_args))
+            await asyncio.sleep(0.5)  # connect and take the initial snapshot
+
+            latencies: List[float] = []
+            packets = 0
+            secrets = 0
+            # Five saves per level, each finding a new secret; the first save
+            # in a level also completes the previous one.
+            for save_number in range(1, min(args.saves, _MAX_SAVES) + 1):
+                level = 1 + (save_number - 1) // 5
+                secret = (save_number - 1) % 5
+                secrets = (0 if secret == 0 else secrets) | 1 << secret
+                write_save(save_path, save_number % savefile.MAX_SAVE_SLOTS, save_number, level, secrets)
+                written = time.perf_counter()
+
+                received, _locations = await asyncio.wait_for(server.received.get(), timeout=5)
+                latencies.append(received - written)
+                packets += 1
+                await asyncio.sleep(args.settle * 2)
+                while not server.received.empty():
+                    server.received.get_nowait()
+                    packets += 1
+
+            tracker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await tracker
+
+    latencies.sort()
+    print(f"{len(latencies)} saves with checks, {packets} LocationChecks packets")
+    print(f"  poll {args.poll_interval * 1000:.0f} ms, settle {args.settle * 1000:.0f} ms, "
+          f"coalesce {args.coalesce * 1000:.0f} ms")
+    print(f"  latency median {statistics.median(latencies) * 1000:7.2f} ms")
+    print(f"          p95    {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.2f} ms")
+    print(f"          max    {latencies[-1] * 1000:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--saves", type=int, default=50, help=f"at most {_MAX_SAVES}")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--settle", type=float, default=0.1)
+    parser.add_argument("--coalesce", type=float, default=0.02)
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Batch seed validation: generate many TR1R seeds in parallel and check them.
+
+Every seed is a single-player TR1R generation on the apstub MultiWorld (see
+bench_generation.py), cycling through every combination of goal,
+secrets_mode, trap_percentage, starting_weapons, key_gated_regions and
+level_order. For
+each seed the runner checks that:
+  - the goal is reachable (the seed is beatable),
+  - which playthrough sphere every key item lands in,
+  - which locations can't be reached even with every item collected.
+
+Before any seed runs, the rule tables are also checked for requirements on
+items the exporter doesn't list (those would make a location unreachable in
+every seed).
+
+Results stream to a JSON Lines file as seeds finish: one "seed" record per
+seed, then a final "summary" record. Aggregates are keyed by key item,
+location and option combination, not by seed, so memory stays flat however
+many seeds are run.
+
+Usage:
+    python tools/benchmarks/validate_seeds.py [--seeds 10000] [--jobs N]
+        [--output seeds.jsonl]
+
+Exits with status 1 if any seed is unbeatable, any location is unreachable,
+or a rule needs an unknown item.
+
+Requires apworld/tr1r/data/tr1r_data.json (exporter output).
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Tuple
+
+import apstub
+
+apstub.install()
+
+import bench_generation  # noqa: E402
+from tr1r import options as tr1r_options  # noqa: E402
+from tr1r.game_data import load_region_table  # noqa: E402
+from tr1r.items import get_all_items, get_items_by_category  # noqa: E402
+from tr1r.rules import LEVEL_COMPLETE_REQUIREMENTS  # noqa: E402
+
+OptionValues = Tuple[Tuple[str, int], ...]
+
+VARIED_OPTIONS = {
+    "goal": tr1r_options.Goal,
+    "secrets_mode": tr1r_options.SecretsMode,
+    "trap_percentage": tr1r_options.TrapPercentage,
+    "starting_weapons": tr1r_options.StartingWeapons,
+    "key_gated_regions": tr1r_options.KeyGatedRegions,
+    "level_order": tr1r_options.LevelOrder,
+}
+
+
+def option_values(option: type) -> List[int]:
+    """Every choice of a Choice option or Toggle; the ends and default of a Range."""
+    if hasattr(option, "range_start"):
+        return sorted({option.range_start, option.default, option.range_end})
+    # Toggles inherit option_false/option_true (which the stand-in Options lack)
+    return sorted({getattr(option, name) for name in dir(option) if name.startswith("option_")}) or [0, 1]
+
+
+def option_combinations() -> List[OptionValues]:
+    names = list(VARIED_OPTIONS)
+    return [
+        tuple(zip(names, values))
+        for values in itertools.product(*(option_values(VARIED_OPTIONS[name]) for name in names))
+    ]
+
+
+def unknown_rule_items() -> List[str]:
+    """Items named by a rule or region requirement that aren't in the item table."""
+    item_table = get_all_items()
+    required = {item for items in LEVEL_COMPLETE_REQUIREMENTS.values() for item in items}
+    required.update(
+        item
+        for areas in load_region_table().values()
+        for area in areas
+        for items in area.requires
+        for item in items
+    )
+    return sorted(required - item_table.keys())
+
+
+def validate_seed(task: Tuple[int, OptionValues]) -> Dict[str, Any]:
+    seed, values = task
+    multiworld = bench_generation.create_multiworld(1, seed, **dict(values))
+    bench_generation.generate(multiworld)
+    locations = multiworld.get_locations()
+
+    # Playthrough spheres: every location reachable with what earlier spheres gave
+    key_items = set(get_items_by_category("key_item"))
+    key_spheres: Dict[str, int] = {}
+    state = apstub.CollectionState(multiworld)
+    remaining = [location for location in locations if location.item is not None]
+    sphere = 0
+    while remaining:
+        reachable = [location for location in remaining if location.can_reach(state)]
+        if not reachable:
+            break
+        for location in reachable:
+            state.collect(location.item, location)
+            if location.item.name in key_items:
+                key_spheres[location.item.name] = sphere
+        remaining = [location for location in remaining if location not in state.locations_checked]
+        sphere += 1
+    beatable = multiworld.can_beat_game(state)
+
+    # Unreachable even holding everything: a logic bug, not bad luck in the fill
+    everything = apstub.CollectionState(multiworld)
+    for location in locations:
+        if location.item is not None:
+            everything.collect(location.item)
+    unreachable = sorted(location.name for location in locations if not location.can_reach(everything))
+
+    return {
+        "type": "seed",
+        "seed": seed,
+        "options": dict(values),
+        "beatable": beatable,
+        "spheres": sphere,
+        "key_spheres": key_spheres,
+        "unreachable": unreachable,
+    }
+
+
+class Summary:
+    """Running aggregates over seed results; size is independent of the seed count."""
+
+    def __init__(self) -> None:
+        self.seeds = 0
+        self.unbeatable_by_options: Counter = Counter()
+        self.sphere_counts: Counter = Counter()
+        self.key_spheres: Dict[str, Counter] = defaultdict(Counter)
+        self.unreachable: Counter = Counter()
+        self.first_unbeatable_seed: Dict[str, int] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.seeds += 1
+        self.sphere_counts[result["spheres"]] += 1
+        for item, sphere in result["key_spheres"].items():
+            self.key_spheres[item][sphere] += 1
+        self.unreachable.update(result["unreachable"])
+        if not result["beatable"]:
+            options = json.dumps(result["options"], sort_keys=True)
+            self.unbeatable_by_options[options] += 1
+            self.first_unbeatable_seed.setdefault(options, result["seed"])
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.unbeatable_by_options or self.unreachable)
+
+    def to_record(self, unknown_items: List[str]) -> Dict[str, Any]:
+        return {
+            "type": "summary",
+            "seeds": self.seeds,
+            "unbeatable": sum(self.unbeatable_by_options.values()),
+            "unbeatable_by_options": [
+                {"options": json.loads(options), "count": count,
+                 "first_seed": self.first_unbeatable_seed[options]}
+                for options, count in self.unbeatable_by_options.most_common()
+            ],
+            "sphere_counts": {str(spheres): count for spheres, count in sorted(self.sphere_counts.items())},
+            "key_item_spheres": {
+                item: {str(sphere): count for sphere, count in sorted(spheres.items())}
+                for item, spheres in sorted(self.key_spheres.items())
+            },
+            "unreachable_locations": dict(self.unreachable.most_common()),
+            "unknown_rule_items": unknown_items,
+        }
+
+
+def tasks(seeds: int, start: int) -> Iterator[Tuple[int, OptionValues]]:
+    combinations = option_combinations()
+    for seed in range(start, start + seeds):
+        yield seed, combinations[seed % len(combinations)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seeds", type=int, default=10_000)
+    parser.add_argument("--start", type=int, default=0, help="first seed number")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default="seed_validation.jsonl")
+    args = parser.parse_args()
+
+    unknown_items = unknown_rule_items()
+    summary = Summary()
+    with open(args.output, "w", encoding="utf-8") as out, Pool(args.jobs) as pool:
+        for result in pool.imap_unordered(validate_seed, tasks(args.seeds, args.start), chunksize=16):
+            summary.add(result)
+            out.write(json.dumps(result) + "\n")
+            if summary.seeds % 500 == 0:
+                print(f"  {summary.seeds}/{args.seeds} seeds", file=sys.stderr)
+        record = summary.to_record(unknown_items)
+        out.write(json.dumps(record) + "\n")
+
+    print(f"{record['seeds']} seeds, {record['unbeatable']} unbeatable, "
+          f"{len(record['unreachable_locations'])} unreachable locations, "
+          f"{len(unknown_items)} unknown rule items")
+    print(f"Written to: {os.path.abspath(args.output)}")
+    if summary.failed or unknown_items:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Room-graph compiler: builds the key-gated sub-region table for the APWorld.
+
+Reads the per-level room graphs in tr1r_data.json (rooms, portal links and
+the keyhole doors that gate them, written by TRDataExporter) and works out,
+for every room holding a pickup or key item, which sets of key items make it
+reachable from Lara's start room. Rooms that open up under exactly the same
+key sets collapse into one sub-region, and rooms reachable with no keys stay
+in the level's own region, so finer logic adds as few regions (and sweep
+work) as possible.
+
+Keys are used up, so a key can only ever open one door: the exporters gate
+each keyhole's doors on that keyhole's own key item, and a link is open only
+while every key it lists is held. Doors without a key of their own have no
+link at all.
+
+The result is a static table, data/tr1r_regions.json, that create_regions
+loads as-is when the key_gated_regions option is on; no graph work happens
+at generation time. It records the SHA-256 of the tr1r_data.json it was
+compiled from and is ignored by the APWorld once the two no longer match.
+
+Table layout:
+  {
+    "version": 2,
+    "source_sha256": "<hex>",
+    "levels": {
+      "<level name>": [
+        {"name": "<level name> - Area 1",
+         "requires": [["<key item>", ...], ...],   # any one set opens it
+         "locations": [<location id>, ...]},
+        ...
+      ]
+    }
+  }
+
+Usage:
+    python tools/compile_regions.py [tr1r_data.json] [-o tr1r_regions.json]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "apworld" / "tr1r" / "data"
+TABLE_VERSION = 2  # 2: one key per keyhole door
+
+# As in apworld/tr1r/ids.py (checked by tests/test_ids.py)
+PICKUP_BASE_ID = 780_000
+PICKUP_LEVEL_STRIDE = 1000
+
+# Every subset of a level's keys is searched (4096 at twelve keys). TR1 levels
+# have at most six gate keys; the limit leaves room for custom levels.
+MAX_KEYS_PER_LEVEL = 12
+
+Requirement = Tuple[FrozenSet[str], ...]
+
+
+def reachable_rooms(start: int, links: Sequence[dict], keys: Sequence[str], key_mask: int) -> int:
+    """Bitset of rooms reachable from start holding the keys selected by key_mask."""
+    held = {key for bit, key in enumerate(keys) if key_mask >> bit & 1}
+    adjacency: Dict[int, List[int]] = {}
+    for link in links:
+        if held.issuperset(link.get("keys") or ()):
+            adjacency.setdefault(link["from"], []).append(link["to"])
+
+    seen = 1 << start
+    stack = [start]
+    while stack:
+        for room in adjacency.get(stack.pop(), ()):
+            if not seen >> room & 1:
+                seen |= 1 << room
+                stack.append(room)
+    return seen
+
+
+def minimal_masks(masks: Sequence[int]) -> List[int]:
+    """Drop every mask that is a superset of another one in the list."""
+    ordered = sorted(set(masks), key=lambda mask: (bin(mask).count("1"), mask))
+    minimal: List[int] = []
+    for mask in ordered:
+        if not any(mask & smaller == smaller for smaller in minimal):
+            minimal.append(mask)
+    return minimal
+
+
+def compile_level(level: dict, level_index: int) -> List[dict]:
+    """Sub-regions for one level, or [] if nothing in it is key-gated."""
+    graph = level.get("roomGraph")
+    if not graph:
+        return []
+
+    links = graph["links"]
+    keys = sorted({key for link in links for key in link.get("keys") or ()})
+    if len(keys) > MAX_KEYS_PER_LEVEL:
+        raise ValueError(f"{level['name']}: {len(keys)} gate keys, at most {MAX_KEYS_PER_LEVEL} supported")
+
+    reachable = [
+        reachable_rooms(graph["startRoom"], links, keys, mask)
+        for mask in range(1 << len(keys))
+    ]
+
+    areas: Dict[Requirement, List[int]] = {}
+    for entity in level["pickups"] + level["keyItems"]:
+        room = entity["room"]
+        masks = [mask for mask, rooms in enumerate(reachable) if rooms >> room & 1]
+        if not masks:
+            print(f"  WARNING: {level['name']}: room {room} is unreachable, "
+                  f"entity {entity['entityIndex']} stays in the level region", file=sys.stderr)
+            continue
+        if masks[0] == 0:
+            continue  # open without keys
+
+        requirement = tuple(
+            frozenset(key for bit, key in enumerate(keys) if mask >> bit & 1)
+            for mask in minimal_masks(masks)
+        )
+        location_id = PICKUP_BASE_ID + level_index * PICKUP_LEVEL_STRIDE + entity["entityIndex"]
+        areas.setdefault(requirement, []).append(location_id)
+
+    ordered = sorted(areas.items(), key=lambda area: (
+        min(len(keys) for keys in area[0]), [sorted(keys) for keys in area[0]]
+    ))
+    return [
+        {
+            "name": f"{level['name']} - Area {number}",
+            "requires": [sorted(keys) for keys in requirement],
+            "locations": sorted(location_ids),
+        }
+        for number, (requirement, location_ids) in enumerate(ordered, 1)
+    ]
+
+
+def compile_regions(source: bytes) -> dict:
+    raw = json.loads(source.decode("utf-8"))
+    levels = {}
+    for level_index, level in enumerate(raw["levels"]):
+        areas = compile_level(level, level_index)
+        if areas:
+            levels[level["name"]] = areas
+    return {
+        "version": TABLE_VERSION,
+        "source_sha256": hashlib.sha256(source).hexdigest(),
+        "levels": levels,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", nargs="?", type=Path, default=DATA_DIR / "tr1r_data.json")
+    parser.add_argument("-o", "--output", type=Path, default=DATA_DIR / "tr1r_regions.json")
+    args = parser.parse_args()
+
+    table = compile_regions(args.source.read_bytes())
+    args.output.write_text(json.dumps(table, indent=2) + "\n", encoding="utf-8")
+
+    area_count = sum(len(areas) for areas in table["levels"].values())
+    location_count = sum(len(area["locations"]) for areas in table["levels"].values() for area in areas)
+    print(f"{area_count} sub-regions in {len(table['levels'])} levels, {location_count} gated locations")
+    print(f"Written to: {args.output.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
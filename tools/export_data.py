@@ -0,0 +1,491 @@
+"""
+Pure-Python data exporter: writes tr1r_data.json and tr1r_data.bin from the
+game's .PHD files, without .NET or TRLevelControl.
+
+Produces the same output as TRDataExporter (tools/TRDataExporter), byte for
+byte: the tables below mirror TR1DataExporter.cs, JSON is laid out the way
+Newtonsoft's indented writer does it (platform line endings, no trailing
+newline) and the binary form follows BinaryDataWriter.cs. Any change to one
+exporter must be made to the other.
+
+Levels are read with tools/phd.py (memory-mapped, skipping everything but
+rooms, floor data and entities) and exported in parallel, one level per
+worker process.
+
+Usage:
+    python tools/export_data.py [game_data_dir] [output_path] [--jobs N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+from multiprocessing import Pool
+from typing import Any, Dict, List, Optional, Tuple
+
+import phd
+
+DEFAULT_GAME_DIR = r"C:\Program Files (x86)\Steam\steamapps\common\Tomb Raider I-III Remastered\1\DATA"
+# As in apworld/tr1r/ids.py (checked by tests/test_ids.py)
+ITEM_BASE_ID = 770_000
+KEY_ITEM_ALIAS_BASE = 10_000  # TR1Type.CavesKeyItemBase; +1000 per level
+
+# (file, display name, region, short name, secret count), in game order
+LEVELS: Tuple[Tuple[str, str, str, str, int], ...] = (
+    ("LEVEL1.PHD", "Caves", "Peru", "Caves", 3),
+    ("LEVEL2.PHD", "City of Vilcabamba", "Peru", "Vilcabamba", 3),
+    ("LEVEL3A.PHD", "Lost Valley", "Peru", "Valley", 5),
+    ("LEVEL3B.PHD", "Tomb of Qualopec", "Peru", "Qualopec", 3),
+    ("LEVEL4.PHD", "St. Francis' Folly", "Greece", "Folly", 4),
+    ("LEVEL5.PHD", "Colosseum", "Greece", "Colosseum", 3),
+    ("LEVEL6.PHD", "Palace Midas", "Greece", "Midas", 3),
+    ("LEVEL7A.PHD", "The Cistern", "Greece", "Cistern", 3),
+    ("LEVEL7B.PHD", "Tomb of Tihocan", "Greece", "Tihocan", 2),
+    ("LEVEL8A.PHD", "City of Khamoon", "Egypt", "Khamoon", 3),
+    ("LEVEL8B.PHD", "Obelisk of Khamoon", "Egypt", "Obelisk", 3),
+    ("LEVEL8C.PHD", "Sanctuary of the Scion", "Egypt", "Sanctuary", 1),
+    ("LEVEL10A.PHD", "Natla's Mines", "Atlantis", "Mines", 3),
+    ("LEVEL10B.PHD", "Atlantis", "Atlantis", "Atlantis", 3),
+    ("LEVEL10C.PHD", "The Great Pyramid", "Atlantis", "Pyramid", 3),
+)
+TIHOCAN = "LEVEL7B.PHD"
+
+# TR1Type values and names used by the exporter
+LARA = 0
+SCION_PIECE_2 = 144
+TYPE_NAMES: Dict[int, str] = {
+    41: "LiftingDoor", 42: "SlammingDoor", 47: "Barricade",
+    57: "Door1", 58: "Door2", 59: "Door3", 60: "Door4",
+    61: "Door5", 62: "Door6", 63: "Door7", 64: "Door8",
+    65: "Trapdoor1", 66: "Trapdoor2", 67: "Trapdoor3",
+    84: "Pistols_S_P", 85: "Shotgun_S_P", 86: "Magnums_S_P", 87: "Uzis_S_P",
+    88: "PistolAmmo_S_P", 89: "ShotgunAmmo_S_P", 90: "MagnumAmmo_S_P", 91: "UziAmmo_S_P",
+    93: "SmallMed_S_P", 94: "LargeMed_S_P",
+    110: "Puzzle1_S_P", 111: "Puzzle2_S_P", 112: "Puzzle3_S_P", 113: "Puzzle4_S_P",
+    126: "LeadBar_S_P",
+    129: "Key1_S_P", 130: "Key2_S_P", 131: "Key3_S_P", 132: "Key4_S_P",
+    141: "Quest1_S_P", 142: "Quest2_S_P",
+    SCION_PIECE_2: "ScionPiece2_S_P",
+}
+KEY_ITEM_TYPES = frozenset((110, 111, 112, 113, 126, 129, 130, 131, 132, 141, 142))
+WEAPON_TYPES = frozenset((84, 85, 86, 87))
+AMMO_TYPES = frozenset((88, 89, 90, 91))
+SMALL_MEDIPACK, LARGE_MEDIPACK = 93, 94
+STANDARD_PICKUP_TYPES = WEAPON_TYPES | AMMO_TYPES | {SMALL_MEDIPACK, LARGE_MEDIPACK}
+
+# Keyholes and puzzle holes, and the pickup type that fits each
+KEYHOLE_KEYS: Dict[int, int] = {
+    137: 129, 138: 130, 139: 131, 140: 132,  # Keyhole1-4 -> Key1-4_S_P
+    118: 110, 119: 111, 120: 112, 121: 113,  # PuzzleHole1-4 -> Puzzle1-4_S_P
+}
+
+# In-game key item names per (level, base type)
+KEY_TYPE_NAMES: Dict[Tuple[str, str], str] = {
+    ("LEVEL2.PHD", "Key1_S_P"): "Silver Key",
+    ("LEVEL2.PHD", "Puzzle1_S_P"): "Gold Idol",
+    ("LEVEL3A.PHD", "Puzzle1_S_P"): "Machine Cog",
+    ("LEVEL4.PHD", "Key1_S_P"): "Neptune Key",
+    ("LEVEL4.PHD", "Key2_S_P"): "Atlas Key",
+    ("LEVEL4.PHD", "Key3_S_P"): "Damocles Key",
+    ("LEVEL4.PHD", "Key4_S_P"): "Thor Key",
+    ("LEVEL5.PHD", "Key1_S_P"): "Rusty Key",
+    ("LEVEL6.PHD", "LeadBar_S_P"): "Lead Bar",
+    ("LEVEL7A.PHD", "Key1_S_P"): "Gold Key",
+    ("LEVEL7A.PHD", "Key2_S_P"): "Silver Key",
+    ("LEVEL7A.PHD", "Key3_S_P"): "Rusty Key",
+    ("LEVEL7B.PHD", "Key1_S_P"): "Gold Key",
+    ("LEVEL7B.PHD", "Key3_S_P"): "Rusty Key",
+    ("LEVEL7B.PHD", "ScionPiece2_S_P"): "Scion",
+    ("LEVEL8A.PHD", "Key1_S_P"): "Sapphire Key",
+    ("LEVEL8B.PHD", "Key1_S_P"): "Sapphire Key",
+    ("LEVEL8B.PHD", "Puzzle1_S_P"): "Eye of Horus",
+    ("LEVEL8B.PHD", "Puzzle2_S_P"): "Scarab",
+    ("LEVEL8B.PHD", "Puzzle3_S_P"): "Seal of Anubis",
+    ("LEVEL8B.PHD", "Puzzle4_S_P"): "Ankh",
+    ("LEVEL8C.PHD", "Key1_S_P"): "Gold Key",
+    ("LEVEL8C.PHD", "Puzzle1_S_P"): "Ankh",
+    ("LEVEL8C.PHD", "Puzzle2_S_P"): "Scarab",
+    ("LEVEL10A.PHD", "Key1_S_P"): "Rusty Key",
+    ("LEVEL10A.PHD", "Puzzle1_S_P"): "Fuse",
+    ("LEVEL10A.PHD", "Puzzle2_S_P"): "Pyramid Key",
+}
+
+# Key item aliases with an AP item (TR1Type name, value, display name), in TR1Type order
+KEY_ITEM_ALIASES: Tuple[Tuple[str, int, str], ...] = (
+    ("Vilcabamba_K1_SilverKey", 11183, "Vilcabamba Silver Key"),
+    ("Vilcabamba_P1_GoldIdol", 11143, "Vilcabamba Gold Idol"),
+    ("Valley_P1_CogAbovePool", 12177, "Lost Valley Cog (Above Pool)"),
+    ("Valley_P1_CogBridge", 12242, "Lost Valley Cog (Bridge)"),
+    ("Valley_P1_CogTemple", 12241, "Lost Valley Cog (Temple)"),
+    ("Folly_K1_NeptuneKey", 14315, "Folly Neptune Key"),
+    ("Folly_K2_AtlasKey", 14299, "Folly Atlas Key"),
+    ("Folly_K3_DamoclesKey", 14290, "Folly Damocles Key"),
+    ("Folly_K4_ThorKey", 14280, "Folly Thor Key"),
+    ("Colosseum_K1_RustyKey", 15217, "Colosseum Rusty Key"),
+    ("Midas_LeadBar_FireRoom", 16178, "Midas Lead Bar (Fire Room)"),
+    ("Midas_LeadBar_SpikeRoom", 16157, "Midas Lead Bar (Spike Room)"),
+    ("Midas_LeadBar_TempleRoof", 16166, "Midas Lead Bar (Temple Roof)"),
+    ("Cistern_K1_GoldKey", 17245, "Cistern Gold Key"),
+    ("Cistern_K2_SilverBehindDoor", 17208, "Cistern Silver Key (Behind Door)"),
+    ("Cistern_K2_SilverBetweenDoors", 17231, "Cistern Silver Key (Between Doors)"),
+    ("Cistern_K3_RustyKeyMainRoom", 17295, "Cistern Rusty Key (Main Room)"),
+    ("Cistern_K3_RustyKeyNearPierre", 17143, "Cistern Rusty Key (Near Pierre)"),
+    ("Tihocan_K1_GoldKeyFlipMap", 18133, "Tihocan Gold Key (Flip Map)"),
+    ("Tihocan_K1_GoldKeyPierre", 18389, "Tihocan Gold Key (Pierre)"),
+    ("Tihocan_K2_RustyKeyBoulders", 18277, "Tihocan Rusty Key (Boulders)"),
+    ("Tihocan_K2_RustyKeyClangClang", 18267, "Tihocan Rusty Key (Clang Clang)"),
+    ("Tihocan_Scion_EndRoom", 18444, "Tihocan Scion"),
+    ("Khamoon_K1_SapphireKeyEnd", 19193, "Khamoon Sapphire Key (End)"),
+    ("Khamoon_K1_SapphireKeyStart", 19217, "Khamoon Sapphire Key (Start)"),
+    ("Obelisk_K1_SapphireKeyEnd", 20213, "Obelisk Sapphire Key (End)"),
+    ("Obelisk_K1_SapphireKeyStart", 20308, "Obelisk Sapphire Key (Start)"),
+    ("Obelisk_P1_EyeOfHorus", 20160, "Obelisk Eye of Horus"),
+    ("Obelisk_P2_Scarab", 20151, "Obelisk Scarab"),
+    ("Obelisk_P3_SealOfAnubis", 20152, "Obelisk Seal of Anubis"),
+    ("Obelisk_P4_Ankh", 20163, "Obelisk Ankh"),
+    ("Sanctuary_K1_GoldKey", 21191, "Sanctuary Gold Key"),
+    ("Sanctuary_P1_AnkhAfterKey", 21196, "Sanctuary Ankh (After Key)"),
+    ("Sanctuary_P1_AnkhBehindSphinx", 21100, "Sanctuary Ankh (Behind Sphinx)"),
+    ("Sanctuary_P2_Scarab", 21202, "Sanctuary Scarab"),
+    ("Mines_K1_RustyKey", 22137, "Mines Rusty Key"),
+    ("Mines_P1_BoulderFuse", 22160, "Mines Fuse (Boulder)"),
+    ("Mines_P1_ConveyorFuse", 22183, "Mines Fuse (Conveyor)"),
+    ("Mines_P1_CowboyFuse", 22148, "Mines Fuse (Cowboy)"),
+    ("Mines_P1_CowboyAltFuse", 22146, "Mines Fuse (Cowboy Alt)"),
+    ("Mines_P2_PyramidKey", 22216, "Mines Pyramid Key"),
+)
+_ALIAS_NAMES: Dict[int, str] = {value: name for name, value, _display in KEY_ITEM_ALIASES}
+_DISPLAY_NAMES: Dict[str, str] = {name: display for name, _value, display in KEY_ITEM_ALIASES}
+
+# (type, name, category, classification) after the key items, as BuildItemDefinitions adds them
+OTHER_ITEMS: Tuple[Tuple[int, str, str, str], ...] = (
+    (85, "Shotgun", "weapon", "useful"),
+    (86, "Magnums", "weapon", "useful"),
+    (87, "Uzis", "weapon", "useful"),
+    (89, "Shotgun Shells", "ammo", "filler"),
+    (90, "Magnum Clips", "ammo", "filler"),
+    (91, "Uzi Clips", "ammo", "filler"),
+    (LARGE_MEDIPACK, "Large Medipack", "large_medipack", "useful"),
+    (SMALL_MEDIPACK, "Small Medipack", "small_medipack", "filler"),
+)
+
+BINARY_FORMAT_VERSION = 1  # BinaryDataWriter.FormatVersion
+
+
+def build_item_definitions() -> Dict[str, Dict[str, Any]]:
+    definitions: Dict[str, Dict[str, Any]] = {}
+    for name, value, display in sorted(KEY_ITEM_ALIASES, key=lambda alias: alias[1]):
+        definitions[name] = {"id": ITEM_BASE_ID + value, "name": display,
+                             "category": "key_item", "apClassification": "progression"}
+    for type_id, name, category, classification in OTHER_ITEMS:
+        definitions[TYPE_NAMES[type_id]] = {"id": ITEM_BASE_ID + type_id, "name": name,
+                                            "category": category, "apClassification": classification}
+    return definitions
+
+
+def key_item_name(level_file: str, display_name: str, type_name: str, same_type_count: int) -> str:
+    name = KEY_TYPE_NAMES.get((level_file, type_name), type_name.replace("_S_P", ""))
+    if same_type_count > 0:
+        return f"{display_name} - {name} #{same_type_count + 1}"
+    return f"{display_name} - {name}"
+
+
+def key_item_alias(short_name: str, type_name: str, same_type_count: int) -> str:
+    short_type = type_name.replace("_S_P", "")
+    if same_type_count > 0:
+        return f"{short_name}_{short_type}_{same_type_count + 1}"
+    return f"{short_name}_{short_type}"
+
+
+def pickup_category(type_id: int) -> str:
+    if type_id in WEAPON_TYPES:
+        return "weapon"
+    if type_id in AMMO_TYPES:
+        return "ammo"
+    if type_id == LARGE_MEDIPACK:
+        return "large_medipack"
+    if type_id == SMALL_MEDIPACK:
+        return "small_medipack"
+    return "pickup"
+
+
+def keyhole_key_item(level_data: Dict[str, Any], key_type: int, slot: int,
+                     level_index: int) -> Tuple[List[str], bool]:
+    """The slot-th key of key_type in the level as [AP item name] ([] if it stays
+    vanilla), and whether the level has that many keys of the type at all."""
+    fitting = [key for key in level_data["keyItems"] if key["type"] == TYPE_NAMES[key_type]]
+    if slot >= len(fitting):
+        return [], False
+    alias = _ALIAS_NAMES.get(KEY_ITEM_ALIAS_BASE + level_index * 1000 + fitting[slot]["entityIndex"])
+    return ([_DISPLAY_NAMES[alias]] if alias is not None else []), True
+
+
+def build_room_graph(level: phd.Level, level_data: Dict[str, Any], level_index: int,
+                     log: List[str]) -> Dict[str, Any]:
+    """Room links, gated by the keyhole doors they pass (TR1DataExporter.BuildRoomGraph)."""
+    start_room = next((entity.room for entity in level.entities if entity.type_id == LARA), 0)
+    graph: Dict[str, Any] = {"startRoom": start_room, "roomCount": len(level.rooms), "links": []}
+
+    # Doors opened from a keyhole: (room, room beyond the door) -> the AP item it takes.
+    # Keys are used up, so one key can't open every door of its type: the n-th
+    # keyhole of a type (in entity order) takes the n-th key of that type.
+    gates: Dict[Tuple[int, int], List[str]] = {}
+    shut = set()
+    keyholes_seen: Dict[int, int] = {}
+    key_triggers = level.key_triggers()
+    for index, entity in enumerate(level.entities):
+        key_type = KEYHOLE_KEYS.get(entity.type_id)
+        if key_type is None:
+            continue
+
+        slot = keyholes_seen.get(key_type, 0)
+        keyholes_seen[key_type] = slot + 1
+        keys, has_key = keyhole_key_item(level_data, key_type, slot, level_index)
+        # Keys that stay vanilla are always in the level, so their doors are not gates
+        if has_key and not keys:
+            continue
+        if not has_key:
+            log.append(f"    WARNING: keyhole #{index} has no {TYPE_NAMES[key_type]} of its own, "
+                       f"its doors stay shut")
+
+        for trigger in key_triggers.get(index, ()):
+            for action, parameter in trigger.actions:
+                if action != phd.ACTION_OBJECT:
+                    continue
+                door = level.entities[parameter]
+                beyond = level.door_room(level.rooms[door.room].sector_fd_index(door.x, door.z))
+                if beyond == phd.NO_ROOM:
+                    door_type = TYPE_NAMES.get(door.type_id, door.type_id)
+                    log.append(f"    WARNING: {door_type} #{parameter} (keyhole #{index}) "
+                               f"is not on a portal, not gated")
+                    continue
+                if not has_key:
+                    shut.update(((door.room, beyond), (beyond, door.room)))
+                    continue
+                gates[(door.room, beyond)] = keys
+                gates[(beyond, door.room)] = keys
+
+    seen = set()
+
+    def add_link(source: int, target: int) -> None:
+        if source != target and (source, target) not in shut and (source, target) not in seen:
+            seen.add((source, target))
+            graph["links"].append({"from": source, "to": target, "keys": gates.get((source, target), [])})
+
+    for room_index, room in enumerate(level.rooms):
+        for adjoining in room.portals:
+            add_link(room_index, adjoining)
+
+        # Flipmaps swap a room for its alternate; treat both as the same place
+        if room.alternate_room != -1:
+            add_link(room_index, room.alternate_room)
+            add_link(room.alternate_room, room_index)
+
+    return graph
+
+
+def export_level(task: Tuple[int, str]) -> Tuple[Dict[str, Any], List[str]]:
+    """Export one level (runs in a worker process); returns its data and log lines."""
+    level_index, game_dir = task
+    level_file, display_name, region, short_name, secret_count = LEVELS[level_index]
+    log: List[str] = []
+    level_data: Dict[str, Any] = {
+        "name": display_name,
+        "file": level_file,
+        "sequence": level_index + 1,
+        "region": region,
+        "pickups": [],
+        "keyItems": [],
+        "secrets": [],
+        "routes": [],
+    }
+
+    path = os.path.join(game_dir, level_file)
+    if not os.path.isfile(path):
+        log.append(f"  WARNING: {path} not found, skipping")
+        return level_data, log
+    try:
+        level = phd.read_level(path)
+    except (OSError, ValueError) as ex:
+        log.append(f"  WARNING: Failed to read {level_file}: {ex}")
+        return level_data, log
+
+    log.append(f"  {display_name}: {len(level.entities)} entities")
+
+    for index, entity in enumerate(level.entities):
+        type_id = entity.type_id
+        if type_id in KEY_ITEM_TYPES or (level_file == TIHOCAN and type_id == SCION_PIECE_2):
+            type_name = TYPE_NAMES[type_id]
+            same_type_count = sum(1 for key in level_data["keyItems"] if key["type"] == type_name)
+            level_data["keyItems"].append({
+                "entityIndex": index,
+                "type": type_name,
+                "alias": key_item_alias(short_name, type_name, same_type_count),
+                "name": key_item_name(level_file, display_name, type_name, same_type_count),
+                "x": entity.x,
+                "y": entity.y,
+                "z": entity.z,
+                "room": entity.room,
+            })
+        elif type_id in STANDARD_PICKUP_TYPES:
+            level_data["pickups"].append({
+                "entityIndex": index,
+                "type": TYPE_NAMES[type_id],
+                "category": pickup_category(type_id),
+                "x": entity.x,
+                "y": entity.y,
+                "z": entity.z,
+                "room": entity.room,
+            })
+
+    level_data["roomGraph"] = build_room_graph(level, level_data, level_index, log)
+
+    # Secrets: use known counts per level
+    level_data["secrets"] = [{"index": secret, "rewardEntities": []} for secret in range(secret_count)]
+    return level_data, log
+
+
+def export(game_dir: str, jobs: int) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "game": "Tomb Raider 1 Remastered",
+        "levels": [],
+        "levelSequence": [level[0] for level in LEVELS],
+        "keyDependencies": {},
+        "itemDefinitions": build_item_definitions(),
+    }
+
+    tasks = [(index, game_dir) for index in range(len(LEVELS))]
+    with Pool(jobs) as pool:
+        for level_data, log in pool.imap(export_level, tasks):
+            for line in log:
+                print(line)
+            data["levels"].append(level_data)
+
+    # For each level's key items, record which level they belong to
+    for level_data in data["levels"]:
+        for key in level_data["keyItems"]:
+            data["keyDependencies"][key["alias"]] = {
+                "level": level_data["file"], "baseType": key["type"], "unlocksRooms": [],
+            }
+    return data
+
+
+def camel_case(name: str) -> str:
+    """Newtonsoft's CamelCaseNamingStrategy.ToCamelCase."""
+    chars = list(name)
+    for i, char in enumerate(chars):
+        if i == 1 and not char.isupper():
+            break
+        if i > 0 and i + 1 < len(chars) and not chars[i + 1].isupper():
+            if chars[i + 1] == " ":
+                chars[i] = char.lower()
+            break
+        chars[i] = char.lower()
+    return "".join(chars)
+
+
+def encode_json(data: Dict[str, Any]) -> bytes:
+    """The JSON exactly as Newtonsoft writes it (indented, platform newlines).
+
+    The C# exporter's CamelCasePropertyNamesContractResolver also camel-cases
+    dictionary keys, so item definition and key dependency keys are written
+    that way here too (the binary form keeps them as they are).
+    """
+    data = dict(data)
+    for table in ("keyDependencies", "itemDefinitions"):
+        data[table] = {camel_case(key): value for key, value in data[table].items()}
+    return json.dumps(data, indent=2, ensure_ascii=False).replace("\n", os.linesep).encode("utf-8")
+
+
+def encode_binary(data: Dict[str, Any], source_json: bytes) -> bytes:
+    """tr1r_data.bin, interning strings in the same order as BinaryDataWriter.cs."""
+    strings: List[str] = [""]
+    string_ids: Dict[str, int] = {"": 0}
+
+    def intern(value: Optional[str]) -> int:
+        value = value or ""
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    entity = struct.Struct("<HHHHHiiih")
+    levels = []
+    for level in data["levels"]:
+        header = (intern(level["name"]), intern(level["file"]), intern(level["region"]))
+        pickups = [entity.pack(p["entityIndex"], intern(p["type"]), intern(p["category"]), 0, 0,
+                               p["x"], p["y"], p["z"], p["room"]) for p in level["pickups"]]
+        keys = [entity.pack(k["entityIndex"], intern(k["type"]), 0, intern(k["alias"]), intern(k["name"]),
+                            k["x"], k["y"], k["z"], k["room"]) for k in level["keyItems"]]
+        levels.append((level, header, pickups, keys))
+    items = [
+        (intern(key), item["id"], intern(item["name"]), intern(item["category"]),
+         intern(item["apClassification"]))
+        for key, item in data["itemDefinitions"].items()
+    ]
+    sequence = [intern(file) for file in data["levelSequence"]]
+
+    out = bytearray(b"TR1R")
+    out += struct.pack("<H", BINARY_FORMAT_VERSION)
+    out += hashlib.sha256(source_json).digest()
+    out += struct.pack("<I", len(strings))
+    for value in strings:
+        encoded = value.encode("utf-8")
+        out += struct.pack("<H", len(encoded)) + encoded
+
+    out += struct.pack("<H", len(levels))
+    for level, (name, file, region), pickups, keys in levels:
+        out += struct.pack("<7H", name, file, region, level["sequence"],
+                           len(pickups), len(keys), len(level["secrets"]))
+        out += b"".join(pickups) + b"".join(keys)
+        out += b"".join(struct.pack("<H", secret["index"]) for secret in level["secrets"])
+
+    out += struct.pack("<H", len(items))
+    for item in items:
+        out += struct.pack("<HiHHH", *item)
+
+    out += struct.pack("<H", len(sequence))
+    out += struct.pack(f"<{len(sequence)}H", *sequence)
+    return bytes(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("game_data_dir", nargs="?", default=DEFAULT_GAME_DIR,
+                        help="TR1 Remastered DATA directory (containing .PHD files)")
+    parser.add_argument("output_path", nargs="?", default="tr1r_data.json")
+    parser.add_argument("--jobs", type=int, default=min(len(LEVELS), os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    print("TR1 Remastered -> Archipelago Data Exporter")
+    print("============================================")
+    if not os.path.isdir(args.game_data_dir):
+        print(f"ERROR: Game data directory not found: {args.game_data_dir}")
+        sys.exit(1)
+    print(f"Game data: {args.game_data_dir}")
+    print()
+
+    data = export(args.game_data_dir, args.jobs)
+    json_bytes = encode_json(data)
+    with open(args.output_path, "wb") as file:
+        file.write(json_bytes)
+
+    # Compact binary form, loaded by the APWorld while it matches the JSON above
+    binary_path = os.path.splitext(args.output_path)[0] + ".bin"
+    with open(binary_path, "wb") as file:
+        file.write(encode_binary(data, json_bytes))
+
+    print()
+    print(f"Exported {len(data['levels'])} levels")
+    print(f"  Total pickups:   {sum(len(level['pickups']) for level in data['levels'])}")
+    print(f"  Total key items: {sum(len(level['keyItems']) for level in data['levels'])}")
+    print(f"  Total secrets:   {sum(len(level['secrets']) for level in data['levels'])}")
+    print(f"  Item defs:       {len(data['itemDefinitions'])}")
+    print(f"Written to: {os.path.abspath(args.output_path)}")
+    print(f"            {os.path.abspath(binary_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Logic exporter: writes the TR1R access logic as a versioned JSON table.
+
+The table (built by apworld/tr1r/logic_table.py, which documents its
+layout) lists the regions, the entrances between them, every location's
+region and item requirement, and the goal conditions, so trackers and
+other tools can follow the world's logic without importing it.
+tr1r.logic_table.LogicTracker evaluates the same table incrementally.
+
+The key-gated areas come from data/tr1r_regions.json; run
+tools/compile_regions.py first if tr1r_data.json has changed.
+
+Pass a slot data JSON to export the logic in that slot's level order
+(level_order: shuffled) and with its key_gated_regions setting; without
+one the vanilla order is used, without key-gated areas.
+
+Usage:
+    python tools/export_logic.py [slot_data.json] [-o tr1r_logic.json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "benchmarks"))
+
+try:
+    import BaseClasses  # noqa: F401
+except ImportError:
+    import apstub
+
+    apstub.install()
+else:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "apworld"))
+
+from tr1r.level_order import order_from_sequence  # noqa: E402
+from tr1r.logic_table import build_logic_table  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("slot_data", nargs="?", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=Path("tr1r_logic.json"))
+    args = parser.parse_args()
+
+    order = None
+    key_gated = False
+    if args.slot_data is not None:
+        slot_data = json.loads(args.slot_data.read_text(encoding="utf-8"))
+        order = order_from_sequence(slot_data["level_sequence"])
+        key_gated = bool(slot_data.get("key_gated_regions", False))
+
+    table = build_logic_table(order, key_gated)
+    args.output.write_text(json.dumps(table, indent=2) + "\n", encoding="utf-8")
+
+    print(f"Logic table v{table['version']}: {len(table['regions'])} regions, "
+          f"{len(table['entrances'])} entrances, {len(table['locations'])} locations")
+    print(f"Written to: {args.output.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
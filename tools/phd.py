@@ -0,0 +1,289 @@
+"""
+Minimal reader for TR1 .PHD level files.
+
+Reads only what the data exporter needs: room portals, sectors and flip
+rooms, the floor data, and the entity table. Everything else in the file
+(textures, room and object meshes, animations, boxes, sounds) is skipped
+by its length prefix, without being decoded or copied. The file is
+memory-mapped and walked with struct.unpack_from, so a level costs a few
+thousand small reads whatever its size.
+
+The chunk layout follows TR1LevelControl.Read in client/TRLevelControl and
+must stay in sync with it. Record sizes are those TRLevelReader uses for
+TR1 (noted next to each skip below).
+
+Usage:
+    python tools/phd.py LEVEL1.PHD [...]
+"""
+
+import argparse
+import mmap
+import struct
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+TR1_FILE_VERSION = 0x20
+TEXTURE_PAGE_SIZE = 256 * 256
+SECTOR_SIZE = 1024  # world units per sector (TRConsts.Step4)
+NO_ROOM = 255
+
+# Floor data function and trigger codes (FDFunction, FDTrigType, FDTrigAction)
+FD_PORTAL = 0x01
+FD_TRIGGER = 0x04
+_FD_ONE_WORD = {0x01, 0x02, 0x03, *range(0x07, 0x13)}  # portal, slants, triangulation
+TRIGGER_SWITCH = 0x02
+TRIGGER_KEY = 0x03
+ACTION_OBJECT = 0x00
+_ACTION_CAMERA = 0x01
+_ACTION_FLYBY = 0x0C
+
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_ROOM_INFO = struct.Struct("<iiii")
+_SECTOR = struct.Struct("<HHBbBb")
+_ROOM_TAIL = struct.Struct("<hh")
+_ENTITY = struct.Struct("<hhiiihhH")
+
+# Fixed-size records skipped as count * size, after a u32 count, in file order
+# from the object mesh pointers to the animated textures.
+_SKIPPED_CHUNKS: Tuple[Tuple[str, int], ...] = (
+    ("mesh pointers", 4),
+    ("animations", 32),
+    ("state changes", 6),
+    ("anim dispatches", 8),
+    ("anim commands", 2),
+    ("mesh trees", 4),
+    ("frames", 2),
+    ("models", 18),
+    ("static meshes", 32),
+    ("object textures", 20),
+    ("sprite textures", 16),
+    ("sprite sequences", 8),
+    ("cameras", 16),
+    ("sound sources", 16),
+)
+
+
+class LevelFormatError(ValueError):
+    """The file is not a TR1 level, or is truncated."""
+
+
+class Entity(NamedTuple):
+    type_id: int
+    room: int
+    x: int
+    y: int
+    z: int
+    angle: int
+    intensity: int
+    flags: int
+
+
+class Room(NamedTuple):
+    x: int
+    z: int
+    portals: Tuple[int, ...]  # adjoining room per portal
+    num_z_sectors: int
+    num_x_sectors: int
+    fd_indexes: array         # floor data index per sector, x-major
+    alternate_room: int
+
+    def sector_fd_index(self, x: int, z: int) -> int:
+        """Floor data index of the sector holding world position x, z (TRRoom.GetSector)."""
+        x = min(max(x, self.x), self.x + (self.num_x_sectors - 1) * SECTOR_SIZE)
+        z = min(max(z, self.z), self.z + (self.num_z_sectors - 1) * SECTOR_SIZE)
+        return self.fd_indexes[(x - self.x) // SECTOR_SIZE * self.num_z_sectors + (z - self.z) // SECTOR_SIZE]
+
+
+class Trigger(NamedTuple):
+    trig_type: int
+    switch_or_key: int                    # entity index, switch and key triggers only
+    actions: Tuple[Tuple[int, int], ...]  # (action, parameter)
+
+
+class FloorEntries(NamedTuple):
+    portal: Optional[int]  # room beyond, for portal sectors
+    triggers: Tuple[Trigger, ...]
+
+
+class Level(NamedTuple):
+    rooms: Tuple[Room, ...]
+    floor_data: array
+    entities: Tuple[Entity, ...]
+
+    def floor_entries(self, fd_index: int) -> FloorEntries:
+        return parse_floor_data(self.floor_data, fd_index)
+
+    def door_room(self, fd_index: int) -> int:
+        """Room a sector's portal leads to, or NO_ROOM (FDControl.GetDoor)."""
+        if fd_index == 0:
+            return NO_ROOM
+        portal = self.floor_entries(fd_index).portal
+        return NO_ROOM if portal is None else portal
+
+    def key_triggers(self) -> Dict[int, List[Trigger]]:
+        """Keyhole entity index -> the key triggers it fires, over every sector."""
+        found: Dict[int, List[Trigger]] = {}
+        seen = set()
+        for room in self.rooms:
+            for fd_index in room.fd_indexes:
+                if fd_index == 0 or fd_index in seen:
+                    continue
+                seen.add(fd_index)
+                for trigger in self.floor_entries(fd_index).triggers:
+                    if trigger.trig_type == TRIGGER_KEY:
+                        found.setdefault(trigger.switch_or_key, []).append(trigger)
+        return found
+
+
+def parse_floor_data(data: array, index: int) -> FloorEntries:
+    """Decode the floor data functions starting at index (TRFDBuilder.ReadFromIndex)."""
+    portal: Optional[int] = None
+    triggers: List[Trigger] = []
+    while True:
+        value = data[index]
+        function = value & 0x1F
+        if function == FD_TRIGGER:
+            trig_type = (value & 0x7F00) >> 8
+            index += 1  # timer, one-shot and mask
+            switch_or_key = -1
+            done = False
+            if trig_type in (TRIGGER_SWITCH, TRIGGER_KEY):
+                index += 1
+                switch_or_key = data[index] & 0x7FFF
+                done = data[index] & 0x8000 != 0
+            actions: List[Tuple[int, int]] = []
+            while not done and index < len(data):
+                index += 1
+                action_data = data[index]
+                action = (action_data & 0x7C00) >> 10
+                actions.append((action, action_data & 0x03FF))
+                done = action_data & 0x8000 != 0
+                if action in (_ACTION_CAMERA, _ACTION_FLYBY):
+                    index += 1
+                    done = data[index] & 0x8000 != 0
+            triggers.append(Trigger(trig_type, switch_or_key, tuple(actions)))
+        elif function in _FD_ONE_WORD:
+            index += 1
+            if function == FD_PORTAL and portal is None:
+                portal = data[index] - 0x10000 if data[index] & 0x8000 else data[index]
+
+        if value & 0x8000:
+            return FloorEntries(portal, tuple(triggers))
+        index += 1
+
+
+class _Cursor:
+    """Read position in the mapped file."""
+
+    __slots__ = ("view", "offset")
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def u16(self) -> int:
+        return self.unpack(_U16)[0]
+
+    def u32(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def skip(self, size: int) -> None:
+        self.offset += size
+        if self.offset > len(self.view):
+            raise LevelFormatError("unexpected end of file")
+
+    def take(self, size: int) -> memoryview:
+        """The next size bytes, bounds-checked; release the view when done with it."""
+        start = self.offset
+        self.skip(size)
+        return self.view[start:self.offset]
+
+    def u16_array(self, count: int) -> array:
+        values = array("H")
+        with self.take(count * 2) as data:
+            values.frombytes(data)
+        return values
+
+
+def _read_rooms(cursor: _Cursor) -> Tuple[Room, ...]:
+    rooms: List[Room] = []
+    for _ in range(cursor.u16()):
+        x, z, _y_bottom, _y_top = cursor.unpack(_ROOM_INFO)
+        cursor.skip(cursor.u32() * 2)  # room mesh
+        portals = []
+        for _ in range(cursor.u16()):
+            portals.append(cursor.u16())
+            cursor.skip(30)  # normal and 4 vertices
+        num_z, num_x = cursor.u16(), cursor.u16()
+        with cursor.take(num_z * num_x * _SECTOR.size) as sectors:
+            fd_indexes = array("H", (sector[0] for sector in _SECTOR.iter_unpack(sectors)))
+        cursor.skip(2)                  # ambient intensity
+        cursor.skip(cursor.u16() * 18)  # lights
+        cursor.skip(cursor.u16() * 18)  # static meshes
+        alternate_room, _flags = cursor.unpack(_ROOM_TAIL)
+        rooms.append(Room(x, z, tuple(portals), num_z, num_x, fd_indexes, alternate_room))
+    return tuple(rooms)
+
+
+def parse_level(buffer) -> Level:
+    """Parse a whole .PHD file held in a bytes-like buffer (or mmap)."""
+    with memoryview(buffer) as view:
+        cursor = _Cursor(view)
+        try:
+            version = cursor.u32()
+            if version != TR1_FILE_VERSION:
+                raise LevelFormatError(f"unexpected level version 0x{version:X}")
+            cursor.skip(cursor.u32() * TEXTURE_PAGE_SIZE)
+            cursor.skip(4)  # level number
+
+            rooms = _read_rooms(cursor)
+            floor_data = cursor.u16_array(cursor.u32())
+
+            cursor.skip(cursor.u32() * 2)  # object mesh data
+            for _name, size in _SKIPPED_CHUNKS:
+                cursor.skip(cursor.u32() * size)
+
+            num_boxes = cursor.u32()
+            cursor.skip(num_boxes * 20)     # boxes
+            cursor.skip(cursor.u32() * 2)   # overlaps
+            cursor.skip(num_boxes * 2 * 6)  # zones: ground 1, ground 2, fly; flip off and on
+            cursor.skip(cursor.u32() * 2)   # animated textures
+
+            with cursor.take(cursor.u32() * _ENTITY.size) as records:
+                entities = tuple(Entity(*fields) for fields in _ENTITY.iter_unpack(records))
+        except struct.error as ex:
+            raise LevelFormatError(f"unexpected end of file: {ex}") from ex
+        finally:
+            cursor.view = None
+    return Level(rooms, floor_data, entities)
+
+
+def read_level(path: str) -> Level:
+    """Memory-map a .PHD file and parse it."""
+    with open(path, "rb") as file:
+        if file.seek(0, 2) == 0:
+            raise LevelFormatError("empty file")  # mmap cannot map it
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return parse_level(mapped)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        level = read_level(path)
+        portals = sum(len(room.portals) for room in level.rooms)
+        print(f"{path}: {len(level.rooms)} rooms ({portals} portals), "
+              f"{len(level.floor_data)} floor data words, {len(level.entities)} entities")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Headless save-file tracker for Tomb Raider 1 Remastered.
+
+Watches savegame.dat and sends the secrets and level completions it finds to
+an Archipelago server, without the Windows memory-reading client. Meant for
+streams and race setups where detecting progress on save is enough.
+
+The tracker is a single asyncio process:
+  - the watcher polls the file's size and mtime, reads the TR1 slot region
+    off the event loop once a write has settled, and re-decodes only slots
+    whose bytes changed (per-slot CRC32 fingerprints);
+  - ProgressTracker compares each newer save with the last one: new bits in
+    a level's secrets bitmask (ten per level) become secret locations, and
+    moving on to a later level completes every level from the last saved one
+    up to it (IDs as in apworld/tr1r/ids.py). A save's level index counts
+    positions in the slot's level_sequence, read from slot data, so with a
+    shuffled level order each position is credited to the level played there;
+  - the sender coalesces everything found close together into one
+    LocationChecks packet, skipping locations the server already has.
+
+Like the client's SaveFileGameWatcher, individual pickups can't be told
+apart from a save, so only secrets and level completions are tracked. A
+level only counts as completed when a later level is saved, so reloading an
+older save doesn't complete anything.
+
+Usage:
+    python tools/save_tracker.py savegame.dat --server localhost:38281 --slot Lara
+
+Connecting requires the websockets package (as used by Archipelago's own
+clients); the rest of the module imports without it.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import uuid
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+import savefile
+
+GAME = "Tomb Raider 1 Remastered"
+AP_VERSION = {"major": 0, "minor": 5, "build": 0, "class": "Version"}
+
+# As in apworld/tr1r/ids.py (checked by tests/test_ids.py)
+LEVEL_COMPLETE_BASE_ID = 795_000
+SECRET_BASE_ID = 796_000
+SECRET_LEVEL_STRIDE = 10
+LEVEL_FILES = ("LEVEL1.PHD", "LEVEL2.PHD", "LEVEL3A.PHD", "LEVEL3B.PHD", "LEVEL4.PHD", "LEVEL5.PHD",
+               "LEVEL6.PHD", "LEVEL7A.PHD", "LEVEL7B.PHD", "LEVEL8A.PHD", "LEVEL8B.PHD", "LEVEL8C.PHD",
+               "LEVEL10A.PHD", "LEVEL10B.PHD", "LEVEL10C.PHD")
+
+_REGION_SIZE = savefile.SAVE_FILE_MAX_OFFSET - savefile.SAVE_FILE_BASE_OFFSET
+
+logger = logging.getLogger("save_tracker")
+
+
+class ProgressTracker:
+    """
+    Turns decoded save slots into newly found location IDs (no I/O).
+
+    level_sequence is the slot data's: level files in the order played. Empty
+    (the vanilla order, or slot data from before level shuffling) keeps every
+    level at its own position.
+    """
+
+    def __init__(self, level_sequence: Sequence[str] = ()) -> None:
+        # 0-based level played at each 1-based position
+        self.levels = [LEVEL_FILES.index(file.upper()) for file in level_sequence] or list(range(len(LEVEL_FILES)))
+        self.last_save_number = -1
+        self.level_index = 0  # 1-based position, 0 until the first save is seen
+        self.level_secrets: Dict[int, int] = {}  # 1-based position -> secrets bitmask
+        self.completed_levels: Set[int] = set()
+
+    def update(self, slots: Iterable[Dict[str, int]]) -> List[int]:
+        """Process changed slots; saves older than the last one seen are ignored."""
+        found: List[int] = []
+        occupied = (slot for slot in slots if slot["status"] == savefile.SLOT_OCCUPIED)
+        for slot in sorted(occupied, key=lambda slot: slot["save_number"]):
+            if slot["save_number"] <= self.last_save_number:
+                continue
+            self.last_save_number = slot["save_number"]
+            level = slot["level_index"]
+
+            # Saving in a later level completes every level before it since the last save
+            if self.level_index > 0:
+                for completed in range(self.level_index, level):
+                    if completed not in self.completed_levels:
+                        self.completed_levels.add(completed)
+                        found.append(LEVEL_COMPLETE_BASE_ID + self.level_at(completed))
+            self.level_index = level
+
+            previous = self.level_secrets.get(level, 0)
+            new_bits = slot["secrets_found"] & ~previous
+            self.level_secrets[level] = previous | slot["secrets_found"]
+            found.extend(
+                SECRET_BASE_ID + self.level_at(level) * SECRET_LEVEL_STRIDE + bit
+                for bit in range(SECRET_LEVEL_STRIDE) if new_bits >> bit & 1
+            )
+        return found
+
+    def level_at(self, position: int) -> int:
+        """The 0-based level played at a 1-based position (past the sequence, the position's own)."""
+        return self.levels[position - 1] if 0 < position <= len(self.levels) else position - 1
+
+
+class SaveFileWatcher:
+    """Polls savegame.dat and yields the decoded slots whose bytes changed."""
+
+    def __init__(self, path: str, poll_interval: float, settle: float):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self._stat: Optional[Tuple[int, int]] = None
+        self._fingerprints: List[Optional[int]] = [None] * savefile.MAX_SAVE_SLOTS
+
+    def _file_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_region(self) -> bytes:
+        with open(self.path, "rb") as file:
+            file.seek(savefile.SAVE_FILE_BASE_OFFSET)
+            return file.read(_REGION_SIZE)
+
+    def changed_slots(self, region: bytes) -> List[Dict[str, int]]:
+        """Decode the slots whose fingerprint differs from the last read."""
+        changed = []
+        with memoryview(region) as view:
+            for index in range(min(savefile.MAX_SAVE_SLOTS, len(region) // savefile.SAVE_SLOT_SIZE)):
+                start = index * savefile.SAVE_SLOT_SIZE
+                fingerprint = zlib.crc32(view[start:start + savefile.SAVE_SLOT_SIZE])
+                if fingerprint != self._fingerprints[index]:
+                    self._fingerprints[index] = fingerprint
+                    changed.append(savefile.decode_slot(region, index, base_offset=0))
+        return changed
+
+    async def watch(self, on_change) -> None:
+        while True:
+            stat = self._file_stat()
+            if stat is not None and stat != self._stat:
+                # The game may write the file in several passes; wait for it to settle
+                await asyncio.sleep(self.settle)
+                settled = self._file_stat()
+                if settled == stat:
+                    self._stat = stat
+                    region = await asyncio.to_thread(self._read_region)
+                    slots = self.changed_slots(region)
+                    if slots:
+                        on_change(slots)
+                    continue
+            await asyncio.sleep(self.poll_interval)
+
+
+class ArchipelagoConnection:
+    """Minimal Archipelago client: connect to a slot and send location checks."""
+
+    def __init__(self, url: str, slot: str, password: str = ""):
+        self.url = url if "://" in url else f"ws://{url}"
+        self.slot = slot
+        self.password = password
+        self.checked: Set[int] = set()
+        self.level_sequence: List[str] = []
+        self._socket = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        self._socket = await websockets.connect(self.url, max_size=None)
+        await self._receive("RoomInfo")
+        await self._send({
+            "cmd": "Connect",
+            "game": GAME,
+            "name": self.slot,
+            "password": self.password,
+            "uuid": uuid.uuid4().hex,
+            "version": AP_VERSION,
+            "items_handling": 0,
+            "tags": [],
+            "slot_data": True,
+        })
+        reply = await self._receive("Connected", "ConnectionRefused")
+        if reply["cmd"] == "ConnectionRefused":
+            raise ConnectionError(f"connection refused: {reply.get('errors')}")
+        self.checked = set(reply.get("checked_locations", ()))
+        self.level_sequence = reply.get("slot_data", {}).get("level_sequence", [])
+        self._reader = asyncio.create_task(self._read_updates())
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._socket is not None:
+            await self._socket.close()
+
+    async def send_location_checks(self, locations: List[int]) -> None:
+        await self._send({"cmd": "LocationChecks", "locations": locations})
+        self.checked.update(locations)
+
+    async def _send(self, packet: Dict[str, Any]) -> None:
+        await self._socket.send(json.dumps([packet]))
+
+    async def _receive(self, *commands: str) -> Dict[str, Any]:
+        while True:
+            for packet in json.loads(await self._socket.recv()):
+                if packet.get("cmd") in commands:
+                    return packet
+
+    async def _read_updates(self) -> None:
+        """Keep draining server packets, picking up checks made elsewhere."""
+        async for message in self._socket:
+            for packet in json.loads(message):
+                if packet.get("cmd") == "RoomUpdate":
+                    self.checked.update(packet.get("checked_locations", ()))
+
+
+async def send_batches(queue: "asyncio.Queue[List[int]]", connection: ArchipelagoConnection,
+                       coalesce: float) -> None:
+    """Send queued discoveries as one LocationChecks per burst."""
+    while True:
+        batch = set(await queue.get())
+        await asyncio.sleep(coalesce)
+        while not queue.empty():
+            batch.update(queue.get_nowait())
+        locations = sorted(batch - connection.checked)
+        if locations:
+            try:
+                await connection.send_location_checks(locations)
+            except websockets.ConnectionClosed:
+                queue.put_nowait(locations)
+                raise
+            logger.info("sent %d location check(s): %s", len(locations), locations)
+
+
+async def run(args: argparse.Namespace) -> None:
+    tracker: Optional[ProgressTracker] = None
+    watcher = SaveFileWatcher(args.save_file, args.poll_interval, args.settle)
+    queue: "asyncio.Queue[List[int]]" = asyncio.Queue()
+    watch: Optional[asyncio.Task] = None
+
+    def on_change(slots: List[Dict[str, int]]) -> None:
+        found = tracker.update(slots)
+        if found:
+            queue.put_nowait(found)
+
+    try:
+        while True:
+            connection = ArchipelagoConnection(args.server, args.slot, args.password)
+            try:
+                await connection.connect()
+                logger.info("connected to %s as %s", connection.url, args.slot)
+                # Saves are only read once the slot's level order is known
+                if watch is None:
+                    tracker = ProgressTracker(connection.level_sequence)
+                    watch = asyncio.create_task(watcher.watch(on_change))
+                await send_batches(queue, connection, args.coalesce)
+            except (OSError, websockets.ConnectionClosed) as ex:
+                logger.warning("connection lost (%s), retrying in %.0fs", ex, args.reconnect_delay)
+            finally:
+                await connection.close()
+            await asyncio.sleep(args.reconnect_delay)
+    finally:
+        if watch is not None:
+            watch.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("save_file")
+    parser.add_argument("--server", default="localhost:38281")
+    parser.add_argument("--slot", required=True)
+    parser.add_argument("--password", default="")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--settle", type=float, default=0.1,
+                        help="seconds a write must stay unchanged before it is read")
+    parser.add_argument("--coalesce", type=float, default=0.02,
+                        help="seconds to gather more discoveries into the same batch")
+    parser.add_argument("--reconnect-delay", type=float, default=5.0)
+    args = parser.parse_args()
+    if websockets is None:
+        parser.error("the websockets package is required: pip install websockets")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
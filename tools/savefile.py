@@ -0,0 +1,175 @@
+"""
+Bulk reader for TR1 Remastered savegame.dat.
+
+Memory-maps the file and decodes every TR1 slot in one pass, for offline
+tooling that scans many archived saves. The client's SaveFileReader seeks
+and reads each field separately; here the whole slot layout is a single
+struct format (fields at their documented offsets, padding in between), so
+struct.iter_unpack decodes all 32 slots in one call. The result is
+columnar: one typed array per field, indexed by slot.
+
+The layout mirrors the Save_* offsets in the client's TR1RMemoryMap.cs and
+must stay in sync with it:
+  TR1 slots live at 0x2000..0x72000, 0x3800 bytes each (32 slots).
+  Slot status is 1 for an occupied slot. Level index is 1-based.
+
+Health is not decoded: its offset depends on the level
+(TR1RMemoryMap.GetSaveHealthOffset).
+
+Usage:
+    python tools/savefile.py savegame.dat [...]
+"""
+
+import argparse
+import mmap
+import struct
+from array import array
+from typing import Iterator, List, NamedTuple, Optional, Tuple, Union
+
+SAVE_FILE_BASE_OFFSET = 0x2000
+SAVE_FILE_MAX_OFFSET = 0x72000
+SAVE_SLOT_SIZE = 0x3800
+MAX_SAVE_SLOTS = 32
+
+SLOT_OCCUPIED = 1
+
+WEAPON_PISTOLS = 2
+WEAPON_MAGNUMS = 4
+WEAPON_UZIS = 8
+WEAPON_SHOTGUN = 16
+
+# (field, offset within the slot, struct code), in offset order
+SLOT_FIELDS: Tuple[Tuple[str, int, str], ...] = (
+    ("status", 0x004, "B"),
+    ("game_mode", 0x008, "B"),
+    ("save_number", 0x00C, "i"),
+    ("magnum_ammo", 0x4C2, "H"),
+    ("uzi_ammo", 0x4C4, "H"),
+    ("shotgun_ammo", 0x4C6, "H"),
+    ("small_medipacks", 0x4C8, "B"),
+    ("large_medipacks", 0x4C9, "B"),
+    ("weapons_config", 0x4EC, "B"),
+    ("time_taken", 0x614, "i"),
+    ("ammo_used", 0x618, "i"),
+    ("hits", 0x61C, "i"),
+    ("kills", 0x620, "i"),
+    ("distance", 0x624, "I"),
+    ("secrets_found", 0x628, "H"),
+    ("pickups", 0x62A, "B"),
+    ("medipacks_used", 0x62B, "B"),
+    ("level_index", 0x62C, "B"),
+)
+
+
+def _slot_struct() -> struct.Struct:
+    """One whole slot as a struct: each field at its offset, padding elsewhere."""
+    parts: List[str] = ["<"]
+    position = 0
+    for _name, offset, code in SLOT_FIELDS:
+        if offset < position:
+            raise ValueError(f"overlapping save slot field at 0x{offset:X}")
+        if offset > position:
+            parts.append(f"{offset - position}x")
+        parts.append(code)
+        position = offset + struct.calcsize("<" + code)
+    parts.append(f"{SAVE_SLOT_SIZE - position}x")
+    return struct.Struct("".join(parts))
+
+
+SLOT_STRUCT = _slot_struct()
+FIELD_NAMES: Tuple[str, ...] = tuple(name for name, _offset, _code in SLOT_FIELDS)
+
+
+class SaveSlots(NamedTuple):
+    """Every TR1 slot of one savegame.dat, one typed array per field."""
+
+    status: array
+    game_mode: array
+    save_number: array
+    magnum_ammo: array
+    uzi_ammo: array
+    shotgun_ammo: array
+    small_medipacks: array
+    large_medipacks: array
+    weapons_config: array
+    time_taken: array
+    ammo_used: array
+    hits: array
+    kills: array
+    distance: array
+    secrets_found: array
+    pickups: array
+    medipacks_used: array
+    level_index: array
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def occupied(self) -> List[int]:
+        """Indexes of occupied slots."""
+        return [i for i, status in enumerate(self.status) if status == SLOT_OCCUPIED]
+
+    def latest(self) -> Optional[int]:
+        """Index of the occupied slot with the highest save number, if any."""
+        return max(self.occupied(), key=self.save_number.__getitem__, default=None)
+
+    def slot(self, index: int) -> dict:
+        """One slot's fields as a dict (row view)."""
+        return {name: getattr(self, name)[index] for name in FIELD_NAMES}
+
+
+def decode_slots(buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> SaveSlots:
+    """Decode all complete TR1 slots in a savegame.dat buffer."""
+    end = min(len(buffer), SAVE_FILE_MAX_OFFSET)
+    count = max(0, (end - SAVE_FILE_BASE_OFFSET) // SAVE_SLOT_SIZE)
+    with memoryview(buffer) as view:
+        region = view[SAVE_FILE_BASE_OFFSET:SAVE_FILE_BASE_OFFSET + count * SAVE_SLOT_SIZE]
+        rows = list(SLOT_STRUCT.iter_unpack(region)) if count else []
+        region.release()
+
+    columns = zip(*rows) if rows else ((),) * len(SLOT_FIELDS)
+    return SaveSlots(*(
+        array(code, column) for (_name, _offset, code), column in zip(SLOT_FIELDS, columns)
+    ))
+
+
+def decode_slot(buffer: Union[bytes, bytearray, memoryview, mmap.mmap], index: int,
+                base_offset: int = SAVE_FILE_BASE_OFFSET) -> dict:
+    """
+    Decode a single slot as a dict. base_offset is where slot 0 starts in
+    buffer (0 if the buffer holds just the TR1 slot region).
+    """
+    return dict(zip(FIELD_NAMES, SLOT_STRUCT.unpack_from(buffer, base_offset + index * SAVE_SLOT_SIZE)))
+
+
+def read_save_file(path: str) -> SaveSlots:
+    """Memory-map a savegame.dat and decode its TR1 slots."""
+    with open(path, "rb") as file:
+        if file.seek(0, 2) < SAVE_FILE_BASE_OFFSET + SAVE_SLOT_SIZE:
+            return decode_slots(b"")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_slots(mapped)
+
+
+def read_save_files(paths: List[str]) -> Iterator[Tuple[str, SaveSlots]]:
+    for path in paths:
+        yield path, read_save_file(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    for path, slots in read_save_files(args.paths):
+        occupied = slots.occupied()
+        print(f"{path}: {len(occupied)} of {len(slots)} TR1 slots occupied, latest {slots.latest()}")
+        for i in occupied:
+            print(f"  slot {i:2}: save {slots.save_number[i]:4}  level {slots.level_index[i]:2}"
+                  f"  secrets {slots.secrets_found[i]:#06x}  weapons {slots.weapons_config[i]:#04x}"
+                  f"  meds {slots.small_medipacks[i]}/{slots.large_medipacks[i]}"
+                  f"  kills {slots.kills[i]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Sphere and playthrough analyzer for a single TR1R world.
+
+Takes the item placement of one TR1R slot and works out its playthrough
+without running an Archipelago generation: the spheres, the minimal
+playthrough (only the progression items the goal really needs) and what
+each progression item unlocks.
+
+The logic is compiled into bitsets once per run, one bit per progression
+item the logic mentions (key items and "Level Complete" events):
+  - region access comes from the level chain in regions.py (in the slot's
+    level order, for slot data input) and, with key_gated_regions, the
+    key-gated areas of the compiled region table, folded into a minimal
+    list of item masks per region (any one mask is enough);
+  - each location's requirement is its region's masks combined with its
+    entry in rules.LEVEL_COMPLETE_REQUIREMENTS;
+  - locations with the same requirement share one check, so a sphere is a
+    handful of mask tests rather than a reachability sweep.
+
+Placement input is either a JSON object mapping location name -> item
+name, or a slot data JSON with a placement_manifest (pass --player, the
+slot's player number; its goal settings are used unless overridden).
+Progression items of this world that aren't placed in it are in other
+worlds; they are assumed to be available from the start.
+
+Sphere numbers count from 0, the locations reachable with nothing found.
+
+Usage:
+    python tools/spheres.py placement.json [--player N] [--goal final_boss]
+        [--levels-for-goal 15] [--max-spheres 12] [--json]
+
+Exits with status 1 if the seed is unbeatable or has more than
+--max-spheres spheres.
+
+Requires apworld/tr1r/data/tr1r_data.json (exporter output).
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "benchmarks"))
+
+try:
+    import BaseClasses  # noqa: F401
+except ImportError:
+    import apstub
+
+    apstub.install()
+else:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "apworld"))
+
+from tr1r.game_data import get_levels  # noqa: E402
+from tr1r.items import get_item_name_from_id, get_items_by_category  # noqa: E402
+from tr1r.level_order import Order, order_from_sequence, vanilla_level_order  # noqa: E402
+from tr1r.locations import get_location_name_from_id, get_location_table  # noqa: E402
+from tr1r.manifest import decode_manifest  # noqa: E402
+from tr1r.regions import get_location_regions, get_region_connections, get_region_table  # noqa: E402
+from tr1r.rules import LEVEL_COMPLETE_REQUIREMENTS  # noqa: E402
+
+GOALS = ("final_boss", "all_secrets", "n_levels")  # in options.Goal order
+
+Masks = Tuple[int, ...]  # alternatives: any one mask of items is enough
+
+
+def minimize(masks: Iterable[int]) -> Masks:
+    """Drop every mask that is a superset of another one."""
+    kept: List[int] = []
+    for mask in sorted(set(masks), key=lambda mask: (bin(mask).count("1"), mask)):
+        if not any(mask & other == other for other in kept):
+            kept.append(mask)
+    return tuple(kept)
+
+
+def satisfied(masks: Masks, have: int) -> bool:
+    return any(mask & ~have == 0 for mask in masks)
+
+
+class LogicModel:
+    """The world's access logic as item bitsets, built once from the data files."""
+
+    def __init__(self, order: Optional[Order] = None, key_gated: bool = False) -> None:
+        levels = [name for name, _file, _region in get_levels()]
+        required: Set[str] = {f"Level Complete - {name}" for name in levels}
+        for items in LEVEL_COMPLETE_REQUIREMENTS.values():
+            required.update(items)
+        region_table = get_region_table(key_gated)
+        for areas in region_table.values():
+            for area in areas:
+                for items in area.requires:
+                    required.update(items)
+        self.items: Tuple[str, ...] = tuple(sorted(required))
+        self.bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(self.items)}
+
+        edges: List[Tuple[str, str, Masks]] = [
+            (source, target, (self.mask((event,) if event else ()),))
+            for source, target, event in get_region_connections(order or vanilla_level_order())
+        ]
+        for level_name, areas in region_table.items():
+            edges.extend(
+                (level_name, area.name, minimize(self.mask(items) for items in area.requires))
+                for area in areas
+            )
+        self.region_access = self._fold(edges)
+
+        # Locations in table order, grouped by identical requirement
+        self.locations: Tuple[str, ...] = tuple(get_location_table())
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.locations)}
+        groups: Dict[Masks, List[int]] = {}
+        for name, region in get_location_regions(key_gated).items():
+            extra = self.mask(LEVEL_COMPLETE_REQUIREMENTS.get(name, ()))
+            masks = minimize(mask | extra for mask in self.region_access.get(region, ()))
+            groups.setdefault(masks, []).append(self.index[name])
+        self.groups: Tuple[Tuple[Masks, Tuple[int, ...]], ...] = tuple(
+            (masks, tuple(locations)) for masks, locations in groups.items()
+        )
+
+        self.level_events: Tuple[int, ...] = tuple(self.bits[f"Level Complete - {name}"] for name in levels)
+        self.events: Dict[int, str] = {
+            self.index[f"{name} - Complete"]: f"Level Complete - {name}" for name in levels
+        }
+        self.secret_locations: Tuple[int, ...] = tuple(
+            self.index[name] for name, data in get_location_table().items() if data.category == "secret"
+        )
+
+    def mask(self, items: Iterable[str]) -> int:
+        """Bits of the named items; raises KeyError for items the logic never mentions."""
+        mask = 0
+        for item in items:
+            mask |= self.bits[item]
+        return mask
+
+    @staticmethod
+    def _fold(edges: Sequence[Tuple[str, str, Masks]]) -> Dict[str, Masks]:
+        """Minimal item masks reaching each region from Menu (fixpoint over the edges)."""
+        access: Dict[str, Masks] = {"Menu": (0,)}
+        changed = True
+        while changed:
+            changed = False
+            for source, target, gate in edges:
+                if source not in access:
+                    continue
+                masks = minimize(access.get(target, ()) + tuple(
+                    reach | need for reach in access[source] for need in gate
+                ))
+                if masks != access.get(target):
+                    access[target] = masks
+                    changed = True
+        return access
+
+
+class Analysis:
+    """Spheres of one placement; item_bits[i] is the logic bit found at location i."""
+
+    def __init__(self, model: LogicModel, item_bits: Sequence[int], start: int):
+        self.model = model
+        self.item_bits = item_bits
+        self.start = start
+
+    def spheres(self, excluded: int = 0) -> Tuple[List[List[int]], int]:
+        """Locations per sphere and the final item mask, never collecting excluded bits."""
+        have = self.start & ~excluded
+        remaining = list(self.model.groups)
+        spheres: List[List[int]] = []
+        while remaining:
+            opened = [locations for masks, locations in remaining if satisfied(masks, have)]
+            if not opened:
+                break
+            remaining = [group for group in remaining if not satisfied(group[0], have)]
+            sphere = [location for locations in opened for location in locations]
+            spheres.append(sphere)
+            for location in sphere:
+                have |= self.item_bits[location]
+            have &= ~excluded
+        return spheres, have
+
+    def beaten(self, spheres: List[List[int]], have: int, goal: str, levels_for_goal: int) -> bool:
+        if goal == "final_boss":
+            return have & self.model.level_events[-1] != 0
+        if goal == "n_levels":
+            return sum(1 for bit in self.model.level_events if have & bit) >= levels_for_goal
+        reached = {location for sphere in spheres for location in sphere}
+        return all(location in reached for location in self.model.secret_locations)
+
+
+def analyze(model: LogicModel, placement: Mapping[str, str], goal: str = "final_boss",
+            levels_for_goal: int = 15) -> Dict[str, Any]:
+    """
+    Spheres, minimal playthrough and unlocks for one placement (location ->
+    item name). The playthrough is empty if the goal is not reachable.
+    """
+    started = time.perf_counter()
+    locations = model.locations
+    items: Dict[int, str] = {model.index[name]: item for name, item in placement.items()
+                             if name in model.index}
+    items.update(model.events)
+    item_bits = [model.bits.get(items.get(i, ""), 0) for i in range(len(locations))]
+
+    placed = 0
+    for bit in item_bits:
+        placed |= bit
+    external = ((1 << len(model.items)) - 1) & ~placed
+    for bit in model.level_events:
+        external &= ~bit  # events only come from their own location
+    analysis = Analysis(model, item_bits, external)
+
+    spheres, have = analysis.spheres()
+    beatable = analysis.beaten(spheres, have, goal, levels_for_goal)
+    sphere_of = {location: n for n, sphere in enumerate(spheres) for location in sphere}
+
+    # Minimal playthrough: drop progression items, latest first, while the goal stays reachable
+    progression = sorted((location for location in sphere_of if item_bits[location]),
+                         key=lambda location: -sphere_of[location])
+    needed = list(item_bits)
+    minimal: List[List[int]] = []
+    if beatable:
+        for location in progression:
+            if location in model.events:
+                continue
+            bit, needed[location] = needed[location], 0
+            trial = Analysis(model, needed, external)
+            if not trial.beaten(*trial.spheres(), goal, levels_for_goal):
+                needed[location] = bit
+        minimal, _have = Analysis(model, needed, external).spheres()
+
+    # What each progression item unlocks: locations lost if it never turned up
+    reachable = len(sphere_of)
+    unlocks: Dict[str, Dict[str, Any]] = {}
+    for location in progression:
+        item = items[location]
+        lost_spheres, _have = analysis.spheres(excluded=model.bits[item])
+        lost = set(sphere_of) - {lost for sphere in lost_spheres for lost in sphere}
+        unlocks[item] = {
+            "locations": len(lost),
+            "progression": sorted(items[lost_location] for lost_location in lost
+                                  if item_bits[lost_location] and lost_location not in model.events),
+        }
+
+    key_items = set(get_items_by_category("key_item"))
+    return {
+        "goal": goal,
+        "beatable": beatable,
+        "spheres": len(spheres),
+        "reachable": reachable,
+        "locations": len(locations),
+        "external": [model.items[bit] for bit in range(len(model.items)) if external >> bit & 1],
+        "sphere_sizes": [len(sphere) for sphere in spheres],
+        "key_item_spheres": {
+            items[location]: sphere_of[location]
+            for location in sorted(sphere_of) if items.get(location) in key_items
+        },
+        "playthrough": [
+            {locations[location]: items[location] for location in sphere
+             if needed[location] and location not in model.events}
+            for sphere in minimal
+        ],
+        "unlocks": unlocks,
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def load_placement(path: str, player: Optional[int]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Read a placement file; returns (location -> item name, slot data or {})."""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    if "placement_manifest" not in data:
+        return data, {}
+    if player is None:
+        raise SystemExit("--player is required for slot data input")
+
+    placement: Dict[str, str] = {}
+    for location_id, item_id, receiver, _classification in decode_manifest(data["placement_manifest"]):
+        location = get_location_name_from_id(location_id)
+        item = get_item_name_from_id(item_id) if receiver == player else None
+        if location is not None and item is not None:
+            placement[location] = item
+    return placement, data
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"goal {report['goal']}: {'beatable' if report['beatable'] else 'NOT BEATABLE'}, "
+          f"{report['spheres']} spheres, {report['reachable']}/{report['locations']} locations reachable "
+          f"({report['elapsed_ms']:.1f} ms)")
+    if report["external"]:
+        print(f"  from other worlds: {', '.join(report['external'])}")
+    if report["beatable"]:
+        print("Minimal playthrough:")
+    else:
+        print("Minimal playthrough: none, the goal is not reachable")
+    for n, sphere in enumerate(report["playthrough"]):
+        if sphere:
+            print(f"  sphere {n}:")
+            for location, item in sphere.items():
+                print(f"    {location}: {item}")
+    print("Unlocks:")
+    for item, unlocked in sorted(report["unlocks"].items(), key=lambda entry: -entry[1]["locations"]):
+        print(f"  {item}: {unlocked['locations']} locations"
+              + (f", incl. {', '.join(unlocked['progression'])}" if unlocked["progression"] else ""))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("placement")
+    parser.add_argument("--player", type=int, help="slot player number (slot data input)")
+    parser.add_argument("--goal", choices=GOALS)
+    parser.add_argument("--levels-for-goal", type=int)
+    parser.add_argument("--max-spheres", type=int, help="fail if the playthrough is longer")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    placement, slot_data = load_placement(args.placement, args.player)
+    goal = args.goal or GOALS[slot_data.get("goal", 0)]
+    levels_for_goal = args.levels_for_goal or slot_data.get("levels_for_goal", len(get_levels()))
+
+    order = order_from_sequence(slot_data["level_sequence"]) if "level_sequence" in slot_data else None
+    key_gated = bool(slot_data.get("key_gated_regions", False))
+
+    report = analyze(LogicModel(order, key_gated), placement, goal, levels_for_goal)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    too_long = args.max_spheres is not None and report["spheres"] > args.max_spheres
+    if too_long:
+        print(f"FAIL: {report['spheres']} spheres (max {args.max_spheres})", file=sys.stderr)
+    if too_long or not report["beatable"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()